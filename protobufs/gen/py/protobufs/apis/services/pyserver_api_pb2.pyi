@@ -9,10 +9,14 @@ from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class RunTaskRequest(_message.Message):
-    __slots__ = ("call",)
+    __slots__ = ("call", "task_id", "attempt_id")
     CALL_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    ATTEMPT_ID_FIELD_NUMBER: _ClassVar[int]
     call: _task_pb2.ToolCall
-    def __init__(self, call: _Optional[_Union[_task_pb2.ToolCall, _Mapping]] = ...) -> None: ...
+    task_id: str
+    attempt_id: str
+    def __init__(self, call: _Optional[_Union[_task_pb2.ToolCall, _Mapping]] = ..., task_id: _Optional[str] = ..., attempt_id: _Optional[str] = ...) -> None: ...
 
 class RunTaskResponse(_message.Message):
     __slots__ = ("status", "error_message", "output")
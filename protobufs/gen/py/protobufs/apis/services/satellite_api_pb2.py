@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protobufs/apis/services/satellite_api.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'protobufs/apis/services/satellite_api.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n+protobufs/apis/services/satellite_api.proto\x12\x0c\x61ssistant.v1\"\x89\x01\n\nAudioChunk\x12\x14\n\x0csatellite_id\x18\x01 \x01(\t\x12\'\n\x05\x63odec\x18\x02 \x01(\x0e\x32\x18.assistant.v1.AudioCodec\x12\x13\n\x0bsample_rate\x18\x03 \x01(\r\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x05 \x01(\x0c\x12\x0c\n\x04wake\x18\x06 \x01(\x08\"\xa6\x02\n\rListenerEvent\x12.\n\x04kind\x18\x01 \x01(\x0e\x32 .assistant.v1.ListenerEvent.Kind\x12\x0b\n\x03seq\x18\x02 \x01(\x04\x12\x0c\n\x04text\x18\x03 \x01(\t\x12\x12\n\nconfidence\x18\x04 \x01(\x02\x12\x10\n\x08\x62uffered\x18\x05 \x01(\r\"\xa3\x01\n\x04Kind\x12\x14\n\x10KIND_UNSPECIFIED\x10\x00\x12\x0e\n\nKIND_READY\x10\x01\x12\r\n\tKIND_WAKE\x10\x02\x12\x19\n\x15KIND_END_OF_UTTERANCE\x10\x03\x12\x13\n\x0fKIND_TRANSCRIPT\x10\x04\x12\x10\n\x0cKIND_PLANNED\x10\x05\x12\r\n\tKIND_DONE\x10\x06\x12\x15\n\x11KIND_BACKPRESSURE\x10\x07*Z\n\nAudioCodec\x12\x1b\n\x17\x41UDIO_CODEC_UNSPECIFIED\x10\x00\x12\x19\n\x15\x41UDIO_CODEC_PCM_S16LE\x10\x01\x12\x14\n\x10\x41UDIO_CODEC_OPUS\x10\x02\x32\\\n\x10SatelliteService\x12H\n\x0bStreamAudio\x12\x18.assistant.v1.AudioChunk\x1a\x1b.assistant.v1.ListenerEvent(\x01\x30\x01\x42IZGgithub.com/Vol-v/ai-assistant/protobufs/gen/go/apis/services;servicespbb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protobufs.apis.services.satellite_api_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'ZGgithub.com/Vol-v/ai-assistant/protobufs/gen/go/apis/services;servicespb'
+  _globals['_AUDIOCODEC']._serialized_start=498
+  _globals['_AUDIOCODEC']._serialized_end=588
+  _globals['_AUDIOCHUNK']._serialized_start=62
+  _globals['_AUDIOCHUNK']._serialized_end=199
+  _globals['_LISTENEREVENT']._serialized_start=202
+  _globals['_LISTENEREVENT']._serialized_end=496
+  _globals['_LISTENEREVENT_KIND']._serialized_start=333
+  _globals['_LISTENEREVENT_KIND']._serialized_end=496
+  _globals['_SATELLITESERVICE']._serialized_start=590
+  _globals['_SATELLITESERVICE']._serialized_end=682
+# @@protoc_insertion_point(module_scope)
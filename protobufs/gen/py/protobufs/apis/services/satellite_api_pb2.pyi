@@ -0,0 +1,63 @@
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class AudioCodec(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    AUDIO_CODEC_UNSPECIFIED: _ClassVar[AudioCodec]
+    AUDIO_CODEC_PCM_S16LE: _ClassVar[AudioCodec]
+    AUDIO_CODEC_OPUS: _ClassVar[AudioCodec]
+AUDIO_CODEC_UNSPECIFIED: AudioCodec
+AUDIO_CODEC_PCM_S16LE: AudioCodec
+AUDIO_CODEC_OPUS: AudioCodec
+
+class AudioChunk(_message.Message):
+    __slots__ = ("satellite_id", "codec", "sample_rate", "seq", "data", "wake")
+    SATELLITE_ID_FIELD_NUMBER: _ClassVar[int]
+    CODEC_FIELD_NUMBER: _ClassVar[int]
+    SAMPLE_RATE_FIELD_NUMBER: _ClassVar[int]
+    SEQ_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    WAKE_FIELD_NUMBER: _ClassVar[int]
+    satellite_id: str
+    codec: AudioCodec
+    sample_rate: int
+    seq: int
+    data: bytes
+    wake: bool
+    def __init__(self, satellite_id: _Optional[str] = ..., codec: _Optional[_Union[AudioCodec, str]] = ..., sample_rate: _Optional[int] = ..., seq: _Optional[int] = ..., data: _Optional[bytes] = ..., wake: bool = ...) -> None: ...
+
+class ListenerEvent(_message.Message):
+    __slots__ = ("kind", "seq", "text", "confidence", "buffered")
+    class Kind(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        KIND_UNSPECIFIED: _ClassVar[ListenerEvent.Kind]
+        KIND_READY: _ClassVar[ListenerEvent.Kind]
+        KIND_WAKE: _ClassVar[ListenerEvent.Kind]
+        KIND_END_OF_UTTERANCE: _ClassVar[ListenerEvent.Kind]
+        KIND_TRANSCRIPT: _ClassVar[ListenerEvent.Kind]
+        KIND_PLANNED: _ClassVar[ListenerEvent.Kind]
+        KIND_DONE: _ClassVar[ListenerEvent.Kind]
+        KIND_BACKPRESSURE: _ClassVar[ListenerEvent.Kind]
+    KIND_UNSPECIFIED: ListenerEvent.Kind
+    KIND_READY: ListenerEvent.Kind
+    KIND_WAKE: ListenerEvent.Kind
+    KIND_END_OF_UTTERANCE: ListenerEvent.Kind
+    KIND_TRANSCRIPT: ListenerEvent.Kind
+    KIND_PLANNED: ListenerEvent.Kind
+    KIND_DONE: ListenerEvent.Kind
+    KIND_BACKPRESSURE: ListenerEvent.Kind
+    KIND_FIELD_NUMBER: _ClassVar[int]
+    SEQ_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    CONFIDENCE_FIELD_NUMBER: _ClassVar[int]
+    BUFFERED_FIELD_NUMBER: _ClassVar[int]
+    kind: ListenerEvent.Kind
+    seq: int
+    text: str
+    confidence: float
+    buffered: int
+    def __init__(self, kind: _Optional[_Union[ListenerEvent.Kind, str]] = ..., seq: _Optional[int] = ..., text: _Optional[str] = ..., confidence: _Optional[float] = ..., buffered: _Optional[int] = ...) -> None: ...
@@ -0,0 +1,105 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from protobufs.apis.services import satellite_api_pb2 as protobufs_dot_apis_dot_services_dot_satellite__api__pb2
+
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in protobufs/apis/services/satellite_api_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class SatelliteServiceStub(object):
+    """Remote microphones ("satellites") streaming audio to the central listener.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StreamAudio = channel.stream_stream(
+                '/assistant.v1.SatelliteService/StreamAudio',
+                request_serializer=protobufs_dot_apis_dot_services_dot_satellite__api__pb2.AudioChunk.SerializeToString,
+                response_deserializer=protobufs_dot_apis_dot_services_dot_satellite__api__pb2.ListenerEvent.FromString,
+                _registered_method=True)
+
+
+class SatelliteServiceServicer(object):
+    """Remote microphones ("satellites") streaming audio to the central listener.
+    """
+
+    def StreamAudio(self, request_iterator, context):
+        """One call per satellite connection. The first chunk opens the stream (satellite_id,
+        codec, sample_rate); every chunk may carry audio. The listener answers on the same
+        call with what it is doing for this satellite. The server stops reading while its
+        per-stream buffer is full, so a satellite that outruns the listener blocks on send
+        (HTTP/2 flow control) after a BACKPRESSURE event.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_SatelliteServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'StreamAudio': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamAudio,
+                    request_deserializer=protobufs_dot_apis_dot_services_dot_satellite__api__pb2.AudioChunk.FromString,
+                    response_serializer=protobufs_dot_apis_dot_services_dot_satellite__api__pb2.ListenerEvent.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'assistant.v1.SatelliteService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('assistant.v1.SatelliteService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class SatelliteService(object):
+    """Remote microphones ("satellites") streaming audio to the central listener.
+    """
+
+    @staticmethod
+    def StreamAudio(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/assistant.v1.SatelliteService/StreamAudio',
+            protobufs_dot_apis_dot_services_dot_satellite__api__pb2.AudioChunk.SerializeToString,
+            protobufs_dot_apis_dot_services_dot_satellite__api__pb2.ListenerEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
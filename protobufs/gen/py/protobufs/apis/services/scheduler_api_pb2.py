@@ -26,7 +26,7 @@ from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__
 from protobufs.apis.models import task_pb2 as protobufs_dot_apis_dot_models_dot_task__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n+protobufs/apis/services/scheduler_api.proto\x12\x0c\x61ssistant.v1\x1a\x1fgoogle/protobuf/timestamp.proto\x1a protobufs/apis/models/task.proto\"_\n\x13ScheduleTaskRequest\x12 \n\x04task\x18\x01 \x01(\x0b\x32\x12.assistant.v1.Task\x12&\n\x07trigger\x18\x02 \x01(\x0b\x32\x15.assistant.v1.Trigger\"[\n\x14ScheduleTaskResponse\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x32\n\x0enext_fire_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"$\n\x11\x43\x61ncelTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\"&\n\x12\x43\x61ncelTaskResponse\x12\x10\n\x08\x63\x61nceled\x18\x01 \x01(\x08\"\x9b\x01\n\x10ListTasksRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12.\n\nnot_before\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x15\n\rinclude_speak\x18\n \x01(\x08\x12\x15\n\rinclude_timer\x18\x0b \x01(\x08\x12\x1a\n\x12include_play_sound\x18\x0c \x01(\x08\"\xfc\x01\n\x0bTaskSummary\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12(\n\x08priority\x18\x02 \x01(\x0e\x32\x16.assistant.v1.Priority\x12\x32\n\x0enext_fire_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08timezone\x18\x04 \x01(\t\x12\x0c\n\x04tool\x18\x05 \x01(\t\x12\x31\n\x04meta\x18\x06 \x03(\x0b\x32#.assistant.v1.TaskSummary.MetaEntry\x1a+\n\tMetaEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"=\n\x11ListTasksResponse\x12(\n\x05tasks\x18\x01 \x03(\x0b\x32\x19.assistant.v1.TaskSummary\"!\n\x0eGetTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\"\x8f\x01\n\x0fGetTaskResponse\x12 \n\x04task\x18\x01 \x01(\x0b\x32\x12.assistant.v1.Task\x12&\n\x07trigger\x18\x02 \x01(\x0b\x32\x15.assistant.v1.Trigger\x12\x32\n\x0enext_fire_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp2\xd0\x02\n\x10SchedulerService\x12U\n\x0cScheduleTask\x12!.assistant.v1.ScheduleTaskRequest\x1a\".assistant.v1.ScheduleTaskResponse\x12O\n\nCancelTask\x12\x1f.assistant.v1.CancelTaskRequest\x1a .assistant.v1.CancelTaskResponse\x12L\n\tListTasks\x12\x1e.assistant.v1.ListTasksRequest\x1a\x1f.assistant.v1.ListTasksResponse\x12\x46\n\x07GetTask\x12\x1c.assistant.v1.GetTaskRequest\x1a\x1d.assistant.v1.GetTaskResponseBIZGgithub.com/Vol-v/ai-assistant/protobufs/gen/go/apis/services;servicespbb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n+protobufs/apis/services/scheduler_api.proto\x12\x0c\x61ssistant.v1\x1a\x1fgoogle/protobuf/timestamp.proto\x1a protobufs/apis/models/task.proto\"_\n\x13ScheduleTaskRequest\x12 \n\x04task\x18\x01 \x01(\x0b\x32\x12.assistant.v1.Task\x12&\n\x07trigger\x18\x02 \x01(\x0b\x32\x15.assistant.v1.Trigger\"[\n\x14ScheduleTaskResponse\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x32\n\x0enext_fire_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"$\n\x11\x43\x61ncelTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\"&\n\x12\x43\x61ncelTaskResponse\x12\x10\n\x08\x63\x61nceled\x18\x01 \x01(\x08\"\xdb\x01\n\x10ListTasksRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12.\n\nnot_before\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x12\n\npage_token\x18\x03 \x01(\t\x12\x15\n\rinclude_speak\x18\n \x01(\x08\x12\x15\n\rinclude_timer\x18\x0b \x01(\x08\x12\x1a\n\x12include_play_sound\x18\x0c \x01(\x08\x12*\n\npriorities\x18\r \x03(\x0e\x32\x16.assistant.v1.Priority\"\xfc\x01\n\x0bTaskSummary\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12(\n\x08priority\x18\x02 \x01(\x0e\x32\x16.assistant.v1.Priority\x12\x32\n\x0enext_fire_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08timezone\x18\x04 \x01(\t\x12\x0c\n\x04tool\x18\x05 \x01(\t\x12\x31\n\x04meta\x18\x06 \x03(\x0b\x32#.assistant.v1.TaskSummary.MetaEntry\x1a+\n\tMetaEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"V\n\x11ListTasksResponse\x12(\n\x05tasks\x18\x01 \x03(\x0b\x32\x19.assistant.v1.TaskSummary\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"!\n\x0eGetTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\"\x8f\x01\n\x0fGetTaskResponse\x12 \n\x04task\x18\x01 \x01(\x0b\x32\x12.assistant.v1.Task\x12&\n\x07trigger\x18\x02 \x01(\x0b\x32\x15.assistant.v1.Trigger\x12\x32\n\x0enext_fire_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"5\n\x11WatchTasksRequest\x12\r\n\x05\x65poch\x18\x01 \x01(\t\x12\x11\n\tsince_seq\x18\x02 \x01(\x04\"\xa5\x02\n\tTaskEvent\x12*\n\x04kind\x18\x01 \x01(\x0e\x32\x1c.assistant.v1.TaskEvent.Kind\x12\r\n\x05\x65poch\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x04\x12(\n\x05tasks\x18\x04 \x03(\x0b\x32\x19.assistant.v1.TaskSummary\x12\x0f\n\x07task_id\x18\x05 \x01(\t\x12\r\n\x05reset\x18\x06 \x01(\x08\x12\x0c\n\x04\x64one\x18\x07 \x01(\x08\"x\n\x04Kind\x12\x14\n\x10KIND_UNSPECIFIED\x10\x00\x12\x11\n\rKIND_SNAPSHOT\x10\x01\x12\x0f\n\x0bKIND_SYNCED\x10\x02\x12\x12\n\x0eKIND_SCHEDULED\x10\x03\x12\x0e\n\nKIND_FIRED\x10\x04\x12\x12\n\x0eKIND_CANCELLED\x10\x05\x32\xec\x03\n\x10SchedulerService\x12U\n\x0cScheduleTask\x12!.assistant.v1.ScheduleTaskRequest\x1a\".assistant.v1.ScheduleTaskResponse\x12O\n\nCancelTask\x12\x1f.assistant.v1.CancelTaskRequest\x1a .assistant.v1.CancelTaskResponse\x12L\n\tListTasks\x12\x1e.assistant.v1.ListTasksRequest\x1a\x1f.assistant.v1.ListTasksResponse\x12P\n\x0bStreamTasks\x12\x1e.assistant.v1.ListTasksRequest\x1a\x1f.assistant.v1.ListTasksResponse0\x01\x12\x46\n\x07GetTask\x12\x1c.assistant.v1.GetTaskRequest\x1a\x1d.assistant.v1.GetTaskResponse\x12H\n\nWatchTasks\x12\x1f.assistant.v1.WatchTasksRequest\x1a\x17.assistant.v1.TaskEvent0\x01\x42IZGgithub.com/Vol-v/ai-assistant/protobufs/gen/go/apis/services;servicespbb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -45,17 +45,23 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CANCELTASKRESPONSE']._serialized_start=356
   _globals['_CANCELTASKRESPONSE']._serialized_end=394
   _globals['_LISTTASKSREQUEST']._serialized_start=397
-  _globals['_LISTTASKSREQUEST']._serialized_end=552
-  _globals['_TASKSUMMARY']._serialized_start=555
-  _globals['_TASKSUMMARY']._serialized_end=807
-  _globals['_TASKSUMMARY_METAENTRY']._serialized_start=764
-  _globals['_TASKSUMMARY_METAENTRY']._serialized_end=807
-  _globals['_LISTTASKSRESPONSE']._serialized_start=809
-  _globals['_LISTTASKSRESPONSE']._serialized_end=870
-  _globals['_GETTASKREQUEST']._serialized_start=872
-  _globals['_GETTASKREQUEST']._serialized_end=905
-  _globals['_GETTASKRESPONSE']._serialized_start=908
-  _globals['_GETTASKRESPONSE']._serialized_end=1051
-  _globals['_SCHEDULERSERVICE']._serialized_start=1054
-  _globals['_SCHEDULERSERVICE']._serialized_end=1390
+  _globals['_LISTTASKSREQUEST']._serialized_end=616
+  _globals['_TASKSUMMARY']._serialized_start=619
+  _globals['_TASKSUMMARY']._serialized_end=871
+  _globals['_TASKSUMMARY_METAENTRY']._serialized_start=828
+  _globals['_TASKSUMMARY_METAENTRY']._serialized_end=871
+  _globals['_LISTTASKSRESPONSE']._serialized_start=873
+  _globals['_LISTTASKSRESPONSE']._serialized_end=959
+  _globals['_GETTASKREQUEST']._serialized_start=961
+  _globals['_GETTASKREQUEST']._serialized_end=994
+  _globals['_GETTASKRESPONSE']._serialized_start=997
+  _globals['_GETTASKRESPONSE']._serialized_end=1140
+  _globals['_WATCHTASKSREQUEST']._serialized_start=1142
+  _globals['_WATCHTASKSREQUEST']._serialized_end=1195
+  _globals['_TASKEVENT']._serialized_start=1198
+  _globals['_TASKEVENT']._serialized_end=1491
+  _globals['_TASKEVENT_KIND']._serialized_start=1371
+  _globals['_TASKEVENT_KIND']._serialized_end=1491
+  _globals['_SCHEDULERSERVICE']._serialized_start=1494
+  _globals['_SCHEDULERSERVICE']._serialized_end=1986
 # @@protoc_insertion_point(module_scope)
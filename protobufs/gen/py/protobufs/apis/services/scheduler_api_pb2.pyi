@@ -3,6 +3,7 @@ import datetime
 from google.protobuf import timestamp_pb2 as _timestamp_pb2
 from protobufs.apis.models import task_pb2 as _task_pb2
 from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from collections.abc import Iterable as _Iterable, Mapping as _Mapping
@@ -39,18 +40,22 @@ class CancelTaskResponse(_message.Message):
     def __init__(self, canceled: bool = ...) -> None: ...
 
 class ListTasksRequest(_message.Message):
-    __slots__ = ("limit", "not_before", "include_speak", "include_timer", "include_play_sound")
+    __slots__ = ("limit", "not_before", "page_token", "include_speak", "include_timer", "include_play_sound", "priorities")
     LIMIT_FIELD_NUMBER: _ClassVar[int]
     NOT_BEFORE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     INCLUDE_SPEAK_FIELD_NUMBER: _ClassVar[int]
     INCLUDE_TIMER_FIELD_NUMBER: _ClassVar[int]
     INCLUDE_PLAY_SOUND_FIELD_NUMBER: _ClassVar[int]
+    PRIORITIES_FIELD_NUMBER: _ClassVar[int]
     limit: int
     not_before: _timestamp_pb2.Timestamp
+    page_token: str
     include_speak: bool
     include_timer: bool
     include_play_sound: bool
-    def __init__(self, limit: _Optional[int] = ..., not_before: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., include_speak: bool = ..., include_timer: bool = ..., include_play_sound: bool = ...) -> None: ...
+    priorities: _containers.RepeatedScalarFieldContainer[_task_pb2.Priority]
+    def __init__(self, limit: _Optional[int] = ..., not_before: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., page_token: _Optional[str] = ..., include_speak: bool = ..., include_timer: bool = ..., include_play_sound: bool = ..., priorities: _Optional[_Iterable[_Union[_task_pb2.Priority, str]]] = ...) -> None: ...
 
 class TaskSummary(_message.Message):
     __slots__ = ("task_id", "priority", "next_fire_time", "timezone", "tool", "meta")
@@ -76,10 +81,12 @@ class TaskSummary(_message.Message):
     def __init__(self, task_id: _Optional[str] = ..., priority: _Optional[_Union[_task_pb2.Priority, str]] = ..., next_fire_time: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., timezone: _Optional[str] = ..., tool: _Optional[str] = ..., meta: _Optional[_Mapping[str, str]] = ...) -> None: ...
 
 class ListTasksResponse(_message.Message):
-    __slots__ = ("tasks",)
+    __slots__ = ("tasks", "next_page_token")
     TASKS_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     tasks: _containers.RepeatedCompositeFieldContainer[TaskSummary]
-    def __init__(self, tasks: _Optional[_Iterable[_Union[TaskSummary, _Mapping]]] = ...) -> None: ...
+    next_page_token: str
+    def __init__(self, tasks: _Optional[_Iterable[_Union[TaskSummary, _Mapping]]] = ..., next_page_token: _Optional[str] = ...) -> None: ...
 
 class GetTaskRequest(_message.Message):
     __slots__ = ("task_id",)
@@ -96,3 +103,43 @@ class GetTaskResponse(_message.Message):
     trigger: _task_pb2.Trigger
     next_fire_time: _timestamp_pb2.Timestamp
     def __init__(self, task: _Optional[_Union[_task_pb2.Task, _Mapping]] = ..., trigger: _Optional[_Union[_task_pb2.Trigger, _Mapping]] = ..., next_fire_time: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ...) -> None: ...
+
+class WatchTasksRequest(_message.Message):
+    __slots__ = ("epoch", "since_seq")
+    EPOCH_FIELD_NUMBER: _ClassVar[int]
+    SINCE_SEQ_FIELD_NUMBER: _ClassVar[int]
+    epoch: str
+    since_seq: int
+    def __init__(self, epoch: _Optional[str] = ..., since_seq: _Optional[int] = ...) -> None: ...
+
+class TaskEvent(_message.Message):
+    __slots__ = ("kind", "epoch", "seq", "tasks", "task_id", "reset", "done")
+    class Kind(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+        __slots__ = ()
+        KIND_UNSPECIFIED: _ClassVar[TaskEvent.Kind]
+        KIND_SNAPSHOT: _ClassVar[TaskEvent.Kind]
+        KIND_SYNCED: _ClassVar[TaskEvent.Kind]
+        KIND_SCHEDULED: _ClassVar[TaskEvent.Kind]
+        KIND_FIRED: _ClassVar[TaskEvent.Kind]
+        KIND_CANCELLED: _ClassVar[TaskEvent.Kind]
+    KIND_UNSPECIFIED: TaskEvent.Kind
+    KIND_SNAPSHOT: TaskEvent.Kind
+    KIND_SYNCED: TaskEvent.Kind
+    KIND_SCHEDULED: TaskEvent.Kind
+    KIND_FIRED: TaskEvent.Kind
+    KIND_CANCELLED: TaskEvent.Kind
+    KIND_FIELD_NUMBER: _ClassVar[int]
+    EPOCH_FIELD_NUMBER: _ClassVar[int]
+    SEQ_FIELD_NUMBER: _ClassVar[int]
+    TASKS_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    RESET_FIELD_NUMBER: _ClassVar[int]
+    DONE_FIELD_NUMBER: _ClassVar[int]
+    kind: TaskEvent.Kind
+    epoch: str
+    seq: int
+    tasks: _containers.RepeatedCompositeFieldContainer[TaskSummary]
+    task_id: str
+    reset: bool
+    done: bool
+    def __init__(self, kind: _Optional[_Union[TaskEvent.Kind, str]] = ..., epoch: _Optional[str] = ..., seq: _Optional[int] = ..., tasks: _Optional[_Iterable[_Union[TaskSummary, _Mapping]]] = ..., task_id: _Optional[str] = ..., reset: bool = ..., done: bool = ...) -> None: ...
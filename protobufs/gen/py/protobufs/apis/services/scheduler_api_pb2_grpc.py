@@ -49,11 +49,21 @@ class SchedulerServiceStub(object):
                 request_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksRequest.SerializeToString,
                 response_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksResponse.FromString,
                 _registered_method=True)
+        self.StreamTasks = channel.unary_stream(
+                '/assistant.v1.SchedulerService/StreamTasks',
+                request_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksRequest.SerializeToString,
+                response_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksResponse.FromString,
+                _registered_method=True)
         self.GetTask = channel.unary_unary(
                 '/assistant.v1.SchedulerService/GetTask',
                 request_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.GetTaskRequest.SerializeToString,
                 response_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.GetTaskResponse.FromString,
                 _registered_method=True)
+        self.WatchTasks = channel.unary_stream(
+                '/assistant.v1.SchedulerService/WatchTasks',
+                request_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.WatchTasksRequest.SerializeToString,
+                response_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.TaskEvent.FromString,
+                _registered_method=True)
 
 
 class SchedulerServiceServicer(object):
@@ -77,12 +87,30 @@ class SchedulerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamTasks(self, request, context):
+        """Same filters as ListTasks, streamed in next_fire_time order as pages (limit 0 = all).
+        Each page's next_page_token resumes the listing if the stream breaks.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetTask(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchTasks(self, request, context):
+        """Live view of the pending tasks: the current set as SNAPSHOT pages, then one event per
+        change, each numbered. To resume after a reconnect send the last (epoch, seq) seen:
+        the server replays the changes since, or starts over with a snapshot if it no longer
+        has them (different epoch, or too far behind).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_SchedulerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -101,11 +129,21 @@ def add_SchedulerServiceServicer_to_server(servicer, server):
                     request_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksRequest.FromString,
                     response_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksResponse.SerializeToString,
             ),
+            'StreamTasks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTasks,
+                    request_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksRequest.FromString,
+                    response_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksResponse.SerializeToString,
+            ),
             'GetTask': grpc.unary_unary_rpc_method_handler(
                     servicer.GetTask,
                     request_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.GetTaskRequest.FromString,
                     response_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.GetTaskResponse.SerializeToString,
             ),
+            'WatchTasks': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchTasks,
+                    request_deserializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.WatchTasksRequest.FromString,
+                    response_serializer=protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.TaskEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'assistant.v1.SchedulerService', rpc_method_handlers)
@@ -198,6 +236,33 @@ class SchedulerService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/assistant.v1.SchedulerService/StreamTasks',
+            protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksRequest.SerializeToString,
+            protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.ListTasksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetTask(request,
             target,
@@ -224,3 +289,30 @@ class SchedulerService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def WatchTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/assistant.v1.SchedulerService/WatchTasks',
+            protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.WatchTasksRequest.SerializeToString,
+            protobufs_dot_apis_dot_services_dot_scheduler__api__pb2.TaskEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
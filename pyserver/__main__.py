@@ -11,7 +11,16 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="PythonWorkerService (assistant.v1)")
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--warm-llm", action="append", default=[], metavar="MODEL",
+                        help="load this Ollama model (OLLAMA_HOST) before reporting SERVING; repeatable")
+    parser.add_argument("--admin-port", type=int, default=None,
+                        help="serve /debug/loop, /debug/coroutines and /debug/profile on 127.0.0.1:PORT")
+    parser.add_argument("--time-coroutines", action="store_true",
+                        help="time every coroutine from startup (costly on busy loops; also POST /debug/coroutines/start)")
     parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--tts-engine", choices=("pyttsx3", "onnx", "null"), default="pyttsx3",
+                        help="'onnx' streams a neural voice (--tts-model); 'null' only logs speech (hosts without a speech engine)")
+    parser.add_argument("--tts-model", help="Piper-style voice for --tts-engine onnx (voice.onnx, with voice.onnx.json beside it)")
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -19,7 +28,8 @@ def main() -> None:
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
 
-    asyncio.run(serve(args.host, args.port))
+    asyncio.run(serve(args.host, args.port, args.tts_engine, args.tts_model, args.admin_port, args.warm_llm,
+                      args.time_coroutines))
 
 
 if __name__ == "__main__":
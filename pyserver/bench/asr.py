@@ -0,0 +1,138 @@
+# bench/asr.py
+"""
+Micro-batched ASR: decode throughput against batch size, and the latency the batching
+window adds under concurrent utterances.
+
+    python -m pyserver.bench.asr --batch-sizes 1,2,4,8,16 --windows 0,10,25,50
+    python -m pyserver.bench.asr --model base.en        # real faster-whisper model
+
+Without --model a synthetic decoder is used: a Whisper-shaped NumPy model (per-clip
+encoder GEMMs over the padded batch, then autoregressive decoder steps where the batch
+shares each weight read), so the batching gain is real CPU work rather than a sleep.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from pyserver.bench.stats import summarize
+from pyserver.listener.asr import BatchConfig, BatchDecoder, BatchingASR, WhisperBatchDecoder, pad_batch
+from pyserver.listener.audio import SAMPLE_RATE
+
+
+class SyntheticWhisper:
+    """Whisper-like cost model: encoder work grows with batch x padded length, decoder steps are amortized."""
+
+    def __init__(self, d_model: int = 384, layers: int = 4, tokens: int = 24, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        scale = 1.0 / np.sqrt(d_model)
+        self._enc = [rng.standard_normal((d_model, d_model), dtype=np.float32) * scale for _ in range(layers)]
+        self._dec = [rng.standard_normal((d_model, 4 * d_model), dtype=np.float32) * scale for _ in range(layers)]
+        self._proj = rng.standard_normal((4 * d_model, d_model), dtype=np.float32) * scale
+        self._embed = rng.standard_normal((160, d_model), dtype=np.float32) * scale
+        self._tokens = tokens
+
+    def decode(self, audio: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        batch, _ = pad_batch(audio, multiple=160)
+        frames = batch.reshape(len(audio), -1, 160)[:, ::2] @ self._embed  # 50 frames/s, like Whisper
+        for w in self._enc:
+            frames = np.tanh(frames @ w)
+        state = frames.mean(axis=1)
+        for _ in range(self._tokens):
+            for w in self._dec:
+                state = np.tanh((state @ w) @ self._proj)
+        return [(f"utterance {i}", 0.9) for i in range(len(audio))]
+
+
+def _clip(rng: random.Random) -> np.ndarray:
+    seconds = rng.uniform(1.5, 4.0)  # typical command length
+    return (np.random.default_rng(rng.randrange(1 << 30)).standard_normal(int(seconds * SAMPLE_RATE)) * 0.05).astype(np.float32)
+
+
+def throughput(decoder: BatchDecoder, sizes: Sequence[int], seconds: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    decoder.decode([_clip(rng)])  # warm up
+    out = {}
+    for b in sizes:
+        times: List[float] = []
+        stop = time.perf_counter() + seconds
+        while time.perf_counter() < stop or len(times) < 3:
+            clips = [_clip(rng) for _ in range(b)]
+            t0 = time.perf_counter()
+            decoder.decode(clips)
+            times.append(time.perf_counter() - t0)
+        s = summarize(times)
+        out[str(b)] = {"batch_ms": s["p50_ms"], "utterances_per_s": round(1000.0 * b / s["p50_ms"], 1)}
+    return out
+
+
+async def _window_run(decoder: BatchDecoder, window_ms: float, max_batch: int, rate: float, seconds: float, seed: int) -> dict:
+    asr = BatchingASR(decoder, BatchConfig(window_ms=window_ms, max_batch=max_batch))
+    rng = random.Random(seed)
+    clips = [(_clip(rng) * 32768.0).astype(np.int16).tobytes() for _ in range(32)]
+    latencies: List[float] = []
+
+    async def one(frame: bytes) -> None:
+        t0 = time.perf_counter()
+        await asr.transcribe([frame])
+        latencies.append(time.perf_counter() - t0)
+
+    calls = []
+    stop = time.perf_counter() + seconds
+    while True:
+        await asyncio.sleep(rng.expovariate(rate))
+        if time.perf_counter() >= stop:
+            break
+        calls.append(asyncio.create_task(one(rng.choice(clips))))
+    await asyncio.gather(*calls)
+    await asr.aclose()
+    st = asr.stats
+    return {
+        "latency": summarize(latencies),
+        "batches": st.batches,
+        "mean_batch": round(st.requests / max(st.batches, 1), 2),
+        "largest": st.largest,
+        "mean_wait_ms": round(1000.0 * st.waited_s / max(st.requests, 1), 2),
+        "mean_decode_ms": round(1000.0 * st.decode_s / max(st.batches, 1), 2),
+    }
+
+
+async def window_latency(decoder: BatchDecoder, windows: Sequence[float], args: argparse.Namespace) -> dict:
+    out = {"unbatched": await _window_run(decoder, 0.0, 1, args.rate, args.seconds, args.seed)}
+    for w in windows:
+        out[f"window_{w:g}ms"] = await _window_run(decoder, w, args.max_batch, args.rate, args.seconds, args.seed)
+    # Added latency alone: single utterances with an idle decoder.
+    out["idle"] = {f"window_{w:g}ms": (await _window_run(decoder, w, args.max_batch, 2.0, 3.0, args.seed))["latency"]["p50_ms"]
+                   for w in (0.0, *windows)}
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-batched ASR benchmark")
+    parser.add_argument("--model", help="faster-whisper model name or path (default: synthetic decoder)")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    parser.add_argument("--windows", default="0,10,25,50", help="batching windows in ms")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=30.0, help="utterances per second across all callers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    decoder: BatchDecoder = WhisperBatchDecoder(args.model) if args.model else SyntheticWhisper()
+    report = {
+        "decoder": args.model or "synthetic",
+        "throughput": throughput(decoder, [int(b) for b in args.batch_sizes.split(",")], args.seconds / 2, args.seed),
+        "windowed": asyncio.run(window_latency(decoder, [float(w) for w in args.windows.split(",")], args)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# bench/backends.py
+"""
+RunTask tail latency while a CPU-heavy tool saturates the worker, per execution backend.
+
+    python -m pyserver.bench.backends --load 4 --burn-ms 200 --seconds 5
+
+An in-process PythonWorkerService gets a registry where `play_sound` is a pure-Python
+busy loop of `repeat` milliseconds (GIL-bound, like decoding audio in Python) and
+`speak` is the normal inline handler. `--load` clients call the burn tool back to back
+while a probe sends a speak RunTask every `--probe-ms`; the probe's latency is reported
+for the burn tool running inline, on its thread pool and in worker processes. A final
+scenario calls a burn longer than the process timeout, then a short one; that the first
+fails near the timeout and the pool recovers is asserted in tests/test_backends.py.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import Dict, List, Mapping, Optional
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import FakeTTSEngine
+from pyserver.server.server import PythonWorkerService, TTSQueue
+from pyserver.tools.registry import ToolContext, ToolRegistry, ToolSpec
+
+
+def burn(args: models_pb.PlaySoundArgs) -> Mapping[str, str]:
+    """Spin for args.repeat ms holding the GIL."""
+    end = time.perf_counter() + args.repeat / 1000.0
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return {"iterations": str(n)}
+
+
+async def burn_inline(args: models_pb.PlaySoundArgs, _ctx: ToolContext) -> Mapping[str, str]:
+    return burn(args)
+
+
+def _registry(backend: str, load: int, timeout_s: Optional[float]) -> ToolRegistry:
+    reg = ToolRegistry()
+    reg.register(ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", "pyserver.tools.builtin:speak"))
+    handler = "pyserver.bench.backends:burn_inline" if backend == "inline" else "pyserver.bench.backends:burn"
+    reg.register(ToolSpec("play_sound", "pyserver.llm.models:PlaySoundArgsModel", handler,
+                          backend=backend, max_concurrency=load, timeout_s=timeout_s))
+    return reg
+
+
+async def _serve(reg: ToolRegistry):
+    tts = TTSQueue(engine=FakeTTSEngine())
+    await tts.start()
+    worker = PythonWorkerService(tts, tools=reg)
+    await worker.start()
+    server = grpc.aio.server()
+    rpc.add_PythonWorkerServiceServicer_to_server(worker, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, tts, worker, f"127.0.0.1:{port}"
+
+
+async def _scenario(backend: str, args: argparse.Namespace) -> dict:
+    reg = _registry(backend, max(args.load, 1), None)
+    server, tts, worker, addr = await _serve(reg)
+    probe: List[float] = []
+    burns = 0
+    try:
+        async with grpc.aio.insecure_channel(addr) as ch:
+            stub = rpc.PythonWorkerServiceStub(ch)
+            heavy = pb.RunTaskRequest(call=models_pb.ToolCall(play_sound=models_pb.PlaySoundArgs(sound_id="burn", repeat=args.burn_ms)))
+            light = pb.RunTaskRequest(call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text="hi")))
+            await stub.RunTask(light)  # warm the channel
+            stop = time.perf_counter() + args.seconds
+
+            async def loader() -> None:
+                nonlocal burns
+                while time.perf_counter() < stop:
+                    resp = await stub.RunTask(heavy)
+                    assert resp.status == pb.RunTaskResponse.STATUS_OK and resp.output["iterations"], resp
+                    burns += 1
+
+            async def prober() -> None:
+                while time.perf_counter() < stop:
+                    t0 = time.perf_counter()
+                    await stub.RunTask(light)
+                    probe.append(time.perf_counter() - t0)
+                    await asyncio.sleep(args.probe_ms / 1000.0)
+
+            await asyncio.gather(prober(), *(loader() for _ in range(args.load)))
+    finally:
+        await server.stop(grace=None)
+        await tts.stop()
+        worker.close()
+    return {"probe": summarize(probe), "burns_per_s": round(burns / args.seconds, 1)}
+
+
+async def hard_timeout(timeout_s: float = 0.25) -> dict:
+    server, tts, worker, addr = await _serve(_registry("process", 1, timeout_s))
+    try:
+        async with grpc.aio.insecure_channel(addr) as ch:
+            stub = rpc.PythonWorkerServiceStub(ch)
+
+            async def call(ms: int):
+                t0 = time.perf_counter()
+                resp = await stub.RunTask(pb.RunTaskRequest(call=models_pb.ToolCall(play_sound=models_pb.PlaySoundArgs(repeat=ms))))
+                return resp, time.perf_counter() - t0
+
+            hung, hung_s = await call(10_000)
+            after, after_s = await call(10)
+    finally:
+        await server.stop(grace=None)
+        await tts.stop()
+        worker.close()
+    return {
+        "timeout_s": timeout_s,
+        "overrun_status": pb.RunTaskResponse.Status.Name(hung.status),
+        "overrun_error": hung.error_message,
+        "overrun_returned_s": round(hung_s, 3),
+        "next_call_status": pb.RunTaskResponse.Status.Name(after.status),
+        "next_call_s": round(after_s, 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    report: Dict[str, object] = {"load": args.load, "burn_ms": args.burn_ms}
+    report["idle"] = await _scenario("inline", argparse.Namespace(**{**vars(args), "load": 0}))
+    for backend in ("inline", "thread", "process"):
+        report[backend] = await _scenario(backend, args)
+    report["hard_timeout"] = await hard_timeout()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tool execution backend tail-latency benchmark")
+    parser.add_argument("--load", type=int, default=4, help="clients calling the CPU-heavy tool")
+    parser.add_argument("--burn-ms", type=int, default=200)
+    parser.add_argument("--probe-ms", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
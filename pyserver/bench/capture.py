@@ -0,0 +1,235 @@
+# bench/capture.py
+"""
+Capture under inference load: dropped frames and callback jitter with the microphone in
+the inference process ("inline", MicrophoneSource) vs in its own process ("process",
+CaptureProcess + shared-memory ring).
+
+    python -m pyserver.bench.capture --seconds 10 --block-ms 10 --asr-streams 2 --planner-threads 2
+
+The sound card is emulated: a thread that wakes at every block boundary and runs the
+callback, which (like PortAudio's) needs the GIL. The device buffers --device-blocks
+blocks; a callback later than that loses the oldest (input overflow). Each block carries
+its sequence number, so the consumer counts every frame lost between the device and
+itself. The consumer does the wake detector's per-block work (log-mel + energy gate)
+while ASR load runs in the same process: --asr-streams callers transcribing clips back
+to back through BatchingASR on the synthetic Whisper decoder (bench.asr), plus
+--planner-threads of pure-Python planning (toolcall parsing and validation).
+
+Reported per mode, idle and under load: callback lateness (jitter) percentiles, frames
+lost at the device, frames lost in the queue/ring, delivery latency from the end of a
+block to the consumer, and ASR utterances decoded (the load both modes carried).
+tests/test_capture.py asserts the capture process loses no frames in the ring and no more
+at the device than inline.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from pyserver.bench.asr import SyntheticWhisper
+from pyserver.bench.stats import summarize
+from pyserver.listener.asr import BatchingASR
+from pyserver.listener.audio import SAMPLE_RATE, AudioSource, MicrophoneSource, pcm_to_float
+from pyserver.listener.capture import CaptureConfig, CaptureProcess
+from pyserver.listener.wake import EnergyGate, LogMelFrontend
+from pyserver.llm.llm import parse_toolcall
+
+MODES = ("inline", "process")
+_REPLY = json.dumps({"timer": {"minutes": 10, "label": "tea"}, "confidence": 0.9})
+
+
+class EmulatedInput:
+    """sounddevice.RawInputStream stand-in (start/stop/close) driven by a pacing thread."""
+
+    def __init__(self, sample_rate: int, block_size: int, device: Any, callback: Callable, *, start_at: float,
+                 buffer_blocks: int, stats_path: str, max_seconds: float = 600.0) -> None:
+        self.period = block_size / sample_rate
+        self.block_size = block_size
+        self.start_at = start_at
+        self.buffer_blocks = buffer_blocks
+        self.stats_path = stats_path
+        self.callback = callback
+        self.lost = 0
+        self.delivered = 0
+        self._late = np.zeros(int(max_seconds / self.period), dtype=np.float64)
+        noise = np.random.default_rng(0).standard_normal(block_size * 64) * 30.0
+        self._noise = noise.astype(np.int16)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="emulated-input", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def close(self) -> None:
+        late = self._late[:min(self.delivered, len(self._late))]
+        with open(self.stats_path, "w") as f:
+            json.dump({"callbacks": self.delivered, "device_lost": self.lost, "late_s": late.tolist()}, f)
+
+    def _block(self, seq: int) -> bytes:
+        start = (seq % 64) * self.block_size
+        block = self._noise[start:start + self.block_size].copy()
+        block[:2] = np.asarray([seq], dtype=np.int32).view(np.int16)
+        return block.tobytes()
+
+    def _run(self) -> None:
+        seq = 0
+        while not self._stop.is_set():
+            due = self.start_at + (seq + 1) * self.period  # block seq is complete at its end
+            now = time.monotonic()
+            if now < due:
+                time.sleep(due - now)  # waking up means taking the GIL back
+                continue
+            if self.delivered < len(self._late):  # how long the oldest waiting block has waited
+                self._late[self.delivered] = now - due
+            ready = int((now - self.start_at) / self.period)
+            overflow = ready - seq > self.buffer_blocks
+            if overflow:  # the device kept only the newest buffer_blocks
+                self.lost += ready - self.buffer_blocks - seq
+                seq = ready - self.buffer_blocks
+            self.callback(self._block(seq), self.block_size, None, "input overflow" if overflow else None)
+            self.delivered += 1
+            seq += 1
+
+
+def emulated_input(sample_rate: int, block_size: int, device: Any, callback: Callable, **kw: Any) -> EmulatedInput:
+    return EmulatedInput(sample_rate, block_size, device, callback, **kw)
+
+
+async def _consume(source: AudioSource, start_at: float, period: float, stop_at: float) -> dict:
+    """The wake detector's per-block work; counts sequence gaps and delivery latency."""
+    frontend, gate = LogMelFrontend(), EnergyGate()
+    expected: Optional[int] = None
+    gaps = received = 0
+    delivery = np.zeros(int((stop_at - start_at) / period) + 64, dtype=np.float64)
+    while time.monotonic() < stop_at:
+        frame = await source.read()
+        seq = int(np.frombuffer(frame[:4], dtype=np.int32)[0])
+        if expected is not None and seq > expected:
+            gaps += seq - expected
+        expected = seq + 1
+        if received < len(delivery):
+            delivery[received] = time.monotonic() - (start_at + (seq + 1) * period)
+        received += 1
+        pcm = pcm_to_float(frame)
+        frontend.push(pcm)
+        gate.update(pcm)
+    return {"received": received, "lost_total": gaps, "delivery": summarize(delivery[:min(received, len(delivery))].tolist())}
+
+
+def _planner(stop: threading.Event, counter: List[int]) -> None:
+    while not stop.is_set():
+        parse_toolcall(_REPLY)
+        counter[0] += 1
+
+
+async def run_mode(mode: str, loaded: bool, args: argparse.Namespace, stats_path: str) -> dict:
+    block_size = SAMPLE_RATE * args.block_ms // 1000
+    period = block_size / SAMPLE_RATE
+    start_at = time.monotonic() + args.startup_s
+    stream_args = {"start_at": start_at, "buffer_blocks": args.device_blocks, "stats_path": stats_path}
+    capture: Optional[CaptureProcess] = None
+    if mode == "process":
+        capture = CaptureProcess(CaptureConfig(block_ms=args.block_ms, ring_blocks=args.ring_blocks,
+                                               stream="pyserver.bench.capture:emulated_input", stream_args=stream_args))
+        await capture.start()
+        source: Any = capture.source()
+    else:
+        source = MicrophoneSource(block_ms=args.block_ms, max_blocks=args.ring_blocks,
+                                  stream_factory=functools.partial(emulated_input, **stream_args))
+        await source.start()
+
+    stop = threading.Event()
+    planned = [0]
+    planners = [threading.Thread(target=_planner, args=(stop, planned), daemon=True)
+                for _ in range(args.planner_threads if loaded else 0)]
+    asr = BatchingASR(SyntheticWhisper())
+    rng = np.random.default_rng(1)
+    clip = (rng.standard_normal(int(args.clip_s * SAMPLE_RATE)) * 1500).astype(np.int16).tobytes()
+    decoded = [0]
+
+    async def transcribe_forever() -> None:
+        while True:
+            await asr.transcribe([clip])
+            decoded[0] += 1
+
+    await asyncio.sleep(max(0.0, start_at - time.monotonic() - 0.2))
+    for t in planners:
+        t.start()
+    streams = [asyncio.create_task(transcribe_forever()) for _ in range(args.asr_streams if loaded else 0)]
+    try:
+        consumer = await _consume(source, start_at, period, start_at + args.seconds)
+    finally:
+        for s in streams:
+            s.cancel()
+        await asyncio.gather(*streams, return_exceptions=True)
+        await asr.aclose()
+        stop.set()
+        for t in planners:
+            t.join()
+        handoff_lost = source.dropped  # MicrophoneSource queue / ring reader
+        if capture is not None:
+            await capture.close()
+        else:
+            await source.close()
+
+    with open(stats_path) as f:
+        device = json.load(f)
+    late = device.pop("late_s")
+    return {
+        "jitter": summarize(late),
+        "callbacks": device["callbacks"],
+        "lost_at_device": device["device_lost"],
+        "lost_in_handoff": handoff_lost,
+        "lost_total": consumer["lost_total"],
+        "received": consumer["received"],
+        "delivery": consumer["delivery"],
+        "asr_utterances": decoded[0],
+        "planner_calls": planned[0],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    report: dict = {"block_ms": args.block_ms, "device_blocks": args.device_blocks, "seconds": args.seconds,
+                    "cpus": os.cpu_count(), "modes": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            report["modes"][mode] = {
+                load: await run_mode(mode, load == "loaded", args, os.path.join(tmp, f"{mode}-{load}.json"))
+                for load in ("idle", "loaded")
+            }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Capture jitter and dropped frames: inline vs capture process")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--block-ms", type=int, default=10)
+    parser.add_argument("--device-blocks", type=int, default=2, help="blocks the emulated device buffers")
+    parser.add_argument("--ring-blocks", type=int, default=64, help="queue / ring capacity in blocks")
+    parser.add_argument("--asr-streams", type=int, default=2, help="concurrent transcribe() callers under load")
+    parser.add_argument("--clip-s", type=float, default=3.0)
+    parser.add_argument("--planner-threads", type=int, default=2)
+    parser.add_argument("--startup-s", type=float, default=2.0, help="time given to the capture process to start")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# bench/dedup.py
+"""
+Idempotent RunTask under duplicate, late, failed and hedged requests: what deduplication
+costs and what it prevents.
+
+    python -m pyserver.bench.dedup --tasks 300
+
+An in-process PythonWorkerService whose `speak` handler counts executions per text is
+hit with concurrent copies of each request, copies after completion, a retry of a failed
+run, and WorkerDispatcher traffic where ~10% of requests stall in transport (delayed
+before they reach the worker), with and without hedging. The same hedged traffic against
+a worker without deduplication shows the double executions it prevents. That each task
+runs once is asserted in tests/test_dedup.py; this reports executions and latency.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from typing import List, Mapping, Optional
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import FakeTTSEngine
+from pyserver.scheduler.service import WorkerDispatcher
+from pyserver.server.dedup import DedupCache
+from pyserver.server.server import PythonWorkerService, TTSQueue
+from pyserver.tools.registry import ToolContext, ToolRegistry, ToolSpec
+
+RUNS: Counter = Counter()
+_FAILED_ONCE: set = set()
+
+
+async def counting_speak(args: models_pb.SpeakArgs, _ctx: ToolContext) -> Mapping[str, str]:
+    RUNS[args.text] += 1
+    await asyncio.sleep(0.005)
+    if args.text.startswith("flaky") and args.text not in _FAILED_ONCE:
+        _FAILED_ONCE.add(args.text)
+        raise RuntimeError("transient failure")
+    return {"run": str(RUNS[args.text])}
+
+
+class _NoDedup(DedupCache):
+    """Runs every copy (the baseline deduplication is measured against)."""
+
+    async def run(self, key, fn):
+        self.stats.executed += 1
+        return await fn()
+
+
+class _StallingWorker(PythonWorkerService):
+    """
+    Delays a fraction of RunTask requests before the worker sees them (a slow hop). Like a
+    request stuck in transit, a stalled one still runs after its caller has given up.
+    """
+
+    def __init__(self, *a, stall_p: float = 0.0, stall_s: float = 0.0, seed: int = 0, **kw) -> None:
+        super().__init__(*a, **kw)
+        self._stall_p, self._stall_s = stall_p, stall_s
+        self._rng = random.Random(seed)
+
+    async def RunTask(self, request, context):
+        if self._rng.random() < self._stall_p:
+            return await asyncio.shield(asyncio.ensure_future(self._late(request, context)))
+        return await super().RunTask(request, context)
+
+    async def _late(self, request, context):
+        await asyncio.sleep(self._stall_s)
+        return await super().RunTask(request, context)
+
+
+async def _worker(dedup: Optional[DedupCache] = None, **stall):
+    reg = ToolRegistry()
+    reg.register(ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", counting_speak))
+    tts = TTSQueue(engine=FakeTTSEngine())
+    worker = _StallingWorker(tts, tools=reg, dedup=dedup, **stall)
+    server = grpc.aio.server()
+    rpc.add_PythonWorkerServiceServicer_to_server(worker, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, worker, f"127.0.0.1:{port}"
+
+
+def _req(text: str, task_id: str = "", attempt_id: str = "") -> pb.RunTaskRequest:
+    return pb.RunTaskRequest(call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text=text)), task_id=task_id, attempt_id=attempt_id)
+
+
+async def duplicates(args: argparse.Namespace) -> dict:
+    RUNS.clear()
+    server, worker, addr = await _worker()
+    try:
+        async with grpc.aio.insecure_channel(addr) as ch:
+            stub = rpc.PythonWorkerServiceStub(ch)
+            reqs = [_req(f"dup-{i}", f"task-{i}", "1") for i in range(args.tasks)]
+            copies = [r for r in reqs for _ in range(args.copies)]
+            random.Random(args.seed).shuffle(copies)
+            first = await asyncio.gather(*(stub.RunTask(r) for r in copies))
+            late = await asyncio.gather(*(stub.RunTask(r) for r in reqs))
+            # a failed run is not cached: its retry runs again
+            flaky = _req("flaky-0", "task-flaky", "1")
+            failed = await stub.RunTask(flaky)
+            retried = await stub.RunTask(flaky)
+            again = await stub.RunTask(flaky)
+    finally:
+        await server.stop(grace=None)
+    st = worker.dedup.stats
+    return {
+        "requests": len(copies) + len(reqs) + 3,
+        "executions": sum(v for k, v in RUNS.items() if k.startswith("dup-")),
+        "max_runs_per_task": max(v for k, v in RUNS.items() if k.startswith("dup-")),
+        "all_ok": all(r.status == pb.RunTaskResponse.STATUS_OK for r in first + late),
+        "same_output": all(r.output["run"] == "1" for r in first + late),
+        "joined": st.joined,
+        "cached": st.cached,
+        "flaky": [pb.RunTaskResponse.Status.Name(r.status) for r in (failed, retried, again)],
+        "flaky_runs": RUNS["flaky-0"],
+    }
+
+
+async def hedging(args: argparse.Namespace, hedge_ms: Optional[float], dedup: bool) -> dict:
+    RUNS.clear()
+    server, worker, addr = await _worker(None if dedup else _NoDedup(),
+                                         stall_p=args.stall_p, stall_s=args.stall_ms / 1000.0, seed=args.seed)
+    dispatcher = WorkerDispatcher(addr, hedge_after_s=hedge_ms / 1000.0 if hedge_ms else None)
+    latency: List[float] = []
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            resp = await dispatcher(models_pb.Task(task_id=f"hedge-{i}", call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text=f"hedge-{i}"))))
+            assert resp.status == pb.RunTaskResponse.STATUS_OK, resp
+            latency.append(time.perf_counter() - t0)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.tasks)))
+        await asyncio.sleep(args.stall_ms / 1000.0 + 0.05)  # let stalled copies land
+    finally:
+        await dispatcher.close()
+        await server.stop(grace=None)
+    return {
+        "latency": summarize(latency),
+        "sent": dispatcher.stats.sent,
+        "hedged": dispatcher.stats.hedged,
+        "executions": sum(RUNS.values()),
+        "double_executions": sum(1 for v in RUNS.values() if v > 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    return {
+        "duplicates": await duplicates(args),
+        "unhedged": await hedging(args, None, dedup=True),
+        "hedged": await hedging(args, args.hedge_ms, dedup=True),
+        "hedged_without_dedup": await hedging(args, args.hedge_ms, dedup=False),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RunTask deduplication under duplicate and hedged traffic")
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--copies", type=int, default=5, help="concurrent copies of each request")
+    parser.add_argument("--concurrency", type=int, default=16, help="hedging scenario: tasks in flight")
+    parser.add_argument("--stall-p", type=float, default=0.1, help="fraction of requests delayed in transport")
+    parser.add_argument("--stall-ms", type=float, default=200.0)
+    parser.add_argument("--hedge-ms", type=float, default=25.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# bench/hub.py
+"""
+ListenerHub scale test: N simulated rooms on one event loop, driven by replayed corpus
+transcripts, sharing one pooled SchedulerClient (to the stub scheduler + worker) and one
+planner in front of a stub Ollama with limited parallel slots.
+
+    python -m pyserver.bench.hub --rooms 16 --seconds 20
+
+Room 0 is "chatty" (speaks again as soon as it is answered); the last `--open-plan` rooms
+overhear each other, so each of their utterances arrives in all of them at once (single
+flight). The rest speak after an exponential pause. Per-room latency runs from submitting
+the transcript to the last ScheduleTask of that utterance; the run is repeated with the
+fair gate and with plain FIFO slot granting.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from pyserver.bench.pipeline import ReplayFeed, load_corpus
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import Loopback, StubOllama, table_responder
+from pyserver.listener.daemon import ListenerConfig
+from pyserver.listener.hub import ListenerHub
+
+
+async def _scenario(args: argparse.Namespace, fair: bool) -> dict:
+    corpus = load_corpus(args.corpus)
+    llm = StubOllama(
+        table_responder({it.text: it.reply for it in corpus}),
+        latency=lambda _m: args.llm_ms / 1000.0,
+        parallel=args.plan_concurrency,
+    ).start()
+    lb = await Loopback.start()
+    hub = ListenerHub(
+        ListenerConfig(scheduler_addr=lb.scheduler_addr, ollama_host=llm.host),
+        plan_concurrency=args.plan_concurrency, pool_size=args.pool_size, fair=fair,
+    )
+
+    names = [f"room-{i:02d}" for i in range(args.rooms)]
+    feeds: Dict[str, ReplayFeed] = {}
+    submitted: Dict[str, float] = {}
+    latency: Dict[str, List[float]] = defaultdict(list)
+
+    def hook_for(room: str):
+        def hook(stage: str, _seconds: float) -> None:
+            if stage == "schedule":
+                latency[room].append(time.perf_counter() - submitted[room])
+        return hook
+
+    for name in names:
+        feeds[name] = ReplayFeed()
+        hub.add_room(name, feeds[name], feeds[name], feeds[name], stage_hook=hook_for(name))
+
+    rng = random.Random(args.seed)
+    stop = time.perf_counter() + args.seconds
+
+    async def drive(group: List[str], think_s: float) -> None:
+        while True:
+            await asyncio.gather(*(feeds[r].idle.wait() for r in group))
+            if think_s:
+                await asyncio.sleep(rng.expovariate(1.0 / think_s))
+            if time.perf_counter() >= stop:
+                return
+            item = rng.choice(corpus)
+            for r in group:
+                submitted[r] = time.perf_counter()
+                feeds[r].submit(item)
+
+    open_plan = names[len(names) - args.open_plan:] if args.open_plan > 1 else []
+    drivers = [drive([names[0]], 0.0), drive(open_plan, args.think_s)] if open_plan else [drive([names[0]], 0.0)]
+    drivers += [drive([r], args.think_s) for r in names[1:len(names) - len(open_plan)]]
+
+    hub_task = asyncio.create_task(hub.run())
+    try:
+        await asyncio.gather(*drivers)
+        await asyncio.wait_for(asyncio.gather(*(f.idle.wait() for f in feeds.values())), timeout=30)
+    finally:
+        hub_task.cancel()
+        await asyncio.gather(hub_task, return_exceptions=True)
+        await lb.stop()
+        llm.stop()
+
+    quiet = [s for r in names[1:] for s in latency[r]]
+    return {
+        "utterances": sum(len(v) for v in latency.values()),
+        "plans": hub.planner.stats.plans,
+        "deduplicated": hub.planner.stats.deduplicated,
+        "chatty_room": {"utterances": len(latency[names[0]]), **summarize(latency[names[0]])},
+        "other_rooms": summarize(quiet),
+        "per_room_p95_ms": {r: summarize(latency[r]).get("p95_ms") for r in names},
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    return {
+        "rooms": args.rooms,
+        "fair": await _scenario(args, fair=True),
+        "fifo": await _scenario(args, fair=False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-room listener hub scale test")
+    parser.add_argument("--corpus", default="data/bench/corpus.jsonl")
+    parser.add_argument("--rooms", type=int, default=16)
+    parser.add_argument("--open-plan", type=int, default=4, help="rooms that overhear each other")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--think-s", type=float, default=2.0, help="mean pause between a room's utterances")
+    parser.add_argument("--llm-ms", type=float, default=150.0)
+    parser.add_argument("--plan-concurrency", type=int, default=1, help="LLM slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
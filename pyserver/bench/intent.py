@@ -0,0 +1,239 @@
+# bench/intent.py
+"""
+Intent tier: accuracy, coverage and latency of the embedding classifier on a labelled
+corpus, against planning every utterance with the LLM.
+
+    python -m pyserver.bench.intent
+    python -m pyserver.bench.intent --model minilm/model.onnx --tokenizer minilm/tokenizer.json
+    python -m pyserver.bench.intent --ollama-host http://127.0.0.1:11434   # a real LLM instead of the stub
+
+Corpus lines (JSONL): {"text", "reply" (the stub LLM's answer), "expect": {"tool", "args"}}.
+Args are compared on the keys given (speak text ignoring case and punctuation); an
+expected speak with no args is a request only the LLM can answer, and the tier answering
+it at all is a false accept.
+
+Without --model a test encoder is written to a temp dir: a WordPiece tokenizer trained on
+the exemplars and an ONNX graph (IDF-weighted token embeddings, orthogonal layers,
+last_hidden_state out). It is a bag of subwords with no idea of synonyms, so it shows
+the mechanics and the latency floor; coverage of real paraphrases needs a real encoder.
+
+Reported: index build time, classify latency (encoder + lookup, cold and cached),
+coverage and accuracy of the answers kept local, why the rest escalated, a threshold
+sweep, and end-to-end plan latency and accuracy through PlannerRouter for "llm_only"
+and "tiered" (the stub answers every model call after --llm-ms). That the test encoder
+makes no false accept and the tier keeps plans correct is asserted in tests/test_intent.py.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import StubOllama, table_responder
+from pyserver.llm.intent import IntentClassifier, IntentConfig, load_exemplars
+from pyserver.llm.models import ToolCallModel
+from pyserver.llm.router import PlannerRouter, RouterConfig
+
+_PUNCT = re.compile(r"[^\w\s]")
+SPECIAL = ["[PAD]", "[UNK]"]
+TEST_THRESHOLD = 0.4  # the test encoder's cosines run lower than a trained model's (see the sweep)
+
+
+def make_test_encoder(directory: str, texts: Sequence[str], dim: int = 384, layers: int = 2) -> Tuple[str, str]:
+    """Write encoder.onnx + tokenizer.json (the HF layout OnnxEncoder reads); return both paths."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, trainers
+
+    tok = Tokenizer(models.WordPiece(unk_token="[UNK]"))
+    tok.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tok.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tok.train_from_iterator(texts, trainers.WordPieceTrainer(vocab_size=2000, special_tokens=SPECIAL))
+    vocab = tok.get_vocab_size()
+    # IDF over the exemplars; pieces the exemplars never use (fragments of unknown words) count little
+    df = Counter(i for t in texts for i in set(tok.encode(t).ids))
+    weight = np.asarray([math.log((len(texts) + 1) / (df[i] + 1)) + 1 if df[i] else 0.3 for i in range(vocab)],
+                        dtype=np.float32)
+    weight[:len(SPECIAL)] = 0.0
+
+    rng = np.random.default_rng(0)
+    inits = [numpy_helper.from_array((rng.standard_normal((vocab, dim)) * weight[:, None]).astype(np.float32), "embed"),
+             numpy_helper.from_array(np.asarray([2], dtype=np.int64), "axis2")]
+    nodes = [helper.make_node("Gather", ["embed", "input_ids"], ["tok"]),
+             helper.make_node("Cast", ["attention_mask"], ["maskf"], to=TensorProto.FLOAT),
+             helper.make_node("Unsqueeze", ["maskf", "axis2"], ["mask3"]),
+             helper.make_node("Mul", ["tok", "mask3"], ["h0"])]
+    for i in range(layers):  # orthogonal: transformer-like cost per token, cosines unchanged
+        q, _ = np.linalg.qr(rng.standard_normal((dim, dim)))
+        inits.append(numpy_helper.from_array(q.astype(np.float32), f"w{i}"))
+        nodes.append(helper.make_node("MatMul", [f"h{i}", f"w{i}"], [f"h{i + 1}"] if i < layers - 1 else ["last_hidden_state"]))
+    graph = helper.make_graph(
+        nodes, "test_encoder",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "tokens"]),
+         helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "tokens"])],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "tokens", dim])],
+        inits)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    model_path, tokenizer_path = os.path.join(directory, "encoder.onnx"), os.path.join(directory, "tokenizer.json")
+    onnx.save(model, model_path)
+    tok.save(tokenizer_path)
+    return model_path, tokenizer_path
+
+
+def _norm(text: str) -> str:
+    return " ".join(_PUNCT.sub("", text.lower()).split())
+
+
+def llm_only(line: dict) -> bool:
+    return line["expect"]["tool"] == "speak" and "args" not in line["expect"]
+
+
+def correct(toolcall: ToolCallModel, expect: dict) -> bool:
+    if toolcall.which().value != expect["tool"]:
+        return False
+    got = getattr(toolcall, expect["tool"]).model_dump()
+    for key, want in expect.get("args", {}).items():
+        if (_norm(got.get(key) or "") != _norm(want)) if isinstance(want, str) else got.get(key) != want:
+            return False
+    return True
+
+
+def _score(lines: List[dict], toolcalls: List[Optional[ToolCallModel]]) -> dict:
+    """Coverage and accuracy of the answers the tier kept (None: passed to the LLM)."""
+    local = [(l, tc) for l, tc in zip(lines, toolcalls) if tc is not None]
+    wrong = [{"text": l["text"], "got": tc.model_dump(exclude_none=True), "expect": l["expect"]}
+             for l, tc in local if llm_only(l) or not correct(tc, l["expect"])]
+    actionable = sum(not llm_only(l) for l in lines)
+    return {
+        "local": len(local),
+        "coverage": round((len(local) - len(wrong)) / actionable, 3) if actionable else 0.0,
+        "precision": round(1 - len(wrong) / len(local), 3) if local else 1.0,
+        "false_accepts": wrong,
+    }
+
+
+def classifier(lines: List[dict], cfg: IntentConfig, thresholds: Sequence[float]) -> dict:
+    clf = IntentClassifier(cfg)
+    t0 = time.perf_counter()
+    clf.load()
+    index_s = time.perf_counter() - t0
+    texts = [l["text"] for l in lines]
+    cold: List[float] = []
+    cached: List[float] = []
+    matches = []
+    for text in texts:
+        clf._embed.cache_clear()
+        t0 = time.perf_counter()
+        matches.append(clf.classify(text))
+        cold.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        clf.classify(text)
+        cached.append(time.perf_counter() - t0)
+    assert clf.index is not None and clf.encoder is not None
+    scores = clf.index.scores(clf.encoder.encode([t.lower() for t in texts]))
+    sweep = {}
+    for threshold in thresholds:
+        clf.cfg = dataclasses.replace(cfg, threshold=threshold)
+        s = _score(lines, [clf.decide(t, row).toolcall for t, row in zip(texts, scores)])
+        sweep[f"{threshold:.2f}"] = {k: len(v) if k == "false_accepts" else v for k, v in s.items()}
+    return {
+        "exemplars": len(clf.index.vectors),
+        "intents": clf.index.intents,
+        "index_ms": round(index_s * 1e3, 1),
+        "latency_cold": summarize(cold),
+        "latency_cached": summarize(cached),
+        "threshold": cfg.threshold,
+        **_score(lines, [m.toolcall for m in matches]),
+        "escalated": dict(Counter(m.reason for m in matches if m.toolcall is None)),
+        "sweep": sweep,
+    }
+
+
+async def _plan_all(lines: List[dict], cfg: RouterConfig) -> dict:
+    router = PlannerRouter(cfg)
+    await router.warm()
+    latency: Dict[str, List[float]] = {"intents": [], "llm": []}
+    right = 0
+    for line in lines:
+        t0 = time.perf_counter()
+        plan = await router.plan(line["text"])
+        latency["intents" if plan.model == "intents" else "llm"].append(time.perf_counter() - t0)
+        right += correct(plan.toolcall, line["expect"]) and not (plan.model == "intents" and llm_only(line))
+    every = latency["intents"] + latency["llm"]
+    return {
+        "accuracy": round(right / len(lines), 3),
+        "llm_calls": len(latency["llm"]),
+        "plan": summarize(every),
+        "mean_ms": round(float(np.mean(every)) * 1e3, 2),
+        **({"plan_local": summarize(latency["intents"])} if latency["intents"] else {}),
+    }
+
+
+async def end_to_end(lines: List[dict], cfg: IntentConfig, args: argparse.Namespace) -> dict:
+    stub = None
+    host = args.ollama_host
+    if host is None:
+        replies = {l["text"]: json.dumps(l["reply"]) for l in lines}
+        stub = StubOllama(table_responder(replies), latency=lambda _m: args.llm_ms / 1000).start()
+        host = stub.host
+    try:
+        base = RouterConfig(large_model=args.llm, host=host, timeout_s=120.0)
+        return {
+            "llm": "stub" if stub is not None else args.llm,
+            "llm_only": await _plan_all(lines, base),
+            "tiered": await _plan_all(lines, dataclasses.replace(base, intents=cfg)),
+        }
+    finally:
+        if stub is not None:
+            stub.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Embedding intent tier vs LLM-only planning")
+    parser.add_argument("--corpus", default="data/bench/intents.jsonl")
+    parser.add_argument("--exemplars", default="data/intents/exemplars.jsonl")
+    parser.add_argument("--model", help="sentence encoder .onnx; default: a test encoder built from the exemplars")
+    parser.add_argument("--tokenizer", help="tokenizer.json; default: next to --model")
+    parser.add_argument("--threshold", type=float, help=f"default: {IntentConfig.threshold}, {TEST_THRESHOLD} for the test encoder")
+    parser.add_argument("--margin", type=float, default=IntentConfig.margin)
+    parser.add_argument("--top-k", type=int, default=IntentConfig.top_k)
+    parser.add_argument("--sweep", default="0.3,0.4,0.5,0.6,0.7,0.8,0.9")
+    parser.add_argument("--llm", default=RouterConfig.large_model)
+    parser.add_argument("--llm-ms", type=float, default=200.0, help="stub LLM latency per call")
+    parser.add_argument("--ollama-host", help="plan with a real Ollama instead of the stub")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    lines = [json.loads(l) for l in Path(args.corpus).read_text().splitlines() if l.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        model, tokenizer = args.model, args.tokenizer
+        if model is None:
+            model, tokenizer = make_test_encoder(tmp, load_exemplars(args.exemplars)[0])
+        threshold = args.threshold if args.threshold is not None else IntentConfig.threshold if args.model else TEST_THRESHOLD
+        cfg = IntentConfig(model_path=model, tokenizer_path=tokenizer, exemplars_path=args.exemplars,
+                           threshold=threshold, margin=args.margin, top_k=args.top_k)
+        report = {
+            "corpus": len(lines),
+            "encoder": args.model or "test",
+            "classifier": classifier(lines, cfg, [float(t) for t in args.sweep.split(",")]),
+            "end_to_end": asyncio.run(end_to_end(lines, cfg, args)),
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# bench/listing.py
+"""
+ListTasks at scale: one-shot listing vs page tokens vs StreamTasks over loopback gRPC,
+plus filtered queries through TaskIndex vs the old scan-and-sort.
+
+    python -m pyserver.bench.listing --tasks 100000
+
+Memory is measured in a separate pass: tracemalloc's peak covers Python allocations in the
+client and the in-process server, and the growth of peak RSS also covers protobuf/gRPC
+buffers. Peak RSS only ever rises, so modes run cheapest first and later figures are
+lower bounds. Latencies are measured without tracing.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import resource
+import time
+import tracemalloc
+from typing import AsyncIterator, Awaitable, Callable, List
+
+import grpc
+from google.protobuf.duration_pb2 import Duration
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+
+from pyserver.bench.stats import summarize
+from pyserver.clients.scheduler.client import SchedulerClient, list_request
+from pyserver.scheduler.engine import SchedulerEngine
+from pyserver.scheduler.service import SchedulerService
+
+# tool mix: mostly speech, some timers, rare sounds (the selective filter case)
+_TOOLS = (
+    (0.70, models_pb.ToolCall(speak=models_pb.SpeakArgs(text="drink some water"))),
+    (0.29, models_pb.ToolCall(timer=models_pb.TimerArgs(minutes=5, label="tea"))),
+    (0.01, models_pb.ToolCall(play_sound=models_pb.PlaySoundArgs(sound_id="chime"))),
+)
+_PRIORITIES = (models_pb.PRIORITY_HIGH, models_pb.PRIORITY_NORMAL, models_pb.PRIORITY_LOW)
+
+
+async def _noop(_task: models_pb.Task) -> None:
+    pass
+
+
+def _populate(engine: SchedulerEngine, n: int) -> None:
+    rng = random.Random(0)
+    weights, calls = zip(*_TOOLS)
+    for i in range(n):
+        d = Duration()
+        d.FromNanoseconds(int(rng.uniform(600, 86400) * 1e9))
+        task = models_pb.Task(task_id=f"t{i:06d}", call=rng.choices(calls, weights)[0], priority=rng.choice(_PRIORITIES))
+        engine.schedule(task, models_pb.Trigger(delay=d))
+
+
+def _scan(engine: SchedulerEngine, tools: set, limit: int) -> list:
+    """The pre-index ListTasks: filter every task, sort, cut."""
+    recs = [r for r in engine.tasks() if not tools or r.tool in tools]
+    recs.sort(key=lambda r: (r.next_fire, r.task.priority))
+    return recs[:limit]
+
+
+async def _drain(it: AsyncIterator) -> int:
+    n = 0
+    async for _ in it:
+        n += 1
+    return n
+
+
+async def _timed(fn: Callable[[], Awaitable[int]], repeat: int) -> dict:
+    samples: List[float] = []
+    n = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = await fn()
+        samples.append(time.perf_counter() - t0)
+    return {"items": n, **summarize(samples)}
+
+
+async def _memory(fn: Callable[[], Awaitable[int]]) -> dict:
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    try:
+        await fn()
+        py_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss0  # KiB on Linux
+    return {"py_peak_mib": round(py_peak / 2**20, 2), "rss_growth_mib": round(rss / 1024, 1)}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    engine = SchedulerEngine(_noop)
+    _populate(engine, args.tasks)
+
+    t0 = time.perf_counter()
+    engine.query(limit=1)
+    report: dict = {"tasks": args.tasks, "index_build_ms": round((time.perf_counter() - t0) * 1e3, 1)}
+
+    # in-process: index vs scan for a first page
+    filtered = {}
+    for name, tools in (("all", set()), ("play_sound", {"play_sound"})):
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            _scan(engine, tools, args.page_size)
+        scan_ms = (time.perf_counter() - t0) / args.repeat * 1e3
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            engine.query(tools=tools, limit=args.page_size)
+        index_ms = (time.perf_counter() - t0) / args.repeat * 1e3
+        filtered[name] = {"scan_ms": round(scan_ms, 3), "index_ms": round(index_ms, 3)}
+    report["first_page_in_process"] = filtered
+
+    server = grpc.aio.server(options=[("grpc.max_send_message_length", -1)])
+    sched_rpc.add_SchedulerServiceServicer_to_server(SchedulerService(engine), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    client = SchedulerClient(f"127.0.0.1:{port}")
+    await client.start()
+    # The one-shot listing needs a raised receive limit: 100k summaries exceed gRPC's 4 MiB default.
+    big_ch = grpc.aio.insecure_channel(f"127.0.0.1:{port}", options=[("grpc.max_receive_message_length", -1)])
+    big_stub = sched_rpc.SchedulerServiceStub(big_ch)
+
+    async def one_shot() -> int:
+        return len((await big_stub.ListTasks(list_request())).tasks)
+
+    async def first_page() -> int:
+        return len((await big_stub.ListTasks(list_request(limit=args.page_size))).tasks)
+
+    async def first_page_filtered() -> int:
+        return len((await big_stub.ListTasks(list_request(limit=args.page_size, tools=["play_sound"]))).tasks)
+
+    async def paged() -> int:
+        return await _drain(client.iter_tasks(page_size=args.page_size))
+
+    async def streamed() -> int:
+        return await _drain(client.stream_tasks())
+
+    async def stream_first() -> int:
+        async for _ in client.stream_tasks():
+            return 1
+        return 0
+
+    modes = {
+        "first_page": first_page,
+        "first_page_play_sound": first_page_filtered,
+        "stream_first_item": stream_first,
+        "paged_all": paged,
+        "stream_all": streamed,
+        "one_shot_all": one_shot,
+    }
+    try:
+        # memory first, cheapest first (peak RSS never comes back down)
+        memory = {name: await _memory(fn) for name, fn in modes.items() if name.endswith("_all")}
+        report["grpc"] = {name: {**await _timed(fn, args.repeat), **memory.get(name, {})} for name, fn in modes.items()}
+    finally:
+        await client.close()
+        await big_ch.close()
+        await server.stop(None)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scheduler task listing benchmark")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench/memory.py
+"""
+Conversation memory over long sessions: prompt size and planner latency per turn with no
+history, with the whole history, and with the token-bounded ConversationMemory.
+
+    python -m pyserver.bench.memory --turns 100 --sessions 3
+
+The stub LLM charges prefill time per prompt token (`--prefill-us`) on top of a fixed
+decode time, so prompt growth shows up as latency. Summaries are answered by the same
+stub (a fixed-size text) and run in the background on the shared limiter.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List
+
+from pyserver.bench.pipeline import load_corpus
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import APOLOGY, StubOllama
+from pyserver.llm.llm import messages_for
+from pyserver.llm.memory import ConversationMemory, MemoryConfig, estimate_tokens
+from pyserver.llm.router import PlannerRouter, RouterConfig
+
+_SUMMARY = "The user set several timers (10, 5 and 25 minutes), asked for a chime, and prefers short replies. " * 2
+
+
+def _responder(replies: Dict[str, str], args: argparse.Namespace):
+    def respond(_model: str, messages: List[dict]) -> str:
+        tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        time.sleep((args.decode_ms * 1e3 + args.prefill_us * tokens) / 1e6)
+        if messages and messages[0]["content"].startswith("You keep the running memory"):
+            return _SUMMARY
+        return replies.get(messages[-1]["content"].strip().lower(), APOLOGY)
+    return respond
+
+
+async def _session(mode: str, router: PlannerRouter, texts: List[str], budget: int) -> dict:
+    memory = ConversationMemory(router, MemoryConfig(budget_tokens=budget if mode == "bounded" else 1 << 30))
+    prompt_tokens: List[int] = []
+    latency: List[float] = []
+    assembly: List[float] = []
+    for text in texts:
+        t0 = time.perf_counter()
+        history = memory.messages() if mode != "none" else ()
+        messages = messages_for(text, history)
+        assembly.append(time.perf_counter() - t0)
+        prompt_tokens.append(sum(estimate_tokens(m["content"]) for m in messages))
+        t0 = time.perf_counter()
+        plan = await router.plan(text, history)
+        latency.append(time.perf_counter() - t0)
+        memory.add("user", text)
+        memory.add("assistant", plan.toolcall.model_dump_json(exclude_none=True))
+    await memory.wait_idle()
+    return {"prompt_tokens": prompt_tokens, "latency": latency, "assembly": assembly, "summaries": memory.summaries}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    corpus = load_corpus(args.corpus)
+    replies = {it.text.strip().lower(): it.reply for it in corpus}
+    llm = StubOllama(_responder(replies, args)).start()
+    texts = [corpus[i % len(corpus)].text for i in range(args.turns)]
+    checkpoints = [t for t in (1, 10, 50, 100, args.turns) if t <= args.turns]
+    report: dict = {"turns": args.turns, "sessions": args.sessions, "budget_tokens": args.budget}
+    try:
+        for mode in ("none", "unbounded", "bounded"):
+            router = PlannerRouter(RouterConfig(host=llm.host, timeout_s=60.0))
+            runs = [await _session(mode, router, texts, args.budget) for _ in range(args.sessions)]
+            tokens = [r["prompt_tokens"] for r in runs]
+            report[mode] = {
+                "prompt_tokens_at_turn": {str(t): max(s[t - 1] for s in tokens) for t in checkpoints},
+                "prompt_tokens_max": max(max(s) for s in tokens),
+                "plan_latency": summarize([x for r in runs for x in r["latency"]]),
+                "last_10_turns_p50_ms": summarize([x for r in runs for x in r["latency"][-10:]])["p50_ms"],
+                "assembly_us_p50": round(summarize([x for r in runs for x in r["assembly"]])["p50_ms"] * 1e3, 2),
+                "summaries_per_session": sum(r["summaries"] for r in runs) / len(runs),
+            }
+    finally:
+        llm.stop()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Conversation memory benchmark")
+    parser.add_argument("--corpus", default="data/bench/corpus.jsonl")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=512, help="bounded memory token budget")
+    parser.add_argument("--decode-ms", type=float, default=40.0)
+    parser.add_argument("--prefill-us", type=float, default=150.0, help="per prompt token")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# bench/pipeline.py
+"""
+End-to-end replay of a corpus through ListenerDaemon against a stub Ollama, an in-process
+stub scheduler and an in-process PythonWorkerService with a fake TTS engine.
+
+    python -m pyserver.bench --corpus data/bench/corpus.jsonl --repeat 20 --out bench.json
+
+Corpus lines (JSONL):
+    {"text": "...", "reply": <stub LLM output: object or raw string>,
+     "expect": [{"tool": "timer", "args": {"minutes": 10}}, ...], "wav": "optional.wav"}
+
+`expect` entries match scheduled calls by tool name and a subset of args.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import Loopback, ScheduledCall, StubOllama, table_responder
+from pyserver.listener.audio import AudioFrame, WavSource, read_wav
+from pyserver.listener.daemon import ListenerConfig, ListenerDaemon, WakeDetector
+
+
+@dataclass
+class CorpusItem:
+    text: str
+    reply: str
+    expect: List[dict] = field(default_factory=list)
+    wav: Optional[str] = None
+
+
+def load_corpus(path: str | Path) -> List[CorpusItem]:
+    items = []
+    for line in Path(path).read_text().splitlines():
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        reply = obj.get("reply", "")
+        items.append(CorpusItem(
+            text=obj["text"],
+            reply=reply if isinstance(reply, str) else json.dumps(reply),
+            expect=obj.get("expect", []),
+            wav=obj.get("wav"),
+        ))
+    return items
+
+
+def matches(expect: Sequence[dict], actual: Sequence[ScheduledCall]) -> bool:
+    unused = list(actual)
+    for e in expect:
+        want = e.get("args", {})
+        hit = next((a for a in unused if a.tool == e["tool"] and all(a.args.get(k) == v for k, v in want.items())), None)
+        if hit is None:
+            return False
+        unused.remove(hit)
+    return True
+
+
+# ===============================
+#      Replay wake/VAD/ASR
+# ===============================
+class ReplayFeed:
+    """
+    Acts as WakeDetector, VAD, ASR and AudioSource for ListenerDaemon, one corpus item at a
+    time. With a real detector plugged in, WAV items are streamed through it before waking.
+    """
+
+    def __init__(self) -> None:
+        self.detector: Optional[WakeDetector] = None
+        self.idle = asyncio.Event()
+        self.wake_missed = 0
+        self._items: asyncio.Queue[CorpusItem] = asyncio.Queue()
+        self._current: Optional[CorpusItem] = None
+        self._audio: Optional[WavSource] = None
+
+    def submit(self, item: CorpusItem) -> None:
+        self.idle.clear()
+        self._items.put_nowait(item)
+
+    # WakeDetector
+    async def wait_for_hotword(self) -> None:
+        self.idle.set()
+        item = await self._items.get()
+        self._current = item
+        if self.detector is not None and item.wav:
+            self._audio = WavSource(read_wav(item.wav))
+            try:
+                await self.detector.wait_for_hotword()
+            except EOFError:
+                self.wake_missed += 1
+
+    # AudioSource (for plugged-in detectors)
+    async def read(self) -> AudioFrame:
+        if self._audio is None:
+            raise EOFError("no audio for current item")
+        return await self._audio.read()
+
+    # VAD
+    async def stream_until_eou(self, pre_roll: Sequence[AudioFrame]) -> Sequence[AudioFrame]:
+        assert self._current is not None
+        return [self._current.text.encode("utf-8")]
+
+    # ASR
+    async def transcribe(self, frames: Sequence[AudioFrame]) -> Tuple[str, float]:
+        return frames[0].decode("utf-8"), 1.0
+
+
+def _onnx_wake(feed: ReplayFeed, args: argparse.Namespace) -> WakeDetector:
+    from pyserver.listener.wake import OnnxWakeDetector, WakeConfig
+    return OnnxWakeDetector(feed, WakeConfig(model_path=args.wake_model))
+
+
+WAKE_DETECTORS: Dict[str, Optional[Callable[[ReplayFeed, argparse.Namespace], WakeDetector]]] = {
+    "replay": None,
+    "onnx": _onnx_wake,
+}
+
+
+# ===============================
+#            Runner
+# ===============================
+async def _until(ev: asyncio.Event, daemon_task: asyncio.Task) -> None:
+    waiter = asyncio.create_task(ev.wait())
+    done, _ = await asyncio.wait({waiter, daemon_task}, return_when=asyncio.FIRST_COMPLETED)
+    if daemon_task in done:
+        waiter.cancel()
+        daemon_task.result()
+        raise RuntimeError("listener exited")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    corpus = load_corpus(args.corpus)
+    llm = StubOllama(
+        table_responder({it.text: it.reply for it in corpus}),
+        latency=lambda _model: args.llm_latency_ms / 1000.0,
+    ).start()
+    lb = await Loopback.start(seconds_per_char=args.tts_ms_per_char / 1000.0)
+
+    stages: Dict[str, List[float]] = defaultdict(list)
+    feed = ReplayFeed()
+    factory = WAKE_DETECTORS[args.wake]
+    if factory is not None:
+        feed.detector = factory(feed, args)
+    daemon = ListenerDaemon(
+        wake=feed, vad=feed, asr=feed,
+        cfg=ListenerConfig(scheduler_addr=lb.scheduler_addr, ollama_host=llm.host),
+        stage_hook=lambda name, s: stages[name].append(s),
+    )
+    daemon_task = asyncio.create_task(daemon.run())
+
+    e2e: List[float] = []
+    correct = 0
+    mismatches: List[dict] = []
+    t_start = time.perf_counter()
+    try:
+        for _ in range(args.repeat):
+            for item in corpus:
+                await _until(feed.idle, daemon_task)
+                n0 = len(lb.scheduler.calls)
+                t0 = time.perf_counter()
+                feed.submit(item)
+                await _until(feed.idle, daemon_task)
+                t_sched = time.perf_counter()
+                await lb.tts.join()
+                t1 = time.perf_counter()
+
+                calls = lb.scheduler.calls[n0:]
+                e2e.append(t1 - t0)
+                stages["tts"].append(t1 - t_sched)
+                stages["dispatch"].extend(c.dispatched - c.received for c in calls if c.dispatched)
+                if matches(item.expect, calls):
+                    correct += 1
+                elif len(mismatches) < 20:
+                    mismatches.append({"text": item.text, "expect": item.expect,
+                                       "actual": [{"tool": c.tool, "args": c.args} for c in calls]})
+        elapsed = time.perf_counter() - t_start
+    finally:
+        daemon_task.cancel()
+        await asyncio.gather(daemon_task, return_exceptions=True)
+        await lb.stop()
+        llm.stop()
+
+    total = len(e2e)
+    return {
+        "corpus": str(args.corpus),
+        "utterances": total,
+        "duration_s": round(elapsed, 3),
+        "throughput_per_s": round(total / elapsed, 2) if elapsed else 0.0,
+        "accuracy": round(correct / total, 4) if total else 0.0,
+        "wake": {"detector": args.wake, "missed": feed.wake_missed},
+        "end_to_end": summarize(e2e),
+        "stages": {name: summarize(v) for name, v in stages.items()},
+        "mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline replay benchmark for the voice pipeline")
+    parser.add_argument("--corpus", default="data/bench/corpus.jsonl")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--wake", choices=sorted(WAKE_DETECTORS), default="replay")
+    parser.add_argument("--wake-model", help="ONNX model for --wake onnx")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated Ollama latency")
+    parser.add_argument("--tts-ms-per-char", type=float, default=0.0, help="simulated speech time")
+    parser.add_argument("--out", help="also write the JSON report here")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    if args.wake == "onnx" and not args.wake_model:
+        parser.error("--wake onnx requires --wake-model")
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.out:
+        Path(args.out).write_text(report + "\n")
+    print(report)
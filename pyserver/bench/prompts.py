@@ -0,0 +1,190 @@
+# bench/prompts.py
+"""
+Tool catalog size vs prompt size and planner latency: every tool in every system prompt
+("full") against only the tools relevant to the utterance ("filtered", llm.prompt).
+
+    python -m pyserver.bench.prompts --sizes 3,30,100 --prefill-us 150
+
+Catalogs beyond the three built-in tools are synthetic: snippets (schema, example,
+keywords) for made-up smart-home, media, calendar... tools written to a temp dir, about
+the size of the real ones, some sharing words with them ("play", "alarm", "time").
+
+Utterances come from the intent corpus (data/bench/intents.jsonl). The stub LLM charges
+prefill time per prompt token on top of a fixed decode time, like bench.memory, and
+answers with the corpus reply only when the expected tool is described in the system
+prompt (a model cannot call a tool it was not shown); otherwise it apologises.
+
+Reported per size and mode: system prompt tokens, the prefix shared by every variant
+(what the server's KV cache can reuse), selection recall (expected tool included),
+select+render time uncached and cached, distinct variants, and plan latency and accuracy
+through PlannerRouter. tests/test_prompts.py asserts that filtering keeps every expected
+tool and shrinks the prompt of a catalog larger than `filter_above`.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from pyserver.bench.intent import correct
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import APOLOGY, StubOllama
+from pyserver.llm.memory import estimate_tokens
+from pyserver.llm.prompt import PromptBuilder, PromptConfig
+from pyserver.llm.router import PlannerRouter, RouterConfig
+from pyserver.tools.catalog import TOOLS
+
+MODES = ("full", "filtered")
+
+# noun -> keywords; verb -> keywords. Synthetic tools are noun_verb pairs.
+_NOUNS = {
+    "lights": "light, lights, lamp, bright, dim, room", "thermostat": "heating, temperature, warm, cold, degrees",
+    "music": "music, song, songs, album, artist, play", "podcast": "podcast, episode, show, play",
+    "calendar": "calendar, meeting, appointment, event, schedule, time", "email": "email, mail, inbox, message",
+    "messages": "text, message, send, sms", "shopping_list": "shopping, list, buy, groceries",
+    "weather": "weather, rain, forecast, sunny", "news": "news, headlines, today",
+    "volume": "volume, louder, quieter, mute", "apps": "app, open, launch, application",
+    "door_lock": "door, lock, unlock, front", "camera": "camera, doorbell, video",
+    "vacuum": "vacuum, clean, hoover", "blinds": "blinds, curtains, shades",
+    "tv": "tv, television, channel, watch", "radio": "radio, station, fm, play",
+    "alarm_clock": "alarm, wake, morning, time", "notes": "note, notes, write, jot",
+    "contacts": "contact, phone, number, call", "translate": "translate, translation, language, french, spanish",
+    "recipes": "recipe, cook, cooking, dinner", "stopwatch": "stopwatch, lap, elapsed, time",
+    "battery": "battery, charge, power",
+}
+_VERBS = {"on": "turn, on, start", "off": "turn, off, stop", "set": "set, change", "get": "what, check, status, tell",
+          "add": "add, new, create", "next": "next, skip"}
+
+
+def synthetic_snippet(name: str, keywords: str) -> str:
+    args = ", ".join(f'"{a}": "<{a}>"' for a in name.split("_")[:2])
+    noun = name.rsplit("_", 1)[0].replace("_", " ")
+    return (f"# keywords: {keywords}\n"
+            f"{name}: {name.split('_')[-1]} the {noun} (synthetic tool for prompt benchmarks).\n"
+            f"  args: {{{args}, \"room\": \"<optional room>\"}}\n"
+            f"  User: \"{name.split('_')[-1]} the {noun} in the kitchen\"\n"
+            f"  JSON: {{\"{name}\": {{\"room\": \"kitchen\"}}}}\n")
+
+
+def make_catalog(directory: str, size: int, source: str) -> List[str]:
+    """Write the built-in snippets plus size - 3 synthetic ones; return the names in catalog order."""
+    names = TOOLS.names()
+    for name in names:
+        shutil.copy(os.path.join(source, f"{name}.txt"), directory)
+    extra = [(f"{n}_{v}", f"{nk}, {vk}") for v, vk in _VERBS.items() for n, nk in _NOUNS.items()]
+    if size - len(names) > len(extra):
+        raise ValueError(f"at most {len(names) + len(extra)} tools")
+    for name, keywords in extra[:max(0, size - len(names))]:
+        Path(directory, f"{name}.txt").write_text(synthetic_snippet(name, keywords))
+        names.append(name)
+    return names
+
+
+def _responder(lines: List[dict], args: argparse.Namespace):
+    replies = {l["text"].strip().lower(): (l["expect"]["tool"], json.dumps(l["reply"])) for l in lines}
+
+    def respond(_model: str, messages: List[dict]) -> str:
+        tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        time.sleep((args.decode_ms * 1e3 + args.prefill_us * tokens) / 1e6)
+        tool, reply = replies.get(messages[-1]["content"].strip().lower(), ("", APOLOGY))
+        shown = re.search(rf"^{re.escape(tool)}:", messages[0]["content"], re.MULTILINE) if tool else None
+        return reply if shown else APOLOGY
+    return respond
+
+
+def prompts(builder: PromptBuilder, lines: List[dict], filtered: bool) -> dict:
+    texts = [l["text"] for l in lines]
+    render = builder.system if filtered else (lambda _t: builder.full())
+    builder._select.cache_clear()
+    builder._render.cache_clear()
+    uncached, cached = [], []
+    for text in texts:
+        t0 = time.perf_counter()
+        render(text)
+        uncached.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        render(text)
+        cached.append(time.perf_counter() - t0)
+    systems = [render(t) for t in texts]
+    tokens = [estimate_tokens(s) for s in systems]
+    chosen = [builder.select(t) if filtered else tuple(builder.snippets) for t in texts]
+    missed = [{"text": l["text"], "expect": l["expect"]["tool"], "selected": list(c)}
+              for l, c in zip(lines, chosen) if l["expect"]["tool"] not in c]
+    return {
+        "system_tokens": {"p50": int(np.median(tokens)), "max": max(tokens)},
+        "shared_prefix_tokens": estimate_tokens(os.path.commonprefix(systems)),
+        "tools_per_prompt": round(float(np.mean([len(c) for c in chosen])), 2),
+        "variants": len(set(systems)),
+        "recall": round(1 - len(missed) / len(lines), 3),
+        "missed": missed,
+        "build_us_uncached_p50": round(summarize(uncached)["p50_ms"] * 1e3, 2),
+        "build_us_cached_p50": round(summarize(cached)["p50_ms"] * 1e3, 2),
+    }
+
+
+async def plan_all(lines: List[dict], cfg: RouterConfig) -> dict:
+    router = PlannerRouter(cfg)
+    await router.warm()
+    latency: List[float] = []
+    right = 0
+    for line in lines:
+        t0 = time.perf_counter()
+        plan = await router.plan(line["text"])
+        latency.append(time.perf_counter() - t0)
+        right += correct(plan.toolcall, line["expect"])
+    return {"accuracy": round(right / len(lines), 3), "plan": summarize(latency)}
+
+
+async def run(lines: List[dict], sizes: Sequence[int], args: argparse.Namespace) -> dict:
+    llm = StubOllama(_responder(lines, args)).start()
+    report: dict = {"corpus": len(lines), "filter_above": args.filter_above, "max_tools": args.max_tools, "sizes": {}}
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                names = make_catalog(tmp, size, args.tools_dir)
+                report["sizes"][str(size)] = by_mode = {}
+                for mode in MODES:
+                    # "full" is the same builder with filtering off
+                    cfg = PromptConfig(system_path=args.system, tools_dir=tmp, tools=names, max_tools=args.max_tools,
+                                       filter_above=args.filter_above if mode == "filtered" else 1 << 30)
+                    builder = PromptBuilder(cfg)
+                    builder.load()
+                    by_mode[mode] = {
+                        **prompts(builder, lines, mode == "filtered"),
+                        **await plan_all(lines, RouterConfig(host=llm.host, timeout_s=60.0, prompt=cfg)),
+                    }
+    finally:
+        llm.stop()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prompt size and plan latency vs tool catalog size")
+    parser.add_argument("--corpus", default="data/bench/intents.jsonl")
+    parser.add_argument("--system", default=PromptConfig.system_path)
+    parser.add_argument("--tools-dir", default=PromptConfig.tools_dir, help="snippets of the built-in tools")
+    parser.add_argument("--sizes", default="3,30,100")
+    parser.add_argument("--filter-above", type=int, default=PromptConfig.filter_above)
+    parser.add_argument("--max-tools", type=int, default=PromptConfig.max_tools)
+    parser.add_argument("--decode-ms", type=float, default=40.0)
+    parser.add_argument("--prefill-us", type=float, default=150.0, help="per prompt token")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    lines = [json.loads(l) for l in Path(args.corpus).read_text().splitlines() if l.strip()]
+    report = asyncio.run(run(lines, [int(s) for s in args.sizes.split(",")], args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# bench/router.py
+"""
+Planner routing under bursty load against a stub Ollama with per-model latency and a fixed
+number of parallel inference slots.
+
+    python -m pyserver.bench.router --rate 3 --background-rate 1.5 --seconds 20
+
+Scenarios: "large_only" (every utterance to the 8B model, no client-side limit: the old
+toolcall_from_text behaviour), "tiered" (small model first, escalation, no limit) and
+"tiered_limited" (plus the priority limiter with deadlines). Interactive utterances are
+PRIORITY_HIGH; background requests (e.g. summaries) are PRIORITY_LOW with a short deadline.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Dict, List
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import StubOllama
+from pyserver.llm.router import PlannerRouter, RouterConfig
+
+SMALL, LARGE = "small-3b", "large-8b"
+
+SIMPLE = ["what time is it", "set a 5 minute timer", "play the chime", "say good morning",
+          "set a timer for ten minutes", "tell me a joke", "stop the music"]
+HARD_SIMPLE = ["timer for the pasta thing", "ding twice please"]   # small model unsure
+COMPLEX = ["remind me to water the plants every weekday at 8 and then play a sound",
+           "set a timer for twenty minutes and tell me when the laundry is done",
+           "if it is after six remind me to call mom before dinner"]
+BACKGROUND = "summarize the conversation so far and then list open reminders"
+
+_OK = json.dumps({"speak": {"text": "Okay."}, "confidence": 0.9})
+_UNSURE = json.dumps({"speak": {"text": "Okay?"}, "confidence": 0.3})
+
+
+def _respond(model: str, messages: List[dict]) -> str:
+    user = messages[-1]["content"]
+    if model == SMALL:
+        if user in COMPLEX or user == BACKGROUND:
+            return "{not json"
+        if user in HARD_SIMPLE:
+            return _UNSURE
+    return _OK
+
+
+async def _scenario(host: str, cfg: RouterConfig, args: argparse.Namespace) -> dict:
+    router = PlannerRouter(cfg)
+    rng = random.Random(args.seed)  # same arrivals and utterances in every scenario
+    interactive: List[float] = []
+    counts: Dict[str, int] = {"interactive": 0, "escalated": 0, "dropped": 0, "background": 0, "background_dropped": 0}
+
+    async def one(text: str, background: bool) -> None:
+        t0 = time.perf_counter()
+        if background:
+            plan = await router.plan(text, priority=models_pb.PRIORITY_LOW, timeout_s=args.background_deadline)
+            counts["background"] += 1
+            counts["background_dropped"] += plan.dropped
+            return
+        plan = await router.plan(text, priority=models_pb.PRIORITY_HIGH)
+        interactive.append(time.perf_counter() - t0)
+        counts["interactive"] += 1
+        counts["escalated"] += plan.escalated
+        counts["dropped"] += plan.dropped
+
+    async def arrivals(rate: float, pick, background: bool, seed: int) -> List[asyncio.Task]:
+        gaps = random.Random(seed)
+        tasks, stop = [], time.perf_counter() + args.seconds
+        while True:
+            await asyncio.sleep(gaps.expovariate(rate))
+            if time.perf_counter() >= stop:
+                return tasks
+            tasks.append(asyncio.create_task(one(pick(), background)))
+
+    def utterance() -> str:
+        r = rng.random()
+        return rng.choice(COMPLEX if r < args.complex_share else HARD_SIMPLE if r < args.complex_share + 0.07 else SIMPLE)
+
+    t0 = time.perf_counter()
+    fg, bg = await asyncio.gather(
+        arrivals(args.rate, utterance, False, args.seed),
+        arrivals(args.background_rate, lambda: BACKGROUND, True, args.seed + 1) if args.background_rate > 0 else asyncio.sleep(0, []),
+    )
+    await asyncio.gather(*fg, *bg)
+    return {
+        **counts,
+        "drain_s": round(time.perf_counter() - t0 - args.seconds, 2),
+        "limiter_max_waiting": router.limiter.stats.max_waiting,
+        "e2e": summarize(interactive),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    latency = {SMALL: args.small_ms / 1000, LARGE: args.large_ms / 1000}
+    stub = StubOllama(_respond, latency=lambda m: latency.get(m, 0.0), parallel=args.parallel).start()
+    unlimited = 1 << 16
+    scenarios = {
+        "large_only": RouterConfig(large_model=LARGE, small_model=None, max_concurrency=unlimited, host=stub.host),
+        "tiered": RouterConfig(large_model=LARGE, small_model=SMALL, max_concurrency=unlimited, host=stub.host),
+        "tiered_limited": RouterConfig(large_model=LARGE, small_model=SMALL, max_concurrency=args.parallel,
+                                       timeout_s=args.deadline, host=stub.host),
+    }
+    report: dict = {"parallel": args.parallel, "rate": args.rate, "background_rate": args.background_rate}
+    try:
+        for name, cfg in scenarios.items():
+            report[name] = await _scenario(stub.host, cfg, args)
+    finally:
+        stub.stop()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Planner router / limiter benchmark")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--rate", type=float, default=3.0, help="interactive utterances per second")
+    parser.add_argument("--background-rate", type=float, default=1.5, help="PRIORITY_LOW requests per second")
+    parser.add_argument("--complex-share", type=float, default=0.3)
+    parser.add_argument("--small-ms", type=float, default=120.0)
+    parser.add_argument("--large-ms", type=float, default=600.0)
+    parser.add_argument("--parallel", type=int, default=2, help="stub inference slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--deadline", type=float, default=8.0, help="interactive deadline, s")
+    parser.add_argument("--background-deadline", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("PlannerRouter").setLevel(logging.ERROR)  # drops are counted instead
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# bench/satellite.py
+"""
+SatelliteService load test: many simulated satellites streaming to one listener on loopback.
+
+    python -m pyserver.bench.satellite --satellites 32 --seconds 20 --codecs pcm,opus
+
+The satellites run in a separate process (so the CPU measured here is the listener's):
+each sends 20 ms chunks in real time, background noise between utterances and, for an
+utterance, a tone whose pitch identifies a corpus item (it survives Opus, and the bench
+decoder recovers the text from it) with the satellite-side wake flag on its first chunk.
+The listener side is the real pipeline: SatelliteService -> EnergyVAD -> BatchingASR on the
+synthetic Whisper decoder -> hub planner (stub Ollama) -> SchedulerClient (stub scheduler
+and worker).
+
+Reported per codec: listener CPU per stream (process CPU over wall time, minus the idle
+baseline, divided by streams), end-to-end latency from the end of speech to the
+END_OF_UTTERANCE / TRANSCRIPT / DONE events (the VAD's end-of-speech silence is part of
+it), backpressure events and how long satellites were blocked sending. That every
+transcript is right, every satellite finishes utterances and no stream fails is asserted
+in tests/test_satellite.py.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import grpc
+import numpy as np
+
+from protobufs.gen.py.protobufs.apis.services import satellite_api_pb2 as sat_pb
+from protobufs.gen.py.protobufs.apis.services import satellite_api_pb2_grpc as sat_rpc
+from pyserver.bench.asr import SyntheticWhisper
+from pyserver.bench.pipeline import load_corpus
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import Loopback, StubOllama, table_responder
+from pyserver.listener.asr import BatchConfig, BatchingASR
+from pyserver.listener.audio import SAMPLE_RATE
+from pyserver.listener.daemon import ListenerConfig
+from pyserver.listener.hub import ListenerHub
+from pyserver.listener.satellite import SatelliteConfig, SatelliteService
+
+Event = sat_pb.ListenerEvent
+CHUNK = SAMPLE_RATE // 50  # 20 ms
+TONE_HZ = 500.0
+TONE_STEP_HZ = 250.0
+
+
+def _tone(index: int) -> float:
+    return TONE_HZ + TONE_STEP_HZ * index
+
+
+# ===============================
+#        Listener side
+# ===============================
+class ToneWhisper(SyntheticWhisper):
+    """SyntheticWhisper's cost, but the text comes from the audio: the corpus item whose tone dominates."""
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        super().__init__()
+        self._texts = list(texts)
+
+    def decode(self, audio: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        super().decode(audio)
+        out = []
+        for a in audio:
+            spectrum = np.abs(np.fft.rfft(a))
+            peak = float(np.argmax(spectrum)) * SAMPLE_RATE / max(1, len(a))
+            index = int(round((peak - TONE_HZ) / TONE_STEP_HZ))
+            out.append((self._texts[index], 0.95) if 0 <= index < len(self._texts) else ("", 0.0))
+        return out
+
+
+# ===============================
+#        Satellite side
+# ===============================
+def _pcm(seconds: float, rng: np.random.Generator, tone_hz: Optional[float] = None) -> np.ndarray:
+    n = int(seconds * SAMPLE_RATE) // CHUNK * CHUNK
+    x = rng.standard_normal(n) * 0.003
+    if tone_hz is not None:
+        t = np.arange(n) / SAMPLE_RATE
+        x += 0.3 * np.sin(2 * np.pi * tone_hz * t) * (0.75 + 0.25 * np.sin(2 * np.pi * 4.0 * t))  # syllable-ish envelope
+    return (x * 32767).astype(np.int16)
+
+
+def _encode(pcm: np.ndarray, codec: str) -> List[bytes]:
+    """20 ms chunks as the satellite would send them (one Opus packet each)."""
+    if codec == "pcm":
+        return [pcm[i:i + CHUNK].tobytes() for i in range(0, len(pcm), CHUNK)]
+    import av
+    enc = av.CodecContext.create("libopus", "w")
+    enc.sample_rate, enc.layout, enc.format, enc.bit_rate = SAMPLE_RATE, "mono", "s16", 24000
+    packets: List[bytes] = []
+    for i in range(0, len(pcm), CHUNK):
+        frame = av.AudioFrame.from_ndarray(pcm[None, i:i + CHUNK], format="s16", layout="mono")
+        frame.sample_rate, frame.pts = SAMPLE_RATE, i
+        packets += [bytes(p) for p in enc.encode(frame)]
+    packets += [bytes(p) for p in enc.encode(None)]
+    return packets
+
+
+async def _satellite(name: str, addr: str, args: dict, noise: List[bytes], speech: List[List[bytes]],
+                     stop: float, out: dict) -> None:
+    rng = random.Random(f"{args['seed']}:{name}")
+    codec = sat_pb.AUDIO_CODEC_OPUS if args["codec"] == "opus" else sat_pb.AUDIO_CODEC_PCM_S16LE
+    seq = 0
+    pending: List[Tuple[int, float]] = []  # (item, end of speech) awaiting DONE
+    done = asyncio.Event()
+    done.set()
+    async with grpc.aio.insecure_channel(addr) as channel:
+        call = sat_rpc.SatelliteServiceStub(channel).StreamAudio()
+        await call.write(sat_pb.AudioChunk(satellite_id=name, codec=codec, sample_rate=SAMPLE_RATE))
+
+        async def events() -> None:
+            marks: Dict[int, float] = {}
+            async for ev in call:
+                now = time.perf_counter()
+                if ev.kind == Event.KIND_BACKPRESSURE:
+                    out["backpressure"] += 1
+                if not pending or ev.kind not in (Event.KIND_END_OF_UTTERANCE, Event.KIND_TRANSCRIPT, Event.KIND_DONE):
+                    continue
+                item, spoken = pending[0]
+                marks[ev.kind] = now - spoken
+                if ev.kind == Event.KIND_TRANSCRIPT:
+                    out["correct" if ev.text == args["texts"][item] else "wrong"] += 1
+                if ev.kind == Event.KIND_DONE:
+                    pending.pop(0)
+                    for kind, key in ((Event.KIND_END_OF_UTTERANCE, "eou"), (Event.KIND_TRANSCRIPT, "transcript"),
+                                      (Event.KIND_DONE, "done")):
+                        if kind in marks:
+                            out[key].append(marks[kind])
+                    marks.clear()
+                    done.set()
+
+        reader = asyncio.create_task(events())
+        t0 = time.perf_counter()
+
+        async def send(chunks: Sequence[bytes], wake: bool = False) -> None:
+            nonlocal seq
+            for data in chunks:
+                seq += 1
+                due = t0 + seq * CHUNK / SAMPLE_RATE
+                now = time.perf_counter()
+                if due > now:
+                    await asyncio.sleep(due - now)
+                before = time.perf_counter()
+                await call.write(sat_pb.AudioChunk(seq=seq, data=data, wake=wake))
+                out["send_blocked_s"] += time.perf_counter() - before
+                wake = False
+
+        try:
+            while time.perf_counter() < stop:
+                await send(noise[: rng.randrange(25, 100)])  # 0.5-2 s of room noise
+                if not done.is_set():
+                    continue  # still answering the last one: keep streaming noise
+                item = rng.randrange(len(speech))
+                await send(speech[item], wake=True)
+                pending.append((item, time.perf_counter()))
+                done.clear()
+                out["utterances"] += 1
+            give_up = time.perf_counter() + 10.0
+            while not done.is_set():  # keep the room noise going: the VAD needs silence to end the last one
+                if time.perf_counter() > give_up:
+                    raise TimeoutError("no DONE for the last utterance")
+                await send(noise[:5])
+            await call.done_writing()
+            await asyncio.wait_for(reader, timeout=10.0)
+        except Exception as e:  # counted, not raised: one satellite must not hide the others' numbers
+            out["errors"].append(f"{type(e).__name__}: {e}")
+            reader.cancel()
+
+
+async def _satellites(addr: str, args: dict) -> dict:
+    rng = np.random.default_rng(args["seed"])
+    noise = _encode(_pcm(2.0, rng), args["codec"])
+    speech = [_encode(_pcm(args["utterance_s"], rng, _tone(i)), args["codec"]) for i in range(len(args["texts"]))]
+    outs = {f"sat-{i:03d}": {"utterances": 0, "correct": 0, "wrong": 0, "backpressure": 0, "send_blocked_s": 0.0,
+                             "eou": [], "transcript": [], "done": [], "errors": []}
+            for i in range(args["satellites"])}
+    stop = time.perf_counter() + args["seconds"]
+    cpu0 = time.process_time()
+    await asyncio.gather(*(_satellite(name, addr, args, noise, speech, stop, out) for name, out in outs.items()))
+    return {"satellites": outs, "client_cpu_s": time.process_time() - cpu0}
+
+
+def _satellite_process(addr: str, args: dict, conn) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    conn.send(asyncio.run(_satellites(addr, args)))
+    conn.close()
+
+
+# ===============================
+#            Runner
+# ===============================
+async def scenario(args: argparse.Namespace, codec: str) -> dict:
+    corpus = load_corpus(args.corpus)
+    texts = [it.text for it in corpus]
+    llm = StubOllama(table_responder({it.text: it.reply for it in corpus}),
+                     latency=lambda _m: args.llm_ms / 1000.0, parallel=args.plan_concurrency).start()
+    lb = await Loopback.start()
+    hub = ListenerHub(ListenerConfig(scheduler_addr=lb.scheduler_addr, ollama_host=llm.host, memory_tokens=0),
+                      plan_concurrency=args.plan_concurrency)
+    asr = BatchingASR(ToneWhisper(texts), BatchConfig(window_ms=args.asr_window_ms))
+    service = SatelliteService(hub, asr, SatelliteConfig())
+    server = grpc.aio.server()
+    sat_rpc.add_SatelliteServiceServicer_to_server(service, server)
+    addr = f"127.0.0.1:{server.add_insecure_port('127.0.0.1:0')}"
+    await server.start()
+    hub_task = asyncio.create_task(hub.run())
+    await asr.warm()
+
+    loop = asyncio.get_running_loop()
+    t0, cpu0 = time.perf_counter(), time.process_time()
+    await asyncio.sleep(1.0)
+    idle_cpu = (time.process_time() - cpu0) / (time.perf_counter() - t0)
+
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_satellite_process, name="satellites", args=(addr, {
+        "codec": codec, "satellites": args.satellites, "seconds": args.seconds, "seed": args.seed,
+        "utterance_s": args.utterance_s, "texts": texts}, child))
+    try:
+        proc.start()
+        while not service.streams:  # spawning imports grpc, av, numpy: don't count that time
+            await asyncio.sleep(0.05)
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        client = await loop.run_in_executor(None, parent.recv)
+        wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+        await loop.run_in_executor(None, proc.join)
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+        hub_task.cancel()
+        await asyncio.gather(hub_task, return_exceptions=True)
+        await server.stop(grace=None)
+        await asr.aclose()
+        await lb.stop()
+        llm.stop()
+
+    sats = client["satellites"].values()
+    latency = {key: summarize([s for sat in sats for s in sat[key]]) for key in ("eou", "transcript", "done")}
+    n = len(client["satellites"])
+    busy = max(0.0, cpu / wall - idle_cpu)
+    return {
+        "streams": n,
+        "utterances": sum(s["utterances"] for s in sats),
+        "correct": sum(s["correct"] for s in sats),
+        "wrong": sum(s["wrong"] for s in sats),
+        "idle_satellites": sorted(name for name, s in client["satellites"].items() if not s["done"]),
+        "errors": [e for s in sats for e in s["errors"]],
+        "listener_cpu_pct": round(100 * cpu / wall, 1),
+        "cpu_per_stream_pct": round(100 * busy / n, 3),
+        "asr": {"batches": asr.stats.batches, "largest": asr.stats.largest,
+                "decode_ms": round(asr.stats.decode_s * 1e3, 1)},
+        "satellite_cpu_per_stream_pct": round(100 * client["client_cpu_s"] / wall / n, 3),
+        "backpressure_events": sum(s["backpressure"] for s in sats),
+        "send_blocked_ms_max": summarize([s["send_blocked_s"] for s in sats]).get("max_ms"),
+        "latency_from_end_of_speech": latency,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    return {
+        "satellites": args.satellites,
+        "codecs": {codec: await scenario(args, codec) for codec in args.codecs.split(",")},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Satellite audio streaming load test")
+    parser.add_argument("--corpus", default="data/bench/corpus.jsonl")
+    parser.add_argument("--satellites", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--codecs", default="pcm,opus")
+    parser.add_argument("--utterance-s", type=float, default=1.2)
+    parser.add_argument("--llm-ms", type=float, default=150.0)
+    parser.add_argument("--plan-concurrency", type=int, default=4, help="LLM slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--asr-window-ms", type=float, default=25.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# bench/scheduler.py
+"""
+SchedulerEngine under load: insert/cancel/fire throughput with 100k pending timers,
+firing jitter, and cron next-fire evaluation cost.
+
+    python -m pyserver.bench.scheduler --pending 100000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+from google.protobuf.duration_pb2 import Duration
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+
+from pyserver.bench.stats import summarize
+from pyserver.scheduler.cron import compile_cron, zone
+from pyserver.scheduler.engine import ScheduledTask, SchedulerEngine
+
+_PRIORITIES = (models_pb.PRIORITY_HIGH, models_pb.PRIORITY_NORMAL, models_pb.PRIORITY_LOW)
+
+
+def _task(i: int) -> models_pb.Task:
+    return models_pb.Task(
+        task_id=f"t{i}",
+        call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text="x")),
+        priority=_PRIORITIES[i % 3],
+    )
+
+
+def _delay(seconds: float) -> models_pb.Trigger:
+    d = Duration()
+    d.FromNanoseconds(int(seconds * 1e9))
+    return models_pb.Trigger(delay=d)
+
+
+def _rate(n: int, seconds: float) -> float:
+    return round(n / seconds, 1) if seconds else float("inf")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(0)
+    fired = 0
+    done = asyncio.Event()
+    target = 0
+
+    async def dispatch(_task: models_pb.Task) -> None:
+        nonlocal fired
+        fired += 1
+        if fired >= target:
+            done.set()
+
+    lateness: List[float] = []
+    first_burst_fire = 0.0
+
+    def on_fire(rec: ScheduledTask, late: float) -> None:
+        nonlocal first_burst_fire
+        if rec.task_id.startswith("j"):
+            lateness.append(late)
+        elif not first_burst_fire and rec.task_id.startswith("b"):
+            first_burst_fire = time.perf_counter()
+
+    engine = SchedulerEngine(dispatch, on_fire=on_fire)
+    report: dict = {"pending": args.pending}
+
+    # insert
+    tasks = [_task(i) for i in range(args.pending)]
+    triggers = [_delay(rng.uniform(600, 7200)) for _ in range(args.pending)]
+    t0 = time.perf_counter()
+    for task, trig in zip(tasks, triggers):
+        engine.schedule(task, trig)
+    report["insert_per_s"] = _rate(args.pending, time.perf_counter() - t0)
+
+    # cancel half, then re-insert so 100k stay pending
+    victims = rng.sample(range(args.pending), args.pending // 2)
+    t0 = time.perf_counter()
+    for i in victims:
+        engine.cancel(f"t{i}")
+    report["cancel_per_s"] = _rate(len(victims), time.perf_counter() - t0)
+    for i in victims:
+        engine.schedule(_task(i), _delay(rng.uniform(600, 7200)))
+
+    await engine.start()
+    try:
+        # jitter: timers spread over a few seconds on top of the pending set
+        target = args.jitter_timers
+        for i in range(args.jitter_timers):
+            engine.schedule(models_pb.Task(task_id=f"j{i}", call=tasks[0].call), _delay(0.2 + rng.uniform(0, args.jitter_span)))
+        await asyncio.wait_for(done.wait(), timeout=args.jitter_span + 30)
+        report["jitter"] = summarize(lateness)
+
+        # fire: a burst all due at once
+        fired, target = 0, args.burst
+        done.clear()
+        for i in range(args.burst):
+            engine.schedule(models_pb.Task(task_id=f"b{i}", call=tasks[0].call, priority=_PRIORITIES[i % 3]), _delay(0.5))
+        await asyncio.wait_for(done.wait(), timeout=120)
+        report["fire_per_s"] = _rate(args.burst, time.perf_counter() - first_burst_fire)
+        report["pending_after"] = len(engine)
+    finally:
+        await engine.close()
+
+    cron, tz = compile_cron("0 8 * * 1-5"), zone("Europe/London")
+    now, n = time.time(), 20000
+    t0 = time.perf_counter()
+    for k in range(n):
+        cron.next_after(now + k * 3600, tz)
+    report["cron_next_per_s"] = _rate(n, time.perf_counter() - t0)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Python scheduler engine benchmark")
+    parser.add_argument("--pending", type=int, default=100_000)
+    parser.add_argument("--burst", type=int, default=20_000)
+    parser.add_argument("--jitter-timers", type=int, default=2000)
+    parser.add_argument("--jitter-span", type=float, default=3.0, help="seconds to spread jitter timers over")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
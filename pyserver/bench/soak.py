@@ -0,0 +1,356 @@
+# bench/soak.py
+"""
+Memory soak: the listener and the worker under steady synthetic load for a long time.
+
+    python -m pyserver.bench.soak --seconds 600 --warmup-s 30
+
+Everything but the stub Ollama (a separate process, like the real one) runs in this process
+so tracemalloc sees all of it: a PythonWorkerService (null
+TTS engine) and a SchedulerEngine/SchedulerService dispatching to it through a
+WorkerDispatcher, both on loopback gRPC ports, a ListenerDaemon replaying the bench corpus
+against a stub Ollama at --utterances-per-s, and a client calling the worker's RunTask
+directly at --runtasks-per-s. Timers the corpus sets are cancelled after each utterance and
+the worker's DedupCache is shrunk to --dedup-entries, so bounded state fills up during the
+warmup; what still grows after it is what a run of weeks would accumulate.
+
+After the warmup a tracemalloc snapshot is taken, traced memory and RSS are sampled every
+--sample-s, and the final snapshot is diffed against the first (the --top allocation sites
+that grew most). Then each hot path runs --per-request times on its own, reported as the
+bytes/blocks still allocated per request (retained: ~0 unless something keeps a reference)
+and the peak of Python allocations while one request runs (transient).
+
+tests/test_soak.py runs a short soak and asserts the MAX_* limits (traced memory and RSS
+growth, bytes a hot path retains per request) and that no request fails.
+"""
+from __future__ import annotations
+import argparse
+import array
+import asyncio
+import gc
+import itertools
+import json
+import linecache
+import logging
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import sysconfig
+import time
+import tracemalloc
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+
+from pyserver.bench.pipeline import CorpusItem, ReplayFeed, _until, load_corpus
+from pyserver.bench.stubs import StubOllama, table_responder
+from pyserver.clients.scheduler.client import SchedulerClient
+from pyserver.listener.daemon import ListenerConfig, ListenerDaemon
+from pyserver.llm.models import SpeakArgsModel, ToolCallModel
+from pyserver.llm.router import PlannerRouter, RouterConfig
+from pyserver.scheduler.engine import SchedulerEngine
+from pyserver.scheduler.service import SchedulerService, WorkerDispatcher
+from pyserver.server.dedup import DedupCache
+from pyserver.server.server import NullTTSEngine, PythonWorkerService, TTSQueue
+
+MAX_GROWTH_KIB = 256.0
+MAX_RSS_GROWTH_MIB = 16.0
+MAX_RETAINED_B = 64.0
+
+_SPEAK = models_pb.ToolCall(speak=models_pb.SpeakArgs(text="soak"))
+_OK = pb.RunTaskResponse.STATUS_OK
+# tracemalloc's own bookkeeping and import machinery are not the code under test
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _rss() -> int:
+    """Resident set size in bytes (current on Linux; peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(_IGNORE)
+
+
+def _traced(snap: tracemalloc.Snapshot) -> int:
+    return sum(s.size for s in snap.statistics("filename"))
+
+
+def _where(frame: tracemalloc.Frame) -> str:
+    path = frame.filename
+    for marker in ("site-packages/", sysconfig.get_paths()["stdlib"] + "/", os.getcwd() + "/"):
+        if marker in path:
+            path = path.split(marker, 1)[1]
+    return f"{path}:{frame.lineno}"
+
+
+def _llm_process(corpus: str, conn) -> None:
+    llm = StubOllama(table_responder({it.text: it.reply for it in load_corpus(corpus)})).start()
+    conn.send(llm.host)
+    conn.recv()  # until the soak is over
+    llm.stop()
+
+
+# ===============================
+#        Worker + listener
+# ===============================
+class _Rig:
+    """Worker, scheduler and listener wired as in production, on loopback ports."""
+
+    def __init__(self, corpus: List[CorpusItem], args: argparse.Namespace) -> None:
+        self.corpus = corpus
+        self.args = args
+        self.counts: Counter = Counter()
+        self._servers: List[grpc.aio.Server] = []
+
+    async def start(self) -> None:
+        self.tts = TTSQueue(engine=NullTTSEngine())
+        await self.tts.start()
+        self.worker = PythonWorkerService(self.tts, dedup=DedupCache(max_entries=self.args.dedup_entries))
+        worker_addr = await self._serve(lambda srv: rpc.add_PythonWorkerServiceServicer_to_server(self.worker, srv))
+
+        self.dispatcher = WorkerDispatcher(worker_addr)
+        self.engine = SchedulerEngine(self._dispatch, on_fire=lambda _rec, _late: self.counts.update(("fired",)))
+        await self.engine.start()
+        sched_addr = await self._serve(lambda srv: sched_rpc.add_SchedulerServiceServicer_to_server(SchedulerService(self.engine), srv))
+
+        self._llm, child = multiprocessing.get_context("spawn").Pipe()
+        self._llm_proc = multiprocessing.get_context("spawn").Process(
+            target=_llm_process, name="stub-ollama", args=(self.args.corpus, child), daemon=True)
+        self._llm_proc.start()
+        llm_host = await asyncio.get_running_loop().run_in_executor(None, self._llm.recv)
+        self.feed = ReplayFeed()
+        self.daemon = ListenerDaemon(wake=self.feed, vad=self.feed, asr=self.feed,
+                                     cfg=ListenerConfig(scheduler_addr=sched_addr, ollama_host=llm_host))
+        self.daemon_task = asyncio.create_task(self.daemon.run())
+        self.planner = PlannerRouter(RouterConfig(host=llm_host))
+        self.client = SchedulerClient(sched_addr)
+        await self.client.start()
+        self._channel = grpc.aio.insecure_channel(worker_addr)
+        self.stub = rpc.PythonWorkerServiceStub(self._channel)
+        await _until(self.feed.idle, self.daemon_task)
+
+    async def _serve(self, add: Callable[[grpc.aio.Server], None]) -> str:
+        srv = grpc.aio.server()
+        add(srv)
+        port = srv.add_insecure_port("127.0.0.1:0")
+        await srv.start()
+        self._servers.append(srv)
+        return f"127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        self.daemon_task.cancel()
+        await asyncio.gather(self.daemon_task, return_exceptions=True)
+        await self.client.close()
+        await self._channel.close()
+        await self.engine.close()
+        await self.dispatcher.close()
+        for srv in self._servers:
+            await srv.stop(grace=None)
+        await self.tts.stop()
+        self._llm.send(None)
+        self._llm_proc.join(5)
+
+    async def _dispatch(self, task: models_pb.Task) -> None:
+        resp = await self.dispatcher(task)
+        self.counts["dispatched"] += 1
+        if resp.status != _OK:
+            self.counts["errors"] += 1
+
+    async def settle(self) -> None:
+        """Let what was scheduled run (speech spoken, dispatches answered); drop pending timers."""
+        for rec in [r for r in self.engine.tasks() if r.tool == "timer"]:
+            self.engine.cancel(rec.task_id)
+        while self.counts["fired"] > self.counts["dispatched"]:
+            await asyncio.sleep(0.001)
+        await self.tts.join()
+
+    # ---- one request on each hot path ----
+
+    async def utterance(self, i: int) -> None:
+        await _until(self.feed.idle, self.daemon_task)
+        self.feed.submit(self.corpus[i % len(self.corpus)])
+        await _until(self.feed.idle, self.daemon_task)
+        await self.settle()
+        self.counts["utterances"] += 1
+
+    async def run_task(self, i: int) -> None:
+        resp = await self.stub.RunTask(pb.RunTaskRequest(call=_SPEAK, task_id=f"soak-{i}", attempt_id="1"))
+        self.counts["runtasks"] += 1
+        if resp.status != _OK:
+            self.counts["errors"] += 1
+
+    def hot_paths(self) -> Dict[str, Callable[[int], Awaitable[None]]]:
+        speak = ToolCallModel(speak=SpeakArgsModel(text="soak"))
+        reply = next(it.reply for it in self.corpus if it.expect)
+
+        async def parse(_i: int) -> None:  # the per-call pydantic -> proto conversion
+            ToolCallModel.model_validate_json(reply).to_proto()
+
+        async def execute(_i: int) -> None:
+            await self.worker.execute(_SPEAK)
+            await self.tts.join()
+
+        async def run_task(i: int) -> None:
+            await self.run_task(-i - 1)  # keys the soak did not use
+            await self.tts.join()
+
+        async def schedule(_i: int) -> None:
+            await self.client.schedule_toolcall_now(speak)
+            while len(self.engine):  # not fired yet
+                await asyncio.sleep(0.0005)
+            await self.settle()
+
+        async def plan(i: int) -> None:
+            await self.planner.plan(self.corpus[i % len(self.corpus)].text)
+
+        return {
+            "toolcall.parse": parse,
+            "worker.execute": execute,
+            "worker.RunTask": run_task,
+            "scheduler.ScheduleTask": schedule,
+            "planner.plan": plan,
+            "listener.utterance": self.utterance,
+        }
+
+
+# ===============================
+#             Soak
+# ===============================
+async def _paced(per_s: float, stop: float, step: Callable[[int], Awaitable[None]], start: int) -> None:
+    for i in itertools.count(start):
+        if time.perf_counter() >= stop:
+            return
+        t0 = time.perf_counter()
+        await step(i)
+        await asyncio.sleep(max(0.0, 1.0 / per_s - (time.perf_counter() - t0)))
+
+
+async def _load(rig: _Rig, seconds: float, start: int) -> None:
+    stop = time.perf_counter() + seconds
+    await asyncio.gather(
+        _paced(rig.args.utterances_per_s, stop, rig.utterance, start),
+        _paced(rig.args.runtasks_per_s, stop, rig.run_task, start * 100),
+    )
+    await rig.settle()
+
+
+def _requests(rig: _Rig) -> int:
+    return rig.counts["utterances"] + rig.counts["runtasks"]
+
+
+async def _sample(rig: _Rig, every: float, t0: float, series: List[dict]) -> None:
+    while True:
+        await asyncio.sleep(every)
+        gc.collect()
+        series.append({
+            "t_s": round(time.perf_counter() - t0, 1),
+            "requests": _requests(rig),
+            "traced_kib": round(tracemalloc.get_traced_memory()[0] / 1024, 1),
+            "rss_mib": round(_rss() / 2**20, 2),
+        })
+
+
+async def _per_request(step: Callable[[int], Awaitable[None]], n: int) -> dict:
+    for i in range(min(n, 200)):  # first calls fill caches and pools
+        await step(i)
+    peaks = array.array("q", [0]) * n  # preallocated: recording a sample must not allocate
+    _snapshot()  # compiles the filters' patterns
+    before = _snapshot()
+    for i in range(n):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await step(i)
+        peaks[i] = tracemalloc.get_traced_memory()[1] - current
+    after = _snapshot()
+    diff = after.compare_to(before, "filename")
+    return {
+        "requests": n,
+        "retained_b": round(sum(s.size_diff for s in diff) / n, 1),
+        "retained_blocks": round(sum(s.count_diff for s in diff) / n, 3),
+        "peak_b_p50": int(statistics.median(peaks)),
+        "peak_b_max": max(peaks),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    tracemalloc.start(1)
+    rig = _Rig(load_corpus(args.corpus), args)
+    await rig.start()
+    try:
+        await _load(rig, args.warmup_s, 0)
+        warm_requests = _requests(rig)
+        base = _snapshot()
+        traced0, rss0 = _traced(base), _rss()  # RSS from here on includes the snapshot
+        series: List[dict] = []
+        t0 = time.perf_counter()
+        sampler = asyncio.create_task(_sample(rig, args.sample_s, t0, series))
+        await _load(rig, args.seconds, 1_000_000)
+        soak_s = time.perf_counter() - t0
+        sampler.cancel()
+        await asyncio.gather(sampler, return_exceptions=True)
+        rss1 = _rss()
+        final = _snapshot()
+        traced1 = _traced(final)
+        requests = _requests(rig) - warm_requests
+        top = [
+            {"site": _where(s.traceback[0]), "size_diff_kib": round(s.size_diff / 1024, 1), "count_diff": s.count_diff}
+            for s in final.compare_to(base, "lineno")[:args.top]
+        ]
+        del base, final
+        hot = {name: await _per_request(step, args.per_request) for name, step in rig.hot_paths().items()}
+    finally:
+        await rig.stop()
+        tracemalloc.stop()
+    return {
+        "seconds": round(soak_s, 1),
+        "requests": requests,
+        "counts": dict(rig.counts),
+        "speech_dropped": rig.tts.dropped,
+        "traced_growth_kib": round((traced1 - traced0) / 1024, 1),
+        "traced_growth_b_per_request": round((traced1 - traced0) / max(requests, 1), 1),
+        "rss_growth_mib": round((rss1 - rss0) / 2**20, 2),
+        "top_growth": top,
+        "series": series,
+        "per_request": hot,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory soak of the listener and worker")
+    parser.add_argument("--corpus", default="data/bench/corpus.jsonl")
+    parser.add_argument("--seconds", type=float, default=600.0, help="measured soak after the warmup")
+    parser.add_argument("--warmup-s", type=float, default=30.0)
+    parser.add_argument("--sample-s", type=float, default=10.0)
+    parser.add_argument("--utterances-per-s", type=float, default=20.0)
+    parser.add_argument("--runtasks-per-s", type=float, default=100.0)
+    parser.add_argument("--dedup-entries", type=int, default=256)
+    parser.add_argument("--per-request", type=int, default=500, help="requests per hot path for the per-request figures")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# bench/startup.py
+"""
+Cold start of the Python worker (`python -m pyserver`): import cost from `-X importtime`
+and wall clock from exec to port bound, to the first successful RunTask and to health
+SERVING. The budgets (and that no LAZY_MODULES load at start-up) are regression tests in
+tests/test_startup.py.
+
+    python -m pyserver.bench.startup --runs 5
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+
+from pyserver.bench.stats import summarize
+
+# Must not be imported just to start serving.
+LAZY_MODULES = ("pyttsx3", "ollama", "onnxruntime", "faster_whisper", "sounddevice")
+MAX_IMPORT_MS = 400.0
+MAX_FIRST_TASK_MS = 1500.0
+
+_STAGES = ("bound", "first_task", "serving")
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_profile(module: str = "pyserver.__main__") -> Dict[str, object]:
+    """Import `module` in a fresh interpreter under -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=os.environ.copy(), check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    total_us = sum(cum for _, cum, depth, _ in rows if depth == 0)
+    top = sorted(rows, reverse=True)[:10]
+    return {
+        "modules": len(rows),
+        "total_ms": round(total_us / 1e3, 1),
+        "top_self_ms": {name: round(us / 1e3, 1) for us, _, _, name in top},
+        "eager_heavy": sorted({name.split(".")[0] for *_, name in rows} & set(LAZY_MODULES)),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _until(fn, deadline: float, pause: float = 0.005):
+    while True:
+        try:
+            res = await fn()
+            if res:
+                return res
+        except grpc.aio.AioRpcError:
+            pass
+        if time.perf_counter() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(pause)
+
+
+async def cold_start(tts_engine: str, timeout_s: float) -> Dict[str, float]:
+    """Spawn the worker and time bind, first successful RunTask and SERVING."""
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "pyserver", "--host", "127.0.0.1", "--port", str(port),
+         "--tts-engine", tts_engine, "--log-level", "WARNING"],
+        env=os.environ.copy(),
+    )
+    marks: Dict[str, float] = {}
+    deadline = t0 + timeout_s
+    # gRPC's default reconnect backoff (1 s) would dominate the measurement.
+    options = [("grpc.initial_reconnect_backoff_ms", 5), ("grpc.min_reconnect_backoff_ms", 5), ("grpc.max_reconnect_backoff_ms", 20)]
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}", options=options) as ch:
+            health = health_pb2_grpc.HealthStub(ch)
+            worker = rpc.PythonWorkerServiceStub(ch)
+
+            async def bound():
+                await health.Check(health_pb2.HealthCheckRequest(service="grpc.health.v1.Health"), timeout=0.2)
+                return True
+
+            async def first_task():
+                call = models_pb.ToolCall(speak=models_pb.SpeakArgs(text="hello"))
+                resp = await worker.RunTask(pb.RunTaskRequest(call=call), timeout=0.5)
+                return resp.status == pb.RunTaskResponse.STATUS_OK
+
+            async def serving():
+                resp = await health.Check(health_pb2.HealthCheckRequest(service=""), timeout=0.2)
+                return resp.status == health_pb2.HealthCheckResponse.SERVING
+
+            for name, fn in (("bound", bound), ("first_task", first_task), ("serving", serving)):
+                try:
+                    await _until(fn, deadline)
+                except TimeoutError:
+                    break  # later stages stay unreached
+                marks[name] = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return marks
+
+
+async def run(args: argparse.Namespace) -> dict:
+    report: dict = {"imports": import_profile()}
+    runs: Dict[str, List[float]] = {name: [] for name in _STAGES}
+    for _ in range(args.runs):
+        for name, t in (await cold_start(args.tts_engine, args.timeout)).items():
+            runs[name].append(t)
+    report["cold_start"] = {name: summarize(ts) if ts else "not reached" for name, ts in runs.items()}
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Python worker cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tts-engine", choices=("pyttsx3", "null"), default="null")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per run")
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
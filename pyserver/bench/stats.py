@@ -0,0 +1,21 @@
+# bench/stats.py
+from __future__ import annotations
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def summarize(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds (n, mean, p50, p95, p99, max)."""
+    if not samples_s:
+        return {"n": 0}
+    a = np.asarray(samples_s, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(a, [50, 95, 99])
+    return {
+        "n": int(a.size),
+        "mean_ms": round(float(a.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(a.max()), 3),
+    }
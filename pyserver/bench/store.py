@@ -0,0 +1,128 @@
+# bench/store.py
+"""
+TaskStore durability costs: write throughput under group commit (each writer awaits its
+own fsync) and recovery time for a large task set from snapshot and from WAL alone.
+
+    python -m pyserver.bench.store --tasks 1000000 --dir /var/tmp/taskstore-bench
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+
+from pyserver.bench.stats import summarize
+from pyserver.scheduler.engine import SchedulerEngine
+from pyserver.scheduler.store import TaskRecord, TaskStore
+
+
+def _record(i: int, now: float) -> TaskRecord:
+    r = TaskRecord(
+        task=models_pb.Task(
+            task_id=f"task-{i:08d}",
+            call=models_pb.ToolCall(timer=models_pb.TimerArgs(minutes=5, label="tea")),
+            priority=models_pb.PRIORITY_NORMAL,
+        ),
+    )
+    r.trigger.delay.FromSeconds(300)
+    r.next_fire_time.FromNanoseconds(int((now + 300 + i % 86400) * 1e9))
+    return r
+
+
+async def _writes(path: Path, writers: int, seconds: float, interval: float) -> dict:
+    store = TaskStore(path, commit_interval_s=interval, compact_bytes=1 << 40)
+    store.load()
+    await store.start()
+    latencies: List[float] = []
+    now = time.time()
+    stop = time.perf_counter() + seconds
+
+    async def writer(w: int) -> None:
+        i = 0
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            store.put(_record(w * 10_000_000 + i, now))
+            await store.sync()
+            latencies.append(time.perf_counter() - t0)
+            i += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(writers)))
+    elapsed = time.perf_counter() - t0
+    await store.close()
+    return {
+        "writers": writers,
+        "ops_per_s": round(len(latencies) / elapsed, 1),
+        "fsyncs": store.stats.commits,
+        "avg_batch": round(store.stats.appends / max(1, store.stats.commits), 1),
+        "ack_latency": summarize(latencies),
+    }
+
+
+async def _populate(path: Path, n: int, snapshot: bool) -> dict:
+    store = TaskStore(path, compact_bytes=1 << 40)
+    store.load()
+    await store.start()
+    now = time.time()
+    t0 = time.perf_counter()
+    for i in range(n):
+        store.put(_record(i, now))
+        if i % 50_000 == 0:
+            await store.sync()
+    await store.sync()
+    if snapshot:
+        await store.compact()
+    await store.close()
+    return {"write_s": round(time.perf_counter() - t0, 2), "bytes": sum(p.stat().st_size for p in path.iterdir())}
+
+
+async def _noop(_task: models_pb.Task) -> None:
+    pass
+
+
+def _recover(path: Path) -> dict:
+    t0 = time.perf_counter()
+    engine = SchedulerEngine(_noop, store=TaskStore(path))
+    n = engine.recover()
+    return {"tasks": n, "recover_s": round(time.perf_counter() - t0, 3)}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    root = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="taskstore-bench-"))
+    report: dict = {"group_commit": []}
+    try:
+        for writers in args.writers:
+            d = root / f"writes-{writers}"
+            report["group_commit"].append(await _writes(d, writers, args.seconds, args.commit_interval_ms / 1000))
+            shutil.rmtree(d, ignore_errors=True)
+
+        for mode, snapshot in (("snapshot", True), ("wal_only", False)):
+            d = root / f"recovery-{mode}"
+            populate = await _populate(d, args.tasks, snapshot)
+            report[f"recovery_{mode}"] = {**populate, **_recover(d)}
+            shutil.rmtree(d, ignore_errors=True)
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scheduler task store benchmark")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--commit-interval-ms", type=float, default=2.0)
+    parser.add_argument("--dir", help="directory on the disk under test (default: a temp dir)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
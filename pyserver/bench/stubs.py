@@ -0,0 +1,236 @@
+# bench/stubs.py
+"""In-process stand-ins for Ollama, the scheduler and the TTS engine used by the benchmarks."""
+from __future__ import annotations
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2 as sched_pb
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+from google.protobuf.json_format import MessageToDict
+
+from pyserver.server.server import PythonWorkerService, TTSQueue
+
+APOLOGY = json.dumps({"speak": {"text": "Sorry, I didn’t catch that."}})
+
+
+# ---------------------------
+# Ollama
+# ---------------------------
+
+# (model, messages) -> assistant content
+Responder = Callable[[str, List[dict]], str]
+
+
+class StubOllama:
+    """
+    Minimal Ollama HTTP API (POST /api/chat, non-streaming) on a background thread.
+    `latency` maps a model name to simulated inference seconds and `load` to the seconds
+    the first request for a model spends loading it (one load at a time, like Ollama).
+    With `parallel`, at most that many requests are "inferring" at once and the rest wait
+    their turn, like Ollama with OLLAMA_NUM_PARALLEL (requests whose client gave up are
+    still processed).
+    """
+
+    def __init__(
+        self,
+        responder: Responder,
+        latency: Callable[[str], float] = lambda _m: 0.0,
+        parallel: Optional[int] = None,
+        load: Callable[[str], float] = lambda _m: 0.0,
+    ) -> None:
+        self.responder = responder
+        self.latency = latency
+        self.load = load
+        self.loaded: set = set()
+        self._loading = threading.Lock()
+        self._slots = threading.Semaphore(parallel) if parallel else None
+        self.requests: List[dict] = []
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        assert self._httpd is not None
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> "StubOllama":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub.requests.append(body)
+                model = body.get("model", "")
+                with stub._loading:
+                    if model not in stub.loaded:
+                        time.sleep(stub.load(model))
+                        stub.loaded.add(model)
+                delay = stub.latency(model) if self.path == "/api/chat" else 0.0
+                if stub._slots is not None:
+                    with stub._slots:
+                        time.sleep(delay)
+                elif delay > 0:
+                    time.sleep(delay)
+                if self.path == "/api/chat":
+                    content = stub.responder(model, body.get("messages", []))
+                    reply = {"model": model, "created_at": "1970-01-01T00:00:00Z", "done": True,
+                             "message": {"role": "assistant", "content": content}}
+                else:  # /api/generate (keep_alive preloads)
+                    reply = {"model": model, "created_at": "1970-01-01T00:00:00Z", "done": True, "response": ""}
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_args) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+def table_responder(replies: Dict[str, str], default: str = APOLOGY) -> Responder:
+    """Answer by exact (stripped, lower-cased) match on the last user message."""
+    norm = {k.strip().lower(): v for k, v in replies.items()}
+
+    def respond(_model: str, messages: List[dict]) -> str:
+        user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        return norm.get(user.strip().lower(), default)
+
+    return respond
+
+
+# ---------------------------
+# TTS engine
+# ---------------------------
+
+class FakeTTSEngine:
+    """pyttsx3-compatible engine that 'speaks' for a fixed time per character."""
+
+    def __init__(self, seconds_per_char: float = 0.0) -> None:
+        self.seconds_per_char = seconds_per_char
+        self.spoken: List[tuple[float, str]] = []
+        self._props: Dict[str, object] = {"voices": []}
+        self._pending: List[str] = []
+
+    def setProperty(self, name: str, value) -> None:  # noqa: N802 (pyttsx3 API)
+        self._props[name] = value
+
+    def getProperty(self, name: str):  # noqa: N802
+        return self._props.get(name)
+
+    def say(self, text: str) -> None:
+        self._pending.append(text)
+
+    def runAndWait(self) -> None:  # noqa: N802
+        for text in self._pending:
+            if self.seconds_per_char:
+                time.sleep(self.seconds_per_char * len(text))
+            self.spoken.append((time.perf_counter(), text))
+        self._pending.clear()
+
+
+# ---------------------------
+# Scheduler
+# ---------------------------
+
+@dataclass
+class ScheduledCall:
+    received: float
+    tool: str
+    args: dict
+    delay_s: Optional[float]
+    dispatched: Optional[float] = None
+
+
+class StubScheduler(sched_rpc.SchedulerServiceServicer):
+    """
+    Records every ScheduleTask. Tasks due now are forwarded to the worker with RunTask
+    before the RPC returns; anything with a positive delay is only recorded.
+    """
+
+    def __init__(self, worker_addr: str) -> None:
+        self.worker_addr = worker_addr
+        self.calls: List[ScheduledCall] = []
+        self._ids = itertools.count(1)
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._worker: Optional[rpc.PythonWorkerServiceStub] = None
+
+    async def ScheduleTask(self, request: sched_pb.ScheduleTaskRequest, context) -> sched_pb.ScheduleTaskResponse:
+        call = request.task.call
+        which = call.WhichOneof("payload") or ""
+        trig = request.trigger
+        delay = trig.delay.ToTimedelta().total_seconds() if trig.HasField("delay") else None
+        args = MessageToDict(getattr(call, which), preserving_proto_field_name=True) if which else {}
+        rec = ScheduledCall(time.perf_counter(), which, args, delay)
+        self.calls.append(rec)
+        if not delay:
+            if self._worker is None:
+                self._channel = grpc.aio.insecure_channel(self.worker_addr)
+                self._worker = rpc.PythonWorkerServiceStub(self._channel)
+            await self._worker.RunTask(pb.RunTaskRequest(call=call))
+            rec.dispatched = time.perf_counter()
+        return sched_pb.ScheduleTaskResponse(task_id=f"stub-{next(self._ids)}")
+
+    async def close(self) -> None:
+        if self._channel is not None:
+            await self._channel.close()
+
+
+# ---------------------------
+# Servers
+# ---------------------------
+
+@dataclass
+class Loopback:
+    """Worker + stub scheduler gRPC servers on ephemeral loopback ports."""
+    tts: TTSQueue
+    engine: FakeTTSEngine
+    scheduler: StubScheduler
+    scheduler_addr: str
+    worker_addr: str
+    _servers: List[grpc.aio.Server]
+
+    @classmethod
+    async def start(cls, seconds_per_char: float = 0.0) -> "Loopback":
+        engine = FakeTTSEngine(seconds_per_char)
+        tts = TTSQueue(engine=engine)
+        await tts.start()
+
+        worker_srv = grpc.aio.server()
+        rpc.add_PythonWorkerServiceServicer_to_server(PythonWorkerService(tts), worker_srv)
+        worker_addr = f"127.0.0.1:{worker_srv.add_insecure_port('127.0.0.1:0')}"
+        await worker_srv.start()
+
+        scheduler = StubScheduler(worker_addr)
+        sched_srv = grpc.aio.server()
+        sched_rpc.add_SchedulerServiceServicer_to_server(scheduler, sched_srv)
+        scheduler_addr = f"127.0.0.1:{sched_srv.add_insecure_port('127.0.0.1:0')}"
+        await sched_srv.start()
+        return cls(tts, engine, scheduler, scheduler_addr, worker_addr, [sched_srv, worker_srv])
+
+    async def stop(self) -> None:
+        await self.scheduler.close()
+        for srv in self._servers:
+            await srv.stop(grace=None)
+        await self.tts.stop()
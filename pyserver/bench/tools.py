@@ -0,0 +1,94 @@
+# bench/tools.py
+"""
+Tool dispatch overhead against the number of registered tools: ToolRegistry lookup plus
+dispatch, compared with an if/elif chain over tool names (how RunTask used to route).
+Handlers are no-ops, so the numbers are pure routing cost per call.
+
+    python -m pyserver.bench.tools --sizes 3,30,100,300,1000
+
+tests/test_tools.py asserts that registry dispatch stays flat as the catalog grows.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Callable, List, Optional
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.tools.registry import ToolContext, ToolRegistry, ToolSpec
+
+
+async def _noop(_args, _ctx) -> None:
+    return None
+
+
+def _registry(n: int) -> ToolRegistry:
+    reg = ToolRegistry()
+    for i in range(n):
+        reg.register(ToolSpec(f"tool_{i}", "pyserver.llm.models:SpeakArgsModel", _noop, proto_type=models_pb.SpeakArgs))
+    return reg
+
+
+def _chain(n: int) -> Callable:
+    lines = ["async def dispatch(name, args, ctx):"]
+    for i in range(n):
+        lines.append(f"    {'if' if i == 0 else 'elif'} name == 'tool_{i}':\n        return await handler(args, ctx)")
+    lines.append("    raise ValueError(name)")
+    scope = {"handler": _noop}
+    exec("\n".join(lines), scope)
+    return scope["dispatch"]
+
+
+async def _per_call_ns(fn: Callable, names: List[str], args, ctx, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for name in names:
+            await fn(name, args, ctx)
+        best = min(best, (time.perf_counter_ns() - t0) / len(names))
+    return round(best, 1)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    msg = models_pb.SpeakArgs(text="hi")
+    ctx = ToolContext(tts=None)
+    out = {}
+    for n in [int(x) for x in args.sizes.split(",")]:
+        reg, chain = _registry(n), _chain(n)
+        spread = [f"tool_{rng.randrange(n)}" for _ in range(args.calls)]
+        last = [f"tool_{n - 1}"] * args.calls
+
+        async def registry(name, a, c, _get=reg.get, _dispatch=reg.dispatch):
+            return await _dispatch(_get(name), a, c)
+
+        out[str(n)] = {
+            "registry_ns": await _per_call_ns(registry, spread, msg, ctx, args.repeats),
+            "registry_last_ns": await _per_call_ns(registry, last, msg, ctx, args.repeats),
+            "if_chain_ns": await _per_call_ns(chain, spread, msg, ctx, args.repeats),
+            "if_chain_last_ns": await _per_call_ns(chain, last, msg, ctx, args.repeats),
+        }
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tool registry dispatch microbenchmark")
+    parser.add_argument("--sizes", default="3,30,100,300,1000")
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report: dict = {"per_call": asyncio.run(run(args))}
+    sizes = list(report["per_call"])
+    first, last = report["per_call"][sizes[0]]["registry_ns"], report["per_call"][sizes[-1]]["registry_ns"]
+    report["registry_growth"] = round(last / first, 2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
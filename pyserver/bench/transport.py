@@ -0,0 +1,72 @@
+# bench/transport.py
+"""
+Immediate-task latency: gRPC scheduler round trip vs the in-process LocalSchedulerClient.
+
+    python -m pyserver.bench.transport --n 2000
+
+"scheduled" is the time until schedule_toolcall_now returns (the stub scheduler dispatches
+"now" tasks before replying; the local client returns once the run is started);
+"spoken" additionally waits for the call to reach the fake TTS engine and drain.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import FakeTTSEngine, Loopback
+from pyserver.clients.scheduler.client import SchedulerClient, SchedulerService
+from pyserver.clients.scheduler.local import LocalSchedulerClient
+from pyserver.llm.models import SpeakArgsModel, ToolCallModel
+from pyserver.server.server import PythonWorkerService, TTSQueue
+
+
+async def _measure(sched: SchedulerService, tts: TTSQueue, n: int, warmup: int) -> Dict[str, dict]:
+    call = ToolCallModel(speak=SpeakArgsModel(text="bench"))
+    scheduled: List[float] = []
+    spoken: List[float] = []
+    async with sched:
+        for i in range(warmup + n):
+            t0 = time.perf_counter()
+            await sched.schedule_toolcall_now(call)
+            t1 = time.perf_counter()
+            if isinstance(sched, LocalSchedulerClient):
+                await sched.join()
+            await tts.join()
+            t2 = time.perf_counter()
+            if i >= warmup:
+                scheduled.append(t1 - t0)
+                spoken.append(t2 - t0)
+    return {"scheduled": summarize(scheduled), "spoken": summarize(spoken)}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    lb = await Loopback.start()
+    try:
+        grpc_res = await _measure(SchedulerClient(lb.scheduler_addr), lb.tts, args.n, args.warmup)
+    finally:
+        await lb.stop()
+
+    tts = TTSQueue(engine=FakeTTSEngine())
+    await tts.start()
+    try:
+        local_res = await _measure(LocalSchedulerClient(PythonWorkerService(tts).execute), tts, args.n, args.warmup)
+    finally:
+        await tts.stop()
+
+    speedup = grpc_res["scheduled"]["p50_ms"] / max(local_res["scheduled"]["p50_ms"], 1e-6)
+    return {"n": args.n, "grpc": grpc_res, "local": local_res, "p50_speedup": round(speedup, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Immediate-task latency per scheduler transport")
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# bench/tts.py
+"""
+Neural TTS on CPU: time-to-first-audio and real-time factor, streamed by sentence vs
+synthesized whole.
+
+    python -m pyserver.bench.tts
+    python -m pyserver.bench.tts --model en_US-lessac-medium.onnx   # a real Piper voice
+
+Without --model a small test voice is written to a temp dir: an ONNX graph with the
+Piper I/O contract (input/input_lengths/scales -> output) and cost that grows with the
+phonemes in and the samples out, plus its .onnx.json. Playback goes to a sink that
+blocks for the audio's duration like a sound card, so synthesis of the next sentence
+has to keep up with the one being played (underrun_ms). "whole" is the old behavior:
+nothing plays until the full utterance is synthesized. tests/test_tts.py asserts that
+streaming brings first audio forward and the test voice runs faster than real time.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from pyserver.bench.stats import summarize
+from pyserver.server.tts_onnx import OnnxTTSConfig, OnnxTTSEngine, TTSStats, split_chunks
+
+REPLIES = [
+    "Timer set for ten minutes.",
+    "It is twenty past four. Your next meeting starts at five, and the room has been booked.",
+    "Here is the weather for today. Expect light rain in the morning, clearing by noon. "
+    "Highs around eighteen degrees, with a gentle breeze from the west. "
+    "Tonight will be dry and cool, so you might want a jacket if you head out.",
+    "I found three alarms. One at six thirty, one at seven, and one at seven fifteen on weekdays only. "
+    "Do you want me to remove the earliest one?",
+]
+
+SYMBOLS = list("_^$ abcdefghijklmnopqrstuvwxyz0123456789.,!?;:'-")
+
+
+def make_test_voice(directory: str, dim: int = 192, layers: int = 4, hop: int = 512,
+                    frame: int = 256, expand: int = 16, post_layers: int = 4, sample_rate: int = 22050) -> str:
+    """
+    Write voice.onnx + voice.onnx.json (Piper layout, 'text' phonemes) and return the model
+    path. `hop` samples per phoneme id (~15 characters per second of speech); the decoder's
+    per-sample cost (frame x expand MLPs) is what sets the real-time factor.
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+
+    def weight(name: str, *shape: int) -> onnx.TensorProto:
+        return numpy_helper.from_array((rng.standard_normal(shape) / np.sqrt(shape[0])).astype(np.float32), name)
+
+    inits = [weight("embed", len(SYMBOLS), dim), weight("up", dim, hop)]
+    nodes = [helper.make_node("Gather", ["embed", "input"], ["h0"])]
+    for i in range(layers):  # text encoder: cost per phoneme
+        inits.append(weight(f"enc{i}", dim, dim))
+        nodes += [helper.make_node("MatMul", [f"h{i}", f"enc{i}"], [f"m{i}"]),
+                  helper.make_node("Tanh", [f"m{i}"], [f"h{i + 1}"])]
+    inits.append(numpy_helper.from_array(np.asarray([1, -1, frame], dtype=np.int64), "frames_shape"))
+    nodes += [helper.make_node("MatMul", [f"h{layers}", "up"], ["u0"]),  # "duration" upsampling to samples
+              helper.make_node("Reshape", ["u0", "frames_shape"], ["p0"])]
+    for i in range(post_layers):  # decoder: cost per output sample
+        inits += [weight(f"dec{i}a", frame, frame * expand), weight(f"dec{i}b", frame * expand, frame)]
+        nodes += [helper.make_node("MatMul", [f"p{i}", f"dec{i}a"], [f"q{i}"]),
+                  helper.make_node("Relu", [f"q{i}"], [f"r{i}"]),
+                  helper.make_node("MatMul", [f"r{i}", f"dec{i}b"], [f"s{i}"]),
+                  helper.make_node("Tanh", [f"s{i}"], [f"p{i + 1}"])]
+    inits.append(numpy_helper.from_array(np.asarray([1, 1, -1], dtype=np.int64), "out_shape"))
+    inits.append(numpy_helper.from_array(np.asarray([0.1], dtype=np.float32), "gain"))
+    nodes += [helper.make_node("Reshape", [f"p{post_layers}", "out_shape"], ["raw"]),
+              helper.make_node("Mul", ["raw", "gain"], ["output"])]
+    graph = helper.make_graph(
+        nodes, "test_voice",
+        [helper.make_tensor_value_info("input", TensorProto.INT64, [1, "phonemes"]),
+         helper.make_tensor_value_info("input_lengths", TensorProto.INT64, [1]),
+         helper.make_tensor_value_info("scales", TensorProto.FLOAT, [3])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 1, "samples"])],
+        initializer=inits,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.checker.check_model(model)
+    path = os.path.join(directory, "voice.onnx")
+    onnx.save(model, path)
+    config = {
+        "audio": {"sample_rate": sample_rate},
+        "phoneme_type": "text",
+        "num_speakers": 1,
+        "inference": {"noise_scale": 0.667, "length_scale": 1.0, "noise_w": 0.8},
+        "phoneme_id_map": {s: [i] for i, s in enumerate(SYMBOLS)},
+    }
+    with open(f"{path}.json", "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return path
+
+
+class RealtimeSink:
+    """Plays nothing, but blocks for each write's duration, like a sound card's buffer."""
+
+    def __init__(self, speed: float = 1.0) -> None:
+        self._speed = speed
+        self._rate = 1
+        self.written = 0
+
+    def open(self, sample_rate: int) -> None:
+        self._rate = sample_rate
+
+    def write(self, audio: np.ndarray) -> None:
+        self.written += audio.shape[0]
+        time.sleep(audio.shape[0] / self._rate / self._speed)
+
+    def drain(self) -> None:
+        pass
+
+
+def per_reply(engine: OnnxTTSEngine, text: str, repeat: int) -> dict:
+    streamed: List[float] = []
+    whole: List[float] = []
+    underrun = 0.0
+    audio_s = 0.0
+    for _ in range(repeat):
+        before = engine.stats.underrun_s
+        engine.say(text)
+        engine.runAndWait()
+        streamed.append(engine.stats.first_audio_s)
+        underrun += engine.stats.underrun_s - before
+
+        t0 = time.perf_counter()
+        samples = engine.synthesize(text)  # old behavior: all of it before any playback
+        whole.append(time.perf_counter() - t0)
+        audio_s = samples.shape[0] / engine.tables.sample_rate
+    return {
+        "chars": len(text),
+        "chunks": len(split_chunks(text, engine.cfg.max_chunk_chars)),
+        "audio_s": round(audio_s, 2),
+        "first_audio_streamed_ms": summarize(streamed)["p50_ms"],
+        "first_audio_whole_ms": summarize(whole)["p50_ms"],
+        "underrun_ms": round(underrun / repeat * 1e3, 1),
+    }
+
+
+def run(args: argparse.Namespace, model: str) -> dict:
+    t0 = time.perf_counter()
+    engine = OnnxTTSEngine(OnnxTTSConfig(model, threads=args.threads), sink=RealtimeSink(args.playback_speed))
+    load_ms = (time.perf_counter() - t0) * 1e3
+    engine.synthesize(REPLIES[0])  # warm up
+    engine.stats = TTSStats()
+    replies = [per_reply(engine, text, args.repeat) for text in REPLIES]
+    return {
+        "model": os.path.basename(model),
+        "threads": args.threads,
+        "sample_rate": engine.tables.sample_rate,
+        "load_ms": round(load_ms, 1),
+        "rtf": round(engine.stats.rtf, 4),
+        "replies": replies,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ONNX TTS time-to-first-audio and real-time factor")
+    parser.add_argument("--model", help="Piper-style voice (.onnx with .onnx.json); default: generated test voice")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--playback-speed", type=float, default=1.0, help=">1 shortens the simulated playback")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(args, args.model or make_test_voice(tmp))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# bench/wake.py
+"""
+Wake-word benchmark: idle CPU with the energy gate closed, and detection latency on WAV fixtures.
+
+    python -m pyserver.bench.wake --model kws.onnx --positive hey1.wav --positive hey2.wav
+
+Each positive fixture is a clip that ends where the keyword ends (override with --keyword-end).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from pyserver.bench.stats import summarize
+from pyserver.listener.audio import SAMPLE_RATE, WavSource, read_wav
+from pyserver.listener.wake import OnnxWakeDetector, WakeConfig
+
+
+def _noise(seconds: float, dbfs: float = -70.0, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    amp = 32768.0 * 10 ** (dbfs / 20.0)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * amp).astype(np.int16)
+
+
+async def _idle_cpu(cfg: WakeConfig, seconds: float) -> dict:
+    det = OnnxWakeDetector(WavSource(_noise(seconds), realtime=True), cfg)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    try:
+        await det.wait_for_hotword()
+        false_wake = True
+    except EOFError:
+        false_wake = False
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    return {
+        "seconds": round(wall, 2),
+        "cpu_percent": round(100.0 * cpu / wall, 3),
+        "blocks": det.stats.blocks,
+        "gated_blocks": det.stats.gated_blocks,
+        "inferences": det.stats.inferences,
+        "false_wake": false_wake,
+    }
+
+
+async def _latency(cfg: WakeConfig, path: str, keyword_end: float | None, lead_s: float = 1.0) -> float | None:
+    clip = read_wav(path)
+    kw_end = keyword_end if keyword_end is not None else len(clip) / SAMPLE_RATE
+    src = WavSource(np.concatenate((_noise(lead_s), clip, _noise(2.0, seed=1))), realtime=True)
+    det = OnnxWakeDetector(src, cfg)
+    try:
+        await det.wait_for_hotword()
+    except EOFError:
+        return None
+    assert src.started_at is not None
+    return time.perf_counter() - (src.started_at + lead_s + kw_end)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    cfg = WakeConfig(model_path=args.model, threshold=args.threshold, keyword_index=args.keyword_index)
+    report: dict = {"idle": await _idle_cpu(cfg, args.idle_seconds)}
+    latencies, missed = [], []
+    for path in args.positive:
+        lat = await _latency(cfg, path, args.keyword_end)
+        if lat is None:
+            missed.append(path)
+        else:
+            latencies.append(lat)
+    report["detection"] = {"latency": summarize(latencies), "missed": missed, "fixtures": len(args.positive)}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wake-word detector benchmark")
+    parser.add_argument("--model", required=True, help="ONNX keyword-spotting model")
+    parser.add_argument("--positive", action="append", default=[], help="WAV clip ending with the keyword")
+    parser.add_argument("--keyword-end", type=float, default=None, help="keyword end offset in each clip (s)")
+    parser.add_argument("--idle-seconds", type=float, default=10.0)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--keyword-index", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
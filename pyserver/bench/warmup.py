@@ -0,0 +1,142 @@
+# bench/warmup.py
+"""
+First-request latency against steady state, with and without the warmup phase.
+
+    python -m pyserver.bench.warmup --requests 20 --load-ms 1500
+
+Three components, each started fresh per mode, then given `--requests` identical
+requests one after another ("first" is request 1, "steady" the p50 of the rest):
+
+  llm  PlannerRouter against a stub Ollama whose first request per model loads it for
+       --load-ms (the 1-10 s a real model load takes, scaled down); warm = router.warm()
+  tts  TTSQueue + PythonWorkerService on the bench's ONNX test voice (real onnxruntime
+       first-run cost) behind the worker's readiness gate; latency is RunTask until the
+       queue has spoken it (playback sped up, so mostly synthesis); warm = serve's
+       _report_ready, which flips health to SERVING
+  asr  BatchingASR on the synthetic Whisper decoder; warm = asr.warm()
+
+tests/test_warmup.py asserts that after warmup each first request is within 1.5x
+(+5 ms) of its steady state; this reports the numbers for both modes.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from grpc_health.v1 import health, health_pb2
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+
+from pyserver.bench.asr import SyntheticWhisper
+from pyserver.bench.stats import summarize
+from pyserver.bench.stubs import StubOllama
+from pyserver.bench.tts import RealtimeSink, make_test_voice
+from pyserver.listener.asr import BatchConfig, BatchingASR
+from pyserver.listener.audio import SAMPLE_RATE
+from pyserver.llm.router import PlannerRouter, RouterConfig
+from pyserver.server.serve import _SERVICES, _report_ready
+from pyserver.server.server import PythonWorkerService, TTSQueue
+from pyserver.server.tts_onnx import OnnxTTSConfig, OnnxTTSEngine
+
+REPLY = json.dumps({"timer": {"minutes": 5}, "confidence": 0.9})
+
+
+def _summary(latency: List[float], ready_s: float) -> dict:
+    steady = summarize(latency[1:])
+    return {"ready_ms": round(ready_s * 1e3, 1), "first_ms": round(latency[0] * 1e3, 3),
+            "steady_p50_ms": steady["p50_ms"], "steady_p95_ms": steady["p95_ms"]}
+
+
+async def _measure(n: int, one: Callable[[], Awaitable[None]]) -> List[float]:
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await one()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+async def llm(args: argparse.Namespace, warm: bool) -> dict:
+    stub = StubOllama(lambda _m, _msgs: REPLY, latency=lambda _m: args.infer_ms / 1000.0,
+                      load=lambda _m: args.load_ms / 1000.0).start()
+    try:
+        router = PlannerRouter(RouterConfig(host=stub.host, timeout_s=30.0))
+        t0 = time.perf_counter()
+        if warm:
+            await router.warm()
+        ready = time.perf_counter() - t0
+        latency = await _measure(args.requests, lambda: router.plan("set a timer for five minutes"))
+    finally:
+        stub.stop()
+    return _summary(latency, ready)
+
+
+async def tts(args: argparse.Namespace, warm: bool, voice: str) -> dict:
+    sink = RealtimeSink(speed=1000.0)  # playback itself is not the point
+    t0 = time.perf_counter()
+    queue = TTSQueue(engine_factory=lambda: OnnxTTSEngine(OnnxTTSConfig(voice), sink=sink))
+    worker = PythonWorkerService(queue)
+    await queue.start()
+    health_servicer = health.HealthServicer(experimental_non_blocking=True, experimental_thread_pool=None)
+    if warm:
+        await _report_ready(queue, worker, health_servicer, t0)
+        status = health_servicer.Check(health_pb2.HealthCheckRequest(service=_SERVICES[-1]), None).status
+        assert status == health_pb2.HealthCheckResponse.SERVING, status  # what a health probe now sees
+    ready = time.perf_counter() - t0
+
+    call = models_pb.ToolCall(speak=models_pb.SpeakArgs(text="It is twenty past four. Your next meeting starts at five."))
+
+    async def one() -> None:
+        await worker.execute(call)
+        await queue.join()
+
+    try:
+        latency = await _measure(args.requests, one)
+    finally:
+        await queue.stop()
+        worker.close()
+    return _summary(latency, ready)
+
+
+async def asr(args: argparse.Namespace, warm: bool) -> dict:
+    t0 = time.perf_counter()
+    batching = BatchingASR(SyntheticWhisper(), BatchConfig(window_ms=0))
+    if warm:
+        await batching.warm()
+    ready = time.perf_counter() - t0
+    pcm = (np.random.default_rng(0).standard_normal(2 * SAMPLE_RATE) * 3000).astype(np.int16).tobytes()
+    try:
+        latency = await _measure(args.requests, lambda: batching.transcribe([pcm]))
+    finally:
+        await batching.aclose()
+    return _summary(latency, ready)
+
+
+async def run(args: argparse.Namespace, voice: str) -> Dict[str, dict]:
+    report: Dict[str, dict] = {}
+    for name, fn in (("llm", lambda w: llm(args, w)), ("tts", lambda w: tts(args, w, voice)), ("asr", lambda w: asr(args, w))):
+        report[name] = {"cold": await fn(False), "warm": await fn(True)}
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warmup: first-request vs steady-state latency")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--load-ms", type=float, default=1500.0, help="stub Ollama model load time")
+    parser.add_argument("--infer-ms", type=float, default=40.0, help="stub Ollama per-request inference time")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = asyncio.run(run(args, make_test_voice(tmp)))
+    print(json.dumps({"components": report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# bench/watch.py
+"""
+Reading task state: polling ListTasks against the WatchTasks-fed TaskMirror.
+
+    python -m pyserver.bench.watch --tasks 1000 --seconds 5
+
+A loopback SchedulerService holds --tasks pending tasks while a writer schedules short
+timers (most fire during the run) and cancels others at --writes-per-s. A reader asks
+"what timers do I have?" at --reads-per-s in three ways:
+
+  poll        every read is a ListTasks round trip (always fresh, one RPC per read)
+  poll-cache  a poller refreshes a local list every --poll-s; reads hit memory (stale)
+  mirror      SchedulerClient(mirror=True): reads hit memory, WatchTasks keeps it current
+
+Reported: read latency, RPCs the server handled, stream messages, and staleness (from a
+ScheduleTask returning until the reader's view contains the task). Then the server is
+restarted while the writer keeps going, and the resync is reported. tests/test_watch.py
+asserts the mirror resumes from its seq (changes only, no second snapshot) and ends up
+identical to the engine.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Set
+
+import grpc
+from google.protobuf.duration_pb2 import Duration
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2 as sched_pb
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+
+from pyserver.bench.listing import _populate
+from pyserver.bench.stats import summarize
+from pyserver.clients.scheduler.client import SchedulerClient
+from pyserver.scheduler.engine import SchedulerEngine
+from pyserver.scheduler.service import SchedulerService
+
+MODES = ("poll", "poll-cache", "mirror")
+_TIMER = models_pb.ToolCall(timer=models_pb.TimerArgs(minutes=1, label="bench"))
+
+
+class _CountCalls(grpc.aio.ServerInterceptor):
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+
+    async def intercept_service(self, continuation, details):
+        self.calls[details.method.rsplit("/", 1)[-1]] += 1
+        return await continuation(details)
+
+
+class _Server:
+    def __init__(self, engine: SchedulerEngine) -> None:
+        self.service = SchedulerService(engine)
+        self.counter = _CountCalls()
+        self.port = 0
+        self._server: Optional[grpc.aio.Server] = None
+
+    async def start(self) -> None:
+        self._server = grpc.aio.server(interceptors=[self.counter])
+        sched_rpc.add_SchedulerServiceServicer_to_server(self.service, self._server)
+        self.port = self._server.add_insecure_port(f"127.0.0.1:{self.port}")
+        await self._server.start()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await self._server.stop(grace=None)
+            self._server = None
+
+
+async def _noop(_task: models_pb.Task) -> None:
+    pass
+
+
+async def _writer(client: SchedulerClient, engine: SchedulerEngine, args: argparse.Namespace, stop: float,
+                  visible: Callable[[str], bool], lag: List[float]) -> int:
+    """Schedule short timers / cancel tasks; time how long each new timer takes to show up for the reader."""
+    rng = random.Random(args.seed)
+    ours: List[str] = []
+    probes: List[asyncio.Task] = []
+    n = 0
+
+    async def probe(task_id: str) -> None:
+        t0 = time.perf_counter()
+        while not visible(task_id) and time.perf_counter() - t0 < 5.0 and engine.get(task_id):
+            await asyncio.sleep(0.0005)
+        if engine.get(task_id):  # fired or cancelled first: no sample
+            lag.append(time.perf_counter() - t0)
+
+    while time.perf_counter() < stop:
+        await asyncio.sleep(rng.expovariate(args.writes_per_s))
+        if ours and rng.random() < 0.3:
+            await client.cancel(ours.pop(rng.randrange(len(ours))))
+        else:
+            resp = await client.schedule(_TIMER, delay_s=rng.uniform(0.2, 3.0))  # most fire within the run
+            ours.append(resp.task_id)
+            probes.append(asyncio.create_task(probe(resp.task_id)))
+        n += 1
+    await asyncio.gather(*probes)
+    return n
+
+
+async def run_mode(args: argparse.Namespace, mode: str) -> dict:
+    engine = SchedulerEngine(_noop)
+    _populate(engine, args.tasks)
+    await engine.start()
+    server = _Server(engine)
+    await server.start()
+    addr = f"127.0.0.1:{server.port}"
+    writer = SchedulerClient(addr)
+    reader = SchedulerClient(addr, mirror=mode == "mirror")
+    await writer.start()
+    await reader.start()
+    cache: List[sched_pb.TaskSummary] = []
+    cache_ids: Set[str] = set()
+
+    async def refresh() -> None:
+        nonlocal cache, cache_ids
+        while True:
+            cache = await reader.pending_tasks(tools=["timer"])
+            cache_ids = {t.task_id for t in cache}
+            await asyncio.sleep(args.poll_s)
+
+    poller = asyncio.create_task(refresh()) if mode == "poll-cache" else None
+    if reader.mirror is not None:
+        await asyncio.wait_for(reader.mirror.synced.wait(), 30)
+    elif poller is not None:
+        while not cache:
+            await asyncio.sleep(0.01)
+    server.counter.calls.clear()
+
+    async def read() -> List[sched_pb.TaskSummary]:
+        if mode == "poll-cache":
+            return cache
+        return await reader.pending_tasks(tools=["timer"])
+
+    if mode == "mirror":
+        visible = lambda tid: tid in reader.mirror.tasks
+    elif mode == "poll-cache":
+        visible = lambda tid: tid in cache_ids
+    else:
+        visible = lambda _tid: True  # a read is a round trip: it sees everything acknowledged
+
+    latency: List[float] = []
+    lag: List[float] = []
+    stop = time.perf_counter() + args.seconds
+
+    async def reads() -> None:
+        while time.perf_counter() < stop:
+            await asyncio.sleep(1.0 / args.reads_per_s)
+            t0 = time.perf_counter()
+            await read()
+            latency.append(time.perf_counter() - t0)
+
+    writes, _ = await asyncio.gather(_writer(writer, engine, args, stop, visible, lag), reads())
+    calls = dict(server.counter.calls)
+    out = {
+        "reads": len(latency),
+        "writes": writes,
+        "read_latency": summarize(latency),
+        "rpcs": {k: v for k, v in calls.items() if k not in ("ScheduleTask", "CancelTask")},
+        "staleness": summarize(lag) if mode != "poll" else {"p50_ms": 0.0, "max_ms": 0.0},
+    }
+    if reader.mirror is not None:
+        out["stream_messages"] = reader.mirror.stats.events
+        out["resync"] = await _restart(args, engine, server, writer, reader)
+    if poller is not None:
+        poller.cancel()
+        await asyncio.gather(poller, return_exceptions=True)
+    await reader.close()
+    await writer.close()
+    await server.stop()
+    await engine.close()
+    return out
+
+
+async def _restart(args: argparse.Namespace, engine: SchedulerEngine, server: _Server, writer: SchedulerClient,
+                   reader: SchedulerClient) -> dict:
+    """Take the server down, keep changing tasks, bring it back: the mirror must catch up by replay."""
+    mirror = reader.mirror
+    assert mirror is not None
+    events_before = mirror.stats.events
+    await server.stop()
+    rng = random.Random(args.seed + 1)
+    for i in range(args.offline_changes):  # changes the mirror misses while disconnected
+        if i % 3 == 2:
+            engine.cancel(next(iter(engine.tasks())).task_id)
+        else:
+            d = Duration()
+            d.FromSeconds(rng.randrange(600, 86400))
+            engine.schedule(models_pb.Task(call=_TIMER), models_pb.Trigger(delay=d))
+    t0 = time.perf_counter()
+    await server.start()
+    while not (mirror.synced.is_set() and mirror.stats.resumes + mirror.stats.snapshots >= 2):
+        if time.perf_counter() - t0 > 30:
+            raise TimeoutError("mirror did not resync within 30 s")
+        await asyncio.sleep(0.005)
+    resync = time.perf_counter() - t0
+    await asyncio.sleep(0.2)  # let in-flight fires arrive
+    want = {r.task_id: int(r.next_fire * 1e9) for r in engine.tasks()}
+    have = {t.task_id: t.next_fire_time.ToNanoseconds() for t in mirror.tasks.values()}
+    return {
+        "offline_changes": args.offline_changes,
+        "resync_ms": round(resync * 1e3, 1),
+        "events_to_resync": mirror.stats.events - events_before,
+        "resumes": mirror.stats.resumes,
+        "snapshots": mirror.stats.snapshots,
+        "reconnects": mirror.stats.reconnects,
+        "identical": want == have,
+        "pending": len(want),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    return {"tasks": args.tasks, "modes": {mode: await run_mode(args, mode) for mode in MODES}}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="WatchTasks mirror vs ListTasks polling")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--reads-per-s", type=float, default=50.0)
+    parser.add_argument("--writes-per-s", type=float, default=20.0)
+    parser.add_argument("--poll-s", type=float, default=1.0, help="poll-cache refresh interval")
+    parser.add_argument("--offline-changes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# bench/when.py
+"""
+Time expressions -> Trigger: corpus accuracy and parse throughput.
+
+    python -m pyserver.bench.when --corpus data/bench/when.jsonl --iterations 20000
+
+Corpus lines (JSONL):
+    {"text": "remind me tomorrow at 9", "expect": {"at": "2026-03-07T09:00"}}
+    {"text": "...", "expect": {"delay_s": 90}} | {"cron": "0 8 * * 1-5"} | null (no expression)
+with optional "now" (local wall time) and "tz" overriding --now/--tz. Expected `at`
+values are local wall times in that zone. Lines with a "tool" ("speak", "timer",
+"play_sound") check the listener's routing instead (listener.daemon.when_to_run): what
+the tool call is deferred to, null when it runs now despite naming a time.
+
+Throughput is reported for find_when() uncached (every parse from scratch), cached (the
+same utterance again) and for the whole text -> Trigger step, next to corpus accuracy;
+tests/test_when.py asserts every corpus line.
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from pyserver.scheduler.cron import zone
+from pyserver.listener.daemon import when_to_run
+from pyserver.llm.models import Tools
+from pyserver.scheduler.when import find_when
+
+# what the corpus is resolved at, unless a line says otherwise
+NOW = "2026-03-06T10:00"
+TZ = "Europe/London"
+
+
+def local_time(stamp: str, tz: str) -> float:
+    return dt.datetime.fromisoformat(stamp).replace(tzinfo=zone(tz)).timestamp()
+
+
+def actual(text: str, tz: str, now: float, tool: Optional[str] = None) -> Optional[dict]:
+    when = find_when(text) if tool is None else when_to_run(Tools(tool), text)
+    if when is None:
+        return None
+    trig = when.trigger(tz, now)
+    if trig.HasField("recurrence"):
+        return {"cron": trig.recurrence.cron}
+    if trig.WhichOneof("time") == "delay":
+        return {"delay_s": trig.delay.ToNanoseconds() / 1e9}
+    at = dt.datetime.fromtimestamp(trig.at.ToNanoseconds() / 1e9, zone(tz))
+    return {"at": at.strftime("%Y-%m-%dT%H:%M")}
+
+
+def accuracy(lines: List[dict], args: argparse.Namespace) -> dict:
+    mismatches = []
+    for obj in lines:
+        tz = obj.get("tz", args.tz)
+        got = actual(obj["text"], tz, local_time(obj.get("now", args.now), tz), obj.get("tool"))
+        if got != obj["expect"]:
+            mismatches.append({"text": obj["text"], **({"tool": obj["tool"]} if "tool" in obj else {}),
+                               "expect": obj["expect"], "actual": got})
+    return {"lines": len(lines), "correct": len(lines) - len(mismatches), "mismatches": mismatches}
+
+
+def _rate(fn, texts: List[str], iterations: int) -> dict:
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        fn(texts[i % len(texts)])
+    elapsed = time.perf_counter() - t0
+    return {"per_s": round(iterations / elapsed), "us_per_parse": round(elapsed / iterations * 1e6, 2)}
+
+
+def throughput(texts: List[str], args: argparse.Namespace) -> dict:
+    now = local_time(args.now, args.tz)
+
+    def to_trigger(text: str) -> None:
+        when = find_when(text)
+        if when is not None:
+            when.trigger(args.tz, now)
+
+    uncached = find_when.__wrapped__
+    find_when.cache_clear()
+    return {
+        "uncached": _rate(uncached, texts, args.iterations),
+        "cached": _rate(find_when, texts, args.iterations),
+        "text_to_trigger": _rate(to_trigger, texts, args.iterations),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Temporal expression parser: accuracy and throughput")
+    parser.add_argument("--corpus", default="data/bench/when.jsonl")
+    parser.add_argument("--now", default=NOW, help="local wall time the corpus is resolved at")
+    parser.add_argument("--tz", default=TZ)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+    lines = [json.loads(l) for l in Path(args.corpus).read_text().splitlines() if l.strip()]
+    report = {"accuracy": accuracy(lines, args), "throughput": throughput([l["text"] for l in lines], args)}
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
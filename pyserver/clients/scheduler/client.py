@@ -1,6 +1,7 @@
 # listener/daemon.py
 from __future__ import annotations
-from typing import Optional
+from typing import AsyncIterator, Iterable, List, Optional, Protocol
+import itertools
 import re
 
 import grpc
@@ -9,15 +10,73 @@ from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
 from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2 as sched_pb          
 from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2_grpc as sched_rpc    
 from google.protobuf.duration_pb2 import Duration
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from pyserver.clients.scheduler.mirror import TaskMirror
+from pyserver.llm.models import TaskModel, ToolCallModel
+from pyserver.scheduler.engine import TIMEZONE_META_KEY
+
+class SchedulerService(Protocol):
+    """What the listener needs from a scheduler transport (gRPC or in-process)."""
+
+    async def __aenter__(self) -> "SchedulerService": ...
+    async def __aexit__(self, *_) -> None: ...
+    async def start(self) -> None: ...
+    async def close(self) -> None: ...
+    async def schedule_toolcall_now(self, call: ToolCallModel, *, timezone: Optional[str] = None) -> sched_pb.ScheduleTaskResponse: ...
+    async def schedule_timer(self, toolcall: ToolCallModel, minutes: int) -> sched_pb.ScheduleTaskResponse: ...
+    async def schedule(self, call: models_pb.ToolCall, *, delay_s: float = 0.0, trigger: Optional[models_pb.Trigger] = None,
+                       priority: int = models_pb.PRIORITY_NORMAL, timezone: Optional[str] = None) -> sched_pb.ScheduleTaskResponse: ...
+
+
+_TOOL_FLAGS = {"speak": "include_speak", "timer": "include_timer", "play_sound": "include_play_sound"}
+
+
+def list_request(
+    *,
+    limit: int = 0,
+    page_token: str = "",
+    tools: Iterable[str] = (),
+    priorities: Iterable[int] = (),
+    not_before: Optional[float] = None,
+) -> sched_pb.ListTasksRequest:
+    """Build a ListTasksRequest from tool names ("speak", "timer", ...) and an epoch not_before."""
+    req = sched_pb.ListTasksRequest(limit=limit, page_token=page_token, priorities=list(priorities))
+    for tool in tools:
+        if tool not in _TOOL_FLAGS:
+            raise ValueError(f"unknown tool filter {tool!r}")
+        setattr(req, _TOOL_FLAGS[tool], True)
+    if not_before is not None:
+        ts = Timestamp(); ts.FromNanoseconds(int(not_before * 1e9))
+        req.not_before.CopyFrom(ts)
+    return req
 
-from llm.models import TaskModel, ToolCallModel
 
 class SchedulerClient:
-    def __init__(self, addr: str, secure: bool = False):
+    """
+    SchedulerService over gRPC. With pool_size > 1 calls round-robin over that many
+    channels (separate HTTP/2 connections), for processes such as ListenerHub that issue
+    many concurrent calls through one client. With mirror=True a TaskMirror follows
+    WatchTasks from start() on and pending_tasks() reads from it.
+    """
+
+    def __init__(self, addr: str, secure: bool = False, timezone: Optional[str] = None, pool_size: int = 1,
+                 mirror: bool = False):
         self._addr = addr
         self._secure = secure
-        self._ch: Optional[grpc.aio.Channel] = None
-        self._stub: Optional[sched_rpc.SchedulerServiceStub] = None
+        self._timezone = timezone
+        self._pool_size = max(1, pool_size)
+        self._channels: List[grpc.aio.Channel] = []
+        self._stubs: List[sched_rpc.SchedulerServiceStub] = []
+        self._rr = itertools.count()
+        self._mirror = mirror
+        self.mirror: Optional[TaskMirror] = None
+
+    def _next_stub(self) -> sched_rpc.SchedulerServiceStub:
+        """The next channel's stub, round-robin; take it once per RPC."""
+        if not self._stubs:
+            raise RuntimeError("SchedulerClient not started; call start() first")
+        return self._stubs[next(self._rr) % len(self._stubs)]
 
     async def __aenter__(self) -> "SchedulerClient":
         await self.start(); return self
@@ -25,19 +84,28 @@ class SchedulerClient:
     async def __aexit__(self, *_): await self.close()
 
     async def start(self):
-        if self._ch is None:
-            self._ch = grpc.aio.secure_channel(self._addr, grpc.local_channel_credentials()) if self._secure \
-                       else grpc.aio.insecure_channel(self._addr)
-            self._stub = sched_rpc.SchedulerServiceStub(self._ch)
+        if not self._channels:
+            for i in range(self._pool_size):
+                # distinct channel args keep gRPC from sharing one subchannel across the pool
+                opts = [("grpc.channel_pool_index", i)]
+                ch = grpc.aio.secure_channel(self._addr, grpc.local_channel_credentials(), options=opts) if self._secure \
+                     else grpc.aio.insecure_channel(self._addr, options=opts)
+                self._channels.append(ch)
+                self._stubs.append(sched_rpc.SchedulerServiceStub(ch))
+            if self._mirror:
+                self.mirror = TaskMirror(self._stubs[0])
+                await self.mirror.start()
 
     async def close(self):
-        if self._ch:
-            await self._ch.close()
-            self._ch = None
-            self._stub = None
+        if self.mirror is not None:
+            await self.mirror.close()
+            self.mirror = None
+        channels, self._channels, self._stubs = self._channels, [], []
+        for ch in channels:
+            await ch.close()
 
     async def schedule_toolcall_now(self, call: ToolCallModel, *, timezone: Optional[str] = None) -> sched_pb.ScheduleTaskResponse:
-        assert self._stub is not None
+        stub = self._next_stub()
         # Build Task
         task = models_pb.Task()
         task.call.CopyFrom(call.to_proto())
@@ -50,12 +118,12 @@ class SchedulerClient:
         trig.delay.CopyFrom(d)
 
         req = sched_pb.ScheduleTaskRequest(task=task, trigger=trig)
-        return await self._stub.ScheduleTask(req)
+        return await stub.ScheduleTask(req)
 
 
     async def schedule_timer(self, toolcall: ToolCallModel, minutes: int) -> sched_pb.ScheduleTaskResponse:
         """Schedule a timer toolcall to fire after N minutes."""
-        assert self._stub is not None
+        stub = self._next_stub()
         task_model = TaskModel(call=toolcall)
         task_pb = task_model.to_proto()
 
@@ -68,5 +136,64 @@ class SchedulerClient:
         trig.delay.CopyFrom(d)
 
         req = sched_pb.ScheduleTaskRequest(task=task, trigger=trig)
-        assert self._stub is not None
-        return await self._stub.ScheduleTask(req)
\ No newline at end of file
+        return await stub.ScheduleTask(req)
+
+    async def schedule(
+        self,
+        call: models_pb.ToolCall,
+        *,
+        delay_s: float = 0.0,
+        trigger: Optional[models_pb.Trigger] = None,
+        priority: int = models_pb.PRIORITY_NORMAL,
+        timezone: Optional[str] = None,
+    ) -> sched_pb.ScheduleTaskResponse:
+        """
+        Same shape as LocalSchedulerClient.schedule: a tool call after delay_s, or on `trigger`
+        (recurrences are evaluated in `timezone`, else the client's, else the scheduler's).
+        """
+        stub = self._next_stub()
+        if trigger is None:
+            d = Duration(); d.FromNanoseconds(int(max(0.0, delay_s) * 1e9))
+            trigger = models_pb.Trigger(delay=d)
+        task = models_pb.Task(call=call, priority=priority)
+        if timezone or self._timezone:
+            task.meta[TIMEZONE_META_KEY] = timezone or self._timezone
+        return await stub.ScheduleTask(sched_pb.ScheduleTaskRequest(task=task, trigger=trigger))
+
+    async def cancel(self, task_id: str) -> bool:
+        return (await self._next_stub().CancelTask(sched_pb.CancelTaskRequest(task_id=task_id))).canceled
+
+    async def iter_tasks(self, *, page_size: int = 500, **filters) -> AsyncIterator[sched_pb.TaskSummary]:
+        """Page through ListTasks lazily; filters as in list_request()."""
+        token = ""
+        while True:
+            resp = await self._next_stub().ListTasks(list_request(limit=page_size, page_token=token, **filters))
+            for t in resp.tasks:
+                yield t
+            token = resp.next_page_token
+            if not token:
+                return
+
+    async def pending_tasks(self, *, limit: int = 0, **filters) -> List[sched_pb.TaskSummary]:
+        """
+        Pending tasks in fire order, filters as in list_request(). Served from the mirror
+        while it is in sync; otherwise (no mirror, reconnecting, old server) from ListTasks.
+        """
+        if self.mirror is not None and self.mirror.synced.is_set():
+            return self.mirror.list(limit=limit, **filters)
+        out: List[sched_pb.TaskSummary] = []
+        async for t in self.iter_tasks(page_size=limit or 500, **filters):
+            out.append(t)
+            if limit and len(out) >= limit:
+                break
+        return out
+
+    async def stream_tasks(self, *, limit: int = 0, **filters) -> AsyncIterator[sched_pb.TaskSummary]:
+        """Same as iter_tasks over one StreamTasks call; gRPC flow control bounds buffering."""
+        call = self._next_stub().StreamTasks(list_request(limit=limit, **filters))
+        try:
+            async for page in call:
+                for t in page.tasks:
+                    yield t
+        finally:
+            call.cancel()
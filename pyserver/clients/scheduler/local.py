@@ -0,0 +1,108 @@
+# clients/scheduler/local.py
+from __future__ import annotations
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional, Set
+
+from google.protobuf.duration_pb2 import Duration
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+from protobufs.gen.py.protobufs.apis.services import pyserver_api_pb2 as pb
+from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2 as sched_pb
+
+from pyserver.llm.models import ToolCallModel
+from pyserver.scheduler.engine import TIMEZONE_META_KEY, SchedulerEngine
+
+# PythonWorkerService.execute, or anything with the same shape.
+Dispatch = Callable[[models_pb.ToolCall], Awaitable[pb.RunTaskResponse]]
+
+
+class LocalSchedulerClient:
+    """
+    In-process SchedulerService for single-box deployments.
+
+    Calls due now go straight to the worker's dispatch coroutine (no gRPC, no
+    serialization), started as a task so schedule() returns its task_id without waiting
+    for the tool; delayed calls are timed by an embedded SchedulerEngine.
+    """
+
+    def __init__(self, dispatch: Dispatch, timezone: Optional[str] = None) -> None:
+        self._dispatch = dispatch
+        self._timezone = timezone
+        self._engine = SchedulerEngine(self._run_task, default_timezone=timezone or "UTC")
+        self._running: Set[asyncio.Task] = set()  # fast-path runs; referenced until done
+        self._log = logging.getLogger("LocalScheduler")
+
+    @property
+    def engine(self) -> SchedulerEngine:
+        return self._engine
+
+    async def __aenter__(self) -> "LocalSchedulerClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        await self._engine.start()
+
+    async def close(self) -> None:
+        for t in self._running:
+            t.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+        await self._engine.close()
+
+    async def join(self) -> None:
+        """Wait for the calls started by schedule() on the fast path."""
+        while self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def schedule_toolcall_now(self, call: ToolCallModel, *, timezone: Optional[str] = None) -> sched_pb.ScheduleTaskResponse:
+        return await self.schedule(call.to_proto(), delay_s=0.0, timezone=timezone)
+
+    async def schedule_timer(self, toolcall: ToolCallModel, minutes: int) -> sched_pb.ScheduleTaskResponse:
+        """Schedule a timer toolcall to fire after N minutes."""
+        return await self.schedule(toolcall.to_proto(), delay_s=max(0, minutes * 60))
+
+    async def schedule(
+        self,
+        call: models_pb.ToolCall,
+        *,
+        delay_s: float = 0.0,
+        trigger: Optional[models_pb.Trigger] = None,
+        priority: int = models_pb.PRIORITY_NORMAL,
+        timezone: Optional[str] = None,
+    ) -> sched_pb.ScheduleTaskResponse:
+        task = models_pb.Task(call=call, priority=priority)
+        if timezone or self._timezone:
+            task.meta[TIMEZONE_META_KEY] = timezone or self._timezone
+
+        if trigger is None and delay_s <= 0 and not self._engine.has_due():
+            # Fast path: nothing due ahead of us, start it now.
+            task.task_id = uuid.uuid4().hex
+            resp = sched_pb.ScheduleTaskResponse(task_id=task.task_id)
+            resp.next_fire_time.FromNanoseconds(time.time_ns())
+            run = asyncio.create_task(self._run_task(task), name=f"local:{task.task_id}")
+            self._running.add(run)
+            run.add_done_callback(self._running.discard)
+            return resp
+
+        if trigger is None:
+            d = Duration()
+            d.FromNanoseconds(int(delay_s * 1e9))
+            trigger = models_pb.Trigger(delay=d)
+        rec = self._engine.schedule(task, trigger)
+        resp = sched_pb.ScheduleTaskResponse(task_id=rec.task_id)
+        resp.next_fire_time.FromNanoseconds(int(rec.next_fire * 1e9))
+        return resp
+
+    async def cancel(self, task_id: str) -> bool:
+        return self._engine.cancel(task_id)
+
+    async def _run_task(self, task: models_pb.Task) -> None:
+        resp = await self._dispatch(task.call)
+        if resp.status != pb.RunTaskResponse.STATUS_OK:
+            self._log.warning("Task %s: %s", task.task_id or "-", resp.error_message or pb.RunTaskResponse.Status.Name(resp.status))
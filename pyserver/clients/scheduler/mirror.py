@@ -0,0 +1,184 @@
+# clients/scheduler/mirror.py
+from __future__ import annotations
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional, Tuple
+
+import grpc
+
+from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2 as sched_pb
+from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2_grpc as sched_rpc
+
+from pyserver.scheduler.timers import priority_rank
+
+Event = sched_pb.TaskEvent
+
+
+@dataclass
+class MirrorStats:
+    events: int = 0
+    snapshots: int = 0    # full resyncs (first connect, or the server could not replay)
+    resumes: int = 0      # reconnects answered with only the missed changes
+    reconnects: int = 0
+
+
+# (seconds, nanos, priority rank, task_id): ListTasks order, computed once per task version
+Key = Tuple[int, int, int, str]
+
+
+def _order(t: sched_pb.TaskSummary) -> Key:
+    ts = t.next_fire_time
+    return ts.seconds, ts.nanos, priority_rank(t.priority), t.task_id
+
+
+class TaskMirror:
+    """
+    Local copy of the scheduler's pending tasks, kept current by one WatchTasks stream, so
+    "what timers do I have?" is answered from memory instead of a ListTasks round trip.
+
+    After a disconnect it reconnects with the last (epoch, seq) applied and the server
+    replays only the changes it missed; a full snapshot is built aside and swapped in
+    when complete, so reads keep seeing the previous copy meanwhile. `synced` is set while
+    the stream is up and caught up. Against a server without WatchTasks the mirror stops
+    and `supported` turns False.
+
+    Each task's sort key is computed when it arrives and tasks are bucketed by tool, so a
+    read never touches the protos it does not return; results are memoized until the next
+    change (repeated questions between changes cost a copy of the list).
+    """
+
+    def __init__(self, stub: sched_rpc.SchedulerServiceStub, *, backoff_s: float = 0.1, max_backoff_s: float = 5.0) -> None:
+        self.tasks: Dict[str, sched_pb.TaskSummary] = {}
+        self._keys: Dict[str, Key] = {}
+        self._by_tool: Dict[str, Dict[str, Key]] = {}
+        self._version = 0
+        self._memo: Dict[tuple, List[sched_pb.TaskSummary]] = {}
+        self._memo_version = -1
+        self.epoch = ""
+        self.seq = 0
+        self.synced = asyncio.Event()
+        self.supported = True
+        self.stats = MirrorStats()
+        self._stub = stub
+        self._backoff = backoff_s
+        self._max_backoff = max_backoff_s
+        self._staging: Optional[Dict[str, sched_pb.TaskSummary]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._log = logging.getLogger("TaskMirror")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="task-mirror")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.synced.clear()
+
+    # ---- reads ----
+
+    def get(self, task_id: str) -> Optional[sched_pb.TaskSummary]:
+        return self.tasks.get(task_id)
+
+    def list(
+        self,
+        *,
+        tools: Collection[str] = (),
+        priorities: Collection[int] = (),
+        not_before: Optional[float] = None,
+        limit: int = 0,
+    ) -> List[sched_pb.TaskSummary]:
+        """Pending tasks in fire order, filtered like ListTasks."""
+        memo_key = (frozenset(tools), frozenset(priority_rank(p) for p in priorities), not_before, limit)
+        if self._memo_version != self._version:
+            self._memo.clear()
+            self._memo_version = self._version
+        hit = self._memo.get(memo_key)
+        if hit is None:
+            hit = self._memo[memo_key] = self._select(*memo_key)
+        return list(hit)
+
+    def _select(self, tools: frozenset, prios: frozenset, not_before: Optional[float], limit: int) -> List[sched_pb.TaskSummary]:
+        if tools:
+            keys = [k for tool in tools for k in self._by_tool.get(tool, {}).values()]
+        else:
+            keys = list(self._keys.values())
+        if prios:
+            keys = [k for k in keys if k[2] in prios]
+        if not_before is not None:
+            floor = (int(not_before), int(not_before % 1 * 1e9))
+            keys = [k for k in keys if k[:2] >= floor]
+        keys = heapq.nsmallest(limit, keys) if limit else sorted(keys)
+        return [self.tasks[k[3]] for k in keys]
+
+    # ---- stream ----
+
+    async def _run(self) -> None:
+        delay = self._backoff
+        while True:
+            self._staging = None  # a snapshot cut off mid-way is discarded, not swapped in
+            call = self._stub.WatchTasks(sched_pb.WatchTasksRequest(epoch=self.epoch, since_seq=self.seq))
+            resumed, snapshots = bool(self.epoch), self.stats.snapshots
+            try:
+                async for ev in call:
+                    if self._apply(ev):
+                        delay = self._backoff
+                        if resumed and self.stats.snapshots == snapshots:
+                            self.stats.resumes += 1
+            except grpc.aio.AioRpcError as e:
+                if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    self._log.warning("scheduler has no WatchTasks; reads go to ListTasks")
+                    self.supported = False
+                    return
+                self._log.info("watch interrupted (%s); resuming from seq %d", e.code().name, self.seq)
+            finally:
+                call.cancel()
+            self.synced.clear()
+            self.stats.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_backoff)
+
+    def _apply(self, ev: sched_pb.TaskEvent) -> bool:
+        """Apply one event; True when it completes a (re)sync."""
+        self.stats.events += 1
+        kind = ev.kind
+        if kind == Event.KIND_SNAPSHOT:
+            if ev.reset:
+                self._staging = {}
+                self.stats.snapshots += 1
+            assert self._staging is not None
+            for t in ev.tasks:
+                self._staging[t.task_id] = t
+            return False
+        self.epoch, self.seq = ev.epoch, ev.seq
+        if kind == Event.KIND_SYNCED:
+            if self._staging is not None:
+                self.tasks, self._keys, self._by_tool = {}, {}, {}
+                for t in self._staging.values():
+                    self._put(t)
+                self._staging = None
+                self._version += 1  # an empty snapshot puts nothing, but the memoized reads are stale
+            self.synced.set()
+            return True
+        if kind == Event.KIND_CANCELLED or (kind == Event.KIND_FIRED and ev.done):
+            self._drop(ev.task_id)
+        elif ev.tasks:
+            self._put(ev.tasks[0])
+        return False
+
+    def _put(self, t: sched_pb.TaskSummary) -> None:
+        self._drop(t.task_id)
+        key = self._keys[t.task_id] = _order(t)
+        self.tasks[t.task_id] = t
+        self._by_tool.setdefault(t.tool, {})[t.task_id] = key
+
+    def _drop(self, task_id: str) -> None:
+        self._version += 1
+        t = self.tasks.pop(task_id, None)
+        if t is not None:
+            del self._keys[task_id]
+            del self._by_tool[t.tool][task_id]
@@ -0,0 +1,188 @@
+# diagnostics/admin.py
+"""
+Always-on diagnostics for a service process and a loopback HTTP endpoint to read them.
+
+    GET  /debug/loop                         lag percentiles, stalls with the blocking stack
+    POST /debug/coroutines/start             time tasks created from now on (off by default)
+    POST /debug/coroutines/stop
+    GET  /debug/coroutines?top=20            per-coroutine time on the loop
+    POST /debug/profile/start?hz=100&seconds=30
+    POST /debug/profile/stop                 writes profile-*.folded, returns its path
+
+    curl -s localhost:50090/debug/loop | jq
+    curl -s -XPOST 'localhost:50090/debug/profile/start?seconds=20'
+
+Only the loop watchdog runs by default (about 1% of loop throughput). Per-coroutine
+timing costs up to a quarter of it on a loop of tiny steps, so it is switched on when
+needed, with the endpoint above or from the start (--time-coroutines / DiagnosticsConfig).
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pyserver.diagnostics.loop import LoopConfig, LoopWatchdog
+from pyserver.diagnostics.profiler import SamplingProfiler
+from pyserver.diagnostics.tasks import TaskTimer
+
+
+@dataclass
+class DiagnosticsConfig:
+    loop: LoopConfig = field(default_factory=LoopConfig)
+    coroutines: bool = False         # per-coroutine step timing (task factory) from the start
+    profile_dir: str = "profiles"
+    profile_hz: float = 100.0
+
+
+class Diagnostics:
+    """Loop watchdog, started with the service; coroutine timing and the profiler on demand."""
+
+    def __init__(self, cfg: DiagnosticsConfig = DiagnosticsConfig()) -> None:
+        self.cfg = cfg
+        self.watchdog = LoopWatchdog(cfg.loop)
+        self.tasks = TaskTimer()
+        self.timing = False
+        self.profiler = SamplingProfiler(cfg.profile_dir, cfg.profile_hz)
+
+    def start(self) -> None:
+        """Call from the event loop, before the service creates its long-lived tasks."""
+        self.watchdog.start()
+        if self.cfg.coroutines:
+            self.time_coroutines(True)
+
+    def time_coroutines(self, on: bool) -> None:
+        """Install or remove the timing task factory (from the loop); only tasks created meanwhile are timed."""
+        if on and not self.timing:
+            self.tasks.install()
+        elif not on and self.timing:
+            self.tasks.uninstall()
+        self.timing = on
+
+    def stop(self) -> None:
+        self.watchdog.stop()
+        self.time_coroutines(False)
+        if self.profiler.running:
+            self.profiler.stop()
+
+
+Response = Tuple[int, Dict[str, Any]]
+
+_ORDER = {"busy": "busy_s", "max_step": "max_step_s", "steps": "steps", "tasks": "tasks"}
+
+
+class AdminServer:
+    """Minimal HTTP/1.0 JSON endpoint (stdlib asyncio). Bind it to loopback: it has no auth."""
+
+    def __init__(self, diag: Diagnostics, host: str = "127.0.0.1", port: int = 50090) -> None:
+        self.diag = diag
+        self.host, self.port = host, port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._timed_stop: Optional[asyncio.TimerHandle] = None
+        self._routes: Dict[Tuple[str, str], Callable[[Dict[str, str]], Awaitable[Response]]] = {
+            ("GET", "/debug/loop"): self._loop,
+            ("GET", "/debug/coroutines"): self._coroutines,
+            ("POST", "/debug/coroutines/start"): self._coroutines_start,
+            ("POST", "/debug/coroutines/stop"): self._coroutines_stop,
+            ("POST", "/debug/profile/start"): self._profile_start,
+            ("POST", "/debug/profile/stop"): self._profile_stop,
+        }
+        self._log = logging.getLogger("AdminServer")
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._log.info("diagnostics on http://%s:%d/debug/loop", self.host, self.port)
+
+    async def close(self) -> None:
+        if self._timed_stop is not None:
+            self._timed_stop.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = (await asyncio.wait_for(reader.readline(), 5.0)).decode("latin-1").split()
+            while (await asyncio.wait_for(reader.readline(), 5.0)) not in (b"\r\n", b"\n", b""):
+                pass  # headers: nothing we need
+            if len(line) < 2:
+                return
+            method, target = line[0].upper(), urlsplit(line[1])
+            route = self._routes.get((method, target.path))
+            if route is None:
+                status, body = 404, {"error": f"no route {method} {target.path}"}
+            else:
+                query = {k: v[-1] for k, v in parse_qs(target.query).items()}
+                try:
+                    status, body = await route(query)
+                except (RuntimeError, ValueError) as e:
+                    status, body = 409, {"error": str(e)}
+            payload = json.dumps(body, indent=1).encode()
+            writer.write(f"HTTP/1.0 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _loop(self, _q: Dict[str, str]) -> Response:
+        return 200, self.diag.watchdog.snapshot()
+
+    async def _coroutines(self, q: Dict[str, str]) -> Response:
+        if not self.diag.timing and not self.diag.tasks.stats:
+            raise RuntimeError("coroutine timing is off (POST /debug/coroutines/start)")
+        by = _ORDER.get(q.get("by", "busy"))
+        if by is None:
+            raise ValueError(f"by must be one of {', '.join(_ORDER)}")
+        return 200, self.diag.tasks.top(int(q.get("top", 20)), by)
+
+    async def _coroutines_start(self, q: Dict[str, str]) -> Response:
+        if "reset" in q:
+            self.diag.tasks.reset()
+        self.diag.time_coroutines(True)
+        return 200, {"timing": True}
+
+    async def _coroutines_stop(self, _q: Dict[str, str]) -> Response:
+        self.diag.time_coroutines(False)
+        return 200, {"timing": False}
+
+    async def _profile_start(self, q: Dict[str, str]) -> Response:
+        seconds = float(q["seconds"]) if "seconds" in q else None
+        self.diag.profiler.start(float(q["hz"]) if "hz" in q else None)
+        if seconds:
+            loop = asyncio.get_running_loop()
+            self._timed_stop = loop.call_later(seconds, lambda: loop.create_task(self._profile_stop({})))
+        return 200, {"profiling": True, "hz": self.diag.profiler.hz, "seconds": seconds}
+
+    async def _profile_stop(self, _q: Dict[str, str]) -> Response:
+        if self._timed_stop is not None:
+            self._timed_stop.cancel()
+            self._timed_stop = None
+        if not self.diag.profiler.running:
+            raise RuntimeError("profiler not running")
+        # writing the file is disk I/O: keep it off the loop
+        path, samples = await asyncio.get_running_loop().run_in_executor(None, self.diag.profiler.stop)
+        return 200, {"path": path, "samples": samples}
+
+
+@asynccontextmanager
+async def diagnostics(admin_port: Optional[int] = None, cfg: Optional[DiagnosticsConfig] = None) -> AsyncIterator[Diagnostics]:
+    """Diagnostics for the body of a service's main coroutine, and the admin endpoint if a port is given."""
+    diag = Diagnostics(cfg or DiagnosticsConfig())
+    diag.start()
+    admin: Optional[AdminServer] = None
+    try:
+        if admin_port is not None:
+            admin = AdminServer(diag, port=admin_port)
+            await admin.start()
+        yield diag
+    finally:
+        if admin is not None:
+            await admin.close()
+        diag.stop()
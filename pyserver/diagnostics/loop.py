@@ -0,0 +1,125 @@
+# diagnostics/loop.py
+from __future__ import annotations
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+
+@dataclass
+class LoopConfig:
+    interval_s: float = 0.1    # lag probe period
+    slow_s: float = 0.1        # the loop not answering a probe for this long is a stall
+    window: int = 600          # lag samples kept for percentiles (a minute at the default period)
+    stalls_kept: int = 20
+
+
+@dataclass
+class Stall:
+    started: float             # wall clock
+    duration_s: float
+    task: str                  # the task that was running, if any
+    stack: str                 # where the loop thread was when the stall was detected
+
+
+class LoopWatchdog:
+    """
+    Event-loop lag and stall detector on a daemon thread. Every `interval_s` it schedules a
+    no-op on the loop with call_soon_threadsafe and times how long the loop takes to run it
+    (the lag any callback would see). If it does not run within `slow_s`, the loop thread is
+    stuck in a callback: its current stack is captured from another thread and logged, so
+    blocking calls are caught in the act. Costs one callback per probe on the loop.
+    """
+
+    def __init__(self, cfg: LoopConfig = LoopConfig()) -> None:
+        self.cfg = cfg
+        self.probes = 0
+        self.max_lag_s = 0.0
+        self._lags: Deque[float] = deque(maxlen=cfg.window)
+        self.stalls: Deque[Stall] = deque(maxlen=cfg.stalls_kept)
+        self.stall_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread = 0
+        self._stop = threading.Event()
+        self._pong = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._log = logging.getLogger("LoopWatchdog")
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Watch `loop` (default: the running loop); call from the loop's thread."""
+        if self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pong.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def snapshot(self) -> dict:
+        lags = sorted(self._lags)
+
+        def pct(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))] * 1e3, 3) if lags else 0.0
+
+        return {
+            "probes": self.probes,
+            "lag_ms": {"p50": pct(0.50), "p99": pct(0.99), "max": round(self.max_lag_s * 1e3, 3)},
+            "stalls": self.stall_count,
+            "recent_stalls": [
+                {"at": time.strftime("%H:%M:%S", time.localtime(s.started)), "ms": round(s.duration_s * 1e3, 1),
+                 "task": s.task, "stack": s.stack}
+                for s in self.stalls
+            ],
+        }
+
+    def _watch(self) -> None:
+        loop = self._loop
+        assert loop is not None
+        while not self._stop.is_set():
+            self._pong.clear()
+            sent = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(self._pong.set)
+            except RuntimeError:  # loop closed
+                return
+            if not self._pong.wait(self.cfg.slow_s):
+                self._stalled(loop, sent)
+            lag = time.perf_counter() - sent
+            if self._stop.is_set():
+                return
+            self.probes += 1
+            self._lags.append(lag)
+            self.max_lag_s = max(self.max_lag_s, lag)
+            self._stop.wait(max(0.0, self.cfg.interval_s - lag))
+
+    def _stalled(self, loop: asyncio.AbstractEventLoop, sent: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+        task = asyncio.current_task(loop)
+        name = f"{task.get_name()} ({_coro_name(task.get_coro())})" if task is not None else "<callback>"
+        started = time.time() - (time.perf_counter() - sent)
+        self._pong.wait()  # until the loop runs again
+        duration = time.perf_counter() - sent
+        if self._stop.is_set():
+            return
+        self.stall_count += 1
+        self.stalls.append(Stall(started, duration, name, stack))
+        self._log.warning("event loop blocked for %.0f ms in %s:\n%s", duration * 1e3, name, stack.rstrip())
+
+
+def _coro_name(coro: object) -> str:
+    inner = getattr(coro, "_coro", coro)  # TaskTimer wrapper
+    return getattr(inner, "__qualname__", type(inner).__name__)
+
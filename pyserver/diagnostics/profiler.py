@@ -0,0 +1,100 @@
+# diagnostics/profiler.py
+from __future__ import annotations
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+# Threads of the diagnostics themselves; their stacks are noise in a profile.
+_OWN_THREADS = ("loop-watchdog", "sampling-profiler")
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every thread in the process. A daemon thread reads
+    sys._current_frames() `hz` times a second and counts each thread's stack in collapsed
+    form ("thread;module.func;module.func"), which flamegraph.pl, speedscope and inferno
+    read directly. Costs nothing until started; while running, one stack walk per thread
+    per sample (about 1% of a core at 100 Hz with a dozen threads).
+    """
+
+    def __init__(self, out_dir: str = ".", hz: float = 100.0) -> None:
+        self.out_dir = out_dir
+        self.hz = hz
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("SamplingProfiler")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, hz: Optional[float] = None) -> None:
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("profiler already running")
+            self.hz = hz or self.hz
+            self.samples = 0
+            self._stacks.clear()
+            self._started = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        self._log.info("profiling at %g Hz", self.hz)
+
+    def stop(self) -> Tuple[str, int]:
+        """Stop sampling and write the collapsed stacks; returns (path, samples)."""
+        self.cancel()
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started))
+        path = os.path.join(self.out_dir, f"profile-{stamp}-{os.getpid()}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self._log.info("wrote %d samples to %s", self.samples, path)
+        return path, self.samples
+
+    def cancel(self) -> None:
+        """Stop sampling without writing anything."""
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("profiler not running")
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self) -> None:
+        period = 1.0 / self.hz
+        me = threading.get_ident()
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if ident == me or name in _OWN_THREADS:
+                    continue
+                self._stacks[self._collapse(name, frame)] += 1
+            self.samples += 1
+            next_at += period
+            self._stop.wait(max(0.0, next_at - time.perf_counter()))
+
+    def _collapse(self, thread: str, frame) -> str:
+        parts = []
+        labels = self._labels
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+            parts.append(label)
+            frame = frame.f_back
+        parts.append(thread.replace(";", ":").replace(" ", "_"))
+        return ";".join(reversed(parts))
@@ -0,0 +1,188 @@
+# listener/asr.py
+from __future__ import annotations
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from pyserver.listener.audio import SAMPLE_RATE, AudioFrame, pcm_to_float
+
+
+class BatchDecoder(Protocol):
+    """Blocking, CPU-bound: one result per clip, in order. Runs on the batcher's thread."""
+    def decode(self, audio: Sequence[np.ndarray]) -> List[Tuple[str, float]]: ...
+
+
+def pad_batch(audio: Sequence[np.ndarray], multiple: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-pad float32 clips to a common length -> (batch (B, T), lengths (B,))."""
+    lengths = np.fromiter((len(a) for a in audio), dtype=np.int64, count=len(audio))
+    width = -(-int(lengths.max(initial=0)) // multiple) * multiple
+    out = np.zeros((len(audio), width), dtype=np.float32)
+    for row, a in zip(out, audio):
+        row[:len(a)] = a
+    return out, lengths
+
+
+@dataclass
+class BatchConfig:
+    window_ms: float = 25.0  # how long the oldest request waits for company
+    max_batch: int = 8
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    batches: int = 0
+    largest: int = 0
+    waited_s: float = 0.0   # summed arrival -> dispatch
+    decode_s: float = 0.0   # summed batch decode time
+
+
+@dataclass
+class _Pending:
+    audio: np.ndarray
+    future: asyncio.Future
+    arrived: float
+
+
+class BatchingASR:
+    """
+    ASR in front of a BatchDecoder. Utterances arriving within `window_ms` of the oldest
+    waiting one (or until `max_batch` are waiting) are decoded together in a single call on
+    a dedicated thread, and each caller gets its own result back. While a batch decodes,
+    new requests queue up and go out as the next batch without further waiting, so under
+    load batches grow on their own and the window only costs latency when the decoder is
+    idle. Share one instance between rooms (ListenerHub) to batch across them.
+    """
+
+    def __init__(self, decoder: BatchDecoder, cfg: Optional[BatchConfig] = None, executor: Optional[Executor] = None) -> None:
+        self.cfg = cfg or BatchConfig()
+        if self.cfg.max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.stats = BatchStats()
+        self._decoder = decoder
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr")
+        self._pending: Deque[_Pending] = deque()
+        self._wake = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._log = logging.getLogger("BatchingASR")
+
+    async def transcribe(self, frames: Sequence[AudioFrame]) -> Tuple[str, float]:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._dispatch(), name="asr-batcher")
+        fut = loop.create_future()
+        self._pending.append(_Pending(pcm_to_float(b"".join(frames)), fut, loop.time()))
+        self.stats.requests += 1
+        self._wake.set()
+        if len(self._pending) >= self.cfg.max_batch:
+            self._full.set()
+        return await fut
+
+    async def warm(self) -> None:
+        """Decode a second of silence on the decoder thread, so the first utterance does not pay first-run setup."""
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._decoder.decode, [silence])
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for p in self._pending:
+            p.future.cancel()
+        self._pending.clear()
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        window = self.cfg.window_ms / 1000.0
+        while True:
+            await self._wake.wait()
+            delay = self._pending[0].arrived + window - loop.time() if self._pending else 0.0
+            if delay > 0 and len(self._pending) < self.cfg.max_batch:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch: List[_Pending] = []
+            while self._pending and len(batch) < self.cfg.max_batch:
+                p = self._pending.popleft()
+                if not p.future.done():  # skip callers that gave up
+                    batch.append(p)
+            if not self._pending:
+                self._wake.clear()
+            if not batch:
+                continue
+
+            now = loop.time()
+            self.stats.batches += 1
+            self.stats.largest = max(self.stats.largest, len(batch))
+            self.stats.waited_s += sum(now - p.arrived for p in batch)
+            try:
+                results = await loop.run_in_executor(self._executor, self._decoder.decode, [p.audio for p in batch])
+            except Exception as e:
+                self._log.exception("Batch of %d failed", len(batch))
+                for p in batch:
+                    if not p.future.done():
+                        p.future.set_exception(e)
+                continue
+            finally:
+                self.stats.decode_s += loop.time() - now
+            for p, res in zip(batch, results):
+                if not p.future.done():
+                    p.future.set_result(res)
+
+
+# ===============================
+#      faster-whisper decoder
+# ===============================
+class WhisperBatchDecoder:
+    """
+    faster-whisper (CTranslate2) model run as one batch: per-clip log-mel features padded
+    to the 30 s encoder input, one encode and one greedy/beam generate for the whole batch.
+    Confidence is exp(mean token log-prob).
+    """
+
+    def __init__(self, model: str = "base.en", *, compute_type: str = "int8", cpu_threads: int = 0,
+                 beam_size: int = 1, language: str = "en") -> None:
+        from faster_whisper import WhisperModel
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+
+        t0 = time.perf_counter()
+        self._model = WhisperModel(model, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+        self._pad = pad_or_trim
+        self._tokenizer = Tokenizer(self._model.hf_tokenizer, self._model.model.is_multilingual,
+                                    task="transcribe", language=language)
+        self._prompt = self._model.get_prompt(self._tokenizer, [], without_timestamps=True)
+        self._beam_size = beam_size
+        logging.getLogger("BatchingASR").info("Loaded whisper %s in %.2fs", model, time.perf_counter() - t0)
+
+    def decode(self, audio: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        if not audio:
+            return []
+        extract = self._model.feature_extractor
+        features = np.stack([self._pad(extract(a)) for a in audio])
+        encoded = self._model.encode(features)
+        results = self._model.model.generate(
+            encoded, [self._prompt] * len(audio),
+            beam_size=self._beam_size, max_length=self._model.max_length,
+            suppress_blank=True, return_scores=True,
+        )
+        eot = self._tokenizer.eot
+        out = []
+        for a, res in zip(audio, results):
+            ids = [t for t in res.sequences_ids[0] if t < eot]
+            text = self._tokenizer.decode(ids).strip()
+            conf = math.exp(res.scores[0]) if ids and len(a) >= SAMPLE_RATE // 10 else 0.0
+            out.append((text, conf))
+        return out
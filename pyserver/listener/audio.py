@@ -0,0 +1,151 @@
+# listener/audio.py
+from __future__ import annotations
+import asyncio
+import logging
+import time
+import wave
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol
+
+import numpy as np
+
+AudioFrame = bytes
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # int16 PCM, mono
+
+
+class AudioSource(Protocol):
+    async def read(self) -> AudioFrame: ...
+
+
+def read_wav(path: str | Path) -> np.ndarray:
+    """Load a 16 kHz mono int16 WAV file as an int16 array."""
+    with wave.open(str(path), "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != SAMPLE_WIDTH or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(
+                f"{path}: expected {SAMPLE_RATE} Hz mono 16-bit PCM, got "
+                f"{wf.getframerate()} Hz x{wf.getnchannels()} {8 * wf.getsampwidth()}-bit"
+            )
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def pcm_to_float(frame: AudioFrame) -> np.ndarray:
+    return np.frombuffer(frame, dtype=np.int16).astype(np.float32) * (1.0 / 32768.0)
+
+
+# (sample_rate, block_size, device, callback) -> an unstarted input stream with the
+# sounddevice.RawInputStream start/stop/close API, calling callback(indata, frames, time_info, status)
+InputStreamFactory = Callable[[int, int, Optional[Any], Callable], Any]
+
+
+def sounddevice_input(sample_rate: int, block_size: int, device: Optional[Any], callback: Callable) -> Any:
+    import sounddevice as sd  # heavy (PortAudio); only needed with a real microphone
+
+    return sd.RawInputStream(samplerate=sample_rate, blocksize=block_size, channels=1, dtype="int16",
+                             device=device, callback=callback)
+
+
+# ===============================
+#        Live microphone
+# ===============================
+class MicrophoneSource:
+    """
+    sounddevice input stream feeding fixed-size int16 blocks into an asyncio queue.
+    When the consumer falls behind, the oldest block is dropped so latency stays bounded.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        block_ms: int = 80,
+        device: Optional[int | str] = None,
+        max_blocks: int = 64,
+        stream_factory: InputStreamFactory = sounddevice_input,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.block_size = sample_rate * block_ms // 1000
+        self._device = device
+        self._stream_factory = stream_factory
+        self._q: asyncio.Queue[AudioFrame] = asyncio.Queue(maxsize=max_blocks)
+        self._stream = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._log = logging.getLogger("Microphone")
+        self.dropped = 0
+
+    async def start(self) -> None:
+        if self._stream is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stream = self._stream_factory(self.sample_rate, self.block_size, self._device, self._callback)
+        self._stream.start()
+        self._log.info("Capturing %d Hz, %d samples/block", self.sample_rate, self.block_size)
+
+    async def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    async def read(self) -> AudioFrame:
+        if self._stream is None:
+            await self.start()
+        return await self._q.get()
+
+    def _callback(self, indata, frames, time_info, status) -> None:  # PortAudio thread
+        if status:
+            self._log.debug("Input status: %s", status)
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._put, bytes(indata))
+
+    def _put(self, frame: AudioFrame) -> None:
+        if self._q.full():
+            self._q.get_nowait()
+            self.dropped += 1
+        self._q.put_nowait(frame)
+
+
+# ===============================
+#         WAV replay
+# ===============================
+class WavSource:
+    """
+    Replays int16 PCM in fixed-size blocks. With realtime=True blocks are paced at the
+    capture rate, which is what the idle-CPU and latency measurements rely on.
+    Raises EOFError once the audio is exhausted.
+    """
+
+    def __init__(self, pcm: np.ndarray, *, block_ms: int = 80, realtime: bool = False) -> None:
+        self._pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        self.block_size = SAMPLE_RATE * block_ms // 1000
+        self._realtime = realtime
+        self._pos = 0
+        self._t0: Optional[float] = None
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kw) -> "WavSource":
+        return cls(read_wav(path), **kw)
+
+    @property
+    def position_s(self) -> float:
+        """Audio time (seconds) of the next sample to be emitted."""
+        return self._pos / SAMPLE_RATE
+
+    @property
+    def started_at(self) -> Optional[float]:
+        """perf_counter() timestamp of the first emitted block (realtime mode)."""
+        return self._t0
+
+    async def read(self) -> AudioFrame:
+        if self._pos >= len(self._pcm):
+            raise EOFError("end of audio")
+        if self._realtime:
+            now = time.perf_counter()
+            if self._t0 is None:
+                self._t0 = now
+            due = self._t0 + (self._pos + self.block_size) / SAMPLE_RATE
+            if due > now:
+                await asyncio.sleep(due - now)
+        block = self._pcm[self._pos:self._pos + self.block_size]
+        self._pos += len(block)
+        return block.tobytes()
@@ -0,0 +1,242 @@
+# listener/capture.py
+"""
+Microphone capture in its own process, handing blocks to the inference process(es)
+through a ring buffer in shared memory.
+
+In one process the audio callback needs the GIL, so it waits behind wake-word, VAD, ASR
+and planning work and the device overflows when it waits too long. Here the capture
+process only runs the callback: it writes each int16 block into the next slot of a
+multiprocessing.shared_memory ring and then publishes it by bumping the head counter.
+Readers (SharedRingSource, an ordinary AudioSource, so WakeDetector/VAD/ASR are unchanged)
+copy blocks straight out of the segment. Audio is never pickled and there are no locks:
+one writer, any number of readers each with its own cursor; a reader that falls more than
+`ring_blocks` behind loses the oldest blocks and counts them in `dropped`.
+
+Capture stamps use time.monotonic(), which is one clock for all processes on Linux.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import multiprocessing as mp
+import signal
+import time
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from pyserver.listener.audio import SAMPLE_RATE, AudioFrame
+from pyserver.tools.backends import load_attr
+
+# int64 header fields, then one float64 stamp per slot, then the int16 blocks
+_HEAD, _STOP, _OVERFLOWS = range(3)
+_HEADER_BYTES = 64
+
+# (shared memory name, slots, samples per block): all a process needs to attach
+RingSpec = Tuple[str, int, int]
+
+
+class FrameRing:
+    """
+    Fixed-size int16 blocks in a SharedMemory segment; single writer, lock-free readers.
+
+    write() fills slot head % slots and only then stores head + 1, so a reader never looks
+    at a slot before it is complete. The slot a reader copies can be reused by the writer
+    once head reaches seq + slots; readers check head again after copying and discard the
+    block if it may have been overwritten meanwhile.
+    """
+
+    def __init__(self, shm: SharedMemory, slots: int, block_size: int, owner: bool) -> None:
+        self.shm = shm
+        self.slots = slots
+        self.block_size = block_size
+        self._owner = owner
+        self._header = np.ndarray((_HEADER_BYTES // 8,), dtype=np.int64, buffer=shm.buf)
+        self._stamps = np.ndarray((slots,), dtype=np.float64, buffer=shm.buf, offset=_HEADER_BYTES)
+        self._pcm = np.ndarray((slots, block_size), dtype=np.int16, buffer=shm.buf, offset=_HEADER_BYTES + 8 * slots)
+
+    @classmethod
+    def create(cls, slots: int, block_size: int) -> "FrameRing":
+        shm = SharedMemory(create=True, size=_HEADER_BYTES + slots * (8 + 2 * block_size))
+        ring = cls(shm, slots, block_size, owner=True)
+        ring._header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, spec: RingSpec) -> "FrameRing":
+        name, slots, block_size = spec
+        return cls(SharedMemory(name=name), slots, block_size, owner=False)
+
+    @property
+    def spec(self) -> RingSpec:
+        return self.shm.name, self.slots, self.block_size
+
+    @property
+    def head(self) -> int:
+        """Blocks published so far (the next block's sequence number)."""
+        return int(self._header[_HEAD])
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self._header[_STOP])
+
+    @property
+    def overflows(self) -> int:
+        return int(self._header[_OVERFLOWS])
+
+    def write(self, pcm: np.ndarray, stamp: float) -> None:
+        seq = int(self._header[_HEAD])
+        slot = seq % self.slots
+        self._pcm[slot] = pcm
+        self._stamps[slot] = stamp
+        self._header[_HEAD] = seq + 1  # publish
+
+    def read(self, seq: int) -> Tuple[AudioFrame, float]:
+        slot = seq % self.slots
+        return self._pcm[slot].tobytes(), float(self._stamps[slot])
+
+    def count_overflow(self) -> None:
+        self._header[_OVERFLOWS] += 1
+
+    def stop(self) -> None:
+        self._header[_STOP] = 1
+
+    def close(self) -> None:
+        # numpy views pin the mapping; drop them before closing it
+        self._header = self._stamps = self._pcm = None  # type: ignore[assignment]
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class SharedRingSource:
+    """
+    AudioSource reading a FrameRing from its own cursor (from the newest block on). With
+    no doorbell between the processes, read() sleeps until the next block is due (last
+    capture stamp + one block) and then looks at the head again. Raises EOFError once the
+    capture process has stopped, or `alive()` says it died, and every published block was read.
+    """
+
+    def __init__(self, ring: FrameRing, *, poll_s: float = 0.002, alive: Optional[Callable[[], bool]] = None) -> None:
+        self.ring = ring
+        self.block_s = ring.block_size / SAMPLE_RATE
+        self.dropped = 0
+        self.last_stamp = 0.0   # capture time of the block read last
+        self._next = ring.head
+        self._poll_s = poll_s
+        self._alive = alive
+
+    @classmethod
+    def attach(cls, spec: RingSpec, **kw: Any) -> "SharedRingSource":
+        """For an inference process other than the one that started the capture."""
+        return cls(FrameRing.attach(spec), **kw)
+
+    def poll(self) -> Optional[AudioFrame]:
+        ring = self.ring
+        while True:
+            head = ring.head
+            if self._next >= head:
+                return None
+            oldest = head - ring.slots + 1
+            if self._next < oldest:  # lapped: the writer has reused those slots
+                self.dropped += oldest - self._next
+                self._next = oldest
+            seq = self._next
+            self._next += 1
+            frame, stamp = ring.read(seq)
+            if ring.head - seq < ring.slots:
+                self.last_stamp = stamp
+                return frame
+            self.dropped += 1  # overwritten while being copied
+
+    async def read(self) -> AudioFrame:
+        while True:
+            frame = self.poll()
+            if frame is not None:
+                return frame
+            if self.ring.stopped:
+                raise EOFError("capture stopped")
+            if self._alive is not None and not self._alive():
+                raise EOFError("capture process died")
+            due = self.last_stamp + self.block_s - time.monotonic() if self.last_stamp else self.block_s / 4
+            await asyncio.sleep(max(due, self._poll_s))
+
+
+@dataclass
+class CaptureConfig:
+    block_ms: int = 80
+    ring_blocks: int = 64   # ~5 s at 80 ms: how far a reader may fall behind before losing blocks
+    device: Optional[Any] = None
+    # "module:attr" InputStreamFactory (see listener.audio), resolved in the capture process
+    stream: str = "pyserver.listener.audio:sounddevice_input"
+    stream_args: Dict[str, Any] = field(default_factory=dict)
+
+
+def _capture_main(spec: RingSpec, cfg: CaptureConfig) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent decides when capture stops
+    ring = FrameRing.attach(spec)
+    try:
+        def callback(indata, frames, time_info, status) -> None:
+            stamp = time.monotonic()
+            if status:
+                ring.count_overflow()
+            ring.write(np.frombuffer(indata, dtype=np.int16), stamp)
+
+        stream = load_attr(cfg.stream)(SAMPLE_RATE, ring.block_size, cfg.device, callback, **cfg.stream_args)
+        try:
+            stream.start()
+            while not ring.stopped:
+                time.sleep(0.05)
+        finally:
+            stream.stop()
+            stream.close()
+    finally:
+        ring.stop()  # however capture ended, readers get EOFError instead of waiting for blocks
+        ring.close()
+
+
+class CaptureProcess:
+    """Owns the ring and the capture process; source() gives this process a reader."""
+
+    def __init__(self, cfg: Optional[CaptureConfig] = None) -> None:
+        self.cfg = cfg or CaptureConfig()
+        self.block_size = SAMPLE_RATE * self.cfg.block_ms // 1000
+        self.ring: Optional[FrameRing] = None
+        self._ctx = mp.get_context("spawn")
+        self._proc: Optional[mp.process.BaseProcess] = None
+        self._log = logging.getLogger("CaptureProcess")
+
+    async def start(self) -> None:
+        if self._proc is not None:
+            return
+        self.ring = FrameRing.create(self.cfg.ring_blocks, self.block_size)
+        self._proc = self._ctx.Process(target=_capture_main, args=(self.ring.spec, self.cfg), name="capture", daemon=True)
+        self._proc.start()
+        self._log.info("Capture process %d: %d x %d-sample blocks in %s", self._proc.pid, self.cfg.ring_blocks,
+                       self.block_size, self.ring.shm.name)
+
+    def source(self, **kw: Any) -> SharedRingSource:
+        """A reader that also ends (EOFError) if the capture process dies without stopping the ring."""
+        assert self.ring is not None, "start() first"
+        return SharedRingSource(self.ring, alive=self.alive, **kw)
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.is_alive()
+
+    @property
+    def overflows(self) -> int:
+        """Callbacks the device flagged (input overflow: blocks lost before they reached the ring)."""
+        return self.ring.overflows if self.ring is not None else 0
+
+    async def close(self) -> None:
+        if self._proc is None or self.ring is None:
+            return
+        self.ring.stop()
+        proc, self._proc = self._proc, None
+        await asyncio.get_running_loop().run_in_executor(None, proc.join, 5.0)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+        self.ring.close()
+        self.ring = None
@@ -3,8 +3,10 @@ from __future__ import annotations
 import asyncio
 import enum
 import logging
-from dataclasses import dataclass
-from typing import Optional, Protocol, Sequence, Tuple
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Optional, Protocol, Sequence, Tuple
 import re
 
 import grpc
@@ -14,13 +16,18 @@ from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2 as sched_
 from protobufs.gen.py.protobufs.apis.services import scheduler_api_pb2_grpc as sched_rpc    
 from google.protobuf.duration_pb2 import Duration
 from pyserver.llm.models import ToolCallModel, TaskModel, Tools,SpeakArgsModel,TimerArgsModel,PlaySoundArgsModel
-from pyserver.llm.llm import toolcall_from_text
-from pyserver.clients.scheduler.client import SchedulerClient
-
-from llm.models import ToolCallModel,TaskModel
-AudioFrame = bytes
+from pyserver.llm.intent import IntentConfig
+from pyserver.llm.memory import ConversationMemory, MemoryConfig
+from pyserver.llm.router import Plan, PlannerRouter, RouterConfig
+from pyserver.clients.scheduler.client import SchedulerClient, SchedulerService
+from pyserver.diagnostics.admin import DiagnosticsConfig, diagnostics
+from pyserver.warmup import WarmupFailed, warm_steps, warm_up
+from pyserver.listener.audio import AudioFrame
+from pyserver.scheduler.when import When, find_when
 
 class WakeDetector(Protocol):
+    # Detectors that keep the audio they read (OnnxWakeDetector) expose it as `pre_roll`;
+    # the daemon hands it to the VAD as the start of the utterance.
     async def wait_for_hotword(self) -> None: ...
 
 class VAD(Protocol):
@@ -32,6 +39,11 @@ class ASR(Protocol):
 class Planner(Protocol):
     async def plan(self, transcript: str, summary_hint: Optional[str] = None) -> PlanModel: ...
 
+class TranscriptPlanner(Protocol):
+    """Transcript -> tool call (PlannerRouter, or a per-room view of a ListenerHub planner)."""
+    async def plan(self, text: str, history: Sequence[dict] = ()) -> Plan: ...
+    async def summarize(self, summary: str, turns: Sequence[dict]) -> str: ...
+
 # ===============================
 #       Mock implementations
 # ===============================
@@ -65,6 +77,21 @@ class ListenerConfig:
     scheduler_addr: str = "127.0.0.1:50070"
     min_conf: float = 0.5
     timezone: str = "Asia/Yerevan"   # adjust if you prefer
+    wake_model: Optional[str] = None  # ONNX keyword spotter; None -> press ENTER, type the utterance
+    whisper_model: str = "base.en"  # faster-whisper model transcribing the microphone when wake_model is set
+    ollama_host: Optional[str] = None  # None -> OLLAMA_HOST / localhost:11434
+    small_model: Optional[str] = None  # tried first for short utterances, e.g. "llama3.2:3b"
+    intent_model: Optional[str] = None  # sentence encoder (.onnx) for the intent tier; None -> LLM only
+    transport: str = "grpc"  # "grpc" | "local" (in-process scheduler + worker)
+    memory_tokens: int = 1024  # conversation kept for follow-ups; 0 -> each utterance stands alone
+    pre_roll_frames: int = 4  # 80 ms blocks read before the wake word fired, kept for the VAD
+    capture: str = "inline"  # "inline" | "process": microphone in its own process, frames via shared memory
+
+    def intent_config(self) -> Optional[IntentConfig]:
+        return IntentConfig(model_path=self.intent_model) if self.intent_model else None
+
+# Called with (stage, seconds) after each pipeline stage; used by pyserver.bench.
+StageHook = Callable[[str, float], None]
 
 class ListenerDaemon:
     def __init__(
@@ -73,58 +100,146 @@ class ListenerDaemon:
         vad: VAD,
         asr: ASR,
         cfg: ListenerConfig,
+        stage_hook: Optional[StageHook] = None,
+        scheduler: Optional[SchedulerService] = None,
+        planner: Optional[TranscriptPlanner] = None,
     ) -> None:
         self.wake = wake
         self.vad = vad
         self.asr = asr
         self.cfg = cfg
         self._log = logging.getLogger("Listener")
-        self._ring: list[AudioFrame] = []  # pre-roll placeholder
+        self._stage_hook = stage_hook
+        self._t_stage = 0.0
+        self._scheduler = scheduler
+        self._planner = planner or PlannerRouter(RouterConfig(small_model=cfg.small_model, host=cfg.ollama_host,
+                                                              intents=cfg.intent_config()))
+        self.memory = ConversationMemory(self._planner, MemoryConfig(budget_tokens=cfg.memory_tokens)) if cfg.memory_tokens else None
+
+    def _stage(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stage_hook is not None:
+            self._stage_hook(name, now - self._t_stage)
+        self._t_stage = now
+
+    async def warm(self) -> None:
+        """Load the planner's models and any wake/VAD/ASR sessions before listening (see pyserver.warmup)."""
+        try:
+            await warm_up(warm_steps({"llm": self._planner, "wake": self.wake, "vad": self.vad, "asr": self.asr}))
+        except WarmupFailed as e:
+            self._log.warning("%s; starting cold", e)
 
     async def run(self) -> None:
-        self._log.info("Connecting to scheduler at %s", self.cfg.scheduler_addr)
-        async with SchedulerClient(self.cfg.scheduler_addr, timezone=self.cfg.timezone) as sched:
-            while True:
-                # IDLE
-                self._log.debug("State=%s", State.IDLE.value)
-                await self.wake.wait_for_hotword()
-
-                # CAPTURE
-                self._log.debug("State=%s", State.CAPTURE.value)
-                frames = await self.vad.stream_until_eou(self._ring)
-
-                # INTERPRET
-                self._log.debug("State=%s", State.INTERPRET.value)
-                transcript, conf = await self.asr.transcribe(frames)
-                if not transcript or conf < self.cfg.min_conf:
-                    await sched.schedule_toolcall_now(
-                        ToolCallModel(speak=SpeakArgsModel(text="Sorry, I didn’t catch that."))
-                    )
-                    continue
-
-                # LLM → ToolCallModel
-                toolcall = toolcall_from_text(transcript)
-                which = toolcall.which()
-
-                # Route by tool type
-                if which == Tools.SPEAK:
+        await self.warm()
+        if self._scheduler is None:
+            self._log.info("Connecting to scheduler at %s", self.cfg.scheduler_addr)
+            self._scheduler = SchedulerClient(self.cfg.scheduler_addr, timezone=self.cfg.timezone)
+        async with self._scheduler as sched:
+            await self.serve(sched)
+
+    async def serve(self, sched: SchedulerService) -> None:
+        """The listen/plan/schedule loop on a scheduler the caller has started (and owns)."""
+        while True:
+            # IDLE
+            self._log.debug("State=%s", State.IDLE.value)
+            self._t_stage = time.perf_counter()
+            await self.wake.wait_for_hotword()
+            self._stage("wake")
+
+            # CAPTURE
+            self._log.debug("State=%s", State.CAPTURE.value)
+            frames = await self.vad.stream_until_eou(getattr(self.wake, "pre_roll", ()))
+            self._stage("capture")
+
+            # INTERPRET
+            self._log.debug("State=%s", State.INTERPRET.value)
+            transcript, conf = await self.asr.transcribe(frames)
+            self._stage("asr")
+            if not transcript or conf < self.cfg.min_conf:
+                await sched.schedule_toolcall_now(
+                    ToolCallModel(speak=SpeakArgsModel(text="Sorry, I didn’t catch that."))
+                )
+                self._stage("schedule")
+                continue
+
+            # LLM → ToolCallModel
+            history = self.memory.messages() if self.memory is not None else ()
+            toolcall = (await self._planner.plan(transcript, history)).toolcall
+            self._stage("plan")
+            if self.memory is not None:
+                self.memory.add("user", transcript)
+                self.memory.add("assistant", toolcall.model_dump_json(exclude_none=True))
+            which = toolcall.which()
+            # When to run it comes from the transcript, not from the LLM's arguments
+            when = when_to_run(which, transcript)
+
+            # Route by tool type
+            if which == Tools.SPEAK:
+                if when is not None:
+                    await self._later(sched, toolcall, when, "Okay, I'll remind you {}.")
+                else:
                     # Just schedule speak via scheduler
                     await sched.schedule_toolcall_now(toolcall)
 
-                elif which == Tools.TIMER:
+            elif which == Tools.TIMER:
+                if when is not None:
+                    await self._later(sched, toolcall, when, "Okay, the timer goes off {}.")
+                else:
                     # 1) Speak acknowledgement now
                     minutes = toolcall.timer.minutes
                     ack = ToolCallModel(speak=SpeakArgsModel(text=f"Okay, setting a {minutes} minute timer."))
                     await sched.schedule_toolcall_now(ack)
-    
+
                     # 2) Schedule the timer toolcall for the future
                     await sched.schedule_timer(toolcall, minutes=minutes)
 
-                elif which == Tools.PLAY_SOUND:
+            elif which == Tools.PLAY_SOUND:
+                if when is not None:
+                    await self._later(sched, toolcall, when, "Okay, I'll play it {}.")
+                else:
                     # Optional: speak ack + play sound now
                     ack = ToolCallModel(speak=SpeakArgsModel(text="Playing sound."))
                     await sched.schedule_toolcall_now(ack)
                     await sched.schedule_toolcall_now(toolcall)
+
+            self._stage("schedule")
+
+    async def _later(self, sched: SchedulerService, toolcall: ToolCallModel, when: When, ack: str) -> None:
+        """Acknowledge now; run `toolcall` on the trigger `when` names, in the listener's timezone."""
+        tz = self.cfg.timezone
+        await sched.schedule_toolcall_now(ToolCallModel(speak=SpeakArgsModel(text=ack.format(when.describe(tz)))))
+        await sched.schedule(toolcall.to_proto(), trigger=when.trigger(tz), timezone=tz)
+
+
+# Verbs that ask for speech at a time ("remind me at 7", "say hi in 5 minutes"). Not
+# "tell": "tell me the weather tomorrow" asks about tomorrow, now.
+_DEFER_SPEECH = re.compile(r"\b(?:remind|reminder|say|announce)\b", re.IGNORECASE)
+
+
+def when_to_run(which: Tools, transcript: str) -> Optional[When]:
+    """
+    The time `transcript` asks the tool call to run at, or None to run it now. A time
+    phrase alone is not a request: speech is deferred only when a _DEFER_SPEECH verb
+    governs it (comes before it, or the phrase opens the utterance), and "for ten
+    minutes" is a delay only for a timer; for a sound it is how long to play.
+    """
+    rest, offset = transcript, 0
+    while True:
+        when = find_when(rest)
+        if when is None:
+            return None
+        when = replace(when, start=offset + when.start, end=offset + when.end)
+        if which == Tools.TIMER:
+            return when
+        if not when.text.lower().startswith("for "):
+            if which == Tools.PLAY_SOUND:
+                return when
+            verb = _DEFER_SPEECH.search(transcript)
+            if which == Tools.SPEAK and verb and (verb.start() < when.start or not transcript[:when.start].strip()):
+                return when
+        rest, offset = transcript[when.end:], when.end
+
+
 # ===============================
 #              main
 # ===============================
@@ -133,14 +248,63 @@ async def main() -> None:
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
-    cfg = ListenerConfig()
+    admin_port = os.environ.get("ADMIN_PORT")
+    async with diagnostics(int(admin_port) if admin_port else None,
+                           DiagnosticsConfig(coroutines=os.environ.get("TIME_COROUTINES") == "1")):
+        await _run()
+
+
+async def _run() -> None:
+    cfg = ListenerConfig(
+        wake_model=os.environ.get("WAKE_MODEL") or None,
+        whisper_model=os.environ.get("WHISPER_MODEL") or ListenerConfig.whisper_model,
+        transport=os.environ.get("SCHEDULER_TRANSPORT", "grpc"),
+        small_model=os.environ.get("SMALL_MODEL") or None,
+        intent_model=os.environ.get("INTENT_MODEL") or None,
+        capture=os.environ.get("CAPTURE", "inline"),
+    )
+    capture = None
+    if cfg.wake_model:
+        from pyserver.listener.asr import BatchingASR, WhisperBatchDecoder
+        from pyserver.listener.audio import AudioSource, MicrophoneSource
+        from pyserver.listener.vad import EnergyVAD
+        from pyserver.listener.wake import OnnxWakeDetector, WakeConfig
+        if cfg.capture == "process":
+            from pyserver.listener.capture import CaptureProcess
+            capture = CaptureProcess()
+            await capture.start()
+            source: AudioSource = capture.source()
+        else:
+            source = MicrophoneSource()
+        wake: WakeDetector = OnnxWakeDetector(source, WakeConfig(model_path=cfg.wake_model, pre_roll_blocks=cfg.pre_roll_frames))
+        vad: VAD = EnergyVAD(source)
+        asr: ASR = BatchingASR(WhisperBatchDecoder(cfg.whisper_model))
+    else:
+        wake, vad, asr = MockWakeDetector(), MockVAD(), MockASR()
+    scheduler: Optional[SchedulerService] = None
+    tts = None
+    if cfg.transport == "local":
+        from pyserver.clients.scheduler.local import LocalSchedulerClient
+        from pyserver.server.server import PythonWorkerService, TTSQueue
+        tts = TTSQueue()
+        await tts.start()
+        scheduler = LocalSchedulerClient(PythonWorkerService(tts).execute, timezone=cfg.timezone)
     daemon = ListenerDaemon(
-        wake=MockWakeDetector(),
-        vad=MockVAD(),
-        asr=MockASR(),
+        wake=wake,
+        vad=vad,
+        asr=asr,
         cfg=cfg,
+        scheduler=scheduler,
     )
-    await daemon.run()
+    try:
+        await daemon.run()
+    finally:
+        if tts is not None:
+            await tts.stop()
+        if hasattr(asr, "aclose"):  # BatchingASR: stop its dispatcher
+            await asr.aclose()
+        if capture is not None:
+            await capture.close()
 
 
 if __name__ == "__main__":
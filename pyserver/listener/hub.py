@@ -0,0 +1,232 @@
+# listener/hub.py
+from __future__ import annotations
+import asyncio
+import itertools
+import logging
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from pyserver.clients.scheduler.client import SchedulerClient, SchedulerService
+from pyserver.listener.daemon import ASR, VAD, ListenerConfig, ListenerDaemon, StageHook, WakeDetector
+from pyserver.llm.router import Plan, PlannerRouter, RouterConfig
+from pyserver.warmup import WarmupFailed, warm_steps, warm_up
+
+_SPACE = re.compile(r"\s+")
+
+
+@dataclass
+class HubStats:
+    plans: int = 0
+    deduplicated: int = 0  # joined an identical in-flight plan instead of asking the LLM
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task     # the router call; not owned by any one room
+    waiters: int = 0
+
+
+class FairGate:
+    """
+    Concurrency limit shared by rooms. When slots are contended the next one goes to the
+    waiting room that has held slots for the fewest seconds recently (usage decays with
+    `half_life_s`), FIFO within a room: a room that keeps talking is served after rooms
+    that have been quiet rather than taking turns with them. fair=False grants strictly
+    in arrival order (for comparison).
+    """
+
+    def __init__(self, limit: int, *, half_life_s: float = 30.0, fair: bool = True,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._limit = limit
+        self._half_life = half_life_s
+        self._fair = fair
+        self._clock = clock
+        self._active = 0
+        self._seq = itertools.count()
+        self._waiting: Dict[str, Deque[Tuple[int, asyncio.Future]]] = {}
+        self._usage: Dict[str, Tuple[float, float]] = {}  # room -> (slot-seconds, as of)
+
+    def usage(self, room: str) -> float:
+        used, at = self._usage.get(room, (0.0, 0.0))
+        return used * 0.5 ** ((self._clock() - at) / self._half_life) if used else 0.0
+
+    @asynccontextmanager
+    async def slot(self, room: str) -> AsyncIterator[None]:
+        await self._acquire(room)
+        t0 = self._clock()
+        try:
+            yield
+        finally:
+            self._usage[room] = (self.usage(room) + self._clock() - t0, self._clock())
+            self._release()
+
+    async def _acquire(self, room: str) -> None:
+        if self._active < self._limit:  # implies nobody is waiting: _release() drains first
+            self._active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(room, deque()).append((next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release()  # granted just as the caller was cancelled: pass it on
+            raise
+
+    def _release(self) -> None:
+        while self._waiting:
+            if self._fair:
+                room = min(self._waiting, key=lambda r: (self.usage(r), self._waiting[r][0][0]))
+            else:
+                room = min(self._waiting, key=lambda r: self._waiting[r][0][0])
+            q = self._waiting[room]
+            _, fut = q.popleft()
+            if not q:
+                del self._waiting[room]
+            if not fut.done():
+                fut.set_result(None)  # slot handed over; _active is unchanged
+                return
+        self._active -= 1
+
+
+class HubPlanner:
+    """
+    One planner for every room: identical transcripts already being planned with the same
+    conversation history share the in-flight result (single flight), and LLM slots are
+    handed out by a FairGate. The router call runs in its own task, so a room cancelled
+    while waiting (a satellite disconnecting) leaves the others' plan alone; it is only
+    cancelled once no room is waiting for it.
+    """
+
+    def __init__(self, router: PlannerRouter, concurrency: int, fair: bool = True) -> None:
+        self.router = router
+        self.stats = HubStats()
+        self._gate = FairGate(concurrency, fair=fair)
+        self._inflight: Dict[Tuple[str, int], _Flight] = {}
+
+    def for_room(self, room: str) -> "RoomPlanner":
+        return RoomPlanner(self, room)
+
+    async def plan(self, room: str, text: str, history: Sequence[dict] = ()) -> Plan:
+        key = (_SPACE.sub(" ", text.strip().lower()), hash(tuple(m["content"] for m in history)))
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._inflight[key] = _Flight(asyncio.create_task(self._plan(key, room, text, history),
+                                                                       name=f"plan:{room}"))
+        else:
+            self.stats.deduplicated += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()  # every room that asked has gone
+
+    async def _plan(self, key: Tuple[str, int], room: str, text: str, history: Sequence[dict]) -> Plan:
+        try:
+            async with self._gate.slot(room):
+                plan = await self.router.plan(text, history)
+            self.stats.plans += 1
+            return plan
+        finally:
+            del self._inflight[key]
+
+
+class RoomPlanner:
+    """A room's view of the HubPlanner (what ListenerDaemon calls)."""
+
+    def __init__(self, hub: HubPlanner, room: str) -> None:
+        self._hub = hub
+        self.room = room
+
+    async def plan(self, text: str, history: Sequence[dict] = ()) -> Plan:
+        return await self._hub.plan(self.room, text, history)
+
+    async def summarize(self, summary: str, turns: Sequence[dict]) -> str:
+        return await self._hub.router.summarize(summary, turns)
+
+
+class ListenerHub:
+    """
+    Runs one ListenerDaemon per room on a single event loop. The rooms share one pooled
+    SchedulerClient (started and closed here) and one HubPlanner.
+    """
+
+    def __init__(
+        self,
+        cfg: ListenerConfig,
+        *,
+        scheduler: Optional[SchedulerService] = None,
+        router: Optional[PlannerRouter] = None,
+        plan_concurrency: int = 1,
+        pool_size: int = 2,
+        fair: bool = True,
+    ) -> None:
+        self.cfg = cfg
+        self.scheduler = scheduler or SchedulerClient(cfg.scheduler_addr, timezone=cfg.timezone, pool_size=pool_size)
+        router = router or PlannerRouter(RouterConfig(small_model=cfg.small_model, host=cfg.ollama_host,
+                                                      max_concurrency=plan_concurrency, intents=cfg.intent_config()))
+        self.planner = HubPlanner(router, plan_concurrency, fair=fair)
+        self.rooms: Dict[str, ListenerDaemon] = {}
+        self._sched: Optional[SchedulerService] = None
+        self._serving = asyncio.Event()
+        self._log = logging.getLogger("ListenerHub")
+
+    def add_room(self, name: str, wake: WakeDetector, vad: VAD, asr: ASR, stage_hook: Optional[StageHook] = None) -> ListenerDaemon:
+        if name in self.rooms:
+            raise ValueError(f"room {name!r} already exists")
+        daemon = ListenerDaemon(wake, vad, asr, self.cfg, stage_hook=stage_hook,
+                                scheduler=self.scheduler, planner=self.planner.for_room(name))
+        self.rooms[name] = daemon
+        return daemon
+
+    async def warm(self) -> None:
+        """Warm the shared router once and each distinct wake/VAD/ASR component (rooms may share an ASR)."""
+        components: Dict[str, object] = {"llm": self.planner.router}
+        seen = set()
+        for name, d in self.rooms.items():
+            for kind, c in (("wake", d.wake), ("vad", d.vad), ("asr", d.asr)):
+                if id(c) not in seen:
+                    seen.add(id(c))
+                    components[f"{kind}:{name}"] = c
+        try:
+            await warm_up(warm_steps(components))
+        except WarmupFailed as e:
+            self._log.warning("%s; starting cold", e)
+
+    async def serve_room(self, name: str) -> None:
+        """
+        Serve a room added while the hub runs (a satellite that connected) until cancelled,
+        then remove it. Waits for run() to be up; a failure ends this room only.
+        """
+        try:
+            await self._serving.wait()
+            assert self._sched is not None
+            await self.rooms[name].serve(self._sched)
+        finally:
+            self.rooms.pop(name, None)
+
+    async def run(self) -> None:
+        """Serve every room until cancelled; one room failing stops the hub. Rooms may join later (serve_room)."""
+        await self.warm()
+        async with self.scheduler as sched:
+            self._log.info("Serving %d rooms", len(self.rooms))
+            tasks: List[asyncio.Task] = [
+                asyncio.create_task(d.serve(sched), name=f"room:{name}") for name, d in self.rooms.items()
+            ]
+            tasks.append(asyncio.create_task(asyncio.Event().wait(), name="hub:open"))  # no rooms yet is fine
+            self._sched = sched
+            self._serving.set()
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                self._serving.clear()
+                self._sched = None
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,334 @@
+# listener/satellite.py
+"""
+Remote microphones ("satellites") streaming audio to the central listener over gRPC.
+
+    python -m pyserver.listener.satellite --port 50075 --whisper-model base.en
+
+Each StreamAudio call becomes a ListenerHub room for as long as the satellite is
+connected: its decoded audio is that room's AudioSource, read directly by the wake
+detector and the EnergyVAD, and the blocks the VAD returns go to the shared BatchingASR
+as they are. Events (wake, end of utterance, transcript, ...) go back on the same call.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+
+import grpc
+
+from protobufs.gen.py.protobufs.apis.services import satellite_api_pb2 as sat_pb
+from protobufs.gen.py.protobufs.apis.services import satellite_api_pb2_grpc as sat_rpc
+from pyserver.listener.audio import SAMPLE_RATE, SAMPLE_WIDTH, AudioFrame
+from pyserver.listener.daemon import ASR, ListenerConfig
+from pyserver.listener.hub import ListenerHub
+from pyserver.listener.vad import EnergyVAD, VADConfig
+from pyserver.listener.wake import OnnxWakeDetector, WakeConfig, wake_session
+
+Event = sat_pb.ListenerEvent
+
+_STAGE_EVENTS = {
+    "wake": Event.KIND_WAKE,
+    "capture": Event.KIND_END_OF_UTTERANCE,
+    "plan": Event.KIND_PLANNED,
+    "schedule": Event.KIND_DONE,
+}
+
+_OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+@dataclass
+class SatelliteConfig:
+    buffer_s: float = 4.0            # decoded audio held per stream before the server stops reading
+    max_events: int = 32             # unsent events per stream; the oldest are dropped
+    vad: VADConfig = field(default_factory=VADConfig)
+    wake: Optional[WakeConfig] = None  # keyword spotting here; None -> satellites flag AudioChunk.wake
+
+
+@dataclass
+class StreamStats:
+    chunks: int = 0
+    bytes_in: int = 0
+    blocks: int = 0            # decoded 16 kHz blocks handed to the listener
+    backpressure: int = 0      # times the buffer filled and reading paused
+    events_dropped: int = 0
+
+
+class OpusDecoder:
+    """One Opus packet -> 16 kHz int16 mono blocks (views of PyAV's frame buffers)."""
+
+    def __init__(self) -> None:
+        import av  # pinned in requirements; only needed for Opus satellites
+
+        self._av = av
+        self._codec = av.CodecContext.create("libopus", "r")
+        self._codec.layout = "mono"
+        self._resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+
+    def decode(self, packet: bytes) -> List[AudioFrame]:
+        out: List[AudioFrame] = []
+        for frame in self._codec.decode(self._av.Packet(packet)):
+            for block in self._resampler.resample(frame):
+                out.append(memoryview(block.planes[0])[:block.samples * SAMPLE_WIDTH])
+        return out
+
+
+def _validate(first: sat_pb.AudioChunk) -> Optional[str]:
+    if not first.satellite_id:
+        return "the first chunk must name the satellite (satellite_id)"
+    if first.codec == sat_pb.AUDIO_CODEC_PCM_S16LE and first.sample_rate not in (0, SAMPLE_RATE):
+        return f"PCM must be {SAMPLE_RATE} Hz, got {first.sample_rate}"
+    if first.codec == sat_pb.AUDIO_CODEC_OPUS and first.sample_rate not in (0, *_OPUS_RATES):
+        return f"Opus sample_rate must be one of {_OPUS_RATES}, got {first.sample_rate}"
+    if first.codec not in (sat_pb.AUDIO_CODEC_PCM_S16LE, sat_pb.AUDIO_CODEC_OPUS):
+        return "codec must be PCM_S16LE or OPUS"
+    return None
+
+
+class SatelliteStream:
+    """
+    One connected satellite: its AudioSource, a satellite-side WakeDetector (chunks flagged
+    `wake`), an ASR view that reports transcripts, and the stage hook that turns the room's
+    progress into events.
+
+    Audio is buffered up to `buffer_s`; while the buffer is full the pump stops reading the
+    call, so gRPC flow control pushes back on the satellite instead of memory growing here.
+    That happens while the room is planning (nothing reads audio then) if the satellite
+    keeps talking; the wake detector catches up faster than real time afterwards.
+    """
+
+    def __init__(self, first: sat_pb.AudioChunk, asr: ASR, cfg: SatelliteConfig) -> None:
+        self.satellite_id = first.satellite_id
+        self.cfg = cfg
+        self.stats = StreamStats()
+        self.events: asyncio.Queue[sat_pb.ListenerEvent] = asyncio.Queue()
+        self.seq = 0  # last chunk read by the listener
+        self._asr = asr
+        self._decoder = OpusDecoder() if first.codec == sat_pb.AUDIO_CODEC_OPUS else None
+        self._buf: Deque[Tuple[int, bool, Optional[AudioFrame]]] = deque()  # (seq, wake, block); None = end
+        self._buffered = 0  # bytes
+        self._limit = int(cfg.buffer_s * SAMPLE_RATE) * SAMPLE_WIDTH
+        self._readable = asyncio.Event()
+        self._space = asyncio.Event()
+        self._woke = False
+
+    def emit(self, kind: int, **fields) -> None:
+        if self.events.qsize() >= self.cfg.max_events:
+            self.events.get_nowait()  # the satellite is not reading events; keep the latest
+            self.stats.events_dropped += 1
+        self.events.put_nowait(Event(kind=kind, seq=self.seq, buffered=len(self._buf), **fields))
+
+    # -- feeding (gRPC side) --
+    async def pump(self, first: sat_pb.AudioChunk, chunks: AsyncIterator[sat_pb.AudioChunk]) -> None:
+        """Decode the call's chunks into the buffer until the satellite closes its side."""
+        await self._feed(first)
+        async for chunk in chunks:
+            await self._feed(chunk)
+        await self._put(self.seq, False, None)
+
+    async def _feed(self, chunk: sat_pb.AudioChunk) -> None:
+        data = chunk.data
+        if not data and not chunk.wake:
+            return
+        self.stats.chunks += 1
+        self.stats.bytes_in += len(data)
+        if self._decoder is not None:
+            blocks: Sequence[AudioFrame] = self._decoder.decode(data) if data else ()
+        elif len(data) % SAMPLE_WIDTH:
+            raise ValueError(f"chunk {chunk.seq}: odd PCM length {len(data)}")
+        else:
+            blocks = (data,)  # the message's bytes are the block
+        wake = chunk.wake
+        for block in blocks:
+            await self._put(chunk.seq, wake, block)
+            wake = False
+        if wake:  # flagged chunk without audio (e.g. an Opus packet still filling the decoder)
+            self._woke = True
+            self._readable.set()
+
+    async def _put(self, seq: int, wake: bool, block: Optional[AudioFrame]) -> None:
+        if self._buffered >= self._limit:
+            self.stats.backpressure += 1
+            self.emit(Event.KIND_BACKPRESSURE)
+            while self._buffered >= self._limit:
+                self._space.clear()
+                await self._space.wait()
+        self._buf.append((seq, wake, block))
+        if block is not None:
+            self._buffered += len(block)
+            self.stats.blocks += 1
+        self._readable.set()
+
+    # -- listening (room side) --
+    async def read(self) -> AudioFrame:
+        while not self._buf:
+            self._readable.clear()
+            await self._readable.wait()
+        seq, _wake, block = self._buf[0]
+        if block is None:
+            raise EOFError(f"satellite {self.satellite_id} closed its stream")
+        self._buf.popleft()
+        self._buffered -= len(block)
+        self._space.set()
+        self.seq = seq
+        return block
+
+    async def wait_for_hotword(self) -> None:
+        """Satellite-side keyword spotting: skip audio up to the first chunk flagged `wake`."""
+        while True:
+            if self._woke:
+                self._woke = False
+                return
+            if not self._buf:
+                self._readable.clear()
+                await self._readable.wait()
+            elif self._buf[0][1]:
+                return  # the flagged block starts the utterance: leave it for the VAD
+            else:
+                await self.read()
+
+    async def transcribe(self, frames: Sequence[AudioFrame]) -> Tuple[str, float]:
+        text, conf = await self._asr.transcribe(frames)
+        self.emit(Event.KIND_TRANSCRIPT, text=text, confidence=conf)
+        return text, conf
+
+    def stage(self, name: str, _seconds: float) -> None:
+        kind = _STAGE_EVENTS.get(name)
+        if kind is not None:
+            self.emit(kind)
+
+
+class SatelliteService(sat_rpc.SatelliteServiceServicer):
+    """
+    StreamAudio: one ListenerHub room per connected satellite, sharing the hub's planner and
+    the ASR. With `cfg.wake`, the keyword spotter is loaded once, off the event loop, and its
+    session is shared by every stream's detector.
+    """
+
+    def __init__(self, hub: ListenerHub, asr: ASR, cfg: SatelliteConfig = SatelliteConfig()) -> None:
+        self.hub = hub
+        self.asr = asr
+        self.cfg = cfg
+        self.streams: Dict[str, SatelliteStream] = {}
+        self._wake_session: Optional[asyncio.Future] = None
+        self._log = logging.getLogger("SatelliteService")
+
+    async def warm(self) -> None:
+        """Load the wake model (if any) before the first satellite connects."""
+        if self.cfg.wake is not None:
+            await self._wake()
+
+    async def _wake(self):
+        if self._wake_session is None:
+            self._wake_session = asyncio.get_running_loop().run_in_executor(None, wake_session, self.cfg.wake)
+        return await asyncio.shield(self._wake_session)
+
+    async def StreamAudio(self, request_iterator: AsyncIterator[sat_pb.AudioChunk], context) -> None:
+        chunks = request_iterator.__aiter__()
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            return
+        error = _validate(first)
+        if error is not None:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, error)
+        session = await self._wake() if self.cfg.wake is not None else None
+        name = first.satellite_id
+        if name in self.hub.rooms:
+            await context.abort(grpc.StatusCode.ALREADY_EXISTS, f"satellite {name!r} is already connected")
+
+        stream = SatelliteStream(first, self.asr, self.cfg)
+        wake = OnnxWakeDetector(stream, self.cfg.wake, session=session) if session is not None else stream
+        self.hub.add_room(name, wake, EnergyVAD(stream, self.cfg.vad), stream, stage_hook=stream.stage)
+        self.streams[name] = stream
+        pump = asyncio.create_task(stream.pump(first, chunks), name=f"satellite:{name}:pump")
+        room = asyncio.create_task(self.hub.serve_room(name), name=f"room:{name}")
+        self._log.info("satellite %s connected (%s)", name, sat_pb.AudioCodec.Name(first.codec))
+        try:
+            if wake is not stream:
+                await wake.warm()
+            stream.emit(Event.KIND_READY)
+            await self._send_events(stream, pump, room, context)
+        finally:
+            for t in (pump, room):
+                t.cancel()
+            await asyncio.gather(pump, room, return_exceptions=True)
+            self.hub.rooms.pop(name, None)
+            del self.streams[name]
+            self._log.info("satellite %s disconnected (%d chunks, %d backpressure)",
+                           name, stream.stats.chunks, stream.stats.backpressure)
+
+    async def _send_events(self, stream: SatelliteStream, pump: asyncio.Task, room: asyncio.Task, context) -> None:
+        while True:
+            get = asyncio.ensure_future(stream.events.get())
+            done, _ = await asyncio.wait({get, pump, room} if not pump.done() else {get, room},
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if get in done:
+                await context.write(get.result())
+                continue
+            get.cancel()
+            if pump in done and pump.exception() is not None:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(pump.exception()))
+            if room.done():
+                while not stream.events.empty():  # what happened before the satellite hung up
+                    await context.write(stream.events.get_nowait())
+                exc = room.exception() if not room.cancelled() else None
+                if exc is not None and not isinstance(exc, EOFError):
+                    self._log.error("satellite %s: room failed: %r", stream.satellite_id, exc)
+                    await context.abort(grpc.StatusCode.INTERNAL, f"listener failed: {exc}")
+                return
+
+
+async def serve(host: str, port: int, hub: ListenerHub, asr: ASR, cfg: SatelliteConfig = SatelliteConfig()) -> None:
+    """SatelliteService on host:port in front of `hub`, until cancelled."""
+    service = SatelliteService(hub, asr, cfg)
+    await service.warm()
+    server = grpc.aio.server()
+    sat_rpc.add_SatelliteServiceServicer_to_server(service, server)
+    server.add_insecure_port(f"{host}:{port}")
+    await server.start()
+    logging.getLogger("SatelliteService").info("listening on %s:%d", host, port)
+    try:
+        await hub.run()
+    finally:
+        await server.stop(grace=None)
+
+
+def main() -> None:
+    from pyserver.listener.asr import BatchingASR, WhisperBatchDecoder
+
+    parser = argparse.ArgumentParser(description="SatelliteService: remote microphones into one listener hub")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=50075)
+    parser.add_argument("--scheduler", default="127.0.0.1:50070", help="SchedulerService address")
+    parser.add_argument("--whisper-model", default="base.en")
+    parser.add_argument("--wake-model", default=None, help="spot the wake word here; default: satellites flag it")
+    parser.add_argument("--intent-model", default=None, help="sentence encoder (.onnx) for the intent tier")
+    parser.add_argument("--plan-concurrency", type=int, default=1, help="LLM slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    async def run() -> None:
+        hub = ListenerHub(ListenerConfig(scheduler_addr=args.scheduler, intent_model=args.intent_model), plan_concurrency=args.plan_concurrency)
+        asr = BatchingASR(WhisperBatchDecoder(args.whisper_model))
+        cfg = SatelliteConfig(wake=WakeConfig(model_path=args.wake_model) if args.wake_model else None)
+        try:
+            await asr.warm()
+            await serve(args.host, args.port, hub, asr, cfg)
+        finally:
+            await asr.aclose()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# listener/vad.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from pyserver.listener.audio import SAMPLE_RATE, SAMPLE_WIDTH, AudioFrame, AudioSource, pcm_to_float
+from pyserver.listener.wake import EnergyGate
+
+
+@dataclass
+class VADConfig:
+    margin_db: float = 10.0
+    end_silence_s: float = 0.6     # gate closed this long after speech ends the utterance
+    no_speech_s: float = 3.0       # give up if nothing is said after the wake word
+    max_utterance_s: float = 15.0
+
+
+class EnergyVAD:
+    """
+    VAD over an AudioSource: collects blocks after the wake word until the energy gate
+    has been closed for `end_silence_s`. The blocks returned are the source's own objects
+    (no copy); the ASR joins them once.
+    """
+
+    def __init__(self, source: AudioSource, cfg: VADConfig = VADConfig()) -> None:
+        self.cfg = cfg
+        self._source = source
+        self._gate = EnergyGate(margin_db=cfg.margin_db, hangover_s=cfg.end_silence_s)
+
+    async def stream_until_eou(self, pre_roll: Sequence[AudioFrame]) -> Sequence[AudioFrame]:
+        frames: List[AudioFrame] = list(pre_roll)
+        heard = False
+        seconds = 0.0
+        while seconds < self.cfg.max_utterance_s:
+            frame = await self._source.read()
+            frames.append(frame)
+            seconds += len(frame) / (SAMPLE_RATE * SAMPLE_WIDTH)
+            if self._gate.update(pcm_to_float(frame)):
+                heard = True
+            elif heard or seconds >= self.cfg.no_speech_s:
+                break
+        return frames
@@ -0,0 +1,234 @@
+# listener/wake.py
+from __future__ import annotations
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+import numpy as np
+
+from pyserver.listener.audio import SAMPLE_RATE, AudioFrame, AudioSource, pcm_to_float
+
+_LOG_EPS = 1e-6
+
+
+# ===============================
+#        Log-mel frontend
+# ===============================
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int, fmin: float = 20.0, fmax: Optional[float] = None) -> np.ndarray:
+    """Triangular HTK-style mel filters, shape (n_fft // 2 + 1, n_mels)."""
+    fmax = fmax or sample_rate / 2
+    hz_to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+    mel_to_hz = lambda m: 700.0 * (10.0 ** (m / 2595.0) - 1.0)
+
+    bins = np.linspace(0.0, sample_rate / 2, n_fft // 2 + 1)
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    lo, mid, hi = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    up = (bins[None, :] - lo) / (mid - lo)
+    down = (hi - bins[None, :]) / (hi - mid)
+    return np.maximum(0.0, np.minimum(up, down)).T.astype(np.float32)
+
+
+class LogMelFrontend:
+    """
+    Incremental log-mel features. Only the STFT frames completed by each pushed block are
+    computed (one batched rfft + one matmul); the last `n_frames` rows are kept in a
+    double-written ring so window() is a contiguous, copy-free view.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = SAMPLE_RATE,
+        n_fft: int = 512,
+        win_length: int = 400,   # 25 ms
+        hop_length: int = 160,   # 10 ms
+        n_mels: int = 40,
+        n_frames: int = 98,      # ~1 s of context
+    ) -> None:
+        self.n_fft = n_fft
+        self.win_length = win_length
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.n_frames = n_frames
+        self._window = np.hanning(win_length).astype(np.float32)
+        self._mel = mel_filterbank(sample_rate, n_fft, n_mels)
+        self._ring = np.empty((2 * n_frames, n_mels), dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._ring.fill(np.log(_LOG_EPS))
+        self._pos = 0
+        self.filled = 0
+
+    def push(self, pcm: np.ndarray) -> int:
+        """Consume float32 samples; returns the number of new feature frames."""
+        buf = np.concatenate((self._tail, pcm)) if len(self._tail) else pcm
+        if len(buf) < self.win_length:
+            self._tail = buf
+            return 0
+        n = 1 + (len(buf) - self.win_length) // self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.win_length)[:: self.hop_length][:n]
+        spec = np.fft.rfft(frames * self._window, n=self.n_fft)
+        power = spec.real * spec.real + spec.imag * spec.imag
+        self._write(np.log(power.astype(np.float32) @ self._mel + _LOG_EPS))
+        self._tail = buf[n * self.hop_length:]
+        return n
+
+    def window(self) -> np.ndarray:
+        """Last n_frames feature rows, oldest first, shape (n_frames, n_mels)."""
+        return self._ring[self._pos:self._pos + self.n_frames]
+
+    def _write(self, rows: np.ndarray) -> None:
+        n, cap = len(rows), self.n_frames
+        if n >= cap:
+            rows, n = rows[-cap:], cap
+        first = min(n, cap - self._pos)
+        for base in (0, cap):
+            self._ring[base + self._pos:base + self._pos + first] = rows[:first]
+            self._ring[base:base + n - first] = rows[first:]
+        self._pos = (self._pos + n) % cap
+        self.filled = min(cap, self.filled + n)
+
+
+# ===============================
+#          Energy gate
+# ===============================
+class EnergyGate:
+    """
+    Opens when block energy rises `margin_db` above a slowly adapting noise floor and
+    stays open for `hangover_s` so trailing syllables still reach the model.
+    """
+
+    def __init__(self, margin_db: float = 10.0, min_db: float = -60.0, hangover_s: float = 0.5, adapt: float = 0.01) -> None:
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.hangover_s = hangover_s
+        self.adapt = adapt
+        self.floor_db = min_db
+        self._open_for = 0.0
+
+    def update(self, pcm: np.ndarray) -> bool:
+        db = 10.0 * np.log10(float(np.dot(pcm, pcm)) / max(1, len(pcm)) + 1e-10)
+        if db < self.floor_db:
+            self.floor_db = db
+        else:
+            self.floor_db += self.adapt * (db - self.floor_db)
+        if db > max(self.floor_db + self.margin_db, self.min_db):
+            self._open_for = self.hangover_s
+            return True
+        self._open_for -= len(pcm) / SAMPLE_RATE
+        return self._open_for > 0.0
+
+
+# ===============================
+#      ONNX keyword spotter
+# ===============================
+@dataclass
+class WakeConfig:
+    model_path: str
+    threshold: float = 0.6
+    keyword_index: int = 1       # class index when the model emits per-class scores
+    patience: int = 2            # consecutive hits required
+    infer_hop_ms: int = 40       # model stride while the gate is open
+    n_mels: int = 40
+    n_frames: int = 98
+    gate_margin_db: float = 10.0
+    threads: int = 1
+    pre_roll_blocks: int = 4     # last blocks before detection, handed to the VAD (see `pre_roll`)
+
+
+@dataclass
+class WakeStats:
+    blocks: int = 0
+    gated_blocks: int = 0
+    inferences: int = 0
+    last_score: float = 0.0
+
+
+def wake_session(cfg: WakeConfig):
+    """The keyword spotter's InferenceSession. run() is thread-safe, so detectors on several sources can share one."""
+    import onnxruntime as ort
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = cfg.threads
+    opts.inter_op_num_threads = 1
+    opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(cfg.model_path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+
+class OnnxWakeDetector:
+    """
+    WakeDetector backed by an ONNX keyword-spotting model fed with log-mel features.
+
+    The model input is (1, n_frames, n_mels) or (1, 1, n_frames, n_mels); the output is either
+    a single probability or per-class probabilities indexed by `keyword_index`.
+
+    The last `pre_roll_blocks` blocks read while waiting stay in `pre_roll`, so speech that
+    starts while the detector is still confirming the keyword is not clipped. Pass `session`
+    (see `wake_session`) to share one loaded model between detectors.
+    """
+
+    def __init__(self, source: AudioSource, cfg: WakeConfig, session=None) -> None:
+        self.cfg = cfg
+        self._source = source
+        self._log = logging.getLogger("WakeDetector")
+        self._frontend = LogMelFrontend(n_mels=cfg.n_mels, n_frames=cfg.n_frames)
+        self._gate = EnergyGate(margin_db=cfg.gate_margin_db)
+        self.stats = WakeStats()
+        self.pre_roll: Deque[AudioFrame] = deque(maxlen=cfg.pre_roll_blocks)
+        self._session = session if session is not None else wake_session(cfg)
+        inp = self._session.get_inputs()[0]
+        self._input_name = inp.name
+        self._input_rank = len(inp.shape)
+        self._infer_every = max(1, cfg.infer_hop_ms * SAMPLE_RATE // 1000 // self._frontend.hop_length)
+
+    async def wait_for_hotword(self) -> None:
+        hits = 0
+        since_infer = self._infer_every
+        self.pre_roll.clear()
+        while True:
+            frame = await self._source.read()
+            self.pre_roll.append(frame)
+            pcm = pcm_to_float(frame)
+            self.stats.blocks += 1
+            since_infer += self._frontend.push(pcm)
+
+            if not self._gate.update(pcm):
+                self.stats.gated_blocks += 1
+                hits = 0
+                continue
+            if self._frontend.filled < self._frontend.n_frames or since_infer < self._infer_every:
+                continue
+
+            since_infer = 0
+            score = await self._score()
+            if score >= self.cfg.threshold:
+                hits += 1
+                if hits >= self.cfg.patience:
+                    self._log.info("Hotword detected (score=%.2f)", score)
+                    self._frontend.reset()
+                    return
+            else:
+                hits = 0
+
+    async def warm(self) -> None:
+        """One inference on silence, so the session's buffers are allocated before the first wake word."""
+        await self._run(np.zeros_like(self._frontend.window()))
+
+    async def _score(self) -> float:
+        out = np.asarray((await self._run(self._frontend.window()))[0]).reshape(-1)
+        score = float(out[0] if out.size == 1 else out[self.cfg.keyword_index])
+        self.stats.inferences += 1
+        self.stats.last_score = score
+        return score
+
+    async def _run(self, window: np.ndarray) -> list:
+        """Inference off the event loop; other rooms' audio and RPCs keep moving meanwhile."""
+        x = window[None, ...]
+        if self._input_rank == 4:
+            x = x[:, None, ...]
+        return await asyncio.get_running_loop().run_in_executor(None, self._session.run, None, {self._input_name: x})
@@ -13,7 +13,9 @@ import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_
 import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
 
 # Your Pydantic models from the previous step
-from .models import ToolCallModel, TaskModel, PlanModel, Priority
+from .models import ToolCallModel, TaskModel, Priority
+from pyserver.scheduler.engine import TIMEZONE_META_KEY
+from pyserver.scheduler.when import trigger_for
 
 
 class SchedulerClient:
@@ -59,21 +61,23 @@ class SchedulerClient:
         task_id: Optional[str] = None,
     ) -> sched_pb.ScheduleTaskResponse:
         """
-        Convert a ToolCallModel into Task and call ScheduleTask.
+        Convert a ToolCallModel into Task and call ScheduleTask. `when` is "now", a
+        timedelta, a datetime (naive: wall time in `timezone`) or a phrase such as
+        "in 90 seconds", "tomorrow at 9" or "every weekday at 8" (see scheduler.when);
+        raises ValueError for a phrase it cannot read.
         """
         assert self._stub is not None, "call start() first"
 
         # Build protobuf Task
-        task_model = TaskModel(task_id=task_id, call=call, priority=priority, meta=meta or {})
-        task_pb = task_model.to_proto(models_pb)
+        task_model = TaskModel(task_id=task_id, call=call, priority=priority, meta={TIMEZONE_META_KEY: timezone, **(meta or {})})
+        task_pb = task_model.to_proto()
 
-
-        req = sched_pb.ScheduleTaskRequest(task=task_pb)
+        req = sched_pb.ScheduleTaskRequest(task=task_pb, trigger=trigger_for(when, timezone))
         return await self._stub.ScheduleTask(req)
 
     async def schedule_plan(
         self,
-        plan: PlanModel,
+        plan: Any,  # .actions: [(tool, args, when)]
         *,
         timezone: str = "Asia/Nicosia",
         default_priority: Priority = Priority.PRIORITY_NORMAL,
@@ -0,0 +1,242 @@
+# llm/intent.py
+"""
+Embedding intent classifier: the tier PlannerRouter tries before any LLM call.
+
+A small sentence encoder (ONNX, run with onnxruntime; e.g. an all-MiniLM-L6-v2 export
+with its tokenizer.json) embeds the utterance, and the embedding is compared with a
+precomputed matrix of exemplar embeddings, one block per intent. Each intent scores the
+mean cosine of its top_k nearest exemplars; the best intent is accepted when it scores
+at least `threshold` and beats the runner-up by `margin`, and its arguments can be read
+off the utterance (minutes from the time expression, a known sound id, the text after
+"say"). Everything else -- low confidence, the "llm" intent (questions, chit-chat,
+things no tool does), missing arguments -- goes to the LLM.
+
+Exemplars are JSONL, indexed once at startup (load(), from PlannerRouter.warm):
+
+    {"intent": "timer", "text": "set a timer for ten minutes"}
+    {"intent": "play_sound", "text": "play the chime", "args": {"sound_id": "chime"}}
+    {"intent": "llm", "text": "what's the weather like"}
+
+The sound ids play_sound can fill come from the exemplars' args.
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from pyserver.llm.models import PlaySoundArgsModel, SpeakArgsModel, TimerArgsModel, ToolCallModel, Tools
+from pyserver.scheduler.when import find_duration, find_when
+
+# Exemplars of requests only the LLM can serve; the nearest match being one of these escalates.
+ESCALATE = "llm"
+
+_SAY = re.compile(r"^(?:please\s+)?(?:(?:can|could|would) you\s+)?(?:say|repeat after me|announce(?:\s+that)?)\b[\s:,]*(?P<text>.+?)[\s.!?]*$",
+                  re.IGNORECASE)
+_REMIND = re.compile(r"^(?:please\s+)?remind me\s+(?:to|that|about)\s+(?P<text>.+?)[\s.!?]*$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z]+")
+_TIMES = re.compile(r"\b(once|twice|thrice|\d+|two|three|four|five|six|seven|eight|nine|ten) times\b|\b(once|twice|thrice)\b",
+                    re.IGNORECASE)
+_COUNTS = {"once": 1, "twice": 2, "thrice": 3, **{w: i for i, w in enumerate(
+    "two three four five six seven eight nine ten".split(), 2)}}
+
+
+@dataclass
+class IntentConfig:
+    model_path: str                        # sentence encoder (.onnx)
+    tokenizer_path: Optional[str] = None   # HF tokenizer.json; default: next to the model
+    exemplars_path: str = "data/intents/exemplars.jsonl"
+    top_k: int = 3             # nearest exemplars averaged per intent
+    threshold: float = 0.7     # best intent's score below this -> LLM (calibrate per encoder: bench.intent)
+    margin: float = 0.05       # best intent within this of the runner-up -> LLM
+    max_tokens: int = 64
+    threads: int = 1
+    cache_size: int = 1024     # utterance embeddings kept (repeated commands skip the encoder)
+
+
+@dataclass
+class IntentMatch:
+    intent: str
+    confidence: float
+    margin: float
+    toolcall: Optional[ToolCallModel] = None  # None -> ask the LLM
+    reason: str = ""                          # why it was not accepted
+
+
+class Encoder(Protocol):
+    """Texts -> [n, dim] float32 embeddings with unit-norm rows."""
+    def encode(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+class OnnxEncoder:
+    """
+    Sentence encoder over an ONNX transformer export. Feeds whichever of input_ids /
+    attention_mask / token_type_ids the graph declares; a [batch, tokens, dim] output is
+    mean-pooled over the attention mask, a [batch, dim] one is taken as pooled already.
+    """
+
+    def __init__(self, model_path: str, tokenizer_path: Optional[str] = None, *, max_tokens: int = 64,
+                 threads: int = 1) -> None:
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path or os.path.join(os.path.dirname(model_path), "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.enable_padding()
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        self._inputs = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        enc = self.tokenizer.encode_batch(list(texts))
+        ids = np.asarray([e.ids for e in enc], dtype=np.int64)
+        mask = np.asarray([e.attention_mask for e in enc], dtype=np.int64)
+        feed = {"input_ids": ids, "attention_mask": mask, "token_type_ids": np.zeros_like(ids)}
+        out = self.session.run(None, {name: feed[name] for name in self._inputs})[0]
+        if out.ndim == 3:
+            m = mask[:, :, None].astype(np.float32)
+            out = (out * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1.0)
+        return _normalize(out.astype(np.float32))
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)
+
+
+class IntentIndex:
+    """
+    Exemplar embeddings as one [n, dim] matrix plus, per intent, the row numbers of its
+    exemplars (padded to the largest intent), so scoring a batch of queries is a matrix
+    product, a gather and a partition -- no Python loop over intents or exemplars.
+    """
+
+    def __init__(self, intents: Sequence[str], vectors: np.ndarray, labels: Sequence[str], top_k: int) -> None:
+        self.intents = list(intents)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        rows = [[i for i, label in enumerate(labels) if label == name] for name in self.intents]
+        width = max(map(len, rows))
+        self._rows = np.asarray([r + [0] * (width - len(r)) for r in rows], dtype=np.int64)   # [intents, width]
+        self._valid = np.asarray([[True] * len(r) + [False] * (width - len(r)) for r in rows])
+        self.k = min(top_k, width)
+        self._k_per_intent = np.minimum([len(r) for r in rows], self.k).astype(np.float32)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """[batch, dim] unit vectors -> [batch, intents] mean cosine of each intent's top_k exemplars."""
+        sims = queries @ self.vectors.T                                  # [batch, n]
+        block = np.where(self._valid, sims[:, self._rows], -np.inf)     # [batch, intents, width]
+        top = -np.partition(-block, self.k - 1, axis=-1)[..., :self.k]   # k best per intent, unordered
+        return np.where(np.isfinite(top), top, 0.0).sum(axis=-1) / self._k_per_intent
+
+
+class IntentClassifier:
+    """Utterance -> IntentMatch; a ToolCallModel when it is confident and has the arguments."""
+
+    def __init__(self, cfg: IntentConfig, encoder: Optional[Encoder] = None) -> None:
+        self.cfg = cfg
+        self.encoder = encoder
+        self.index: Optional[IntentIndex] = None
+        self.sounds: frozenset = frozenset()
+        self._lock = threading.Lock()
+        self._embed = lru_cache(maxsize=cfg.cache_size)(self._embed_one)
+        self._log = logging.getLogger("IntentClassifier")
+
+    def load(self) -> None:
+        """Create the encoder and embed every exemplar (blocking; run off the event loop)."""
+        with self._lock:
+            if self.index is not None:
+                return
+            if self.encoder is None:
+                self.encoder = OnnxEncoder(self.cfg.model_path, self.cfg.tokenizer_path,
+                                           max_tokens=self.cfg.max_tokens, threads=self.cfg.threads)
+            texts, labels, sounds = load_exemplars(self.cfg.exemplars_path)
+            vectors = np.concatenate([self.encoder.encode(texts[i:i + 64]) for i in range(0, len(texts), 64)])
+            self.sounds = frozenset(sounds)
+            self.index = IntentIndex(sorted(set(labels)), vectors, labels, self.cfg.top_k)
+            self._log.info("indexed %d exemplars for %s", len(texts), ", ".join(self.index.intents))
+
+    def classify(self, text: str) -> IntentMatch:
+        if self.index is None:
+            self.load()
+        assert self.index is not None
+        return self.decide(text, self.index.scores(self._embed(text.strip().lower())[None, :])[0])
+
+    def decide(self, text: str, scores: np.ndarray) -> IntentMatch:
+        """Threshold, margin and slot filling for one utterance's per-intent scores."""
+        assert self.index is not None
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        margin = best - float(scores[order[1]]) if len(order) > 1 else best
+        match = IntentMatch(self.index.intents[order[0]], best, margin)
+        if match.intent == ESCALATE:
+            match.reason = "llm intent"
+        elif best < self.cfg.threshold:
+            match.reason = "low confidence"
+        elif margin < self.cfg.margin:
+            match.reason = "ambiguous"
+        else:
+            match.toolcall = self.fill(match.intent, text)
+            if match.toolcall is None:
+                match.reason = "missing arguments"
+        return match
+
+    def fill(self, intent: str, text: str) -> Optional[ToolCallModel]:
+        """Arguments for `intent` read off the utterance, or None when they are not all there."""
+        when = find_when(text)
+        if intent == Tools.TIMER.value:
+            secs = find_duration(text) if when is None else when.delay_s if when.kind == "delay" else 0.0
+            if not secs or secs < 60:
+                return None  # "a timer at 7" or "for 30 seconds": minutes are the LLM's call
+            return ToolCallModel(timer=TimerArgsModel(minutes=round(secs / 60)))
+        if intent == Tools.PLAY_SOUND.value:
+            words = _WORD.findall(text.lower())
+            sound = next((w for w in words if w in self.sounds), None) or \
+                next((w[:-1] for w in words if w.endswith("s") and w[:-1] in self.sounds), None)
+            if sound is None:
+                return None
+            times = _TIMES.search(text)
+            count = (times.group(1) or times.group(2)).lower() if times else ""
+            repeat = int(count) if count.isdigit() else _COUNTS.get(count, 0)
+            return ToolCallModel(play_sound=PlaySoundArgsModel(sound_id=sound, repeat=repeat))
+        if intent == Tools.SPEAK.value:
+            bare = f"{text[:when.start]} {text[when.end:]}" if when is not None else text
+            bare = " ".join(bare.split())
+            if m := _SAY.match(bare):
+                said = m.group("text").strip("\"'“”")
+                return ToolCallModel(speak=SpeakArgsModel(text=said[:1].upper() + said[1:]))
+            if m := _REMIND.match(bare):
+                return ToolCallModel(speak=SpeakArgsModel(text=f"Reminder: {m.group('text')}."))
+        return None
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        assert self.encoder is not None
+        return self.encoder.encode([text])[0]
+
+
+def load_exemplars(path: str) -> Tuple[List[str], List[str], set]:
+    """(texts, intents, sound ids) from an exemplar JSONL file."""
+    known = {t.value for t in Tools} | {ESCALATE}
+    texts: List[str] = []
+    labels: List[str] = []
+    sounds: set = set()
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            if obj["intent"] not in known:
+                raise ValueError(f"{path}:{n}: unknown intent {obj['intent']!r}")
+            texts.append(obj["text"].strip().lower())
+            labels.append(obj["intent"])
+            sound = obj.get("args", {}).get("sound_id")
+            if sound:
+                sounds.add(sound.lower())
+    return texts, labels, sounds
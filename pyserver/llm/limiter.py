@@ -0,0 +1,100 @@
+# llm/limiter.py
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import math
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.scheduler.timers import priority_rank
+
+
+class StaleRequest(TimeoutError):
+    """The request's deadline passed before it got a slot; it was never sent."""
+
+
+@dataclass
+class LimiterStats:
+    granted: int = 0
+    dropped: int = 0
+    max_waiting: int = 0
+
+
+class PriorityLimiter:
+    """
+    Concurrency limit in front of a shared backend (the local inference server).
+
+    Like asyncio.Semaphore, but a freed slot goes to the waiter with the best
+    (priority, deadline, arrival) rather than the oldest, and a waiter whose deadline
+    passes is failed with StaleRequest instead of being sent late: an answer the user has
+    stopped waiting for would only delay the ones still wanted. Deadlines are loop.time()
+    values.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self._limit = limit
+        self._active = 0
+        self._waiters: List[list] = []  # [rank, deadline, seq, future]
+        self._seq = itertools.count()
+        self.stats = LimiterStats()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w[3].done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int = models_pb.PRIORITY_NORMAL, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        await self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = models_pb.PRIORITY_NORMAL, deadline: Optional[float] = None) -> None:
+        loop = asyncio.get_running_loop()
+        if deadline is not None and deadline <= loop.time():
+            self.stats.dropped += 1
+            raise StaleRequest("deadline passed before the request was queued")
+        if self._active < self._limit:  # implies nobody is queued: release() drains waiters first
+            self._active += 1
+            self.stats.granted += 1
+            return
+
+        fut = loop.create_future()
+        heapq.heappush(self._waiters, [priority_rank(priority), deadline if deadline is not None else math.inf, next(self._seq), fut])
+        self.stats.max_waiting = max(self.stats.max_waiting, len(self._waiters))
+        timer = loop.call_at(deadline, self._expire, fut) if deadline is not None else None
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                self.release()  # granted just as the caller was cancelled: pass it on
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def release(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            fut = heapq.heappop(waiters)[3]
+            if not fut.done():
+                fut.set_result(None)  # hand the slot over; _active is unchanged
+                self.stats.granted += 1
+                return
+        self._active -= 1
+
+    def _expire(self, fut: asyncio.Future) -> None:
+        if not fut.done():
+            fut.set_exception(StaleRequest("deadline passed while queued"))
+            self.stats.dropped += 1
@@ -1,36 +1,67 @@
 # core/llm.py
 import json
-from pathlib import Path
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
-import ollama
 from pydantic import ValidationError
 
-from pyserver.llm.models import ToolCallModel, Tools, SpeakArgsModel
+from pyserver.llm.models import ToolCallModel, SpeakArgsModel
+from pyserver.llm.prompt import PromptBuilder
 
+if TYPE_CHECKING:
+    import ollama  # ~300 ms (httpx/httpcore); imported on the first request instead
 
-def _system_prompt() -> str:
-    system = Path("data/prompts/system.txt").read_text()
-    # Use enum *values* ("speak", "timer", "play_sound"), not names ("SPEAK", ...)
-    allowed = ", ".join(sorted(t.value for t in Tools))
-    return system.replace("{ALLOWED_TOOLS}", allowed)
 
+@lru_cache(maxsize=1)
+def _prompts() -> PromptBuilder:
+    # data/prompts/system.txt + data/prompts/tools/<tool>.txt for the registered tools
+    return PromptBuilder()
 
-def toolcall_from_text(user_text: str, model: str = "llama3.1:8b-instruct") -> ToolCallModel:
-    sys = _system_prompt()
-    messages = [
-        {"role": "system", "content": sys},
+
+@lru_cache(maxsize=8)
+def _client(host: Optional[str]) -> "ollama.Client":
+    import ollama
+    # host=None -> OLLAMA_HOST or localhost:11434
+    return ollama.Client(host=host)
+
+
+def messages_for(user_text: str, history: Sequence[dict] = (), prompts: Optional[PromptBuilder] = None) -> list[dict]:
+    """System prompt (for the tools relevant to the utterance), earlier turns (see llm.memory) and the new utterance."""
+    return [
+        {"role": "system", "content": (prompts or _prompts()).system(user_text, history)},
+        *history,
         {"role": "user", "content": user_text},
     ]
-    res = ollama.chat(model=model, messages=messages)
-    raw = res["message"]["content"]
 
+
+def parse_toolcall(raw: str) -> Tuple[Optional[ToolCallModel], float]:
+    """
+    Parse a model reply into (toolcall, confidence). An optional top-level "confidence"
+    in [0, 1] is honoured (default 1.0); unparseable or invalid replies give (None, 0.0).
+    """
     try:
         obj = json.loads(raw)
         # LLM should output JSON matching ToolCallModel schema
         parsed = ToolCallModel.model_validate(obj)
-        return parsed
     except (json.JSONDecodeError, ValidationError):
-        # Failsafe: just speak an apology, no tools
-        return ToolCallModel(
-            speak=SpeakArgsModel(text="Sorry, I didn’t catch that.").model_dump()
-        )
+        return None, 0.0
+    conf = obj.get("confidence", 1.0)
+    return parsed, float(conf) if isinstance(conf, (int, float)) else 1.0
+
+
+def apology() -> ToolCallModel:
+    return ToolCallModel(
+        speak=SpeakArgsModel(text="Sorry, I didn’t catch that.").model_dump()
+    )
+
+
+def toolcall_from_text(
+    user_text: str,
+    model: str = "llama3.1:8b-instruct",
+    host: Optional[str] = None,
+    history: Sequence[dict] = (),
+) -> ToolCallModel:
+    res = _client(host).chat(model=model, messages=messages_for(user_text, history))
+    parsed, _conf = parse_toolcall(res["message"]["content"])
+    # Failsafe: just speak an apology, no tools
+    return parsed if parsed is not None else apology()
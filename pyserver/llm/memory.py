@@ -0,0 +1,142 @@
+# llm/memory.py
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional, Protocol, Sequence
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token (Llama-family BPE on English); cheap and close enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+class Summarizer(Protocol):
+    async def summarize(self, summary: str, turns: Sequence[dict]) -> str: ...
+
+
+@dataclass
+class MemoryConfig:
+    budget_tokens: int = 1024   # recent turns (+ summary) sent with each plan
+    keep_recent: int = 4        # turns never folded into the summary
+    target: float = 0.5         # a compaction shrinks the verbatim turns to target * budget
+    idle_reset_s: float = 300.0  # a pause this long starts a new conversation; 0 -> never
+
+
+@dataclass
+class Turn:
+    role: str
+    content: str
+    tokens: int
+    message: dict = field(repr=False)  # built once; prompt assembly reuses it
+
+
+class ConversationMemory:
+    """
+    Recent turns of one conversation, kept within a token budget.
+
+    Each turn's token count is taken once when it is added and a running total is kept,
+    so checking the budget and assembling the prompt never re-count. When the verbatim
+    turns exceed `budget_tokens`, the oldest ones (all but `keep_recent`) are folded into
+    a rolling summary by a background task: the request that crossed the budget is not
+    delayed, and the turns stay in the prompt until their summary has replaced them.
+    """
+
+    def __init__(self, summarizer: Summarizer, cfg: Optional[MemoryConfig] = None,
+                 count: Callable[[str], int] = estimate_tokens, clock: Callable[[], float] = time.monotonic) -> None:
+        self.cfg = cfg or MemoryConfig()
+        self.summaries = 0
+        self._summarizer = summarizer
+        self._count = count
+        self._clock = clock
+        self._turns: Deque[Turn] = deque()
+        self._tokens = 0
+        self._summary: Optional[Turn] = None
+        self._messages: Optional[List[dict]] = None  # cached prompt; None -> rebuild
+        self._last = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._generation = 0  # bumped by reset(); a compaction from before it is discarded
+        self._log = logging.getLogger("Memory")
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens + (self._summary.tokens if self._summary else 0)
+
+    @property
+    def summary(self) -> str:
+        return self._summary.content if self._summary else ""
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def add(self, role: str, content: str) -> None:
+        self._expire()
+        tokens = self._count(content)
+        self._turns.append(Turn(role, content, tokens, {"role": role, "content": content}))
+        self._tokens += tokens
+        self._messages = None
+        self._last = self._clock()
+        if self._tokens > self.cfg.budget_tokens and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._compact(), name="memory-compact")
+
+    def messages(self) -> List[dict]:
+        """History for the next prompt: the summary (as a system message), then recent turns."""
+        self._expire()
+        if self._messages is None:
+            head = [self._summary.message] if self._summary else []
+            self._messages = head + [t.message for t in self._turns]
+        return self._messages
+
+    def reset(self) -> None:
+        self._turns.clear()
+        self._tokens = 0
+        self._summary = None
+        self._messages = None
+        self._generation += 1
+
+    async def wait_idle(self) -> None:
+        """Wait for a running compaction (benchmarks, shutdown)."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _expire(self) -> None:
+        if self.cfg.idle_reset_s and self._turns and self._clock() - self._last > self.cfg.idle_reset_s:
+            self.reset()
+
+    async def _compact(self) -> None:
+        # Only turns present now are folded; anything added meanwhile waits for the next round.
+        generation = self._generation
+        goal = self.cfg.budget_tokens * self.cfg.target
+        n, remaining = 0, self._tokens
+        for t in self._turns:
+            if remaining <= goal or len(self._turns) - n <= self.cfg.keep_recent:
+                break
+            n += 1
+            remaining -= t.tokens
+        if not n:
+            return
+        old = [self._turns[i].message for i in range(n)]
+        try:
+            text = (await self._summarizer.summarize(self.summary, old)).strip()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._log.exception("Summarizing %d turns failed; dropping them", n)
+            text = self.summary
+        if generation != self._generation:
+            return
+        for _ in range(n):
+            self._tokens -= self._turns.popleft().tokens
+        content = f"Earlier in this conversation: {text}" if text else ""
+        self._summary = Turn("system", content, self._count(content), {"role": "system", "content": content}) if text else None
+        self._messages = None
+        self.summaries += 1
+        self._log.debug("Folded %d turns into the summary (%d tokens now)", n, self.tokens)
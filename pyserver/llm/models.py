@@ -2,18 +2,19 @@ from __future__ import annotations
 from enum import Enum
 from typing import Optional, Dict, Any
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 # Import your generated messages once here.
 # Adjust to your path, e.g.:
 # from assistant.v1 import assistant_pb2 as models_pb
 from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
 
+from pyserver.tools.catalog import TOOLS
+from pyserver.tools.registry import ToolSpec
 
-class Tools(str, Enum):
-    SPEAK = "speak"
-    TIMER = "timer"
-    PLAY_SOUND = "play_sound"
+
+# One member per registered tool (Tools.PLAY_SOUND == "play_sound"), in catalog order.
+Tools = Enum("Tools", [(name.upper(), name) for name in TOOLS.names()], type=str)  # type: ignore[misc]
 
 
 class Priority(str, Enum):
@@ -53,66 +54,47 @@ class ToolCallModel(BaseModel):
     speak: Optional[SpeakArgsModel] = None
     timer: Optional[TimerArgsModel] = None
     play_sound: Optional[PlaySoundArgsModel] = None
+    _which: str = PrivateAttr(default="")
 
     @model_validator(mode="after")
     def _validate_oneof(self) -> "ToolCallModel":
-        set_count = sum(v is not None for v in (self.speak, self.timer, self.play_sound))
-        if set_count != 1:
-            raise ValueError("Exactly one of {'speak','timer','play_sound'} must be provided")
+        given = [name for name in self.model_fields_set if name in TOOLS and getattr(self, name) is not None]
+        if len(given) != 1:
+            raise ValueError(f"Exactly one of {'/'.join(TOOLS.names())} must be provided")
+        self._which = given[0]
         return self
 
     @staticmethod
     def from_action(tool: Tools, args: Dict[str, Any]) -> "ToolCallModel":
-        if tool == Tools.SPEAK:
-            return ToolCallModel(speak=SpeakArgsModel(**args))
-        if tool == Tools.TIMER:
-            return ToolCallModel(timer=TimerArgsModel(**args))
-        if tool == Tools.PLAY_SOUND:
-            return ToolCallModel(play_sound=PlaySoundArgsModel(**args))
-        raise ValueError(f"Unsupported tool: {tool}")
+        spec = TOOLS[Tools(tool).value]
+        return ToolCallModel(**{spec.name: spec.model(**args)})
 
     def which(self) -> Tools:
-        if self.speak is not None:
-            return Tools.SPEAK
-        if self.timer is not None:
-            return Tools.TIMER
-        return Tools.PLAY_SOUND
+        return Tools(self._spec().name)
 
     def to_proto(self) -> models_pb.ToolCall:
         call = models_pb.ToolCall()
-        if self.speak is not None:
-            call.speak.CopyFrom(models_pb.SpeakArgs(**self.speak.model_dump(exclude_none=True)))
-        elif self.timer is not None:
-            call.timer.CopyFrom(models_pb.TimerArgs(**self.timer.model_dump(exclude_none=True)))
-        else:
-            call.play_sound.CopyFrom(models_pb.PlaySoundArgs(**self.play_sound.model_dump(exclude_none=True)))
+        spec = self._spec()
+        getattr(call, spec.name).CopyFrom(spec.to_proto(getattr(self, spec.name)))
         return call
 
     @staticmethod
     def from_proto(call_pb: models_pb.ToolCall) -> "ToolCallModel":
         which = call_pb.WhichOneof("payload")
-        if which == "speak":
-            return ToolCallModel(
-                speak=SpeakArgsModel(
-                    text=call_pb.speak.text,
-                    voice_id=call_pb.speak.voice_id or None,
-                )
-            )
-        if which == "timer":
-            return ToolCallModel(
-                timer=TimerArgsModel(
-                    minutes=call_pb.timer.minutes,
-                    label=call_pb.timer.label or None,
-                )
-            )
-        if which == "play_sound":
-            return ToolCallModel(
-                play_sound=PlaySoundArgsModel(
-                    sound_id=call_pb.play_sound.sound_id,
-                    repeat=call_pb.play_sound.repeat or 0,
-                )
-            )
-        raise ValueError("Empty ToolCall payload")
+        if which is None:
+            raise ValueError("Empty ToolCall payload")
+        spec = TOOLS[which]
+        return ToolCallModel(**{which: spec.from_proto(getattr(call_pb, which))})
+
+    def _spec(self) -> ToolSpec:
+        return TOOLS[self._which]
+
+
+# The payload fields above are what planners and callers type-check against; a tool
+# registered without one could never be planned.
+_unplannable = [name for name in TOOLS.names() if name not in ToolCallModel.model_fields]
+if _unplannable:
+    raise RuntimeError(f"registered tools without a ToolCallModel field: {', '.join(_unplannable)}")
 
 
 class TaskModel(BaseModel):
@@ -150,3 +132,4 @@ class TaskModel(BaseModel):
             priority=Priority(prio_name),
             meta=dict(task_pb.meta),
         )
+
@@ -0,0 +1,171 @@
+# llm/prompt.py
+"""
+System prompts that describe only the tools an utterance may need.
+
+Each tool's schema and examples live in their own file, `<tools_dir>/<name>.txt`, whose
+first line lists the words that make it relevant:
+
+    # keywords: timer, countdown, minutes, alarm
+    timer: start a countdown that goes off after a number of minutes.
+      args: {"minutes": <integer>, "label": "<optional name>"}
+      User: "set a 10 minute timer"
+      JSON: {"timer": {"minutes": 10}}
+
+Small catalogs (up to `filter_above` tools) go into every prompt whole. Larger ones are
+filtered per utterance: every tool is scored by the IDF-weighted keywords the utterance
+contains (plus, with an encoder, the cosine between the utterance and the tool's
+snippet), and the best `max_tools` are kept, together with the `always` tools and any
+tool the conversation history already called (so "make it ten" still sees the timer).
+Nothing relevant leaves just `always` -- "speak", which answers or apologises.
+
+The system template puts the tools last, so every variant starts with the same text and
+the server can reuse that prefix's KV cache. Selections (per utterance) and rendered
+prompts (per tool set, in catalog order) are both LRU-cached.
+"""
+from __future__ import annotations
+import json
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pyserver.llm.intent import Encoder, OnnxEncoder
+from pyserver.tools.catalog import TOOLS
+
+_WORD = re.compile(r"[a-z0-9]+")
+_KEYWORDS = "# keywords:"
+
+
+@dataclass
+class PromptConfig:
+    system_path: str = "data/prompts/system.txt"
+    tools_dir: str = "data/prompts/tools"
+    tools: Optional[Sequence[str]] = None  # catalog, in prompt order; None -> the registered TOOLS
+    always: Tuple[str, ...] = ("speak",)   # in every prompt: answers and apologies
+    filter_above: int = 8       # catalogs this small are never filtered
+    max_tools: int = 6          # relevant tools kept per utterance (besides `always` and history)
+    model_path: Optional[str] = None       # sentence encoder (see llm.intent) for embedding relevance
+    tokenizer_path: Optional[str] = None
+    min_similarity: float = 0.35           # cosine at which a tool counts as relevant without a keyword
+    cache_size: int = 1024      # utterance selections and rendered variants kept
+
+
+@dataclass
+class ToolSnippet:
+    name: str
+    text: str                   # what goes into the prompt
+    keywords: frozenset
+
+
+def load_snippet(path: Path) -> ToolSnippet:
+    keywords: set = set()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    while lines and lines[0].startswith("#"):
+        head = lines.pop(0)
+        if head.lower().startswith(_KEYWORDS):
+            keywords.update(k.strip().lower() for k in head[len(_KEYWORDS):].split(",") if k.strip())
+    keywords.update(_WORD.findall(path.stem.lower()))  # "play_sound" -> play, sound
+    return ToolSnippet(path.stem, "\n".join(lines).strip(), frozenset(keywords))
+
+
+def _words(text: str) -> set:
+    words = set(_WORD.findall(text.lower()))
+    return words | {w[:-1] for w in words if len(w) > 3 and w.endswith("s")}
+
+
+class PromptBuilder:
+    """Utterance (+ history) -> the system prompt for the tools it may need."""
+
+    def __init__(self, cfg: Optional[PromptConfig] = None, encoder: Optional[Encoder] = None) -> None:
+        self.cfg = cfg or PromptConfig()
+        self.encoder = encoder
+        self.snippets: Dict[str, ToolSnippet] = {}
+        self._template = ""
+        self._weights: Dict[str, Dict[str, float]] = {}   # keyword -> {tool: idf}
+        self._vectors: Optional[np.ndarray] = None         # [tools, dim], catalog order
+        self._lock = threading.Lock()
+        self._select = lru_cache(maxsize=self.cfg.cache_size)(self._select_one)
+        self._render = lru_cache(maxsize=self.cfg.cache_size)(self._render_one)
+        self._log = logging.getLogger("PromptBuilder")
+
+    @property
+    def filtered(self) -> bool:
+        return len(self.snippets) > self.cfg.filter_above
+
+    def load(self) -> None:
+        """Read the template and snippets (and embed them, with an encoder); blocking."""
+        with self._lock:
+            if self._template:
+                return
+            cfg = self.cfg
+            names = list(cfg.tools) if cfg.tools is not None else TOOLS.names()
+            snippets = {n: load_snippet(Path(cfg.tools_dir) / f"{n}.txt") for n in names}
+            missing = [n for n in cfg.always if n not in snippets]
+            if missing:
+                raise ValueError(f"always-included tools not in the catalog: {', '.join(missing)}")
+            df: Dict[str, List[str]] = {}
+            for s in snippets.values():
+                for k in s.keywords:
+                    df.setdefault(k, []).append(s.name)
+            self._weights = {k: {n: math.log((len(snippets) + 1) / len(tools)) for n in tools} for k, tools in df.items()}
+            if len(snippets) > cfg.filter_above:
+                if self.encoder is None and cfg.model_path:
+                    self.encoder = OnnxEncoder(cfg.model_path, cfg.tokenizer_path)
+                if self.encoder is not None:
+                    self._vectors = self.encoder.encode([s.text for s in snippets.values()])
+            self.snippets = snippets
+            self._template = Path(cfg.system_path).read_text(encoding="utf-8")
+            self._log.info("%d tool snippets (%s)", len(snippets), "filtered per utterance" if self.filtered else "all in every prompt")
+
+    def select(self, text: str, history: Sequence[dict] = ()) -> Tuple[str, ...]:
+        """Names of the tools to describe, in catalog order."""
+        if not self._template:
+            self.load()
+        if not self.filtered:
+            return tuple(self.snippets)
+        chosen = set(self._select(" ".join(text.lower().split())))
+        for turn in history:
+            if turn.get("role") == "assistant":
+                chosen.update(_called(turn.get("content", ""), self.snippets))
+        return tuple(n for n in self.snippets if n in chosen)
+
+    def system(self, text: str, history: Sequence[dict] = ()) -> str:
+        return self._render(self.select(text, history))
+
+    def full(self) -> str:
+        """The prompt with every tool, as an unfiltered catalog would give."""
+        if not self._template:
+            self.load()
+        return self._render(tuple(self.snippets))
+
+    def _select_one(self, text: str) -> Tuple[str, ...]:
+        scores: Dict[str, float] = {}
+        for word in _words(text):
+            for name, weight in self._weights.get(word, {}).items():
+                scores[name] = scores.get(name, 0.0) + weight
+        if self._vectors is not None and self.encoder is not None:
+            sims = self._vectors @ self.encoder.encode([text])[0]
+            for name, sim in zip(self.snippets, sims.tolist()):
+                if sim >= self.cfg.min_similarity:
+                    scores[name] = scores.get(name, 0.0) + sim
+        best = sorted(scores, key=scores.__getitem__, reverse=True)[:self.cfg.max_tools]
+        return tuple(dict.fromkeys([*self.cfg.always, *best]))
+
+    def _render_one(self, names: Tuple[str, ...]) -> str:
+        return (self._template.replace("{ALLOWED_TOOLS}", ", ".join(names))
+                .replace("{TOOLS}", "\n\n".join(self.snippets[n].text for n in names)))
+
+
+def _called(content: str, known: Dict[str, ToolSnippet]) -> List[str]:
+    """Tools an assistant turn (a toolcall's JSON) called."""
+    try:
+        obj = json.loads(content)
+    except json.JSONDecodeError:
+        return []
+    return [k for k in obj if k in known] if isinstance(obj, dict) else []
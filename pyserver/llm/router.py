@@ -0,0 +1,147 @@
+# llm/router.py
+from __future__ import annotations
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.llm.intent import IntentClassifier, IntentConfig
+from pyserver.llm.limiter import PriorityLimiter, StaleRequest
+from pyserver.llm.llm import apology, messages_for, parse_toolcall
+from pyserver.llm.models import ToolCallModel
+from pyserver.llm.prompt import PromptBuilder, PromptConfig
+
+if TYPE_CHECKING:
+    import ollama
+
+# Utterances that chain or condition actions go straight to the large model.
+_COMPOUND = re.compile(r"\b(and|then|after|before|unless|until|every|except|also|if)\b", re.IGNORECASE)
+
+
+@dataclass
+class RouterConfig:
+    large_model: str = "llama3.1:8b-instruct"
+    small_model: Optional[str] = None  # e.g. "llama3.2:3b"; None -> large model only
+    simple_max_words: int = 8
+    min_confidence: float = 0.6
+    max_concurrency: int = 1  # requests in flight at Ollama (match OLLAMA_NUM_PARALLEL)
+    timeout_s: float = 8.0    # a plan not started by then is dropped
+    summary_tokens: int = 160  # cap on a conversation summary (llm.memory)
+    host: Optional[str] = None  # None -> OLLAMA_HOST / localhost:11434
+    keep_alive: str = "30m"    # how long Ollama keeps the models loaded after a request (its default is 5m)
+    intents: Optional[IntentConfig] = None  # embedding classifier tried before any model; None -> LLM only
+    prompt: PromptConfig = field(default_factory=PromptConfig)  # which tools each system prompt describes
+
+
+@dataclass
+class Plan:
+    toolcall: ToolCallModel
+    model: str = ""
+    escalated: bool = False
+    dropped: bool = False
+
+
+class PlannerRouter:
+    """
+    Turns a transcript into a ToolCallModel via Ollama, trying a small model first.
+
+    With `intents` configured, single-action utterances are first matched against the
+    exemplars of llm.intent; a confident match with all its arguments is the plan and no
+    model is asked.
+    Short single-action utterances go to `small_model`; the answer is escalated to
+    `large_model` when it does not parse or validate, or reports a confidence below
+    `min_confidence`. Everything else goes to the large model directly. Every model call
+    takes a slot from a PriorityLimiter, so a burst queues here in priority order instead
+    of piling onto the inference server, and requests still queued after `timeout_s`
+    are dropped (the caller gets an apology). Each request's system prompt describes only
+    the tools relevant to the utterance once the catalog outgrows `prompt.filter_above`
+    (llm.prompt).
+
+    It is also the Summarizer for ConversationMemory: summaries run on the small model
+    when there is one, at low priority, so they only use slots no plan is waiting for.
+    """
+
+    def __init__(self, cfg: RouterConfig, limiter: Optional[PriorityLimiter] = None) -> None:
+        self.cfg = cfg
+        self.limiter = limiter if limiter is not None else PriorityLimiter(cfg.max_concurrency)
+        self._client: Optional["ollama.AsyncClient"] = None  # bound to the running loop; made on first use
+        self.intents = IntentClassifier(cfg.intents) if cfg.intents is not None else None
+        self.prompts = PromptBuilder(cfg.prompt)
+        self._log = logging.getLogger("PlannerRouter")
+
+    def is_simple(self, text: str) -> bool:
+        return len(text.split()) <= self.cfg.simple_max_words and not _COMPOUND.search(text)
+
+    async def plan(self, text: str, history: Sequence[dict] = (), *, priority: int = models_pb.PRIORITY_HIGH,
+                   timeout_s: Optional[float] = None) -> Plan:
+        deadline = asyncio.get_running_loop().time() + (timeout_s if timeout_s is not None else self.cfg.timeout_s)
+        small, large = self.cfg.small_model, self.cfg.large_model
+        if self.intents is not None and not _COMPOUND.search(text):
+            match = await asyncio.to_thread(self.intents.classify, text)
+            if match.toolcall is not None:
+                return Plan(match.toolcall, "intents")
+            self._log.debug("Intent %s %.2f for %r: %s, asking the LLM", match.intent, match.confidence, text, match.reason)
+        try:
+            if small and self.is_simple(text):
+                toolcall, conf = await self._ask(small, text, history, priority, deadline)
+                if toolcall is not None and conf >= self.cfg.min_confidence:
+                    return Plan(toolcall, small)
+                self._log.debug("Escalating %r (confidence %.2f)", text, conf)
+                toolcall, _ = await self._ask(large, text, history, priority, deadline)
+                return Plan(toolcall or apology(), large, escalated=True)
+            toolcall, _ = await self._ask(large, text, history, priority, deadline)
+            return Plan(toolcall or apology(), large)
+        except StaleRequest:
+            self._log.warning("Dropped stale plan for %r", text)
+            return Plan(apology(), dropped=True)
+
+    async def summarize(self, summary: str, turns: Sequence[dict]) -> str:
+        lines = [f"Summary so far: {summary or '(none)'}", "", "New turns:"]
+        lines += [f"{t['role']}: {t['content']}" for t in turns]
+        messages = [{"role": "system", "content": _summary_prompt()}, {"role": "user", "content": "\n".join(lines)}]
+        async with self.limiter.slot(models_pb.PRIORITY_LOW):
+            res = await self._chat().chat(model=self.cfg.small_model or self.cfg.large_model, messages=messages,
+                                          options={"num_predict": self.cfg.summary_tokens}, keep_alive=self.cfg.keep_alive)
+        return res["message"]["content"]
+
+    async def _ask(self, model: str, text: str, history: Sequence[dict], priority: int,
+                   deadline: float) -> Tuple[Optional[ToolCallModel], float]:
+        async with self.limiter.slot(priority, deadline):
+            res = await self._chat().chat(model=model, messages=messages_for(text, history, self.prompts),
+                                          keep_alive=self.cfg.keep_alive)
+        return parse_toolcall(res["message"]["content"])
+
+    async def warm(self) -> None:
+        """
+        Load each model into Ollama and run the system prompt through it once (one token
+        out), so the first utterance pays neither the model load nor the prompt prefill
+        (of the part every tool selection shares). The intent classifier, if any, indexes
+        its exemplars meanwhile.
+        """
+        async def models() -> None:
+            for model in dict.fromkeys(m for m in (self.cfg.small_model, self.cfg.large_model) if m):
+                async with self.limiter.slot(models_pb.PRIORITY_LOW):
+                    await self._chat().chat(model=model, messages=messages_for("hello", prompts=self.prompts),
+                                            options={"num_predict": 1}, keep_alive=self.cfg.keep_alive)
+
+        await asyncio.to_thread(self.prompts.load)
+        if self.intents is None:
+            await models()
+        else:
+            await asyncio.gather(models(), asyncio.to_thread(self.intents.load))
+
+    def _chat(self) -> "ollama.AsyncClient":
+        if self._client is None:
+            import ollama
+            self._client = ollama.AsyncClient(host=self.cfg.host)
+        return self._client
+
+
+@lru_cache(maxsize=1)
+def _summary_prompt() -> str:
+    return Path("data/prompts/summarize.txt").read_text()
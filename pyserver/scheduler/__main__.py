@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import logging
+
+
+from .serve import serve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SchedulerService (assistant.v1), Python engine")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=50070)
+    parser.add_argument("--worker", default="127.0.0.1:50051", help="PythonWorkerService address")
+    parser.add_argument("--timezone", default="UTC", help="default timezone for cron triggers")
+    parser.add_argument("--data-dir", default=None, help="persist tasks here (WAL + snapshot)")
+    parser.add_argument("--retries", type=int, default=2, help="resend RunTask on UNAVAILABLE (the worker deduplicates)")
+    parser.add_argument("--hedge-ms", type=float, default=None, help="send a second RunTask copy after this long")
+    parser.add_argument("--admin-port", type=int, default=None,
+                        help="serve /debug/loop, /debug/coroutines and /debug/profile on 127.0.0.1:PORT")
+    parser.add_argument("--time-coroutines", action="store_true",
+                        help="time every coroutine from startup (costly on busy loops; also POST /debug/coroutines/start)")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    asyncio.run(serve(args.host, args.port, args.worker, args.timezone, args.data_dir,
+                      retries=args.retries, hedge_after_s=args.hedge_ms / 1000.0 if args.hedge_ms else None,
+                      admin_port=args.admin_port, time_coroutines=args.time_coroutines))
+
+
+if __name__ == "__main__":
+    main()
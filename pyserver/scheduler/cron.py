@@ -0,0 +1,157 @@
+# scheduler/cron.py
+from __future__ import annotations
+import bisect
+import calendar
+import datetime as dt
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTHS = {m.lower(): i for i, m in enumerate(calendar.month_abbr) if m}
+_WEEKDAYS = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+
+# (name, lo, hi, aliases)
+_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day", 1, 31, {}),
+    ("month", 1, 12, _MONTHS),
+    ("weekday", 0, 7, _WEEKDAYS),
+)
+_ONE_MINUTE = dt.timedelta(minutes=1)
+_MAX_YEARS = 8  # enough to reach Feb 29 from any start
+
+
+@lru_cache(maxsize=None)
+def zone(name: str) -> ZoneInfo:
+    """Cached ZoneInfo lookup (raises ZoneInfoNotFoundError for unknown names)."""
+    return ZoneInfo(name)
+
+
+def _parse_field(text: str, lo: int, hi: int, aliases: dict) -> Tuple[Tuple[int, ...], bool]:
+    def value(tok: str) -> int:
+        v = aliases.get(tok.lower()) if not tok.isdigit() else int(tok)
+        if v is None or not lo <= v <= hi:
+            raise ValueError(f"value {tok!r} out of range {lo}-{hi}")
+        return v
+
+    out: set[int] = set()
+    for part in text.split(","):
+        rng, _, step_s = part.partition("/")
+        step = int(step_s) if step_s else 1
+        if step < 1:
+            raise ValueError(f"bad step in {part!r}")
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a_s, b_s = rng.split("-", 1)
+            a, b = value(a_s), value(b_s)
+        else:
+            a = value(rng)
+            b = hi if step_s else a
+        if a > b:
+            raise ValueError(f"empty range {part!r}")
+        out.update(range(a, b + 1, step))
+    return tuple(sorted(out)), text == "*"
+
+
+def _next(values: Tuple[int, ...], v: int) -> Optional[int]:
+    i = bisect.bisect_left(values, v)
+    return values[i] if i < len(values) else None
+
+
+class CronSpec:
+    """
+    Precompiled five-field cron expression (minute hour day month weekday, 0=Sunday) with
+    the usual dom/dow rule: when both are restricted a day matches if either does.
+    next_after() walks field by field with bisect jumps instead of minute stepping.
+    """
+
+    __slots__ = ("expr", "minutes", "hours", "days", "months", "weekdays", "_dom_any", "_dow_any")
+
+    def __init__(self, expr: str) -> None:
+        self.expr = expr
+        fields = _MACROS.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        parsed = [_parse_field(f, lo, hi, aliases) for f, (_n, lo, hi, aliases) in zip(fields, _FIELDS)]
+        (self.minutes, _), (self.hours, _), (self.days, self._dom_any), (self.months, _), (dow, self._dow_any) = parsed
+        self.weekdays = frozenset(d % 7 for d in dow)
+
+    def __repr__(self) -> str:
+        return f"CronSpec({self.expr!r})"
+
+    def _day_ok(self, y: int, m: int, d: int) -> bool:
+        dom = d in self.days
+        dow = (calendar.weekday(y, m, d) + 1) % 7 in self.weekdays
+        if self._dom_any or self._dow_any:
+            return dom and dow
+        return dom or dow
+
+    def next_local(self, start: dt.datetime) -> dt.datetime:
+        """First matching naive wall-clock minute >= start."""
+        y, mo, d, h, mi = start.year, start.month, start.day, start.hour, start.minute
+        if start.second or start.microsecond:
+            mi += 1
+        limit = y + _MAX_YEARS
+        while y <= limit:
+            if mi > 59:
+                mi, h = 0, h + 1
+            if h > 23:
+                h, d = 0, d + 1
+            if d > calendar.monthrange(y, mo)[1]:
+                d, mo = 1, mo + 1
+            if mo > 12:
+                mo, y = 1, y + 1
+
+            nm = _next(self.months, mo)
+            if nm != mo:
+                if nm is None:
+                    y, mo = y + 1, self.months[0]
+                else:
+                    mo = nm
+                d, h, mi = 1, 0, 0
+                continue
+            if not self._day_ok(y, mo, d):
+                d, h, mi = d + 1, 0, 0
+                continue
+            nh = _next(self.hours, h)
+            if nh != h:
+                if nh is None:
+                    d, h, mi = d + 1, 0, 0
+                else:
+                    h, mi = nh, 0
+                continue
+            nmi = _next(self.minutes, mi)
+            if nmi is None:
+                h, mi = h + 1, 0
+                continue
+            return dt.datetime(y, mo, d, h, nmi)
+        raise ValueError(f"cron expression never fires: {self.expr!r}")
+
+    def next_after(self, epoch_s: float, tz: dt.tzinfo) -> float:
+        """
+        Next fire time strictly after epoch_s, evaluated in tz's wall clock.
+        Times inside a DST gap fire at the shifted instant; repeated wall times fire once.
+        """
+        local = dt.datetime.fromtimestamp(epoch_s, tz).replace(tzinfo=None, second=0, microsecond=0) + _ONE_MINUTE
+        while True:
+            cand = self.next_local(local)
+            ts = cand.replace(tzinfo=tz).timestamp()
+            if ts > epoch_s:
+                return ts
+            local = cand + _ONE_MINUTE
+
+
+@lru_cache(maxsize=1024)
+def compile_cron(expr: str) -> CronSpec:
+    return CronSpec(expr)
@@ -0,0 +1,295 @@
+# scheduler/engine.py
+from __future__ import annotations
+import asyncio
+import gc
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Collection, Dict, Iterator, List, Optional
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.scheduler.cron import CronSpec, compile_cron, zone
+from pyserver.scheduler.index import SortKey, TaskIndex
+from pyserver.scheduler.store import TaskRecord, TaskStore
+from pyserver.scheduler.timers import TimerHeap
+from pyserver.scheduler.watch import CANCELLED, FIRED, SCHEDULED, TaskFeed
+
+# Runs a due task (e.g. RunTask on the worker). Exceptions are logged, not retried.
+TaskDispatch = Callable[[models_pb.Task], Awaitable[object]]
+# Called after each fire with (task, lateness_s); used for jitter measurements.
+FireHook = Callable[["ScheduledTask", float], None]
+
+TIMEZONE_META_KEY = "timezone"
+
+
+@dataclass(slots=True)
+class ScheduledTask:
+    task: models_pb.Task
+    trigger: models_pb.Trigger
+    timezone: str
+    next_fire: float                 # epoch seconds
+    cron: Optional[CronSpec] = None
+    fired: int = 0
+
+    @property
+    def task_id(self) -> str:
+        return self.task.task_id
+
+    @property
+    def tool(self) -> str:
+        return self.task.call.WhichOneof("payload") or ""
+
+
+class SchedulerEngine:
+    """
+    Timer-driven scheduler core shared by the gRPC SchedulerService and the in-process
+    transport. One asyncio task sleeps until the earliest timer; due tasks are dispatched
+    highest priority first, and cron recurrences are re-armed for their next occurrence
+    after now (missed occurrences coalesce into one fire unless Recurrence.catch_up is set,
+    in which case each one fires).
+
+    With a TaskStore every mutation is written ahead; await sync() before acknowledging.
+    The listing index is built on the first query() and maintained incrementally after
+    that, so deployments that never list tasks do not pay for it; likewise the change feed
+    for WatchTasks starts recording on the first feed().
+    """
+
+    def __init__(
+        self,
+        dispatch: TaskDispatch,
+        *,
+        default_timezone: str = "UTC",
+        clock: Callable[[], float] = time.time,
+        on_fire: Optional[FireHook] = None,
+        store: Optional[TaskStore] = None,
+    ) -> None:
+        self._dispatch = dispatch
+        self._store = store
+        self._default_tz = default_timezone
+        self._clock = clock
+        self._on_fire = on_fire
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._timers = TimerHeap()
+        self._index: Optional[TaskIndex] = None
+        self._feed: Optional[TaskFeed] = None
+        self._wakeup = asyncio.Event()
+        self._armed: Optional[float] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+        self._log = logging.getLogger("SchedulerEngine")
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._runner:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    # ---- queries ----
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, task_id: str) -> Optional[ScheduledTask]:
+        return self._tasks.get(task_id)
+
+    def tasks(self) -> Iterator[ScheduledTask]:
+        return iter(self._tasks.values())
+
+    def query(
+        self,
+        *,
+        tools: Collection[str] = (),
+        priorities: Collection[int] = (),
+        not_before: Optional[float] = None,
+        after: Optional[SortKey] = None,
+        limit: int = 0,
+    ) -> List[ScheduledTask]:
+        """Pending tasks in (next_fire, priority) order; see TaskIndex.query."""
+        if self._index is None:
+            self._index = TaskIndex(self._tasks.values())
+        return self._index.query(tools=tools, priorities=priorities, not_before=not_before, after=after, limit=limit)
+
+    def feed(self) -> TaskFeed:
+        """The change log watchers follow (see TaskFeed); records from the first call on."""
+        if self._feed is None:
+            self._feed = TaskFeed()
+        return self._feed
+
+    def has_due(self) -> bool:
+        """True if some timer is already due (e.g. the runner has not caught up yet)."""
+        when = self._timers.next_when()
+        return when is not None and when <= self._clock()
+
+    # ---- mutations ----
+
+    def schedule(self, task: models_pb.Task, trigger: models_pb.Trigger) -> ScheduledTask:
+        """
+        Register a task. Raises ValueError for an unknown timezone, a bad cron expression or
+        a trigger that never fires.
+        """
+        if not task.task_id:
+            task.task_id = uuid.uuid4().hex
+        elif task.task_id in self._tasks:
+            self.cancel(task.task_id)
+
+        tz_name = task.meta.get(TIMEZONE_META_KEY) or self._default_tz
+        try:
+            tz = zone(tz_name)
+        except Exception as e:
+            raise ValueError(f"unknown timezone {tz_name!r}") from e
+        cron = compile_cron(trigger.recurrence.cron) if trigger.recurrence.cron else None
+
+        now = self._clock()
+        which = trigger.WhichOneof("time")
+        if which == "at":
+            first = trigger.at.ToNanoseconds() / 1e9
+        elif which == "delay":
+            first = now + trigger.delay.ToNanoseconds() / 1e9
+        elif cron is not None:
+            first = cron.next_after(now, tz)
+        else:
+            first = now
+
+        rec = ScheduledTask(task, trigger, tz_name, first, cron)
+        self._tasks[task.task_id] = rec
+        self._arm(rec)
+        self._persist(rec)
+        if self._feed is not None:
+            self._feed.append(SCHEDULED, rec)
+        return rec
+
+    def cancel(self, task_id: str) -> bool:
+        rec = self._tasks.pop(task_id, None)
+        if rec is None:
+            return False
+        self._timers.cancel(task_id)
+        if self._index is not None:
+            self._index.remove(task_id)
+        if self._store is not None:
+            self._store.delete(task_id)
+        if self._feed is not None:
+            self._feed.append(CANCELLED, rec, pending=False)
+        return True
+
+    async def sync(self) -> None:
+        """Wait until all mutations so far are durable (no-op without a store)."""
+        if self._store is not None:
+            await self._store.sync()
+
+    def recover(self) -> int:
+        """
+        Load pending tasks from the store (call before start()). Overdue one-shot tasks fire
+        right away; an overdue recurrence fires its missed occurrences if
+        Recurrence.catch_up is set and otherwise skips to its next occurrence.
+
+        The cyclic GC is paused while the task set is built (a million records would
+        otherwise trigger repeated full collections).
+        """
+        assert self._store is not None, "recover() needs a store"
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._recover()
+        finally:
+            if was_enabled:
+                gc.enable()
+
+    def _recover(self) -> int:
+        now = self._clock()
+        tasks, entries = self._tasks, []
+        for r in self._store.load():
+            task, trigger = r.task, r.trigger
+            meta = task.meta
+            tz_name = (meta.get(TIMEZONE_META_KEY) if meta else None) or self._default_tz
+            cron = compile_cron(trigger.recurrence.cron) if trigger.HasField("recurrence") and trigger.recurrence.cron else None
+            ts = r.next_fire_time
+            rec = ScheduledTask(task, trigger, tz_name, ts.seconds + ts.nanos * 1e-9, cron)
+            if cron is not None and rec.next_fire < now and not trigger.recurrence.catch_up:
+                rec.next_fire = cron.next_after(now, zone(tz_name))
+                self._persist(rec)
+            tid = task.task_id
+            tasks[tid] = rec
+            entries.append((rec.next_fire, tid, rec, task.priority))
+        self._timers.extend(entries)
+        self._index = None
+        self._feed = None  # a different task set: watchers start over
+        self._wakeup.set()
+        return len(entries)
+
+    # ---- internals ----
+
+    def _arm(self, rec: ScheduledTask) -> None:
+        self._timers.push(rec.next_fire, rec.task_id, rec, rec.task.priority)
+        if self._index is not None:
+            self._index.add(rec)
+        if self._armed is None or rec.next_fire < self._armed:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            self._armed = self._timers.next_when()
+            if self._armed is None:
+                await self._wakeup.wait()
+                continue
+            delay = self._armed - self._clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue  # an earlier timer was armed
+                except asyncio.TimeoutError:
+                    pass
+            now = self._clock()
+            for t in self._timers.pop_due(now):
+                self._fire(t.payload, now)
+            await asyncio.sleep(0)  # let dispatches start before re-arming
+
+    def _fire(self, rec: ScheduledTask, now: float) -> None:
+        scheduled = rec.next_fire
+        rec.fired += 1
+        if self._on_fire is not None:
+            self._on_fire(rec, now - scheduled)
+
+        task = asyncio.create_task(self._dispatch_one(rec.task))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+        if rec.cron is None:
+            self._tasks.pop(rec.task_id, None)
+            if self._index is not None:
+                self._index.remove(rec.task_id)
+            if self._store is not None:
+                self._store.delete(rec.task_id)
+            if self._feed is not None:
+                self._feed.append(FIRED, rec, pending=False)
+            return
+        # catch_up: the next occurrence after the one just fired, even if that is overdue too
+        base = scheduled if rec.trigger.recurrence.catch_up else max(scheduled, now)
+        rec.next_fire = rec.cron.next_after(base, zone(rec.timezone))
+        self._arm(rec)
+        self._persist(rec)
+        if self._feed is not None:
+            self._feed.append(FIRED, rec)
+
+    def _persist(self, rec: ScheduledTask) -> None:
+        if self._store is None:
+            return
+        r = TaskRecord(task=rec.task, trigger=rec.trigger)
+        r.next_fire_time.FromNanoseconds(int(rec.next_fire * 1e9))
+        self._store.put(r)
+
+    async def _dispatch_one(self, task: models_pb.Task) -> None:
+        try:
+            await self._dispatch(task)
+        except Exception:
+            self._log.exception("Task %s failed", task.task_id)
@@ -0,0 +1,120 @@
+# scheduler/index.py
+from __future__ import annotations
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pyserver.scheduler.timers import priority_rank
+
+if TYPE_CHECKING:
+    from pyserver.scheduler.engine import ScheduledTask
+
+# (next_fire, priority rank, task_id): listing order, and the cursor a page resumes after.
+SortKey = Tuple[float, int, str]
+
+
+def sort_key(rec: "ScheduledTask") -> SortKey:
+    return (rec.next_fire, priority_rank(rec.task.priority), rec.task.task_id)
+
+
+class TaskIndex:
+    """
+    Ordered views of the pending tasks for ListTasks/StreamTasks.
+
+    The primary index is one sorted list of sort keys; secondary indexes hold the same keys
+    per tool and per priority. A query bisects to its cursor in the narrowest matching
+    index (merging the lists when several tools or priorities are selected) and walks
+    forward, so a page of k costs O(log n + k) instead of a scan and sort of every task.
+    Insert and remove are a bisect plus a list memmove.
+    """
+
+    def __init__(self, recs: Iterable["ScheduledTask"] = ()) -> None:
+        self._entries: Dict[str, Tuple[SortKey, str, "ScheduledTask"]] = {}
+        self._all: List[SortKey] = []
+        self._by_tool: Dict[str, List[SortKey]] = {}
+        self._by_priority: Dict[int, List[SortKey]] = {}
+        self._bulk_load(recs)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, rec: "ScheduledTask") -> None:
+        """Index rec, replacing its previous entry (e.g. a cron task re-armed)."""
+        tid = rec.task.task_id
+        if tid in self._entries:
+            self.remove(tid)
+        key, tool = sort_key(rec), rec.tool
+        self._entries[tid] = (key, tool, rec)
+        insort(self._all, key)
+        insort(self._by_tool.setdefault(tool, []), key)
+        insort(self._by_priority.setdefault(key[1], []), key)
+
+    def remove(self, task_id: str) -> bool:
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        key, tool, _ = entry
+        _discard(self._all, key)
+        _discard(self._by_tool[tool], key)
+        _discard(self._by_priority[key[1]], key)
+        return True
+
+    def query(
+        self,
+        *,
+        tools: Collection[str] = (),
+        priorities: Collection[int] = (),
+        not_before: Optional[float] = None,
+        after: Optional[SortKey] = None,
+        limit: int = 0,
+    ) -> List["ScheduledTask"]:
+        """Tasks in listing order matching every filter, starting strictly after `after`."""
+        ranks = {priority_rank(p) for p in priorities}
+        by_tool = [self._by_tool.get(t, []) for t in tools]
+        by_prio = [self._by_priority.get(r, []) for r in ranks]
+        # Walk the smaller candidate set; the other filter (if any) is checked per key.
+        if by_tool and (not by_prio or sum(map(len, by_tool)) <= sum(map(len, by_prio))):
+            sources, check = by_tool, (lambda key: key[1] in ranks) if ranks else None
+        elif by_prio:
+            tool_set = set(tools)
+            sources, check = by_prio, (lambda key: self._entries[key[2]][1] in tool_set) if tool_set else None
+        else:
+            sources, check = [self._all], None
+
+        keys = _merged(sources, not_before, after)
+        out: List["ScheduledTask"] = []
+        entries = self._entries
+        for key in keys:
+            if check is None or check(key):
+                out.append(entries[key[2]][2])
+                if len(out) == limit:
+                    break
+        return out
+
+    def _bulk_load(self, recs: Iterable["ScheduledTask"]) -> None:
+        for rec in recs:
+            key = sort_key(rec)
+            self._entries[key[2]] = (key, rec.tool, rec)
+        self._all = sorted(key for key, _, _ in self._entries.values())
+        for key in self._all:  # already sorted: plain appends keep the secondaries sorted
+            _, tool, _ = self._entries[key[2]]
+            self._by_tool.setdefault(tool, []).append(key)
+            self._by_priority.setdefault(key[1], []).append(key)
+
+
+def _discard(keys: List[SortKey], key: SortKey) -> None:
+    i = bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+
+def _merged(sources: List[List[SortKey]], not_before: Optional[float], after: Optional[SortKey]) -> Iterator[SortKey]:
+    tails = []
+    for keys in sources:
+        lo = 0
+        if not_before is not None:
+            lo = bisect_left(keys, (not_before,))
+        if after is not None:
+            lo = max(lo, bisect_right(keys, after))
+        tails.append(map(keys.__getitem__, range(lo, len(keys))))
+    return tails[0] if len(tails) == 1 else heapq.merge(*tails)
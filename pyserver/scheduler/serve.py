@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import asyncio
+import logging
+import signal
+from typing import Optional
+
+import grpc
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+from pyserver.diagnostics.admin import DiagnosticsConfig, diagnostics
+from .engine import SchedulerEngine
+from .service import SchedulerService, WorkerDispatcher
+from .store import TaskStore
+
+
+async def serve(host: str, port: int, worker_addr: str, timezone: str, data_dir: Optional[str] = None, *,
+                retries: int = 0, hedge_after_s: Optional[float] = None, admin_port: Optional[int] = None,
+                time_coroutines: bool = False) -> None:
+    async with diagnostics(admin_port, DiagnosticsConfig(coroutines=time_coroutines)):
+        await _serve(host, port, worker_addr, timezone, data_dir, retries, hedge_after_s)
+
+
+async def _serve(host: str, port: int, worker_addr: str, timezone: str, data_dir: Optional[str], retries: int,
+                 hedge_after_s: Optional[float]) -> None:
+    server = grpc.aio.server()
+
+    # Health service
+    health_servicer = health.HealthServicer(
+        experimental_non_blocking=True,
+        experimental_thread_pool=None,
+    )
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+
+    # App services
+    dispatcher = WorkerDispatcher(worker_addr, retries=retries, hedge_after_s=hedge_after_s)
+    store = TaskStore(data_dir) if data_dir else None
+    engine = SchedulerEngine(dispatcher, default_timezone=timezone, store=store)
+    if store is not None:
+        n = engine.recover()
+        logging.getLogger("server").info("Recovered %d tasks from %s", n, data_dir)
+        await store.start()
+    await engine.start()
+    sched_rpc.add_SchedulerServiceServicer_to_server(SchedulerService(engine), server)
+
+    bind_addr = f"{host}:{port}"
+    server.add_insecure_port(bind_addr)
+    logging.getLogger("server").info("SchedulerService listening on %s (worker %s)", bind_addr, worker_addr)
+
+    health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+    health_servicer.set("assistant.v1.SchedulerService", health_pb2.HealthCheckResponse.SERVING)
+
+    await server.start()
+
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows
+
+    await stop_event.wait()
+    logging.getLogger("server").info("Shutting down...")
+
+    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_servicer.set("assistant.v1.SchedulerService", health_pb2.HealthCheckResponse.NOT_SERVING)
+
+    await server.stop(grace=None)
+    await engine.close()
+    if store is not None:
+        await store.close()
+    await dispatcher.close()
@@ -0,0 +1,258 @@
+# scheduler/service.py
+from __future__ import annotations
+import asyncio
+import base64
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2 as sched_pb
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2_grpc as sched_rpc
+
+from pyserver.scheduler.engine import ScheduledTask, SchedulerEngine
+from pyserver.scheduler.index import SortKey, sort_key
+from pyserver.scheduler.watch import CANCELLED, FIRED, Change, TaskFeed
+
+_TOOL_FILTERS = (("include_speak", "speak"), ("include_timer", "timer"), ("include_play_sound", "play_sound"))
+_CURSOR = struct.Struct("<dB")  # next_fire, priority rank; task_id follows
+_STREAM_PAGE = 512
+
+
+# ---------------------------
+# Worker dispatch
+# ---------------------------
+
+@dataclass
+class DispatchStats:
+    sent: int = 0
+    hedged: int = 0   # second copies sent because the first was slow
+    retried: int = 0  # resent after UNAVAILABLE
+
+
+class WorkerDispatcher:
+    """
+    Sends due tasks to PythonWorkerService.RunTask over one shared channel.
+
+    Every request carries (task_id, attempt_id), so the worker runs each occurrence once
+    however many copies reach it. That makes it safe to retry a request that failed with
+    UNAVAILABLE (`retries`, with exponential backoff) and to hedge: with `hedge_after_s`,
+    a call still unanswered after that long gets a second copy and the first answer wins.
+    """
+
+    _RETRYABLE = (grpc.StatusCode.UNAVAILABLE,)
+
+    def __init__(self, worker_addr: str, timeout_s: float = 30.0, *, retries: int = 0,
+                 retry_backoff_s: float = 0.05, hedge_after_s: Optional[float] = None) -> None:
+        self._addr = worker_addr
+        self._timeout = timeout_s
+        self._retries = retries
+        self._backoff = retry_backoff_s
+        self._hedge_after = hedge_after_s
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._stub: Optional[rpc.PythonWorkerServiceStub] = None
+        self.stats = DispatchStats()
+        self._log = logging.getLogger("WorkerDispatcher")
+
+    async def __call__(self, task: models_pb.Task) -> pb.RunTaskResponse:
+        if self._stub is None:
+            self._channel = grpc.aio.insecure_channel(self._addr)
+            self._stub = rpc.PythonWorkerServiceStub(self._channel)
+        req = pb.RunTaskRequest(call=task.call, task_id=task.task_id, attempt_id=str(time.time_ns()))
+        for attempt in range(self._retries + 1):
+            try:
+                resp = await (self._hedged(req) if self._hedge_after is not None and req.task_id else self._send(req))
+                break
+            except grpc.aio.AioRpcError as e:
+                if e.code() not in self._RETRYABLE or attempt == self._retries:
+                    raise
+                self.stats.retried += 1
+                await asyncio.sleep(self._backoff * 2 ** attempt)
+        if resp.status != pb.RunTaskResponse.STATUS_OK:
+            self._log.warning("Task %s: %s", task.task_id, resp.error_message or pb.RunTaskResponse.Status.Name(resp.status))
+        return resp
+
+    async def _send(self, req: pb.RunTaskRequest) -> pb.RunTaskResponse:
+        assert self._stub is not None
+        self.stats.sent += 1
+        return await self._stub.RunTask(req, timeout=self._timeout)
+
+    async def _hedged(self, req: pb.RunTaskRequest) -> pb.RunTaskResponse:
+        first = asyncio.ensure_future(self._send(req))
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_after)
+        if done:
+            return first.result()
+        self.stats.hedged += 1
+        pending = {first, asyncio.ensure_future(self._send(req))}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    if fut.exception() is None or not pending:
+                        return fut.result()  # first success; or the last copy's error
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+    async def close(self) -> None:
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+            self._stub = None
+
+
+# ---------------------------
+# gRPC service implementation
+# ---------------------------
+
+def task_summary(rec: ScheduledTask, next_fire: Optional[float] = None) -> sched_pb.TaskSummary:
+    s = sched_pb.TaskSummary(
+        task_id=rec.task_id,
+        priority=rec.task.priority,
+        timezone=rec.timezone,
+        tool=rec.tool,
+        meta=dict(rec.task.meta),
+    )
+    s.next_fire_time.FromNanoseconds(int((rec.next_fire if next_fire is None else next_fire) * 1e9))
+    return s
+
+
+def task_event(feed: TaskFeed, change: Change) -> sched_pb.TaskEvent:
+    ev = sched_pb.TaskEvent(epoch=feed.epoch, seq=change.seq, task_id=change.rec.task_id)
+    if change.kind == CANCELLED:
+        ev.kind = sched_pb.TaskEvent.KIND_CANCELLED
+        return ev
+    ev.kind = sched_pb.TaskEvent.KIND_FIRED if change.kind == FIRED else sched_pb.TaskEvent.KIND_SCHEDULED
+    ev.done = not change.pending
+    ev.tasks.append(task_summary(change.rec, change.next_fire))
+    return ev
+
+
+def encode_page_token(key: SortKey) -> str:
+    next_fire, rank, task_id = key
+    return base64.urlsafe_b64encode(_CURSOR.pack(next_fire, rank) + task_id.encode()).decode()
+
+
+def decode_page_token(token: str) -> SortKey:
+    """Inverse of encode_page_token; raises ValueError on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token.encode())
+        next_fire, rank = _CURSOR.unpack_from(raw)
+        return next_fire, rank, raw[_CURSOR.size:].decode()
+    except (struct.error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"bad page_token {token!r}") from e
+
+
+def _filters(request: sched_pb.ListTasksRequest) -> dict:
+    after = decode_page_token(request.page_token) if request.page_token else None
+    return {
+        "tools": [tool for flag, tool in _TOOL_FILTERS if getattr(request, flag)],
+        "priorities": list(request.priorities),
+        "not_before": request.not_before.ToNanoseconds() / 1e9 if request.HasField("not_before") else None,
+        "after": after,
+    }
+
+
+class SchedulerService(sched_rpc.SchedulerServiceServicer):
+    """Python implementation of assistant.v1.SchedulerService on top of SchedulerEngine."""
+
+    def __init__(self, engine: SchedulerEngine) -> None:
+        self._engine = engine
+        self._log = logging.getLogger("SchedulerService")
+
+    async def ScheduleTask(self, request: sched_pb.ScheduleTaskRequest, context: grpc.aio.ServicerContext) -> sched_pb.ScheduleTaskResponse:
+        if not request.task.call.WhichOneof("payload"):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "task.call is empty")
+        task = models_pb.Task()
+        task.CopyFrom(request.task)
+        try:
+            rec = self._engine.schedule(task, request.trigger)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        await self._engine.sync()
+        resp = sched_pb.ScheduleTaskResponse(task_id=rec.task_id)
+        resp.next_fire_time.FromNanoseconds(int(rec.next_fire * 1e9))
+        return resp
+
+    async def CancelTask(self, request: sched_pb.CancelTaskRequest, context: grpc.aio.ServicerContext) -> sched_pb.CancelTaskResponse:
+        canceled = self._engine.cancel(request.task_id)
+        await self._engine.sync()
+        return sched_pb.CancelTaskResponse(canceled=canceled)
+
+    async def ListTasks(self, request: sched_pb.ListTasksRequest, context: grpc.aio.ServicerContext) -> sched_pb.ListTasksResponse:
+        try:
+            filters = _filters(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        limit = max(0, request.limit)
+        # Fetch one extra to learn whether another page follows.
+        recs = self._engine.query(**filters, limit=limit + 1 if limit else 0)
+        resp = sched_pb.ListTasksResponse()
+        if limit and len(recs) > limit:
+            recs = recs[:limit]
+            resp.next_page_token = encode_page_token(sort_key(recs[-1]))
+        resp.tasks.extend(task_summary(r) for r in recs)
+        return resp
+
+    async def StreamTasks(self, request: sched_pb.ListTasksRequest, context: grpc.aio.ServicerContext) -> AsyncIterator[sched_pb.ListTasksResponse]:
+        try:
+            filters = _filters(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        remaining = request.limit if request.limit > 0 else None
+        # Re-query per page from a cursor: nothing is held across awaits, and tasks
+        # scheduled or cancelled mid-stream are seen (or not) consistently with the order.
+        while remaining is None or remaining > 0:
+            chunk = _STREAM_PAGE if remaining is None else min(_STREAM_PAGE, remaining)
+            recs = self._engine.query(**filters, limit=chunk)
+            page = sched_pb.ListTasksResponse(tasks=[task_summary(r) for r in recs])
+            if len(recs) == chunk:
+                filters["after"] = sort_key(recs[-1])
+                page.next_page_token = encode_page_token(filters["after"])
+            yield page
+            if not page.next_page_token:
+                return
+            if remaining is not None:
+                remaining -= len(recs)
+
+    async def WatchTasks(self, request: sched_pb.WatchTasksRequest, context: grpc.aio.ServicerContext) -> AsyncIterator[sched_pb.TaskEvent]:
+        feed = self._engine.feed()
+        seq = request.since_seq
+        changes = feed.since(seq) if request.epoch == feed.epoch else None
+        synced = False
+        while True:
+            if changes is None:  # new watcher, another epoch, or further behind than the log
+                seq, synced = feed.seq, False
+                async for page in self._snapshot(feed):
+                    yield page
+            else:
+                for c in changes:
+                    yield task_event(feed, c)
+                    seq = c.seq
+            if not synced:
+                yield sched_pb.TaskEvent(kind=sched_pb.TaskEvent.KIND_SYNCED, epoch=feed.epoch, seq=seq)
+                synced = True
+            await feed.wait(seq)
+            changes = feed.since(seq)
+
+    async def _snapshot(self, feed: TaskFeed) -> AsyncIterator[sched_pb.TaskEvent]:
+        # Pages are built as they are sent: a task changed meanwhile is sent as it is now,
+        # and its change event (seq > the snapshot's) follows, so the client converges.
+        seq, recs = feed.seq, self._engine.query()
+        for i in range(0, max(1, len(recs)), _STREAM_PAGE):
+            yield sched_pb.TaskEvent(kind=sched_pb.TaskEvent.KIND_SNAPSHOT, epoch=feed.epoch, seq=seq, reset=i == 0,
+                                     tasks=[task_summary(r) for r in recs[i:i + _STREAM_PAGE]])
+
+    async def GetTask(self, request: sched_pb.GetTaskRequest, context: grpc.aio.ServicerContext) -> sched_pb.GetTaskResponse:
+        rec = self._engine.get(request.task_id)
+        if rec is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"task {request.task_id!r} not found")
+        resp = sched_pb.GetTaskResponse(task=rec.task, trigger=rec.trigger)
+        resp.next_fire_time.FromNanoseconds(int(rec.next_fire * 1e9))
+        return resp
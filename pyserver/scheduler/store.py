@@ -0,0 +1,287 @@
+# scheduler/store.py
+from __future__ import annotations
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2 as sched_pb
+
+# Every record on disk is framed as <u32 body length><u32 crc32(body)><body>.
+# WAL bodies start with a kind byte; snapshot bodies are bare TaskRecord payloads.
+_FRAME = struct.Struct("<II")
+_SNAP_HEADER = struct.Struct("<8sQQ")  # magic, WAL generation, record count
+_SNAP_MAGIC = b"TSNAP001"
+_PUT = 1
+_DEL = 2
+
+# GetTaskResponse already carries exactly what a pending task needs (task, trigger,
+# next_fire_time), so it doubles as the persisted record.
+TaskRecord = sched_pb.GetTaskResponse
+
+
+@dataclass
+class StoreStats:
+    appends: int = 0
+    commits: int = 0
+    bytes_written: int = 0
+    compactions: int = 0
+
+
+def _frame(body: bytes) -> bytes:
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _frames(buf: memoryview, pos: int = 0) -> Iterator[Tuple[int, memoryview]]:
+    """Yield (end_offset, body) until the buffer ends or a torn/corrupt frame is found."""
+    end = len(buf)
+    while pos + _FRAME.size <= end:
+        n, crc = _FRAME.unpack_from(buf, pos)
+        start = pos + _FRAME.size
+        if start + n > end or zlib.crc32(buf[start:start + n]) != crc:
+            return
+        pos = start + n
+        yield pos, buf[start:pos]
+
+
+class TaskStore:
+    """
+    Durable image of the scheduler's pending tasks.
+
+    Mutations are appended to a write-ahead log and made durable by group commit: a single
+    flusher writes and fsyncs everything appended since the last commit, and every caller
+    waiting in sync() is released by that one fsync. When the log grows past
+    `compact_bytes`, the live set is written to a snapshot (write, fsync, rename) and the
+    log restarts under a new generation. Startup maps the snapshot and replays newer logs.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        commit_interval_s: float = 0.002,
+        compact_bytes: int = 64 << 20,
+        fsync: bool = True,
+    ) -> None:
+        self.dir = Path(path)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._commit_interval = commit_interval_s
+        self._compact_bytes = compact_bytes
+        self._fsync = fsync
+        self._live: Dict[str, bytes] = {}
+        self._gen = 0
+        self._wal = None
+        self._wal_bytes = 0
+        self._pending: List[bytes] = []
+        self._waiters: List[asyncio.Future] = []
+        self._kick = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._compactor: Optional[asyncio.Task] = None
+        self._want_compact = False
+        self._writing = False
+        self.stats = StoreStats()
+        self._log = logging.getLogger("TaskStore")
+
+    # ---- startup ----
+
+    def load(self) -> List[TaskRecord]:
+        """Read snapshot + WAL into memory and return the live records. Call before start()."""
+        records: Dict[str, TaskRecord] = {}
+        snap = self.dir / "snapshot"
+        if snap.exists() and snap.stat().st_size >= _SNAP_HEADER.size:
+            with open(snap, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buf:
+                    magic, self._gen, count = _SNAP_HEADER.unpack_from(buf, 0)
+                    if magic != _SNAP_MAGIC:
+                        raise ValueError(f"{snap}: not a task snapshot")
+                    for _end, body in _frames(buf, _SNAP_HEADER.size):
+                        rec = TaskRecord.FromString(body)
+                        records[rec.task.task_id] = rec
+                        del body  # release the mmap export
+            if len(records) != count:
+                self._log.warning("Snapshot has %d of %d records", len(records), count)
+
+        for gen, wal in sorted(self._wal_files()):
+            if gen < self._gen:
+                wal.unlink()  # superseded by the snapshot (crash before cleanup)
+                continue
+            self._replay(wal, records)
+            self._gen = gen
+
+        self._live = {tid: rec.SerializeToString() for tid, rec in records.items()}
+        self._log.info("Loaded %d tasks (generation %d)", len(records), self._gen)
+        return list(records.values())
+
+    def _wal_files(self) -> Iterator[Tuple[int, Path]]:
+        for p in self.dir.glob("wal-*"):
+            try:
+                yield int(p.name[4:]), p
+            except ValueError:
+                pass
+
+    def _replay(self, wal: Path, records: Dict[str, TaskRecord]) -> None:
+        size = wal.stat().st_size
+        good = 0
+        if size:
+            with open(wal, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buf:
+                    for good, body in _frames(buf):
+                        kind, payload = body[0], body[1:]
+                        if kind == _PUT:
+                            rec = TaskRecord.FromString(payload)
+                            records[rec.task.task_id] = rec
+                        elif kind == _DEL:
+                            records.pop(bytes(payload).decode(), None)
+                        del body, payload  # release the mmap export
+        if good < size:
+            self._log.warning("%s: dropping %d bytes of torn tail", wal.name, size - good)
+            with open(wal, "r+b") as f:
+                f.truncate(good)
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._open_wal(self._gen)
+            self._flusher = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            await self.sync()
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self._compactor is not None:
+            await asyncio.gather(self._compactor, return_exceptions=True)
+            self._compactor = None
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    # ---- mutations ----
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def put(self, rec: TaskRecord) -> None:
+        payload = rec.SerializeToString()
+        self._live[rec.task.task_id] = payload
+        self._append(bytes((_PUT,)) + payload)
+
+    def delete(self, task_id: str) -> None:
+        if self._live.pop(task_id, None) is not None:
+            self._append(bytes((_DEL,)) + task_id.encode())
+
+    async def sync(self) -> None:
+        """Wait until every mutation made so far is on disk."""
+        if not self._pending and not self._writing:
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._kick.set()
+        await fut
+
+    def _append(self, body: bytes) -> None:
+        self._pending.append(_frame(body))
+        self.stats.appends += 1
+        self._kick.set()
+
+    # ---- group commit ----
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._kick.wait()
+            if self._commit_interval > 0 and not self._waiters:
+                await asyncio.sleep(self._commit_interval)  # let a batch form
+            self._kick.clear()
+            batch, self._pending = self._pending, []
+            waiters, self._waiters = self._waiters, []
+            try:
+                if batch:
+                    data = b"".join(batch)
+                    self._writing = True
+                    try:
+                        await loop.run_in_executor(None, self._write, data)
+                    finally:
+                        self._writing = False
+                    self._wal_bytes += len(data)
+                    self.stats.bytes_written += len(data)
+                    self.stats.commits += 1
+                for w in waiters:
+                    if not w.done():
+                        w.set_result(None)
+            except Exception as e:
+                self._log.exception("WAL commit failed")
+                for w in waiters:
+                    if not w.done():
+                        w.set_exception(e)
+            if (self._want_compact or self._wal_bytes >= self._compact_bytes) and self._compactor is None:
+                self._want_compact = False
+                self._compactor = asyncio.create_task(self._compact(self._rotate()))
+                self._compactor.add_done_callback(self._compaction_done)
+
+    def _write(self, data: bytes) -> None:
+        self._wal.write(data)
+        self._wal.flush()
+        if self._fsync:
+            os.fsync(self._wal.fileno())
+
+    def _open_wal(self, gen: int) -> None:
+        path = self.dir / f"wal-{gen:08d}"
+        self._wal = open(path, "ab")
+        self._wal_bytes = path.stat().st_size
+
+    def _rotate(self) -> Tuple[int, object, List[bytes]]:
+        """Switch appends to a new WAL generation; returns what the snapshot must cover."""
+        old = (self._gen, self._wal)
+        self._gen += 1
+        self._open_wal(self._gen)
+        # State as of the rotation; anything later lands in the new WAL and replays on top.
+        return old[0], old[1], list(self._live.values())
+
+    async def _compact(self, rotated: Tuple[int, object, List[bytes]]) -> None:
+        old_gen, old_wal, live = rotated
+        await asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, live, old_gen + 1)
+        old_wal.close()
+        (self.dir / f"wal-{old_gen:08d}").unlink(missing_ok=True)
+        self.stats.compactions += 1
+        self._log.info("Compacted %d tasks into snapshot (generation %d)", len(live), old_gen + 1)
+
+    def _compaction_done(self, task: asyncio.Task) -> None:
+        self._compactor = None
+        if not task.cancelled() and task.exception() is not None:
+            self._log.error("Compaction failed: %s", task.exception())
+
+    def _write_snapshot(self, payloads: List[bytes], gen: int) -> None:
+        tmp = self.dir / "snapshot.tmp"
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(_SNAP_HEADER.pack(_SNAP_MAGIC, gen, len(payloads)))
+            for p in payloads:
+                f.write(_frame(p))
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.dir / "snapshot")
+        if self._fsync:
+            fd = os.open(self.dir, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    async def compact(self) -> None:
+        """Snapshot now (e.g. before a planned shutdown) and wait for it to finish."""
+        self._want_compact = True
+        self._kick.set()
+        await self.sync()
+        while self._want_compact or self._compactor is not None:
+            if self._compactor is not None:
+                await asyncio.gather(self._compactor, return_exceptions=True)
+            else:
+                await asyncio.sleep(self._commit_interval or 0.001)
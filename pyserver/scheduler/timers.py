@@ -0,0 +1,114 @@
+# scheduler/timers.py
+from __future__ import annotations
+import heapq
+import itertools
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+
+
+def priority_rank(priority: int) -> int:
+    """Sort rank for a models_pb.Priority value (lower fires first; UNSPECIFIED counts as NORMAL)."""
+    return models_pb.PRIORITY_NORMAL if priority == models_pb.PRIORITY_UNSPECIFIED else priority
+
+
+class Timer:
+    __slots__ = ("when", "priority", "key", "payload", "cancelled")
+
+    def __init__(self, when: float, priority: int, key: Hashable, payload: Any) -> None:
+        self.when = when
+        self.priority = priority
+        self.key = key
+        self.payload = payload
+        self.cancelled = False
+
+    def __repr__(self) -> str:
+        return f"Timer(key={self.key!r}, when={self.when:.3f}, priority={self.priority})"
+
+
+class TimerHeap:
+    """
+    Binary heap of timers keyed by a unique id.
+
+    Insert is O(log n). Cancel is O(1): the entry is tombstoned and skipped when it reaches
+    the top, and the heap is rebuilt once tombstones outnumber live timers (the same
+    strategy asyncio uses for cancelled TimerHandles). Timers due together pop in
+    (priority, when, insertion) order.
+    """
+
+    _COMPACT_MIN = 256
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, int, Timer]] = []
+        self._live: Dict[Hashable, Timer] = {}
+        self._seq = itertools.count()
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._live
+
+    def get(self, key: Hashable) -> Optional[Timer]:
+        return self._live.get(key)
+
+    def push(self, when: float, key: Hashable, payload: Any = None, priority: int = models_pb.PRIORITY_NORMAL) -> Timer:
+        if key in self._live:
+            self.cancel(key)
+        t = Timer(when, priority_rank(priority), key, payload)
+        self._live[key] = t
+        heapq.heappush(self._heap, (when, t.priority, next(self._seq), t))
+        return t
+
+    def extend(self, entries: Iterable[Tuple[float, Hashable, Any, int]]) -> None:
+        """Bulk insert (when, key, payload, priority) tuples with one O(n) heapify."""
+        heap, live, seq = self._heap, self._live, self._seq
+        unspecified, normal = models_pb.PRIORITY_UNSPECIFIED, models_pb.PRIORITY_NORMAL
+        for when, key, payload, priority in entries:
+            old = live.get(key)
+            if old is not None:
+                old.cancelled = True
+                self._tombstones += 1
+            if priority == unspecified:
+                priority = normal
+            t = Timer(when, priority, key, payload)
+            live[key] = t
+            heap.append((when, priority, next(seq), t))
+        heapq.heapify(heap)
+
+    def cancel(self, key: Hashable) -> bool:
+        t = self._live.pop(key, None)
+        if t is None:
+            return False
+        t.cancelled = True
+        self._tombstones += 1
+        if self._tombstones > self._COMPACT_MIN and self._tombstones * 2 > len(self._heap):
+            self._compact()
+        return True
+
+    def next_when(self) -> Optional[float]:
+        heap = self._heap
+        while heap and heap[0][3].cancelled:
+            heapq.heappop(heap)
+            self._tombstones -= 1
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> List[Timer]:
+        """Remove and return every live timer with when <= now, highest priority first."""
+        heap, due = self._heap, []
+        while heap and heap[0][0] <= now:
+            t = heapq.heappop(heap)[3]
+            if t.cancelled:
+                self._tombstones -= 1
+                continue
+            del self._live[t.key]
+            due.append(t)
+        if len(due) > 1:
+            due.sort(key=lambda t: t.priority)  # stable: keeps (when, seq) order within a priority
+        return due
+
+    def _compact(self) -> None:
+        self._heap = [e for e in self._heap if not e[3].cancelled]
+        heapq.heapify(self._heap)
+        self._tombstones = 0
@@ -0,0 +1,64 @@
+# scheduler/watch.py
+from __future__ import annotations
+import asyncio
+import itertools
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+if TYPE_CHECKING:
+    from pyserver.scheduler.engine import ScheduledTask
+
+SCHEDULED, FIRED, CANCELLED = "scheduled", "fired", "cancelled"
+
+
+@dataclass(slots=True)
+class Change:
+    seq: int
+    kind: str
+    rec: "ScheduledTask"
+    next_fire: float      # as of the change (a recurring rec moves on)
+    pending: bool = True  # False once fired (one-shot) or cancelled
+
+
+class TaskFeed:
+    """
+    Numbered log of task changes for WatchTasks. The last `size` changes are kept, so a
+    watcher that reconnects (or falls behind) within that window resumes from its seq;
+    further back, since() returns None and it needs a snapshot. Watchers hold only their
+    cursor: one shared future wakes them all on the next change.
+
+    The epoch names this log; seqs restart with a new engine, and a watcher holding
+    another epoch's seq starts over.
+    """
+
+    def __init__(self, size: int = 10_000) -> None:
+        self.epoch = uuid.uuid4().hex[:16]
+        self.seq = 0
+        self._log: Deque[Change] = deque(maxlen=size)
+        self._changed: Optional[asyncio.Future] = None
+
+    def append(self, kind: str, rec: "ScheduledTask", pending: bool = True) -> None:
+        self.seq += 1
+        self._log.append(Change(self.seq, kind, rec, rec.next_fire, pending))
+        if self._changed is not None:
+            if not self._changed.done():
+                self._changed.set_result(None)
+            self._changed = None
+
+    def since(self, seq: int) -> Optional[List[Change]]:
+        """Changes after `seq`, oldest first; None if some of them are no longer kept."""
+        if seq >= self.seq:
+            return []
+        first = self._log[0].seq if self._log else self.seq + 1
+        if seq + 1 < first:
+            return None
+        return list(itertools.islice(self._log, seq + 1 - first, None))
+
+    async def wait(self, seq: int) -> None:
+        """Return once there is a change after `seq`."""
+        while self.seq <= seq:
+            if self._changed is None:
+                self._changed = asyncio.get_running_loop().create_future()
+            await asyncio.shield(self._changed)
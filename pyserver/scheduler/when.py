@@ -0,0 +1,427 @@
+# scheduler/when.py
+from __future__ import annotations
+import datetime as dt
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.scheduler.cron import zone
+
+_TOKEN = re.compile(r"\d{1,2}:\d{2}|\d+(?:\.\d+)?|[a-z]+(?:'[a-z]+)?")
+
+_ONES = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen sixteen "
+    "seventeen eighteen nineteen".split())}
+_TENS = {w: 10 * i for i, w in enumerate("twenty thirty forty fifty sixty seventy eighty ninety".split(), 2)}
+
+_UNITS: Dict[str, int] = {}
+for _secs, _names in ((1, "s sec secs second seconds"), (60, "m min mins minute minutes"),
+                      (3600, "h hr hrs hour hours"), (86400, "d day days"), (604800, "week weeks")):
+    _UNITS.update(dict.fromkeys(_names.split(), _secs))
+
+# canonical weekday -> cron number (0=Sunday, as in scheduler.cron)
+_CRON_DOW = {"mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6, "sun": 0}
+_FULL_WEEKDAYS = {d: d[:3] for d in ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")}
+# no "sun"/"sat"/"wed": "play the sun sound" is not about Sunday
+_WEEKDAYS = {**_FULL_WEEKDAYS, "tues": "tue", "weds": "wed", "thur": "thu", "thurs": "thu", "fri": "fri"}
+_PLURAL_WEEKDAYS = {d + "s": c for d, c in _FULL_WEEKDAYS.items()}  # "mondays"
+_ISO_DOW = {c: i for i, c in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))}  # date.weekday()
+# part of day -> default hour (24 h) and the meridiem it implies
+_PARTS = {"morning": (8, "am"), "afternoon": (15, "pm"), "evening": (18, "pm"), "night": (20, "pm")}
+_DEFAULT_HOUR = 9
+
+Words = List[str]
+
+
+@dataclass(frozen=True)
+class When:
+    """
+    A time expression found in an utterance, as structure: resolving it against a clock
+    and a timezone is trigger()'s job, so one parse serves any number of resolutions.
+    """
+    kind: str                 # "delay" | "at" | "cron"
+    text: str                 # the phrase as it appeared, e.g. "tomorrow at 9"
+    start: int = 0            # its span in the utterance
+    end: int = 0
+    delay_s: float = 0.0
+    day: str = ""             # "", "today", "tomorrow" or a weekday ("mon".."sun")
+    skip_today: bool = False  # "next friday" said on a Friday is a week away
+    part: str = ""            # morning / afternoon / evening / night
+    hour: int = -1            # as said (1-12 or 0-23); -1: the part's default, else 9:00
+    minute: int = 0
+    meridiem: str = ""        # "am" / "pm"; "" -> inferred (see _hours)
+    cron: str = ""
+
+    def trigger(self, timezone: str = "UTC", now: Optional[float] = None) -> models_pb.Trigger:
+        """
+        Trigger.delay, Trigger.at or Trigger.recurrence. A cron recurrence is evaluated by
+        the scheduler in the task's timezone (task.meta["timezone"]), so set it to `timezone`.
+        """
+        trig = models_pb.Trigger()
+        if self.kind == "delay":
+            trig.delay.FromNanoseconds(round(self.delay_s * 1e9))
+        elif self.kind == "cron":
+            trig.recurrence.cron = self.cron
+        else:
+            trig.at.FromNanoseconds(round(self.resolve(timezone, now).timestamp() * 1e9))
+        return trig
+
+    def resolve(self, timezone: str = "UTC", now: Optional[float] = None) -> dt.datetime:
+        """The wall-clock time an "at" expression names: the first such moment after `now`."""
+        now = time.time() if now is None else now
+        tz = zone(timezone)
+        today = dt.datetime.fromtimestamp(now, tz).date()
+        if self.day in ("", "today"):
+            dates = (today, today + dt.timedelta(days=1))
+        elif self.day == "tomorrow":
+            dates = (today + dt.timedelta(days=1),)
+        else:
+            ahead = (_ISO_DOW[self.day] - today.weekday()) % 7 or (7 if self.skip_today else 0)
+            dates = (today + dt.timedelta(days=ahead), today + dt.timedelta(days=ahead + 7))
+        best: Optional[dt.datetime] = None
+        for d in dates:
+            for h in _hours(self.hour, self.meridiem, self.part, explicit=self.day not in ("", "today")):
+                t = dt.datetime(d.year, d.month, d.day, h, self.minute, tzinfo=tz)
+                if t.timestamp() > now and (best is None or t < best):
+                    best = t
+            if best is not None:
+                return best
+        return t  # every candidate passed (e.g. "tomorrow at midnight" just before it): the last one
+
+    def describe(self, timezone: str = "UTC", now: Optional[float] = None) -> str:
+        """Short phrase for an acknowledgement: "in 1 hour 30 minutes", "tomorrow at 9:00 AM"."""
+        if self.kind == "delay":
+            return f"in {spell_duration(self.delay_s)}"
+        if self.kind == "cron":
+            return self.text
+        now = time.time() if now is None else now
+        at = self.resolve(timezone, now)
+        days = (at.date() - dt.datetime.fromtimestamp(now, at.tzinfo).date()).days
+        day = "" if days == 0 else "tomorrow " if days == 1 else f"on {at:%A} "
+        return f"{day}at {at:%I:%M %p}".replace("at 0", "at ")
+
+
+def spell_duration(seconds: float) -> str:
+    parts = []
+    rest = round(seconds)
+    for name, size in (("day", 86400), ("hour", 3600), ("minute", 60), ("second", 1)):
+        n, rest = divmod(rest, size)
+        if n:
+            parts.append(f"{n} {name}{'s' if n != 1 else ''}")
+    return " ".join(parts) or "0 seconds"
+
+
+def _hours(hour: int, meridiem: str, part: str, explicit: bool) -> Tuple[int, ...]:
+    """
+    Candidate 24 h hours, earliest wins. An hour without am/pm takes it from the part of
+    day; on a named day 7-11 is morning and 12-6 afternoon; otherwise whichever of the
+    two comes next.
+    """
+    if hour < 0:
+        return (_PARTS[part][0] if part else _DEFAULT_HOUR,)
+    meridiem = meridiem or (_PARTS[part][1] if part else "")
+    if hour == 0 or hour > 12:
+        return (hour,)
+    if meridiem:
+        return (hour % 12 + (12 if meridiem == "pm" else 0),)
+    if explicit:
+        return (hour if hour >= 7 else hour + 12,)
+    return (hour % 12, hour % 12 + 12)
+
+
+# ---------------------------
+# Grammar (over word tokens)
+# ---------------------------
+
+def _tok(w: Words, i: int) -> str:
+    return w[i] if i < len(w) else ""
+
+
+def _number(w: Words, i: int) -> Tuple[Optional[float], int]:
+    t = _tok(w, i)
+    if t[:1].isdigit() and ":" not in t:
+        return float(t), i + 1
+    if t in ("a", "an"):
+        return 1.0, i + 1
+    if t in _ONES:
+        return float(_ONES[t]), i + 1
+    if t in _TENS:
+        if 0 < _ONES.get(_tok(w, i + 1), 0) < 10:
+            return float(_TENS[t] + _ONES[w[i + 1]]), i + 2
+        return float(_TENS[t]), i + 1
+    return None, i
+
+
+def _duration_part(w: Words, i: int) -> Tuple[Optional[float], int]:
+    if _tok(w, i) == "half" and _tok(w, i + 1) in ("a", "an") and _tok(w, i + 2) in _UNITS:
+        return _UNITS[w[i + 2]] / 2, i + 3
+    n, j = _number(w, i)
+    if n is not None and w[j:j + 3] == ["and", "a", "half"] and _tok(w, j + 3) in _UNITS:  # "two and a half hours"
+        return (n + 0.5) * _UNITS[w[j + 3]], j + 4
+    if n is None or _tok(w, j) not in _UNITS:
+        return None, i
+    unit = _UNITS[w[j]]
+    j += 1
+    if w[j:j + 3] == ["and", "a", "half"]:
+        return (n + 0.5) * unit, j + 3
+    return n * unit, j
+
+
+def _duration(w: Words, i: int) -> Tuple[Optional[float], int]:
+    """ "90 seconds", "an hour and a half", "1 hour 20 minutes", "two hours and five minutes" """
+    total, j = _duration_part(w, i)
+    if total is None:
+        return None, i
+    while True:
+        k = j + (_tok(w, j) == "and")
+        more, k = _duration_part(w, k)
+        if more is None:
+            return total, j
+        total, j = total + more, k
+
+
+def _meridiem(w: Words, i: int) -> Tuple[str, int]:
+    t = _tok(w, i)
+    if t in ("am", "pm"):
+        return t, i + 1
+    if t in ("a", "p") and _tok(w, i + 1) == "m":  # "a.m."
+        return t + "m", i + 2
+    return "", i
+
+
+def _clock(w: Words, i: int, words_ok: bool) -> Optional[Tuple[int, int, str, bool, int]]:
+    """(hour, minute, meridiem, exact, next): "7:30 pm", "9", "noon", "half past seven"."""
+    t = _tok(w, i)
+    if t in ("noon", "midday"):
+        return 12, 0, "pm", True, i + 1
+    if t == "midnight":
+        return 0, 0, "am", True, i + 1
+    if t in ("half", "quarter") and _tok(w, i + 1) in ("past", "to"):
+        c = _clock(w, i + 2, True) if _tok(w, i + 2) not in ("noon", "midday", "midnight") else None
+        if c is None or c[1] or (t == "half" and w[i + 1] == "to"):
+            return None
+        h, _m, mer, _exact, j = c
+        if w[i + 1] == "to":  # quarter to 1 -> 12:45, quarter to 0:00 -> 23:45
+            return (h - 1 if h > 1 else 12 if h == 1 else 23), 45, mer, True, j
+        return h, 30 if t == "half" else 15, mer, True, j
+    exact = ":" in t
+    if exact:
+        h, m = (int(x) for x in t.split(":"))
+    elif t.isdigit() and len(t) <= 2:
+        h, m = int(t), 0
+    elif words_ok and t in _ONES and 0 < _ONES[t] <= 12:
+        h, m = _ONES[t], 0
+    else:
+        return None
+    j = i + 1
+    if _tok(w, j) == "o'clock":
+        j += 1
+    mer, j = _meridiem(w, j)
+    if h > 23 or m > 59 or (mer and not 1 <= h <= 12):
+        return None
+    return h, m, mer, exact or bool(mer), j
+
+
+def _day(w: Words, i: int) -> Optional[Tuple[str, bool, str, int]]:
+    """(day, skip_today, part, next): "tomorrow", "tonight", "on next friday", "this evening"."""
+    t = _tok(w, i)
+    if t == "tonight":
+        return "today", False, "night", i + 1
+    if t == "this" and _tok(w, i + 1) in _PARTS:
+        return "today", False, w[i + 1], i + 2
+    if t == "in" and _tok(w, i + 1) == "the" and _tok(w, i + 2) in _PARTS:  # the next one
+        return "today", False, w[i + 2], i + 3
+    if t in ("today", "tomorrow"):
+        day, skip, j = t, False, i + 1
+    else:
+        j = i + (t == "on")
+        skip = _tok(w, j) == "next"
+        j += skip or _tok(w, j) == "this"
+        day = _WEEKDAYS.get(_tok(w, j), "")
+        if not day:
+            return None
+        j += 1
+    part = ""
+    if _tok(w, j) in _PARTS:  # "tomorrow morning", "friday evening"
+        part, j = w[j], j + 1
+    return day, skip, part, j
+
+
+def _part_suffix(w: Words, i: int) -> Tuple[str, int]:
+    if _tok(w, i) == "in" and _tok(w, i + 1) == "the" and _tok(w, i + 2) in _PARTS:
+        return w[i + 2], i + 3
+    if _tok(w, i) == "at" and _tok(w, i + 1) == "night":
+        return "night", i + 2
+    if _tok(w, i) == "tonight":
+        return "night", i + 1
+    return "", i
+
+
+def _relative(w: Words, i: int) -> Optional[Tuple[dict, int]]:
+    if _tok(w, i) in ("in", "for", "after"):
+        secs, j = _duration(w, i + 1)
+        if secs:
+            return {"kind": "delay", "delay_s": secs}, j
+        return None
+    secs, j = _duration(w, i)
+    if not secs:
+        return None
+    if _tok(w, j) in ("timer", "later"):  # "a 10 minute timer"
+        return {"kind": "delay", "delay_s": secs}, j + 1
+    if _tok(w, j) == "from" and _tok(w, j + 1) == "now":
+        return {"kind": "delay", "delay_s": secs}, j + 2
+    return None
+
+
+def _absolute(w: Words, i: int) -> Optional[Tuple[dict, int]]:
+    d = _day(w, i)
+    day, skip, part, j = d if d is not None else ("", False, "", i)
+    at = _tok(w, j) in ("at", "by", "around")
+    c = _clock(w, j + at, words_ok=at)
+    if c is None or not (at or c[3] or day):  # a bare number is not a time ("play 3 sounds")
+        if not day or (day == "today" and not part) or (day in _ISO_DOW and not part and j == i + 1):
+            return None  # "today" or a bare weekday name alone says nothing about when
+        return {"kind": "at", "day": day, "skip_today": skip, "part": part}, j
+    hour, minute, mer, _exact, k = c
+    if not day:
+        d = _day(w, k)
+        if d is not None:
+            day, skip, part, k = d
+    if not part:
+        part, k = _part_suffix(w, k)
+    return {"kind": "at", "day": day, "skip_today": skip, "part": part, "hour": hour, "minute": minute, "meridiem": mer}, k
+
+
+def _recurring(w: Words, i: int) -> Optional[Tuple[dict, int]]:
+    t = _tok(w, i)
+    if t == "hourly":
+        return {"kind": "cron", "cron": "0 * * * *"}, i + 1
+    dow, part, j = "", "", i + 1
+    if t in ("every", "each"):
+        n, k = _number(w, j)
+        unit = _UNITS.get(_tok(w, k), 0)
+        if unit in (60, 3600) and (n is None or n == int(n)):
+            if n == 0:
+                return None  # "every 0 minutes" is no schedule, not "every minute"
+            n = 1 if n is None else int(n)
+            if unit == 60 and 60 % n == 0:
+                return {"kind": "cron", "cron": "* * * * *" if n == 1 else f"*/{n} * * * *"}, k + 1
+            if unit == 3600 and 24 % n == 0:
+                return {"kind": "cron", "cron": "0 * * * *" if n == 1 else f"0 */{n} * * *"}, k + 1
+            return None  # "every 90 minutes": not a cron schedule
+        nxt = _tok(w, j)
+        if nxt == "day":
+            dow, j = "*", j + 1
+        elif nxt == "weekday":
+            dow, j = "1-5", j + 1
+        elif nxt == "weekend":
+            dow, j = "0,6", j + 1
+        elif nxt in _PARTS:
+            dow, part, j = "*", nxt, j + 1
+        else:
+            days, j = _weekday_list(w, j, _WEEKDAYS)
+            if not days:
+                return None
+            dow = days
+    elif t == "daily":
+        dow = "*"
+    else:
+        j = i + (t == "on")
+        nxt = _tok(w, j)
+        if nxt in ("weekdays", "weekends"):
+            dow, j = ("1-5" if nxt == "weekdays" else "0,6"), j + 1
+        else:
+            dow, j = _weekday_list(w, j, _PLURAL_WEEKDAYS)  # "mondays and thursdays"
+            if not dow:
+                return None
+    if not part and _tok(w, j) in _PARTS:  # "every weekday morning"
+        part, j = w[j], j + 1
+    at = _tok(w, j) in ("at", "around")
+    c = _clock(w, j + at, words_ok=at)
+    hour, minute, mer = -1, 0, ""
+    if c is not None and (at or c[3]):
+        hour, minute, mer, _exact, j = c
+    if not part:
+        part, j = _part_suffix(w, j)
+    h = _hours(hour, mer, part, explicit=True)[0]
+    return {"kind": "cron", "cron": f"{minute} {h} * * {dow}"}, j
+
+
+def _weekday_list(w: Words, i: int, names: Dict[str, str]) -> Tuple[str, int]:
+    days: List[int] = []
+    j = i
+    while _tok(w, j) in names:
+        days.append(_CRON_DOW[names[w[j]]])
+        j += 1
+        k = j + (_tok(w, j) == "and")
+        if _tok(w, k) in names:
+            j = k
+    return ",".join(str(d) for d in sorted(set(days))), j
+
+
+_PARSERS = (_recurring, _relative, _absolute)
+
+
+@lru_cache(maxsize=4096)
+def find_when(text: str) -> Optional[When]:
+    """
+    The first time expression in `text`, or None: delays ("in 90 seconds", "a 10 minute
+    timer"), times ("at 7:30 pm", "tomorrow at 9", "on friday evening") and recurrences
+    ("every weekday at 8", "every 15 minutes", "mondays and thursdays at 6 pm").
+    Deterministic; results are cached by text.
+    """
+    spans = list(_TOKEN.finditer(text.lower()))
+    w = [m.group() for m in spans]
+    for i in range(len(w)):
+        for parse in _PARSERS:
+            hit = parse(w, i)
+            if hit is not None:
+                fields, j = hit
+                start, end = spans[i].start(), spans[j - 1].end()
+                return When(text=text[start:end], start=start, end=end, **fields)
+    return None
+
+
+def parse_when(text: str) -> Optional[When]:
+    """Like find_when(), but `text` must be only the time expression."""
+    found = find_when(text)
+    if found is None or text[:found.start].strip() or text[found.end:].strip(" .!?"):
+        return None
+    return found
+
+
+@lru_cache(maxsize=4096)
+def find_duration(text: str) -> Optional[float]:
+    """Seconds of the first duration anywhere in `text`, with or without "in"/"for" ("timer eleven minutes")."""
+    w = _TOKEN.findall(text.lower())
+    for i in range(len(w)):
+        secs, _ = _duration(w, i)
+        if secs:
+            return secs
+    return None
+
+
+def trigger_for(when: Union[str, dt.datetime, dt.timedelta, None], timezone: str = "UTC",
+                now: Optional[float] = None) -> models_pb.Trigger:
+    """
+    Trigger for "now"/None, a timedelta, a datetime (naive ones are wall time in
+    `timezone`) or a phrase parse_when() understands; raises ValueError otherwise.
+    """
+    trig = models_pb.Trigger()
+    if when is None or (isinstance(when, str) and when.strip().lower() in ("", "now", "right now", "immediately")):
+        trig.delay.SetInParent()
+    elif isinstance(when, dt.timedelta):
+        trig.delay.FromTimedelta(when)
+    elif isinstance(when, dt.datetime):
+        at = when if when.tzinfo is not None else when.replace(tzinfo=zone(timezone))
+        trig.at.FromNanoseconds(round(at.timestamp() * 1e9))
+    else:
+        found = parse_when(when)
+        if found is None:
+            raise ValueError(f"not a time expression: {when!r}")
+        return found.trigger(timezone, now)
+    return trig
@@ -0,0 +1,83 @@
+# server/dedup.py
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
+
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+
+Key = Tuple[str, str]  # (task_id, attempt_id)
+
+
+@dataclass
+class DedupStats:
+    executed: int = 0
+    cached: int = 0   # answered from a finished run
+    joined: int = 0   # waited on a run in flight
+    evicted: int = 0
+
+
+class DedupCache:
+    """
+    Idempotent RunTask. The first request for a key runs it; copies that arrive while it
+    runs await the same result, and copies that arrive later (within `ttl_s` of it
+    finishing) get the cached RunTaskResponse. Finished entries are kept in completion
+    order, capped at `max_entries` (oldest first out), so memory is bounded whatever the
+    retry rate. Runs in flight are tracked apart and never evicted -- dropping one would
+    let a late copy execute the task a second time; they are bounded by the worker's
+    concurrency. STATUS_FAILED responses are returned to everyone waiting but not kept,
+    so a later retry runs again.
+
+    The run is its own task: a hedged copy that wins, or a caller giving up, does not
+    cancel work other callers are waiting on.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_s: float = 600.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.stats = DedupStats()
+        self._clock = clock
+        self._running: Dict[Key, asyncio.Future] = {}
+        self._done: "OrderedDict[Key, Tuple[float, asyncio.Future]]" = OrderedDict()  # key -> (finished, run)
+
+    def __len__(self) -> int:
+        return len(self._running) + len(self._done)
+
+    async def run(self, key: Key, fn: Callable[[], Awaitable[pb.RunTaskResponse]]) -> pb.RunTaskResponse:
+        self._expire(self._clock())
+        fut = self._running.get(key)
+        if fut is not None:
+            self.stats.joined += 1
+            return await asyncio.shield(fut)
+        entry = self._done.get(key)
+        if entry is not None:
+            self.stats.cached += 1
+            return entry[1].result()
+
+        task = asyncio.ensure_future(fn())
+        self._running[key] = task
+        self.stats.executed += 1
+        task.add_done_callback(lambda t: self._settled(key, t))
+        return await asyncio.shield(task)
+
+    def _settled(self, key: Key, task: asyncio.Future) -> None:
+        if self._running.get(key) is task:
+            del self._running[key]
+        failed = task.cancelled() or task.exception() is not None or task.result().status == pb.RunTaskResponse.STATUS_FAILED
+        if failed:
+            return
+        self._done[key] = (self._clock(), task)
+        while len(self._done) > self.max_entries:
+            self._done.popitem(last=False)
+            self.stats.evicted += 1
+
+    def _expire(self, now: float) -> None:
+        done = self._done
+        while done:
+            finished, _ = next(iter(done.values()))
+            if now - finished < self.ttl_s:
+                return
+            done.popitem(last=False)
+            self.stats.evicted += 1
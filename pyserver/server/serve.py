@@ -2,18 +2,48 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import functools
 import logging
 import signal
 import time
-from typing import Optional
+from typing import List, Optional, Sequence
 
 import grpc
 from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 
 import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
-from .server import PythonWorkerService,TTSQueue
+from pyserver.diagnostics.admin import DiagnosticsConfig, diagnostics
+from .server import NullTTSEngine, PythonWorkerService, TTSQueue, onnx_engine, pyttsx3_engine
+from pyserver.warmup import Step, StepResult, WarmupFailed, ollama_preload, warm_up
 
-async def serve(host: str, port: int) -> None:
+_SERVICES = ("", "assistant.v1.PythonWorkerService")
+
+
+async def _report_ready(tts: TTSQueue, worker: PythonWorkerService, health_servicer: health.HealthServicer, t0: float,
+                        warm_llm: Sequence[str] = (), ollama_host: Optional[str] = None) -> List[StepResult]:
+    """Warm everything the first RunTask would otherwise pay for, then flip health to SERVING."""
+    log = logging.getLogger("server")
+    steps: List[Step] = [("tts", tts.warm), ("tools", worker.start)]
+    steps += [(f"llm:{m}", functools.partial(ollama_preload, m, ollama_host)) for m in warm_llm]
+    try:
+        results = await warm_up(steps)
+    except WarmupFailed as e:
+        log.error("%s, staying NOT_SERVING", e)
+        return e.results
+    for name in _SERVICES:
+        health_servicer.set(name, health_pb2.HealthCheckResponse.SERVING)
+    log.info("SERVING after %.0f ms", (time.perf_counter() - t0) * 1e3)
+    return results
+
+
+async def serve(host: str, port: int, tts_engine: str = "pyttsx3", tts_model: Optional[str] = None,
+                admin_port: Optional[int] = None, warm_llm: Sequence[str] = (), time_coroutines: bool = False) -> None:
+    async with diagnostics(admin_port, DiagnosticsConfig(coroutines=time_coroutines)):
+        await _serve(host, port, tts_engine, tts_model, warm_llm)
+
+
+async def _serve(host: str, port: int, tts_engine: str, tts_model: Optional[str], warm_llm: Sequence[str]) -> None:
+    t0 = time.perf_counter()
     server = grpc.aio.server()
 
     # Health service
@@ -22,22 +52,29 @@ async def serve(host: str, port: int) -> None:
         experimental_thread_pool=None,
     )
     health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    health_servicer.set("grpc.health.v1.Health", health_pb2.HealthCheckResponse.SERVING)
+    for name in _SERVICES:
+        health_servicer.set(name, health_pb2.HealthCheckResponse.NOT_SERVING)
 
-    # App services
-    tts = TTSQueue()
-    await tts.start()
+    # App services. The TTS engine initializes and warms up in the background: the port is
+    # bound right away and RunTask is accepted (speech queues until the engine is up);
+    # health flips to SERVING once every warmup step has finished.
+    if tts_engine == "onnx":
+        if not tts_model:
+            raise ValueError("--tts-engine onnx needs --tts-model")
+        tts = TTSQueue(engine_factory=functools.partial(onnx_engine, tts_model))
+    else:
+        tts = TTSQueue(engine=NullTTSEngine() if tts_engine == "null" else None, engine_factory=pyttsx3_engine)
     worker = PythonWorkerService(tts)
     rpc.add_PythonWorkerServiceServicer_to_server(worker, server)
 
     bind_addr = f"{host}:{port}"
     server.add_insecure_port(bind_addr) 
-    logging.getLogger("server").info("PythonWorkerService listening on %s", bind_addr)
-
-    health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
-    health_servicer.set("grpc.health.v1.Health", health_pb2.HealthCheckResponse.SERVING)
-    health_servicer.set("assistant.v1.PythonWorkerService", health_pb2.HealthCheckResponse.SERVING)
-
     await server.start()
+    logging.getLogger("server").info("PythonWorkerService listening on %s (%.0f ms)", bind_addr, (time.perf_counter() - t0) * 1e3)
+
+    await tts.start()
+    ready = asyncio.create_task(_report_ready(tts, worker, health_servicer, t0, warm_llm))
 
     stop_event = asyncio.Event()
     for sig in (signal.SIGINT, signal.SIGTERM):
@@ -50,9 +87,11 @@ async def serve(host: str, port: int) -> None:
     logging.getLogger("server").info("Shutting down...")
 
     # Health: not serving
-    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
-    health_servicer.set("assistant.v1.PythonWorkerService", health_pb2.HealthCheckResponse.NOT_SERVING)
+    ready.cancel()
+    for name in _SERVICES:
+        health_servicer.set(name, health_pb2.HealthCheckResponse.NOT_SERVING)
 
     await server.stop(grace=None)  # allow in-flight RPCs to finish
     await tts.stop()
+    worker.close()
 
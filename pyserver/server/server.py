@@ -1,53 +1,167 @@
 #!/usr/bin/env python3
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, Callable, Optional, Union
 
 import grpc
-import pyttsx3
 
 import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
 import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
 import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
 
+from pyserver.server.dedup import DedupCache
+from pyserver.tools.catalog import TOOLS
+from pyserver.tools.backends import ToolFailed, ToolTimeout
+from pyserver.tools.registry import ToolContext, ToolRegistry
+
 
 # ---------------------------
 # Simple TTS queue (no overlap)
 # ---------------------------
 
+def pyttsx3_engine() -> Any:
+    import pyttsx3  # heavy (platform speech driver); imported on first use
+    return pyttsx3.init()
+
+
+def onnx_engine(model_path: str) -> Any:
+    from pyserver.server.tts_onnx import OnnxTTSConfig, OnnxTTSEngine  # onnxruntime + NumPy; imported on first use
+    return OnnxTTSEngine(OnnxTTSConfig(model_path))
+
+
+class NullTTSEngine:
+    """say/runAndWait sink for hosts without a speech engine; the text is only logged."""
+
+    def setProperty(self, name: str, value: Any) -> None:
+        pass
+
+    def getProperty(self, name: str) -> Any:
+        return [] if name == "voices" else None
+
+    def say(self, text: str) -> None:
+        pass
+
+    def runAndWait(self) -> None:
+        pass
+
+    def warm(self) -> None:
+        pass
+
+
+class _Warm:
+    """Queue item: run a silent synthesis on the engine, in turn with speech."""
+    __slots__ = ("done",)
+
+    def __init__(self, done: asyncio.Future) -> None:
+        self.done = done
+
+
 class TTSQueue:
-    def __init__(self) -> None:
-        self._q: asyncio.Queue[models_pb.SpeakArgs] = asyncio.Queue()
+    """
+    Speaks queued SpeakArgs one at a time. Unless an engine is passed in, the engine is
+    created in a worker thread by start() so the caller (e.g. serve()) is not blocked by
+    driver start-up; speech enqueued meanwhile waits for it.
+
+    At most `max_pending` utterances wait; past that enqueue() raises ToolFailed (the
+    RunTask fails) instead of piling up speech, and callers, behind a stuck engine.
+    """
+
+    def __init__(self, engine=None, engine_factory: Callable[[], Any] = pyttsx3_engine, max_pending: int = 64) -> None:
+        self._q: asyncio.Queue[Union[models_pb.SpeakArgs, _Warm]] = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0  # speech refused because the queue was full
         self._worker: Optional[asyncio.Task] = None
+        self._init: Optional[asyncio.Task] = None
         self._log = logging.getLogger("TTSQueue")
-        # init pyttsx3
-        self._engine = pyttsx3.init()
-        self._engine.setProperty("rate", 180)  # tweak later
+        # pyttsx3 (via engine_factory) unless an engine with the same say/runAndWait API is supplied
+        self._engine = engine
+        self._engine_factory = engine_factory
+        if engine is not None:
+            self._configure(engine)
 
     async def start(self) -> None:
+        if self._engine is None and self._init is None:
+            self._init = asyncio.create_task(self._init_engine())
         if self._worker is None:
             self._worker = asyncio.create_task(self._run())
 
+    async def ready(self) -> None:
+        """Wait for the engine; raises if it could not be initialized."""
+        if self._init is not None:
+            await asyncio.shield(self._init)
+
     async def stop(self) -> None:
-        if self._worker:
-            self._worker.cancel()
-            try:
-                await self._worker
-            except asyncio.CancelledError:
-                pass
-            self._worker = None
+        for attr in ("_worker", "_init"):
+            task = getattr(self, attr)
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                setattr(self, attr, None)
+
+    async def _init_engine(self) -> None:
+        engine = await asyncio.get_running_loop().run_in_executor(None, self._engine_factory)
+        self._configure(engine)
+        self._engine = engine
+        self._log.info("TTS engine ready")
+
+    def _configure(self, engine: Any) -> None:
+        engine.setProperty("rate", 180)  # tweak later
+
+    async def warm(self) -> None:
+        """Wait for the engine, then run a silent synthesis (after anything already queued)."""
+        await self.ready()
+        done = asyncio.get_running_loop().create_future()
+        await self._q.put(_Warm(done))
+        await done
 
     async def enqueue(self, speak_args: models_pb.SpeakArgs) -> None:
-        await self._q.put(speak_args)
+        try:
+            self._q.put_nowait(speak_args)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            raise ToolFailed(f"speech queue full ({self._q.maxsize} pending)") from None
+
+    async def join(self) -> None:
+        """Wait until everything enqueued so far has been spoken."""
+        await self._q.join()
 
     async def _run(self) -> None:
         self._log.info("TTS worker started")
+        try:
+            await self.ready()
+        except Exception as e:
+            self._log.error("TTS engine unavailable, dropping speech: %s", e)
         while True:
-            args: models_pb.SpeakArgs = await self._q.get()
+            args = await self._q.get()
             try:
+                if isinstance(args, _Warm):
+                    await self._warm_impl(args.done)
+                    continue
+                if self._engine is None:
+                    self._log.warning("[TTS unavailable] %s", args.text)
+                    continue
                 await self._speak_impl(args)
             except Exception as e:
                 self._log.exception("TTS failed: %s", e)
+            finally:
+                self._q.task_done()
+
+    async def _warm_impl(self, done: asyncio.Future) -> None:
+        def _do():
+            warm = getattr(self._engine, "warm", None)
+            if warm is not None:
+                warm()
+            else:  # pyttsx3: an empty utterance spins up the driver without a sound
+                self._engine.say("")
+                self._engine.runAndWait()
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _do)
+        except Exception as e:
+            if not done.done():
+                done.set_exception(e)
+        else:
+            if not done.done():
+                done.set_result(None)
 
     async def _speak_impl(self, args: models_pb.SpeakArgs) -> None:
         text = args.text
@@ -73,47 +187,46 @@ class TTSQueue:
 # ---------------------------
 
 class PythonWorkerService(rpc.PythonWorkerServiceServicer):
-    def __init__(self, tts: TTSQueue) -> None:
+    def __init__(self, tts: TTSQueue, tools: ToolRegistry = TOOLS, dedup: Optional[DedupCache] = None) -> None:
         self._tts = tts
+        self._tools = tools
+        self.dedup = dedup if dedup is not None else DedupCache()
+        self._ctx = ToolContext(tts=tts)
         self._log = logging.getLogger("PythonWorkerService")
 
+    async def start(self) -> None:
+        """Warm up tools that run in worker processes."""
+        await self._tools.start()
+
+    def close(self) -> None:
+        self._tools.close()
+
     async def RunTask(self, request: pb.RunTaskRequest, context: grpc.aio.ServicerContext) -> pb.RunTaskResponse:
-        call: models_pb.ToolCall = request.call
+        if request.task_id and request.attempt_id:  # retries/hedges of one execution run it once
+            return await self.dedup.run((request.task_id, request.attempt_id), lambda: self.execute(request.call))
+        return await self.execute(request.call)
 
+    async def execute(self, call: models_pb.ToolCall) -> pb.RunTaskResponse:
+        """Run a tool call; shared by RunTask and in-process schedulers."""
         # Route by oneof (tool type)
         which = call.WhichOneof("payload")
+        spec = self._tools.get(which) if which else None
+        if spec is None:
+            err = f"Unsupported tool call type: {which or 'None'}"
+            self._log.error(err)
+            return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_FAILED, error_message=err)
+        if not spec.local:
+            # By design, timers are handled by the Go scheduler.
+            # If one lands here we no-op.
+            msg = f"{which} tool is not handled by the Python worker (routed to the scheduler)."
+            self._log.warning(msg)
+            return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_UNSPECIFIED, error_message=msg)
         try:
-            if which == "speak":
-                await self._handle_speak(call.speak)
-                return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_OK)
-
-            elif which == "play_sound":
-                await self._handle_play_sound(call.play_sound)
-                return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_OK)
-
-            elif which == "timer":
-                # By design, timers are handled by the Go scheduler.
-                # If one lands here we no-op.
-                msg = "Timer tool is not handled by the Python worker (routed to Go)."
-                self._log.warning(msg)
-                return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_UNSPECIFIED, error_message=msg)
-
-            else:
-                err = f"Unsupported tool call type: {which or 'None'}"
-                self._log.error(err)
-                return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_FAILED, error_message=err)
-
+            output = await self._tools.dispatch(spec, getattr(call, which), self._ctx)
+            return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_OK, output=output or None)
+        except (ToolTimeout, ToolFailed) as e:
+            self._log.warning("RunTask failed: %s", e)
+            return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_FAILED, error_message=str(e))
         except Exception as e:
             self._log.exception("RunTask failed")
             return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_FAILED, error_message=str(e))
-
-    # ---- Tool handlers ----
-
-    async def _handle_speak(self, args: models_pb.SpeakArgs) -> None:
-        await self._tts.enqueue(args)
-
-    async def _handle_play_sound(self, args: models_pb.PlaySoundArgs) -> None:
-        # DEV: simple placeholder; integrate an audio player later.
-        txt = f"[SOUND] id={args.sound_id or 'ding'} repeat={args.repeat or 1}"
-        await self._tts.enqueue(models_pb.SpeakArgs(text=txt))  # Reuse TTS queue to announce action.
-
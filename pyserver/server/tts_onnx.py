@@ -0,0 +1,320 @@
+# server/tts_onnx.py
+"""
+Neural TTS engine: a Piper-style VITS voice (model.onnx + model.onnx.json) run with
+onnxruntime. Text is split into sentences and each one is played as soon as it is
+synthesized while the next is being computed, so the first audio arrives after one
+sentence rather than the whole utterance. Exposes the pyttsx3 say/runAndWait API that
+TTSQueue drives.
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+# Piper phoneme_id_map control symbols
+PAD, BOS, EOS = "_", "^", "$"
+
+# TTSQueue sets rate=180; at that rate the voice speaks at its trained pace (length_scale from the config)
+NOMINAL_RATE = 180
+
+_SENTENCE = re.compile(r"(?<=[.!?;])\s+")
+_CLAUSE = re.compile(r"(?<=[,:])\s+")
+_WORD = re.compile(r"\w+(?:'\w+)?|[^\w\s]|\s+")
+
+
+@dataclass
+class OnnxTTSConfig:
+    model_path: str
+    config_path: Optional[str] = None    # default: <model_path>.json (Piper convention)
+    lexicon_path: Optional[str] = None   # word<TAB>phonemes; default: <model_path>.lexicon.tsv if it exists
+    speaker_id: int = 0                  # multi-speaker voices only
+    max_chunk_chars: int = 160           # longer sentences are split at commas, then at spaces
+    threads: int = 1
+    device: Optional[Any] = None         # sounddevice output device
+
+
+@dataclass
+class TTSStats:
+    utterances: int = 0
+    chunks: int = 0
+    synth_s: float = 0.0
+    audio_s: float = 0.0
+    first_audio_s: float = 0.0   # last utterance: runAndWait() to first samples handed to the sink
+    underrun_s: float = 0.0      # playback waiting on synthesis after the first chunk
+
+    @property
+    def rtf(self) -> float:
+        return self.synth_s / self.audio_s if self.audio_s else 0.0
+
+
+def split_chunks(text: str, max_chars: int = 160) -> List[str]:
+    """Sentences; overlong ones are cut into runs of clauses (or, failing that, words) up to max_chars."""
+    chunks: List[str] = []
+    for sentence in _SENTENCE.split(text.strip()):
+        if len(sentence) <= max_chars:
+            if sentence:
+                chunks.append(sentence)
+            continue
+        run = ""
+        for part in _CLAUSE.split(sentence):
+            while len(part) > max_chars:
+                cut = part.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                part, rest = part[:cut], part[cut:].strip()
+                if run:
+                    chunks.append(run)
+                    run = ""
+                chunks.append(part)
+                part = rest
+            if run and len(run) + 1 + len(part) > max_chars:
+                chunks.append(run)
+                run = ""
+            run = f"{run} {part}" if run else part
+        if run:
+            chunks.append(run)
+    return chunks
+
+
+class VoiceTables:
+    """
+    Phoneme lookup for a voice, loaded once: the config's phoneme_id_map and, for espeak
+    voices, an optional word->phonemes lexicon. Words are mapped to ids through an LRU,
+    so repeated vocabulary costs a dict hit. Words missing from the lexicon go to
+    `phonemize` (espeak-ng) when given, else fall back to their letters.
+    """
+
+    def __init__(self, config: Dict[str, Any], lexicon: Optional[Dict[str, str]] = None,
+                 phonemize: Optional[Callable[[str], str]] = None) -> None:
+        self.sample_rate: int = int(config["audio"]["sample_rate"])
+        self.phoneme_type: str = config.get("phoneme_type", "espeak")
+        self.id_map: Dict[str, List[int]] = config["phoneme_id_map"]
+        inference = config.get("inference", {})
+        self.noise_scale = float(inference.get("noise_scale", 0.667))
+        self.length_scale = float(inference.get("length_scale", 1.0))
+        self.noise_w = float(inference.get("noise_w", 0.8))
+        self.speakers = int(config.get("num_speakers", 1))
+        self.lexicon = lexicon or {}
+        self.phonemize = phonemize
+        self.missing = 0
+        self._log = logging.getLogger("VoiceTables")
+        self._word_ids = lru_cache(maxsize=8192)(self._lookup)
+
+    def ids(self, text: str) -> np.ndarray:
+        pad, out = self.id_map[PAD], list(self.id_map[BOS])
+        out += pad
+        for token in _WORD.findall(text.lower() if self.phoneme_type != "text" else text):
+            if token.isspace():
+                token = " "
+            out += self._word_ids(token)
+        out += self.id_map[EOS]
+        return np.asarray(out, dtype=np.int64)
+
+    def _lookup(self, word: str) -> List[int]:
+        phonemes = self.lexicon.get(word) if self.phoneme_type != "text" else None
+        if phonemes is None and self.phonemize is not None and word[0].isalnum():
+            phonemes = self.phonemize(word)
+        if phonemes is None:
+            if self.lexicon and word[0].isalnum():
+                self.missing += 1
+                self._log.debug("not in lexicon: %r", word)
+            phonemes = word
+        pad, ids = self.id_map[PAD], []
+        for ph in phonemes:
+            mapped = self.id_map.get(ph)
+            if mapped is not None:
+                ids += mapped
+                ids += pad
+        return ids
+
+
+def load_lexicon(path: str) -> Dict[str, str]:
+    lexicon: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            word, _, phonemes = line.rstrip("\n").partition("\t")
+            if word and phonemes and not word.startswith("#"):
+                lexicon.setdefault(word.lower(), phonemes.replace(" ", ""))
+    return lexicon
+
+
+def espeak_phonemizer(config: Dict[str, Any]) -> Optional[Callable[[str], str]]:
+    """Word -> phonemes through piper-phonemize (espeak-ng) in the voice's language, if installed."""
+    try:
+        from piper_phonemize import phonemize_espeak
+    except ImportError:
+        return None
+    voice = config.get("espeak", {}).get("voice", "en-us")
+    return lambda word: "".join("".join(s) for s in phonemize_espeak(word, voice))
+
+
+class AudioSink(Protocol):
+    """Blocking playback: write() returns once the samples are queued to the device."""
+    def open(self, sample_rate: int) -> None: ...
+    def write(self, audio: np.ndarray) -> None: ...
+    def drain(self) -> None: ...
+
+
+class SoundDeviceSink:
+    """Mono float32 output stream, kept open across utterances."""
+
+    def __init__(self, device: Optional[Any] = None) -> None:
+        self._device = device
+        self._stream = None
+
+    def open(self, sample_rate: int) -> None:
+        if self._stream is not None:
+            return
+        import sounddevice as sd  # heavy (PortAudio); only needed with a real speaker
+        self._stream = sd.OutputStream(samplerate=sample_rate, channels=1, dtype="float32", device=self._device)
+        self._stream.start()
+
+    def write(self, audio: np.ndarray) -> None:
+        assert self._stream is not None
+        self._stream.write(audio.reshape(-1, 1))
+
+    def drain(self) -> None:
+        pass  # the stream stays open; the tail plays out while the next utterance is synthesized
+
+
+class OnnxTTSEngine:
+    """
+    pyttsx3-compatible engine (setProperty/getProperty/say/runAndWait) over a VITS voice.
+    The InferenceSession and lookup tables are created once, in the constructor (TTSQueue
+    runs the factory off the event loop). runAndWait() synthesizes chunk by chunk on a
+    helper thread and plays on the calling thread, one chunk ahead.
+    """
+
+    def __init__(self, cfg: OnnxTTSConfig, sink: Optional[AudioSink] = None) -> None:
+        import onnxruntime as ort
+
+        self.cfg = cfg
+        self.stats = TTSStats()
+        self._log = logging.getLogger("OnnxTTS")
+        with open(cfg.config_path or f"{cfg.model_path}.json", encoding="utf-8") as f:
+            config = json.load(f)
+        lexicon_path = cfg.lexicon_path or f"{cfg.model_path}.lexicon.tsv"
+        lexicon = load_lexicon(lexicon_path) if os.path.exists(lexicon_path) else None
+        espeak = config.get("phoneme_type", "espeak") != "text"
+        phonemize = espeak_phonemizer(config) if espeak else None
+        if espeak and lexicon is None and phonemize is None:
+            raise ValueError(f"{cfg.model_path} is an espeak voice: install piper-phonemize or provide "
+                             f"a lexicon ({lexicon_path})")
+        self.tables = VoiceTables(config, lexicon, phonemize)
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = cfg.threads
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(cfg.model_path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self._session.get_inputs()}
+
+        self._sink = sink if sink is not None else SoundDeviceSink(cfg.device)
+        self._sink.open(self.tables.sample_rate)
+        self._props: Dict[str, Any] = {"rate": NOMINAL_RATE, "volume": 1.0, "voice": None}
+        self._pending: List[str] = []
+
+    # ---- pyttsx3 API ----
+    def setProperty(self, name: str, value: Any) -> None:
+        self._props[name] = value
+
+    def getProperty(self, name: str) -> Any:
+        return [] if name == "voices" else self._props.get(name)
+
+    def say(self, text: str) -> None:
+        self._pending.append(text)
+
+    def runAndWait(self) -> None:
+        text, self._pending = " ".join(self._pending), []
+        chunks = split_chunks(text, self.cfg.max_chunk_chars)
+        if not chunks:
+            return
+        t0 = time.perf_counter()
+        ready: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def produce() -> None:
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        return
+                    ready.put(self.synthesize(chunk))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                ready.put(None)
+
+        producer = threading.Thread(target=produce, name="tts-synth", daemon=True)
+        producer.start()
+        first = True
+        try:
+            while True:
+                t_wait = time.perf_counter()
+                audio = ready.get()
+                if audio is None:
+                    break
+                if first:
+                    self.stats.first_audio_s = time.perf_counter() - t0
+                    first = False
+                else:
+                    self.stats.underrun_s += time.perf_counter() - t_wait
+                self._sink.write(audio)
+            self._sink.drain()
+        finally:
+            stop.set()
+            while producer.is_alive():  # unblock a producer stuck on a full queue
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    producer.join(timeout=0.01)
+        self.stats.utterances += 1
+        if errors:
+            raise errors[0]
+
+    def warm(self) -> None:
+        """A synthesis that is not played or counted: lets onnxruntime allocate and pick kernels."""
+        self._infer(self.tables.ids("Hello there."))
+
+    # ---- synthesis ----
+    def synthesize(self, text: str) -> np.ndarray:
+        """One chunk of text -> float32 mono samples at tables.sample_rate."""
+        t0 = time.perf_counter()
+        audio = self._infer(self.tables.ids(text))
+        volume = self._props.get("volume", 1.0)
+        volume = 1.0 if volume is None else float(volume)  # 0.0 is mute, not "unset"
+        if volume != 1.0:
+            audio = audio * volume
+        self.stats.chunks += 1
+        self.stats.synth_s += time.perf_counter() - t0
+        self.stats.audio_s += audio.shape[0] / self.tables.sample_rate
+        return audio
+
+    def _infer(self, ids: np.ndarray) -> np.ndarray:
+        feeds: Dict[str, np.ndarray] = {
+            "input": ids[None, :],
+            "input_lengths": np.asarray([ids.shape[0]], dtype=np.int64),
+            "scales": np.asarray(self._scales(), dtype=np.float32),
+        }
+        if "sid" in self._inputs:
+            feeds["sid"] = np.asarray([self.cfg.speaker_id], dtype=np.int64)
+        return self._session.run(None, feeds)[0].reshape(-1).astype(np.float32, copy=False)
+
+    def stream(self, text: str) -> Iterator[np.ndarray]:
+        """Synthesize chunk by chunk, for callers that handle playback themselves."""
+        for chunk in split_chunks(text, self.cfg.max_chunk_chars):
+            yield self.synthesize(chunk)
+
+    def _scales(self) -> Tuple[float, float, float]:
+        t = self.tables
+        rate = float(self._props.get("rate") or NOMINAL_RATE)
+        return t.noise_scale, t.length_scale * NOMINAL_RATE / rate, t.noise_w
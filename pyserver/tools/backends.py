@@ -0,0 +1,234 @@
+# tools/backends.py
+from __future__ import annotations
+import asyncio
+import importlib
+import logging
+import multiprocessing as mp
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Protocol, Tuple
+
+from google.protobuf.message import Message
+
+if TYPE_CHECKING:
+    from pyserver.tools.registry import ToolContext, ToolSpec
+
+Output = Optional[Mapping[str, str]]
+
+# ToolSpec.backend values
+INLINE, THREAD, PROCESS = "inline", "thread", "process"
+
+
+def load_attr(path: str) -> Any:
+    """Import "package.module:attr"."""
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+class ToolFailed(RuntimeError):
+    """The handler raised in a worker process (the message carries the remote error)."""
+
+
+class ToolTimeout(TimeoutError):
+    """The handler did not finish within the tool's timeout_s."""
+
+
+class Backend(Protocol):
+    """Where a tool's handler runs. Thread and process handlers are plain functions args -> output."""
+    async def run(self, args: Message, ctx: "ToolContext") -> Output: ...
+    def close(self) -> None: ...
+
+
+class InlineBackend:
+    """Awaits an async handler on the event loop (the default; for I/O-bound tools)."""
+
+    def __init__(self, spec: "ToolSpec") -> None:
+        self._spec = spec
+        self._handler = spec.resolve()
+
+    async def run(self, args: Message, ctx: "ToolContext") -> Output:
+        if self._spec.timeout_s is None:
+            return await self._handler(args, ctx)
+        try:
+            return await asyncio.wait_for(self._handler(args, ctx), self._spec.timeout_s)
+        except asyncio.TimeoutError:
+            raise ToolTimeout(f"{self._spec.name} timed out after {self._spec.timeout_s:g}s") from None
+
+    def close(self) -> None:
+        pass
+
+
+class ThreadBackend:
+    """
+    Runs a blocking handler on the tool's own thread pool, so it cannot starve other tools
+    of the loop's default executor. The timeout is soft: the caller gets ToolTimeout, but
+    the thread runs on, still holding its slot, until the handler returns.
+    """
+
+    def __init__(self, spec: "ToolSpec") -> None:
+        self._spec = spec
+        self._handler = spec.resolve()
+        self._pool = ThreadPoolExecutor(max_workers=spec.max_concurrency or 1, thread_name_prefix=f"tool-{spec.name}")
+
+    async def run(self, args: Message, ctx: "ToolContext") -> Output:
+        fut = asyncio.get_running_loop().run_in_executor(self._pool, self._handler, args)
+        if self._spec.timeout_s is None:
+            return await fut
+        try:
+            return await asyncio.wait_for(fut, self._spec.timeout_s)
+        except asyncio.TimeoutError:
+            raise ToolTimeout(f"{self._spec.name} timed out after {self._spec.timeout_s:g}s (thread left running)") from None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ===============================
+#         Process pool
+# ===============================
+def _child(conn: Connection, handler_path: str, type_path: str) -> None:
+    """Worker process: serialized args in, (ok, output or error text) out, until EOF."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent shuts us down
+    handler: Callable[[Message], Output] = load_attr(handler_path)
+    parse = load_attr(type_path).FromString
+    conn.send_bytes(b"")  # warm: imports done
+    while True:
+        try:
+            payload = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        try:
+            out = handler(parse(payload))
+            conn.send((True, dict(out) if out else {}))
+        except BaseException as e:  # report everything; the parent decides
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx: Any, handler_path: str, type_path: str, name: str) -> None:
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_child, args=(child, handler_path, type_path), name=name, daemon=True)
+        self.proc.start()
+        child.close()
+        self.conn.recv_bytes()  # blocks until the child has imported the handler
+
+    def call(self, payload: bytes) -> Tuple[bool, Any]:
+        self.conn.send_bytes(payload)
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join(timeout=5)
+        self.conn.close()
+
+
+class ProcessBackend:
+    """
+    Warm worker processes (forkserver where available) for CPU-heavy or untrusted handlers.
+    Args travel as serialized protos and the handler ("module:function", a plain function
+    args -> output) is imported once per process, at start. Each call owns one process;
+    the timeout is hard: a call that overruns has its process killed and replaced.
+    """
+
+    def __init__(self, spec: "ToolSpec") -> None:
+        if not isinstance(spec.handler, str):
+            raise ValueError(f"process tool {spec.name!r} needs its handler as a 'module:function' path")
+        self._spec = spec
+        self._handler_path = spec.handler
+        self._type_path = f"{spec.proto_type.__module__}:{spec.proto_type.__name__}"
+        self._size = spec.max_concurrency or 1
+        self._ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        # One thread per process waits on its pipe; nothing blocks the loop.
+        self._waiters = ThreadPoolExecutor(max_workers=self._size + 1, thread_name_prefix=f"proc-{spec.name}")
+        self._idle: Optional[asyncio.Queue[_Worker]] = None
+        self._all: List[_Worker] = []
+        self._refills: set = set()
+        self._closed = False
+        self._lock = threading.Lock()  # _all and _closed: spawns finish on waiter threads
+        self._log = logging.getLogger("ToolProcess")
+
+    async def start(self) -> None:
+        """Start the processes (also done on first call)."""
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        workers = await asyncio.gather(*(loop.run_in_executor(self._waiters, self._spawn) for _ in range(self._size)))
+        for w in workers:
+            self._idle.put_nowait(w)
+        self._log.info("%s: %d worker processes ready", self._spec.name, self._size)
+
+    async def run(self, args: Message, ctx: "ToolContext") -> Output:
+        if self._idle is None:
+            await self.start()
+        assert self._idle is not None
+        worker = await self._idle.get()
+        fut = asyncio.get_running_loop().run_in_executor(self._waiters, worker.call, args.SerializeToString())
+        reusable = False
+        try:
+            ok, result = await asyncio.wait_for(fut, self._spec.timeout_s) if self._spec.timeout_s else await fut
+            reusable = True
+        except asyncio.TimeoutError:
+            raise ToolTimeout(f"{self._spec.name} timed out after {self._spec.timeout_s:g}s (process killed)") from None
+        except (EOFError, OSError) as e:
+            raise ToolFailed(f"{self._spec.name}: worker process died ({e!r})") from None
+        finally:
+            if reusable:
+                self._idle.put_nowait(worker)
+            else:  # overran, died or the caller was cancelled mid-call: never reuse it
+                self._replace(worker)
+        if not ok:
+            raise ToolFailed(f"{self._spec.name}: {result}")
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._all = self._all, []
+        for task in self._refills:
+            task.cancel()
+        for w in workers:
+            w.kill()
+        self._waiters.shutdown(wait=False, cancel_futures=True)
+
+    def _spawn(self) -> _Worker:
+        if self._closed:
+            raise RuntimeError(f"{self._spec.name}: backend closed")
+        w = _Worker(self._ctx, self._handler_path, self._type_path, f"tool-{self._spec.name}")
+        with self._lock:
+            if not self._closed:
+                self._all.append(w)
+                return w
+        w.kill()  # close() ran while this one was starting
+        raise RuntimeError(f"{self._spec.name}: backend closed")
+
+    def _replace(self, worker: _Worker) -> None:
+        self._log.warning("%s: replacing worker process %d", self._spec.name, worker.proc.pid or 0)
+        worker.kill()
+        with self._lock:
+            if worker in self._all:
+                self._all.remove(worker)
+        if self._closed:
+            return
+        task = asyncio.get_running_loop().create_task(self._refill())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def _refill(self) -> None:
+        try:
+            worker = await asyncio.get_running_loop().run_in_executor(self._waiters, self._spawn)
+        except RuntimeError:
+            if self._closed:
+                return  # closed meanwhile; _spawn killed what it started
+            raise
+        assert self._idle is not None
+        self._idle.put_nowait(worker)
+
+
+BACKENDS: Dict[str, Callable[["ToolSpec"], Backend]] = {
+    INLINE: InlineBackend,
+    THREAD: ThreadBackend,
+    PROCESS: ProcessBackend,
+}
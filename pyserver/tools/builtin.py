@@ -0,0 +1,17 @@
+# tools/builtin.py
+"""Handlers for the built-in tools (registered in pyserver.tools.catalog, imported on first call)."""
+from __future__ import annotations
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.tools.registry import ToolContext
+
+
+async def speak(args: models_pb.SpeakArgs, ctx: ToolContext) -> None:
+    await ctx.tts.enqueue(args)
+
+
+async def play_sound(args: models_pb.PlaySoundArgs, ctx: ToolContext) -> None:
+    # DEV: simple placeholder; integrate an audio player later.
+    txt = f"[SOUND] id={args.sound_id or 'ding'} repeat={args.repeat or 1}"
+    await ctx.tts.enqueue(models_pb.SpeakArgs(text=txt))  # Reuse TTS queue to announce action.
@@ -0,0 +1,17 @@
+# tools/catalog.py
+"""
+The built-in tools. Adding one: its args message and ToolCall.payload field in task.proto,
+an args model and ToolCallModel field in pyserver.llm.models, a handler, a ToolSpec here
+(models and handlers by "module:attr" path, imported on first use) and its prompt snippet
+in data/prompts/tools. The Tools enum and ToolCallModel's oneof check follow the registry.
+"""
+from pyserver.tools.registry import TOOLS, ToolSpec
+
+TOOLS.register(ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", "pyserver.tools.builtin:speak",
+                        description="Say something out loud."))
+TOOLS.register(ToolSpec("timer", "pyserver.llm.models:TimerArgsModel", None,  # run by the scheduler
+                        description="Set a timer for a number of minutes."))
+TOOLS.register(ToolSpec("play_sound", "pyserver.llm.models:PlaySoundArgsModel", "pyserver.tools.builtin:play_sound",
+                        description="Play a short sound, optionally repeated."))
+
+__all__ = ["TOOLS"]
@@ -0,0 +1,183 @@
+# tools/registry.py
+from __future__ import annotations
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, Mapping, Optional, Type, Union
+
+from google.protobuf.message import Message
+
+from protobufs.gen.py.protobufs.apis.models import task_pb2 as models_pb
+
+from pyserver.tools.backends import BACKENDS, INLINE, PROCESS, Backend, load_attr
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from pyserver.server.server import TTSQueue
+
+
+@dataclass
+class ToolContext:
+    """What handlers get besides their args: the worker's shared resources."""
+    tts: "TTSQueue"
+    log: logging.Logger = field(default_factory=lambda: logging.getLogger("Tools"))
+
+
+# (proto args, context) -> optional RunTaskResponse.output
+Handler = Callable[[Message, ToolContext], Awaitable[Optional[Mapping[str, str]]]]
+
+
+@dataclass
+class ToolSpec:
+    """
+    One tool. `name` is its field in the ToolCall `payload` oneof (and in ToolCallModel);
+    `args_model` validates what the planner produced. `handler` is an async callable;
+    None marks tools the Python worker does not run (timers are handled by the scheduler).
+    Both may be given as "module:attr" paths, imported on first use, so the worker can
+    load the catalog without pydantic and a tool's dependencies load only if it runs.
+    `proto_type` defaults to the message type of that oneof field.
+
+    `backend` is where the handler runs (tools.backends), and it decides the handler's
+    signature: "inline" awaits `async handler(args, ctx)` on the loop; "thread" and
+    "process" call a plain `handler(args) -> output` on the tool's own thread pool or
+    warm worker processes (no ctx: the worker's resources stay on the loop). A handler
+    with the wrong arity is rejected when the spec is created or, given as a path,
+    when this process first imports it.
+    """
+    name: str
+    args_model: Union[Type["BaseModel"], str]
+    handler: Union[Handler, str, None] = None
+    max_concurrency: Optional[int] = None  # None -> unlimited; extra calls wait for a slot
+    timeout_s: Optional[float] = None      # per call, once it has a slot
+    backend: str = INLINE
+    description: str = ""
+    proto_type: Optional[Type[Message]] = field(default=None, repr=False)
+    _resolved: Optional[Handler] = field(default=None, init=False, repr=False)
+    _model: Optional[Type["BaseModel"]] = field(default=None, init=False, repr=False)
+    _slots: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+    _backend: Optional[Backend] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.proto_type is None:
+            fd = models_pb.ToolCall.DESCRIPTOR.fields_by_name.get(self.name)
+            if fd is None or fd.containing_oneof is None:
+                raise ValueError(f"ToolCall has no payload field {self.name!r}")
+            self.proto_type = getattr(models_pb, fd.message_type.name)
+        if callable(self.handler):
+            self._resolved = self._checked(self.handler)
+        if not isinstance(self.args_model, str):
+            self._model = self.args_model
+        if self.backend not in BACKENDS:
+            raise ValueError(f"tool {self.name!r}: unknown backend {self.backend!r}")
+
+    @property
+    def local(self) -> bool:
+        return self.handler is not None
+
+    def resolve(self) -> Handler:
+        if self._resolved is None:
+            if not isinstance(self.handler, str):
+                raise LookupError(f"tool {self.name!r} has no handler in this process")
+            self._resolved = self._checked(load_attr(self.handler))
+        return self._resolved
+
+    def _checked(self, handler: Any) -> Any:
+        want = 2 if self.backend == INLINE else 1
+        try:
+            params = list(inspect.signature(handler).parameters.values())
+        except (TypeError, ValueError):  # no signature to look at (some builtins)
+            return handler
+        if any(p.kind == p.VAR_POSITIONAL for p in params):
+            return handler
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        required = [p for p in positional if p.default is p.empty]
+        if not len(required) <= want <= len(positional):
+            raise ValueError(f"tool {self.name!r}: {self.backend} handlers take {'(args, ctx)' if want == 2 else '(args)'}, "
+                             f"{getattr(handler, '__qualname__', handler)!r} does not")
+        return handler
+
+    @property
+    def model(self) -> Type["BaseModel"]:
+        if self._model is None:
+            self._model = load_attr(self.args_model)
+        return self._model
+
+    # ---- proto <-> model ----
+
+    def to_proto(self, args: "BaseModel") -> Message:
+        return self.proto_type(**args.model_dump(exclude_none=True))
+
+    def from_proto(self, msg: Message) -> "BaseModel":
+        # Unset proto3 scalars read as ""/0; optional model fields keep their own default then.
+        values: Dict[str, Any] = {}
+        model = self.model
+        for name, info in model.model_fields.items():
+            v = getattr(msg, name)
+            if info.is_required() or v:
+                values[name] = v
+        return model(**values)
+
+
+class ToolRegistry:
+    """Tools by name: dict dispatch, lazily imported handlers, per-tool limits and timeouts."""
+
+    def __init__(self) -> None:
+        self._specs: Dict[str, ToolSpec] = {}
+
+    def register(self, spec: ToolSpec) -> ToolSpec:
+        if spec.name in self._specs:
+            raise ValueError(f"tool {spec.name!r} already registered")
+        self._specs[spec.name] = spec
+        return spec
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        return self._specs.get(name)
+
+    def __getitem__(self, name: str) -> ToolSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unsupported tool: {name}")
+        return spec
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[ToolSpec]:
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def names(self) -> list[str]:
+        return list(self._specs)
+
+    async def dispatch(self, spec: ToolSpec, args: Message, ctx: ToolContext) -> Optional[Mapping[str, str]]:
+        backend = spec._backend or self._backend(spec)
+        if spec.max_concurrency is None:
+            return await backend.run(args, ctx)
+        if spec._slots is None:
+            spec._slots = asyncio.Semaphore(spec.max_concurrency)
+        async with spec._slots:
+            return await backend.run(args, ctx)
+
+    async def start(self) -> None:
+        """Warm up process-backed tools so their first call does not pay for the spawn."""
+        await asyncio.gather(*(self._backend(spec).start() for spec in self if spec.local and spec.backend == PROCESS))
+
+    def close(self) -> None:
+        for spec in self:
+            if spec._backend is not None:
+                spec._backend.close()
+                spec._backend = None
+
+    @staticmethod
+    def _backend(spec: ToolSpec) -> Backend:
+        if spec._backend is None:
+            spec._backend = BACKENDS[spec.backend](spec)
+        return spec._backend
+
+
+# The tools this process knows; pyserver.tools.catalog registers the built-ins.
+TOOLS = ToolRegistry()
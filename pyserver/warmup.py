@@ -0,0 +1,74 @@
+# warmup.py
+"""Startup warmup shared by the worker (pyserver.server) and the listener (pyserver.listener)."""
+from __future__ import annotations
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+Step = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class StepResult:
+    name: str
+    seconds: float
+    error: Optional[str] = None
+
+
+class WarmupFailed(RuntimeError):
+    def __init__(self, results: List[StepResult]) -> None:
+        self.results = results
+        failed = ", ".join(f"{r.name}: {r.error}" for r in results if r.error)
+        super().__init__(f"warmup failed ({failed})")
+
+
+def warm_steps(components: Dict[str, Any]) -> List[Step]:
+    """
+    One step per component that has a warm() (engines, ASR, wake word, planners). A
+    blocking warm() (e.g. a TTS engine's) runs on a thread so the steps still overlap.
+    """
+    steps: List[Step] = []
+    for name, c in components.items():
+        warm = getattr(c, "warm", None)
+        if not callable(warm):
+            continue
+        steps.append((name, warm if inspect.iscoroutinefunction(warm) else functools.partial(asyncio.to_thread, warm)))
+    return steps
+
+
+async def warm_up(steps: Sequence[Step], timeout_s: float = 300.0) -> List[StepResult]:
+    """
+    Run warmup steps concurrently (they load independent resources: a model in Ollama, the
+    TTS engine, ASR sessions) and log each one's time. Raises WarmupFailed once all have
+    finished if any failed or ran past `timeout_s`, so the caller can stay NOT_SERVING.
+    """
+    log = logging.getLogger("Warmup")
+
+    async def timed(name: str, fn: Callable[[], Awaitable[Any]]) -> StepResult:
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(fn(), timeout_s)
+            result = StepResult(name, time.perf_counter() - t0)
+            log.info("warmup %s: %.0f ms", name, result.seconds * 1e3)
+        except Exception as e:
+            result = StepResult(name, time.perf_counter() - t0, f"{type(e).__name__}: {e}")
+            log.error("warmup %s failed after %.0f ms: %s", name, result.seconds * 1e3, result.error)
+        return result
+
+    t0 = time.perf_counter()
+    results = list(await asyncio.gather(*(timed(name, fn) for name, fn in steps)))
+    log.info("warmup done in %.0f ms (%s)", (time.perf_counter() - t0) * 1e3,
+             ", ".join(f"{r.name} {r.seconds * 1e3:.0f} ms" for r in results) or "nothing to warm")
+    if any(r.error for r in results):
+        raise WarmupFailed(results)
+    return results
+
+
+async def ollama_preload(model: str, host: Optional[str] = None, keep_alive: str = "30m") -> None:
+    """Load `model` into Ollama and keep it resident (an empty generate only loads)."""
+    import ollama
+    await ollama.AsyncClient(host=host).generate(model=model, prompt="", keep_alive=keep_alive)
@@ -0,0 +1,33 @@
+# tests/test_backends.py
+"""Tool execution backends: process timeouts, recovery and handler signatures."""
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from pyserver.bench.backends import hard_timeout
+from pyserver.tools.registry import ToolSpec
+
+
+def test_process_tool_is_cut_off_at_its_timeout() -> None:
+    t = asyncio.run(hard_timeout(timeout_s=0.25))
+    assert t["overrun_status"] == "STATUS_FAILED"
+    assert t["overrun_returned_s"] <= t["timeout_s"] + 0.5
+    assert t["next_call_status"] == "STATUS_OK"  # a fresh worker took the killed one's place
+
+
+async def _inline(args, ctx):
+    return None
+
+
+def _sync(args):
+    return None
+
+
+def test_handler_arity_is_checked() -> None:
+    ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", _inline)
+    ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", _sync, backend="thread")
+    with pytest.raises(ValueError, match=r"inline handlers take \(args, ctx\)"):
+        ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", _sync)
+    with pytest.raises(ValueError, match=r"process handlers take \(args\)"):
+        ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", _inline, backend="process")
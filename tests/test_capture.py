@@ -0,0 +1,90 @@
+# tests/test_capture.py
+"""Capture process and shared-memory ring: no frames lost in the hand-off, readers end with the writer."""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from pyserver.bench.capture import run_mode
+from pyserver.listener.capture import CaptureConfig, CaptureProcess, FrameRing, SharedRingSource
+
+ARGS = argparse.Namespace(seconds=3.0, block_ms=10, device_blocks=2, ring_blocks=64, asr_streams=2, clip_s=3.0,
+                          planner_threads=2, startup_s=1.5)
+
+
+def test_ring_reader_follows_and_counts_laps() -> None:
+    ring = FrameRing.create(4, 8)
+    try:
+        source = SharedRingSource(ring)
+        for seq in range(3):
+            ring.write(np.full(8, seq, dtype=np.int16), float(seq))
+        assert [np.frombuffer(source.poll(), dtype=np.int16)[0] for _ in range(3)] == [0, 1, 2]
+        assert source.poll() is None
+        for seq in range(3, 13):
+            ring.write(np.full(8, seq, dtype=np.int16), float(seq))
+        assert np.frombuffer(source.poll(), dtype=np.int16)[0] == 10  # the oldest block still in the ring
+        assert source.dropped == 7
+    finally:
+        ring.close()
+
+
+def test_capture_process_loses_nothing_in_the_ring(tmp_path) -> None:
+    inline = asyncio.run(run_mode("inline", True, ARGS, str(tmp_path / "inline.json")))
+    process = asyncio.run(run_mode("process", True, ARGS, str(tmp_path / "process.json")))
+    assert process["lost_in_handoff"] == 0
+    assert process["lost_at_device"] <= inline["lost_at_device"]
+
+
+class _Stream:
+    def __init__(self, fail_start: bool) -> None:
+        self.fail_start = fail_start
+
+    def start(self) -> None:
+        if self.fail_start:
+            raise RuntimeError("start failed")
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def failing_factory(*_args, **_kw) -> _Stream:
+    raise RuntimeError("no input device")
+
+
+def failing_start(*_args, **_kw) -> _Stream:
+    return _Stream(fail_start=True)
+
+
+def silent(*_args, **_kw) -> _Stream:
+    return _Stream(fail_start=False)
+
+
+async def _read_after(stream: str, kill: bool = False) -> None:
+    capture = CaptureProcess(CaptureConfig(stream=f"tests.test_capture:{stream}"))
+    await capture.start()
+    try:
+        source = capture.source()
+        if kill:
+            await asyncio.sleep(1.0)
+            os.kill(capture._proc.pid, signal.SIGKILL)
+        await asyncio.wait_for(source.read(), 10.0)
+    finally:
+        await capture.close()
+
+
+@pytest.mark.parametrize("stream", ["failing_factory", "failing_start"])
+def test_reader_ends_when_capture_fails(stream: str) -> None:
+    with pytest.raises(EOFError, match="capture stopped"):
+        asyncio.run(_read_after(stream))
+
+
+def test_reader_ends_when_capture_process_dies() -> None:
+    with pytest.raises(EOFError, match="capture process died"):
+        asyncio.run(_read_after("silent", kill=True))
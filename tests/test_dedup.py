@@ -0,0 +1,98 @@
+# tests/test_dedup.py
+"""RunTask runs each (task_id, attempt_id) once, however many copies reach the worker."""
+from __future__ import annotations
+import asyncio
+from collections import Counter
+from typing import Mapping
+
+import grpc
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2_grpc as rpc
+
+from pyserver.bench.stubs import FakeTTSEngine
+from pyserver.scheduler.service import WorkerDispatcher
+from pyserver.server.server import PythonWorkerService, TTSQueue
+from pyserver.tools.registry import ToolContext, ToolRegistry, ToolSpec
+
+
+class Worker:
+    """PythonWorkerService on a local port whose `speak` counts runs per text."""
+
+    def __init__(self, delay_s: float = 0.005, fail_first: str = "") -> None:
+        self.runs: Counter = Counter()
+        self._delay_s = delay_s
+        self._fail_first = fail_first
+
+    async def speak(self, args: models_pb.SpeakArgs, _ctx: ToolContext) -> Mapping[str, str]:
+        self.runs[args.text] += 1
+        await asyncio.sleep(self._delay_s)
+        if args.text == self._fail_first and self.runs[args.text] == 1:
+            raise RuntimeError("transient failure")
+        return {"run": str(self.runs[args.text])}
+
+    async def __aenter__(self) -> "Worker":
+        reg = ToolRegistry()
+        reg.register(ToolSpec("speak", "pyserver.llm.models:SpeakArgsModel", self.speak))
+        self.service = PythonWorkerService(TTSQueue(engine=FakeTTSEngine()), tools=reg)
+        self._server = grpc.aio.server()
+        rpc.add_PythonWorkerServiceServicer_to_server(self.service, self._server)
+        self.addr = f"127.0.0.1:{self._server.add_insecure_port('127.0.0.1:0')}"
+        await self._server.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._server.stop(grace=None)
+
+
+def _req(text: str, task_id: str, attempt_id: str = "1") -> pb.RunTaskRequest:
+    return pb.RunTaskRequest(call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text=text)),
+                             task_id=task_id, attempt_id=attempt_id)
+
+
+def test_duplicates_run_once_per_attempt() -> None:
+    async def scenario():
+        async with Worker() as w, grpc.aio.insecure_channel(w.addr) as ch:
+            stub = rpc.PythonWorkerServiceStub(ch)
+            reqs = [_req(f"dup-{i}", f"task-{i}") for i in range(20)]
+            concurrent = await asyncio.gather(*(stub.RunTask(r) for r in reqs for _ in range(5)))
+            late = await asyncio.gather(*(stub.RunTask(r) for r in reqs))
+            next_attempt = await stub.RunTask(_req("dup-0", "task-0", attempt_id="2"))
+            return w.runs, concurrent + late, next_attempt
+
+    runs, responses, next_attempt = asyncio.run(scenario())
+    assert runs["dup-0"] == 2 and all(runs[f"dup-{i}"] == 1 for i in range(1, 20))
+    assert all(r.status == pb.RunTaskResponse.STATUS_OK and r.output["run"] == "1" for r in responses)
+    assert next_attempt.output["run"] == "2"
+
+
+def test_failed_run_is_retried() -> None:
+    async def scenario():
+        async with Worker(fail_first="flaky") as w, grpc.aio.insecure_channel(w.addr) as ch:
+            stub = rpc.PythonWorkerServiceStub(ch)
+            statuses = [(await stub.RunTask(_req("flaky", "task-flaky"))).status for _ in range(3)]
+            return w.runs["flaky"], statuses
+
+    runs, statuses = asyncio.run(scenario())
+    assert statuses == [pb.RunTaskResponse.STATUS_FAILED, pb.RunTaskResponse.STATUS_OK, pb.RunTaskResponse.STATUS_OK]
+    assert runs == 2
+
+
+def test_hedged_requests_run_once() -> None:
+    async def scenario():
+        async with Worker(delay_s=0.05) as w:
+            dispatcher = WorkerDispatcher(w.addr, hedge_after_s=0.005)
+            try:
+                tasks = [models_pb.Task(task_id=f"hedge-{i}", call=models_pb.ToolCall(speak=models_pb.SpeakArgs(text=f"hedge-{i}")))
+                         for i in range(10)]
+                responses = await asyncio.gather(*(dispatcher(t) for t in tasks))
+                await asyncio.sleep(0.1)  # a losing copy still reaching the worker must not run again
+            finally:
+                await dispatcher.close()
+            return w.runs, responses, dispatcher.stats
+
+    runs, responses, stats = asyncio.run(scenario())
+    assert stats.hedged == 10 and stats.sent == 20
+    assert all(r.status == pb.RunTaskResponse.STATUS_OK for r in responses)
+    assert runs == {f"hedge-{i}": 1 for i in range(10)}
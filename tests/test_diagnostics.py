@@ -0,0 +1,46 @@
+# tests/test_diagnostics.py
+"""Diagnostics find a blocking coroutine and a busy thread, and the default mode is cheap."""
+from __future__ import annotations
+import argparse
+import asyncio
+import statistics
+
+import pytest
+
+from pyserver.bench.diagnostics import DEFAULT, MAX_OVERHEAD_PCT, effectiveness, throughput
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory) -> dict:
+    return asyncio.run(effectiveness(argparse.Namespace(), str(tmp_path_factory.mktemp("profiles"))))
+
+
+def test_blocking_call_is_reported_with_its_stack(report: dict) -> None:
+    assert report["stalls"] >= 1
+    assert "blocking_handler" in (report["stall_task"] or "")
+    assert report["stall_stack_names_handler"]
+
+
+def test_coroutine_timing_is_opt_in(report: dict) -> None:
+    assert report["coroutines_before_start_status"] == 409
+    assert report["coroutines_start_status"] == 200
+    assert next(iter(report["top_max_step"])) == "blocking_handler"
+
+
+def test_profile_is_complete(report: dict) -> None:
+    p = report["profile"]
+    assert p["valid_collapsed"] and p["busy_thread_seen"] and p["loop_blocked_in_sleep"], p
+
+
+def test_unknown_route_is_404(report: dict) -> None:
+    assert report["unknown_route_status"] == 404
+
+
+@pytest.mark.parametrize("work_us", [0.0, 50.0], ids=["empty", "typical"])
+def test_default_overhead(work_us: float) -> None:
+    runs = {"off": [], DEFAULT: []}
+    for _ in range(3):  # interleaved, so drift hits both alike
+        for mode in runs:
+            runs[mode].append(asyncio.run(throughput(mode, work_us, 0.5, 100)))
+    cost = (1 - statistics.median(runs[DEFAULT]) / statistics.median(runs["off"])) * 100
+    assert cost <= MAX_OVERHEAD_PCT, f"{cost:.2f}%"
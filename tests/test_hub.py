@@ -0,0 +1,77 @@
+# tests/test_hub.py
+"""HubPlanner single flight: rooms asking the same thing share one router call."""
+from __future__ import annotations
+import asyncio
+from typing import Sequence
+
+import pytest
+
+from pyserver.listener.hub import HubPlanner
+
+
+class Router:
+    """Stands in for PlannerRouter: counts calls and answers after `delay_s`."""
+
+    def __init__(self, delay_s: float = 0.05) -> None:
+        self.calls = 0
+        self._delay_s = delay_s
+
+    async def plan(self, text: str, history: Sequence[dict] = ()) -> str:
+        self.calls += 1
+        await asyncio.sleep(self._delay_s)
+        if text == "fail":
+            raise RuntimeError("router down")
+        return f"plan:{text}"
+
+
+def test_identical_requests_share_one_call() -> None:
+    async def main() -> None:
+        router = Router()
+        hub = HubPlanner(router, concurrency=1)
+        plans = await asyncio.gather(hub.plan("kitchen", "Lights  off"), hub.plan("bedroom", "lights off"))
+        assert plans == ["plan:Lights  off"] * 2
+        assert router.calls == 1 and hub.stats.deduplicated == 1
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_leaves_followers_plan() -> None:
+    async def main() -> None:
+        router = Router()
+        hub = HubPlanner(router, concurrency=1)
+        leader = asyncio.create_task(hub.plan("kitchen", "lights off"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(hub.plan("bedroom", "lights off"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == "plan:lights off"
+        assert leader.cancelled()
+        assert router.calls == 1
+
+    asyncio.run(main())
+
+
+def test_call_cancelled_once_nobody_waits() -> None:
+    async def main() -> None:
+        router = Router(delay_s=10.0)
+        hub = HubPlanner(router, concurrency=1)
+        lone = asyncio.create_task(hub.plan("kitchen", "lights off"))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lone
+        await asyncio.sleep(0)
+        router._delay_s = 0.0
+        assert await asyncio.wait_for(hub.plan("kitchen", "lights on"), 1.0) == "plan:lights on"  # slot freed
+
+    asyncio.run(main())
+
+
+def test_errors_reach_every_waiter() -> None:
+    async def main() -> None:
+        hub = HubPlanner(Router(), concurrency=1)
+        results = await asyncio.gather(hub.plan("kitchen", "fail"), hub.plan("bedroom", "fail"),
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    asyncio.run(main())
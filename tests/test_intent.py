@@ -0,0 +1,35 @@
+# tests/test_intent.py
+"""The embedding intent tier answers only what it gets right and leaves the rest to the LLM."""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from pyserver.bench.intent import TEST_THRESHOLD, classifier, end_to_end, make_test_encoder
+from pyserver.llm.intent import IntentConfig, load_exemplars
+
+ROOT = Path(__file__).parents[1]
+EXEMPLARS = str(ROOT / "data/intents/exemplars.jsonl")
+CORPUS = [json.loads(l) for l in (ROOT / "data/bench/intents.jsonl").read_text().splitlines() if l.strip()]
+
+
+@pytest.fixture(scope="module")
+def cfg(tmp_path_factory) -> IntentConfig:
+    model, tokenizer = make_test_encoder(str(tmp_path_factory.mktemp("encoder")), load_exemplars(EXEMPLARS)[0])
+    return IntentConfig(model_path=model, tokenizer_path=tokenizer, exemplars_path=EXEMPLARS, threshold=TEST_THRESHOLD)
+
+
+def test_no_false_accepts(cfg: IntentConfig) -> None:
+    report = classifier(CORPUS, cfg, [TEST_THRESHOLD])
+    assert report["false_accepts"] == []
+    assert report["local"] > 0
+
+
+def test_tier_saves_llm_calls_without_losing_accuracy(cfg: IntentConfig) -> None:
+    args = argparse.Namespace(ollama_host=None, llm="stub", llm_ms=1.0)
+    report = asyncio.run(end_to_end(CORPUS, cfg, args))
+    assert report["tiered"]["accuracy"] == report["llm_only"]["accuracy"] == 1.0
+    assert report["tiered"]["llm_calls"] < report["llm_only"]["llm_calls"]
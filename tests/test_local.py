@@ -0,0 +1,49 @@
+# tests/test_local.py
+"""LocalSchedulerClient: calls due now are started, not awaited, and keep their timezone."""
+from __future__ import annotations
+import asyncio
+from typing import List
+
+import protobufs.gen.py.protobufs.apis.models.task_pb2 as models_pb
+import protobufs.gen.py.protobufs.apis.services.pyserver_api_pb2 as pb
+
+from pyserver.clients.scheduler.local import LocalSchedulerClient
+from pyserver.llm.models import SpeakArgsModel, ToolCallModel
+from pyserver.scheduler.engine import TIMEZONE_META_KEY
+
+
+def test_now_returns_task_id_before_the_tool_finishes() -> None:
+    calls: List[models_pb.ToolCall] = []
+
+    async def main() -> None:
+        release = asyncio.Event()
+
+        async def dispatch(call: models_pb.ToolCall) -> pb.RunTaskResponse:
+            calls.append(call)
+            await release.wait()
+            return pb.RunTaskResponse(status=pb.RunTaskResponse.STATUS_OK)
+
+        async with LocalSchedulerClient(dispatch) as sched:
+            resp = await asyncio.wait_for(sched.schedule_toolcall_now(ToolCallModel(speak=SpeakArgsModel(text="hi"))), 1.0)
+            assert resp.task_id
+            await asyncio.sleep(0)
+            assert [c.speak.text for c in calls] == ["hi"]
+            release.set()
+            await sched.join()
+
+    asyncio.run(main())
+
+
+def test_now_forwards_timezone() -> None:
+    tasks: List[models_pb.Task] = []
+
+    async def main() -> None:
+        async with LocalSchedulerClient(None, timezone="UTC") as sched:
+            async def run(task: models_pb.Task) -> None:
+                tasks.append(task)
+            sched._run_task = run
+            await sched.schedule_toolcall_now(ToolCallModel(speak=SpeakArgsModel(text="hi")), timezone="Asia/Yerevan")
+            await sched.join()
+
+    asyncio.run(main())
+    assert tasks[0].meta[TIMEZONE_META_KEY] == "Asia/Yerevan"
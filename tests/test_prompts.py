@@ -0,0 +1,26 @@
+# tests/test_prompts.py
+"""Per-utterance tool filtering: every expected tool stays in the prompt, and large catalogs shrink."""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from pyserver.bench.prompts import run
+from pyserver.llm.prompt import PromptConfig
+
+ROOT = Path(__file__).parents[1]
+CORPUS = [json.loads(l) for l in (ROOT / "data/bench/intents.jsonl").read_text().splitlines() if l.strip()]
+
+
+def test_filtering_keeps_expected_tools_and_shrinks_large_catalogs() -> None:
+    args = argparse.Namespace(system=str(ROOT / PromptConfig.system_path), tools_dir=str(ROOT / PromptConfig.tools_dir),
+                              filter_above=PromptConfig.filter_above, max_tools=PromptConfig.max_tools,
+                              decode_ms=0.0, prefill_us=0.0)
+    report = asyncio.run(run(CORPUS, [3, 100], args))
+    small, large = report["sizes"]["3"], report["sizes"]["100"]
+    assert small["filtered"]["system_tokens"] == small["full"]["system_tokens"]  # below filter_above: unfiltered
+    for size in (small, large):
+        assert size["filtered"]["missed"] == []
+        assert size["filtered"]["accuracy"] == size["full"]["accuracy"]
+    assert large["filtered"]["system_tokens"]["max"] < large["full"]["system_tokens"]["p50"]
@@ -0,0 +1,39 @@
+# tests/test_satellite.py
+"""Satellites streaming to one listener: every utterance is transcribed right, no stream fails."""
+from __future__ import annotations
+import argparse
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pyserver.bench.satellite import scenario
+from pyserver.listener import satellite
+from pyserver.listener.satellite import SatelliteConfig, SatelliteService
+from pyserver.listener.wake import WakeConfig
+
+ARGS = argparse.Namespace(corpus=str(Path(__file__).parents[1] / "data/bench/corpus.jsonl"), satellites=4, seconds=5.0,
+                          utterance_s=1.2, llm_ms=20.0, plan_concurrency=2, asr_window_ms=25.0, seed=0)
+
+
+@pytest.mark.parametrize("codec", ["pcm", "opus"])
+def test_satellites_stream_utterances(codec: str) -> None:
+    r = asyncio.run(scenario(ARGS, codec))
+    assert r["streams"] == ARGS.satellites
+    assert r["errors"] == []
+    assert r["idle_satellites"] == []
+    assert r["wrong"] == 0 and r["correct"] == r["utterances"] > 0
+
+
+def test_wake_model_is_loaded_once(monkeypatch) -> None:
+    loads = []
+    monkeypatch.setattr(satellite, "wake_session", lambda cfg: loads.append(cfg) or object())
+    service = SatelliteService(hub=None, asr=None, cfg=SatelliteConfig(wake=WakeConfig(model_path="kws.onnx")))
+
+    async def main() -> None:
+        await service.warm()
+        first, second = await asyncio.gather(service._wake(), service._wake())
+        assert first is second
+
+    asyncio.run(main())
+    assert len(loads) == 1  # shared by every stream's detector
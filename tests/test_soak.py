@@ -0,0 +1,34 @@
+# tests/test_soak.py
+"""A short memory soak of the listener and worker: nothing grows per request and nothing fails."""
+from __future__ import annotations
+import argparse
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pyserver.bench.soak import MAX_GROWTH_KIB, MAX_RETAINED_B, MAX_RSS_GROWTH_MIB, run
+
+ARGS = argparse.Namespace(corpus=str(Path(__file__).parents[1] / "data/bench/corpus.jsonl"), seconds=5.0,
+                          warmup_s=3.0, sample_s=2.5, utterances_per_s=20.0, runtasks_per_s=100.0,
+                          dedup_entries=256, per_request=500, top=5)
+
+
+@pytest.fixture(scope="module")
+def report() -> dict:
+    return asyncio.run(run(ARGS))
+
+
+def test_no_request_fails(report: dict) -> None:
+    assert report["requests"] > 0
+    assert not report["counts"].get("errors") and not report["speech_dropped"]
+
+
+def test_memory_stays_flat(report: dict) -> None:
+    assert report["traced_growth_kib"] <= MAX_GROWTH_KIB, report["top_growth"][:3]
+    assert report["rss_growth_mib"] <= MAX_RSS_GROWTH_MIB
+
+
+def test_hot_paths_retain_nothing(report: dict) -> None:
+    retained = {name: r["retained_b"] for name, r in report["per_request"].items()}
+    assert all(b <= MAX_RETAINED_B for b in retained.values()), retained
@@ -0,0 +1,18 @@
+# tests/test_startup.py
+"""Cold start of `python -m pyserver`: lazy imports stay lazy and the first RunTask is fast."""
+from __future__ import annotations
+import asyncio
+
+from pyserver.bench.startup import MAX_FIRST_TASK_MS, MAX_IMPORT_MS, cold_start, import_profile
+
+
+def test_imports_stay_lazy() -> None:
+    profile = import_profile()
+    assert profile["eager_heavy"] == []
+    assert profile["total_ms"] <= MAX_IMPORT_MS, profile["top_self_ms"]
+
+
+def test_cold_start_reaches_serving() -> None:
+    marks = asyncio.run(cold_start("null", timeout_s=30.0))
+    assert list(marks) == ["bound", "first_task", "serving"]
+    assert marks["first_task"] * 1e3 <= MAX_FIRST_TASK_MS
@@ -0,0 +1,35 @@
+# tests/test_tools.py
+"""The tool registry: dispatch cost independent of catalog size; Tools and ToolCallModel follow it."""
+from __future__ import annotations
+import argparse
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from pyserver.bench import tools as tools_bench
+from pyserver.llm.models import SpeakArgsModel, TimerArgsModel, ToolCallModel, Tools
+from pyserver.tools.catalog import TOOLS
+
+
+def test_dispatch_cost_is_flat() -> None:
+    per_call = asyncio.run(tools_bench.run(argparse.Namespace(sizes="3,1000", calls=5000, repeats=5, seed=0)))
+    assert per_call["1000"]["registry_ns"] <= 1.5 * per_call["3"]["registry_ns"], per_call
+
+
+def test_tools_enum_follows_registry() -> None:
+    assert [t.value for t in Tools] == TOOLS.names()
+
+
+def test_toolcall_round_trip() -> None:
+    call = ToolCallModel(timer=TimerArgsModel(minutes=5))
+    assert call.which() == Tools.TIMER
+    back = ToolCallModel.from_proto(call.to_proto())
+    assert back.which() == Tools.TIMER and back.timer.minutes == 5
+
+
+def test_toolcall_needs_exactly_one_tool() -> None:
+    with pytest.raises(ValidationError):
+        ToolCallModel()
+    with pytest.raises(ValidationError):
+        ToolCallModel(speak=SpeakArgsModel(text="hi"), timer=TimerArgsModel(minutes=1))
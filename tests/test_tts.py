@@ -0,0 +1,53 @@
+# tests/test_tts.py
+"""ONNX TTS: streaming by sentence brings first audio forward; volume and chunking behave."""
+from __future__ import annotations
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pyserver.bench.tts import RealtimeSink, make_test_voice, run
+from pyserver.server import tts_onnx
+from pyserver.server.tts_onnx import OnnxTTSConfig, OnnxTTSEngine, split_chunks
+
+
+@pytest.fixture(scope="module")
+def voice(tmp_path_factory) -> str:
+    return make_test_voice(str(tmp_path_factory.mktemp("voice")))
+
+
+def test_streaming_brings_first_audio_forward(voice: str) -> None:
+    report = run(argparse.Namespace(threads=1, repeat=1, playback_speed=4.0), voice)
+    assert report["rtf"] < 1.0
+    for r in report["replies"]:
+        if r["chunks"] > 1:
+            assert r["first_audio_streamed_ms"] < r["first_audio_whole_ms"], r
+
+
+def test_volume_zero_is_mute(voice: str) -> None:
+    engine = OnnxTTSEngine(OnnxTTSConfig(voice), sink=RealtimeSink(speed=1000.0))
+    engine.setProperty("volume", 0.0)
+    assert not np.any(engine.synthesize("Hello there."))
+    engine.setProperty("volume", None)
+    assert np.any(engine.synthesize("Hello there."))
+
+
+def test_split_chunks() -> None:
+    assert split_chunks("One. Two! Three?") == ["One.", "Two!", "Three?"]
+    long = "word, " * 40
+    assert all(len(c) <= 160 for c in split_chunks(long))
+
+
+def test_espeak_voice_needs_a_phonemizer_or_lexicon(tmp_path, monkeypatch) -> None:
+    model = make_test_voice(str(tmp_path))
+    config = json.loads(Path(f"{model}.json").read_text(encoding="utf-8"))
+    Path(f"{model}.json").write_text(json.dumps({**config, "phoneme_type": "espeak"}), encoding="utf-8")
+    monkeypatch.setattr(tts_onnx, "espeak_phonemizer", lambda _config: None)  # piper-phonemize not installed
+    with pytest.raises(ValueError, match="lexicon"):
+        OnnxTTSEngine(OnnxTTSConfig(model), sink=RealtimeSink(speed=1000.0))
+
+    Path(f"{model}.lexicon.tsv").write_text("hello\th e l o\n", encoding="utf-8")
+    engine = OnnxTTSEngine(OnnxTTSConfig(model), sink=RealtimeSink(speed=1000.0))
+    assert engine.tables.ids("hello").size > 0
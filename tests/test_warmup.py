@@ -0,0 +1,63 @@
+# tests/test_warmup.py
+"""After warmup the first request is as fast as the steady state (LLM, TTS, ASR)."""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import pytest
+
+from pyserver.bench import warmup
+from pyserver.bench.tts import make_test_voice
+from pyserver.warmup import WarmupFailed, warm_steps, warm_up
+
+ARGS = argparse.Namespace(requests=6, load_ms=300.0, infer_ms=10.0)
+
+
+def _first_is_steady(summary: dict) -> bool:
+    return summary["first_ms"] <= 1.5 * summary["steady_p50_ms"] + 5.0
+
+
+def test_llm_first_request_after_warmup() -> None:
+    cold = asyncio.run(warmup.llm(ARGS, warm=False))
+    warm = asyncio.run(warmup.llm(ARGS, warm=True))
+    assert not _first_is_steady(cold)  # the model load lands on the first request
+    assert _first_is_steady(warm), warm
+
+
+def test_tts_first_request_after_warmup(tmp_path) -> None:
+    warm = asyncio.run(warmup.tts(ARGS, True, make_test_voice(str(tmp_path))))
+    assert _first_is_steady(warm), warm
+
+
+def test_asr_first_request_after_warmup() -> None:
+    warm = asyncio.run(warmup.asr(ARGS, warm=True))
+    assert _first_is_steady(warm), warm
+
+
+class _Slow:
+    def warm(self) -> None:
+        time.sleep(0.2)
+
+
+class _SlowAsync:
+    async def warm(self) -> None:
+        await asyncio.sleep(0.2)
+
+
+class _Broken:
+    async def warm(self) -> None:
+        raise OSError("model missing")
+
+
+def test_warm_steps_overlap_sync_and_async() -> None:
+    steps = warm_steps({"a": _Slow(), "b": _SlowAsync(), "plain": object()})
+    assert [name for name, _ in steps] == ["a", "b"]
+    t0 = time.perf_counter()
+    asyncio.run(warm_up(steps))
+    assert time.perf_counter() - t0 < 0.35  # concurrently: the blocking warm() ran on a thread
+
+
+def test_warm_up_reports_failures() -> None:
+    with pytest.raises(WarmupFailed, match="broken: OSError"):
+        asyncio.run(warm_up(warm_steps({"ok": _SlowAsync(), "broken": _Broken()})))
@@ -0,0 +1,36 @@
+# tests/test_watch.py
+"""TaskMirror: reads follow every change, and a reconnect resumes instead of resyncing."""
+from __future__ import annotations
+import argparse
+import asyncio
+
+import protobufs.gen.py.protobufs.apis.services.scheduler_api_pb2 as sched_pb
+
+from pyserver.bench.watch import run_mode
+from pyserver.clients.scheduler.mirror import Event, TaskMirror
+
+
+def _snapshot(*task_ids: str) -> list:
+    tasks = [sched_pb.TaskSummary(task_id=t, tool="timer") for t in task_ids]
+    return [Event(kind=Event.KIND_SNAPSHOT, reset=True, tasks=tasks), Event(kind=Event.KIND_SYNCED, epoch="e", seq=1)]
+
+
+def test_resync_to_empty_snapshot_clears_reads() -> None:
+    mirror = TaskMirror(stub=None)
+    for ev in _snapshot("a", "b"):
+        mirror._apply(ev)
+    assert [t.task_id for t in mirror.list(tools=["timer"])] == ["a", "b"]
+    for ev in _snapshot():
+        mirror._apply(ev)
+    assert mirror.list(tools=["timer"]) == [] and mirror.list() == []
+
+
+def test_mirror_resumes_after_restart() -> None:
+    args = argparse.Namespace(tasks=200, seconds=1.0, reads_per_s=50.0, writes_per_s=20.0, poll_s=1.0,
+                              offline_changes=50, seed=0)
+    m = asyncio.run(run_mode(args, "mirror"))
+    r = m["resync"]
+    assert r["identical"], "mirror differs from the engine after the restart"
+    assert (r["resumes"], r["snapshots"]) == (1, 1), "reconnect was not an incremental resume"
+    assert r["events_to_resync"] <= 2 * r["offline_changes"] + 50
+    assert not m["rpcs"].get("ListTasks"), f"mirror reads went to ListTasks: {m['rpcs']}"
@@ -0,0 +1,17 @@
+# tests/test_when.py
+"""Every line of the time-expression corpus (data/bench/when.jsonl) parses and routes as expected."""
+from __future__ import annotations
+import json
+from pathlib import Path
+
+import pytest
+
+from pyserver.bench.when import NOW, TZ, actual, local_time
+
+CORPUS = [json.loads(l) for l in (Path(__file__).parents[1] / "data/bench/when.jsonl").read_text().splitlines() if l.strip()]
+
+
+@pytest.mark.parametrize("line", CORPUS, ids=[f"{l.get('tool', 'find')}:{l['text']}" for l in CORPUS])
+def test_corpus(line: dict) -> None:
+    tz = line.get("tz", TZ)
+    assert actual(line["text"], tz, local_time(line.get("now", NOW), tz), line.get("tool")) == line["expect"]